@@ -7,19 +7,29 @@ import streamlit as st
 import pandas as pd
 
 from config import get_latest_steam_csv, get_latest_nonsteam_csv
-from calculation.process_data import load_data, clean_dev_genre_list, flagging
+from calculation import process_data
+from calculation.process_data import load_data
+from calculation.ranking_cache import RankingCache, frame_fingerprint
+from calculation.row_store import prepare_steam
+from calculation.trends_score_store import open_trends_store, TS_FMT
+from pipelines.snapshot_store import read_snapshot
+from pipelines.job_runner import load_job, is_running, start_job
+from pipelines.ranking_pipeline import NonSteamReady, load_prepared_nonsteam
 
 
-_TRENDS_TS_FMT = "%Y-%m-%d %H:%M:%S"
+_TRENDS_TS_FMT = TS_FMT
 TRENDS_TTL_HOURS = 24
 
 
-def filter_stale_trends_games(games: list, cache_timestamps: dict) -> list:
+def filter_stale_trends_games(games: list, cache_timestamps: dict | None = None) -> list:
     """
     Return only the games from `games` that are missing from the cache or whose
-    cached timestamp is older than TRENDS_TTL_HOURS. Pass a dict of
-    {game_name: fetched_at_str} built from the trends cache CSV.
+    cached timestamp is older than TRENDS_TTL_HOURS. cache_timestamps
+    ({game_name: fetched_at_str}) defaults to a point lookup of `games` in
+    the trends score store.
     """
+    if cache_timestamps is None:
+        cache_timestamps = load_trends_cache_timestamps(games)
     cutoff = dt.datetime.now() - dt.timedelta(hours=TRENDS_TTL_HOURS)
     stale = []
     for game in games:
@@ -35,15 +45,12 @@ def filter_stale_trends_games(games: list, cache_timestamps: dict) -> list:
     return stale
 
 
-def load_trends_cache_timestamps(trends_cache_file) -> dict:
-    """Return {game_name: fetched_at_str} from the trends cache CSV."""
+def load_trends_cache_timestamps(games: list | None = None) -> dict:
+    """Return {game_name: fetched_at_str} from the trends score store (default: every game)."""
     try:
-        df = pd.read_csv(trends_cache_file)
-        if "fetched_at" in df.columns and "game_name" in df.columns:
-            return dict(zip(df["game_name"], df["fetched_at"]))
+        return open_trends_store().timestamps(games)
     except Exception:
-        pass
-    return {}
+        return {}
 
 
 def highlight_new_rows(df: pd.DataFrame):
@@ -61,47 +68,176 @@ def highlight_new_rows(df: pd.DataFrame):
 
 
 def _write_trends_cache(scores: dict, anchor: str):
-    """Write trends scores + anchor to the cache CSV."""
-    from config import TRENDS_CACHE_FILE
-    import datetime as _dt
-    now = _dt.datetime.now().strftime(_TRENDS_TS_FMT)
-    pd.DataFrame([
-        {"game_name": g, "trends_score": s, "fetched_at": now, "anchor": anchor}
-        for g, s in scores.items()
-    ]).to_csv(TRENDS_CACHE_FILE, index=False)
+    """Upsert trends scores + anchor into the trends score store."""
+    open_trends_store().upsert_scores(scores, anchor=anchor)
+
+
+JOB_REFRESH_SECONDS = 5
+
+
+def reload_trends_scores() -> None:
+    """Pull every stored trends score into st.session_state.nonsteam_trends."""
+    try:
+        st.session_state.nonsteam_trends.update(open_trends_store().scores())
+    except Exception:
+        pass
+
+
+def _job_seen_key(kind: str) -> str:
+    return f"_job_seen_{kind}"
+
+
+def start_background_job(kind: str, login: str, password: str) -> None:
+    """Start a background collect job (pipelines/job_runner.py) and rerun to show its progress."""
+    if start_job(kind, login, password):
+        st.session_state[_job_seen_key(kind)] = None
+    else:
+        st.toast("Collection is already running in the background", icon="🔄")
+    st.rerun()
+
+
+def render_job_progress(kind: str, on_finish=None) -> None:
+    """
+    Show a background job's progress. While the job runs, a fragment re-reads
+    its record every JOB_REFRESH_SECONDS without rerunning the page. When a job
+    this session has watched finishes, on_finish(job) is called once and the
+    page reruns so the tables pick up the results.
+    """
+    seen_key = _job_seen_key(kind)
+    job = load_job(kind)
+    if not job:
+        return
+    if job["status"] != "running" and seen_key not in st.session_state:
+        # Finished before this session first looked — nothing to announce
+        st.session_state[seen_key] = job["finished_at"]
+    if job["status"] != "running" and st.session_state[seen_key] == job["finished_at"]:
+        return
+
+    @st.fragment(run_every=JOB_REFRESH_SECONDS)
+    def _progress():
+        job = load_job(kind) or {}
+        if job.get("status") == "running" and is_running(kind):
+            prog = job["progress"]
+            pending = f", {prog['pending']} pending" if prog.get("pending") is not None else ""
+            st.info(f"🔄 {job['label']}: {prog['collected']} collected, {prog['errors']} error(s){pending} "
+                    f"— poll {prog['polls']}, runs in the background")
+            return
+        if st.session_state.get(seen_key) == job.get("finished_at"):
+            return
+        st.session_state[seen_key] = job.get("finished_at")
+        if on_finish is not None and job.get("status") != "running":
+            on_finish(job)
+        st.rerun()
+
+    _progress()
+
+
+def get_developer_index():
+    """
+    Return the DeveloperIndex over the current developer list, or None when
+    the list cannot be loaded. process_data reloads the list whenever the file's
+    mtime changes; the session's dev_list follows it, and a loaded Steam
+    frame's precomputed Developer Points are rescored, so dev-list edits reach
+    the rankings without reloading the data.
+    """
+    try:
+        index = process_data.get_developer_index()
+    except Exception:
+        return None
+    if st.session_state.get("dev_list") is not index.source:
+        st.session_state.dev_list = index.source
+        df = st.session_state.get("df_steam")
+        if df is not None and "Developer Points" in df.columns:
+            df = df.copy()
+            df["Developer Points"], _ = index.score(df["Developers"])
+            st.session_state.df_steam = df
+    return index
+
+
+def get_ranking_cache() -> RankingCache:
+    """Return the per-session ranking LRU, creating it on first use."""
+    if "ranking_cache" not in st.session_state:
+        st.session_state.ranking_cache = RankingCache()
+    return st.session_state.ranking_cache
+
+
+def session_fingerprint(name: str, df: pd.DataFrame | None) -> str:
+    """
+    Content hash of a session-state DataFrame, recomputed only when the object
+    under `name` has been replaced (uploads, reloads) since the last call.
+    """
+    memo = st.session_state.setdefault("_fingerprints", {})
+    cached = memo.get(name)
+    if cached is not None and cached[0] is df:
+        return cached[1]
+    fp = frame_fingerprint(df)
+    memo[name] = (df, fp)
+    return fp
+
+
+def games_appended_since(kind: str, since) -> set[str]:
+    """
+    Names of the games in the latest Steam / Non-Steam snapshot appended
+    on/after `since`. The date filter is pushed into the snapshot read and
+    only the name column is loaded; the result is memoized per snapshot file
+    version and date.
+    """
+    csv_path, name_col = (
+        (get_latest_steam_csv(), "Name") if kind == "steam" else (get_latest_nonsteam_csv(), "Game Title")
+    )
+    try:
+        key = (kind, str(csv_path), csv_path.stat().st_mtime_ns, str(since))
+    except OSError:
+        return set()
+    memo = st.session_state.setdefault("_appended_games", {})
+    if key not in memo:
+        names = read_snapshot(csv_path, columns=[name_col], appended_since=since)[name_col]
+        for stale in [k for k in memo if k[0] == kind]:
+            del memo[stale]   # one entry per kind: older file versions never come back
+        memo[key] = set(names.dropna().astype(str))
+    return memo[key]
 
 
 def load_defaults():
     """Load default CSV files into session state and clean/flag the Steam DataFrame."""
     df_steam, df_nonsteam, dev_list, genre_list, inventory = load_data(
-        get_latest_steam_csv(), get_latest_nonsteam_csv()
+        steam_df=read_snapshot(get_latest_steam_csv()),
+        nonsteam_df=read_snapshot(get_latest_nonsteam_csv()),
     )
-    df_steam = clean_dev_genre_list(df_steam)
-    df_steam = flagging(df_steam)
-    st.session_state.df_steam = df_steam
+    st.session_state.dev_list = dev_list
+    st.session_state.df_steam = prepare_steam(df_steam, get_developer_index())
     st.session_state.steam_source = "default file"
     st.session_state.steam_cleaned = True
     st.session_state.df_nonsteam = df_nonsteam
     st.session_state.nonsteam_source = "default file"
     st.session_state.nonsteam_cleaned = True
-    st.session_state.dev_list = dev_list
     st.session_state.genre_list = genre_list
     st.session_state.uploaded_steam_bytes = None
     st.session_state.uploaded_steam_name = None
     st.session_state.uploaded_nonsteam_bytes = None
     st.session_state.uploaded_nonsteam_name = None
+    refresh_nonsteam_ready()
+
+
+def refresh_nonsteam_ready() -> NonSteamReady:
+    """
+    Point st.session_state.nonsteam_ready at the ranking-ready Non-Steam frame
+    for the latest snapshots — rebuilt only when a snapshot has changed since
+    it was last materialized.
+    """
+    st.session_state.nonsteam_ready = load_prepared_nonsteam()
+    return st.session_state.nonsteam_ready
 
 
 def reload_steam_from_csv():
     """Re-read the latest raw_steam_YYYY-MM-DD.csv from disk and update session state."""
     try:
         latest = get_latest_steam_csv()
-        tmp = pd.read_csv(latest)
-        tmp = clean_dev_genre_list(tmp)
-        tmp = flagging(tmp)
-        st.session_state.df_steam = tmp
+        tmp = read_snapshot(latest)
+        st.session_state.df_steam = prepare_steam(tmp, get_developer_index())
         st.session_state.steam_source = latest.name
         st.session_state.steam_cleaned = True
+        refresh_nonsteam_ready()   # on_steam flags follow the Steam snapshot
     except Exception as e:
         st.error(f"Failed to reload Steam CSV: {e}")
 
@@ -110,10 +246,11 @@ def reload_nonsteam_from_csv():
     """Re-read the latest raw_non_steam_YYYY-MM-DD.csv from disk and update session state."""
     try:
         latest = get_latest_nonsteam_csv()
-        tmp = pd.read_csv(latest, encoding='utf-8-sig')
+        tmp = read_snapshot(latest)
         st.session_state.df_nonsteam = tmp
         st.session_state.nonsteam_source = latest.name
         st.session_state.nonsteam_cleaned = True
+        refresh_nonsteam_ready()
     except Exception as e:
         st.error(f"Failed to reload Non-Steam CSV: {e}")
 
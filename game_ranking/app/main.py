@@ -13,16 +13,18 @@ import io
 import pandas as pd
 import streamlit as st
 
-from config import INVENTORY_FILE, TRENDS_CACHE_FILE, get_latest_steam_csv, get_latest_nonsteam_csv
-from calculation.process_data import load_data, clean_dev_genre_list, flagging, populate_appids
+from config import INVENTORY_FILE
+from calculation.trends_score_store import open_trends_store
+from calculation.process_data import get_genre_list, populate_appids
 from calculation.steam_players import fetch_player_counts_if_needed, resolve_inventory_appids
 from pipelines.steam_pipeline import append_from_uploaded_steam_csv
 from pipelines.nonsteam_pipeline import append_from_uploaded_nonsteam_csv
 from pipelines.normalizer import prepare_steam_upload, prepare_nonsteam_upload
-from app.helpers import load_defaults, reload_steam_from_csv, reload_nonsteam_from_csv
-from app.thread_state import _trends_thread_state
-from pipelines.trends_pipeline import run_trends_pipeline
+from app.helpers import get_developer_index, load_defaults, reload_steam_from_csv, reload_nonsteam_from_csv
+from pipelines.trends_pipeline import run_trends_pipeline, trends_pipeline_progress, take_trends_pipeline_result
 from app import tab_steam, tab_nonsteam, tab_inventory, tab_tournament
+from app.rerun_profile import (ALLOC_SESSION_KEY, SESSION_KEY as CPROFILE_KEY, RerunProfile,
+                               render_sidebar as render_rerun_profile)
 
 
 # ── Page config ────────────────────────────────────────────────────────────────
@@ -31,232 +33,244 @@ st.set_page_config(page_title="AGS - Game Ranking Tool", layout="wide")
 st.title("🎮 AGS Game Ranking Tool")
 st.caption("Review priority scores for Steam and Non-Steam games. Upload a CSV or use the defaults — adjust weights and filters as needed.")
 
-# ── Session state initialisation ──────────────────────────────────────────────
-_SESSION_DEFAULTS = {
-    "df_steam":               None,
-    "df_nonsteam":            None,
-    "steam_cleaned":          False,
-    "nonsteam_cleaned":       False,
-    "uploaded_steam_bytes":   None,
-    "uploaded_steam_name":    None,
-    "uploaded_nonsteam_bytes": None,
-    "uploaded_nonsteam_name": None,
-    "trends_anchor":           None,
-}
-for _key, _default in _SESSION_DEFAULTS.items():
-    if _key not in st.session_state:
-        st.session_state[_key] = _default
-
-if "dev_list" not in st.session_state:
-    try:
-        _, _, st.session_state.dev_list, st.session_state.genre_list, _ = load_data(
-            get_latest_steam_csv(), get_latest_nonsteam_csv()
-        )
-    except Exception:
-        pass
-
-# ── SIDEBAR: FILE UPLOADS ──────────────────────────────────────────────────────
-st.sidebar.header("📁 Data")
-
-uploaded_steam    = st.sidebar.file_uploader("Upload Steam CSV",     type="csv", key="steam_upload")
-uploaded_nonsteam = st.sidebar.file_uploader("Upload Non-Steam CSV", type="csv", key="nonsteam_upload")
-
-if uploaded_steam and uploaded_steam.name != st.session_state.uploaded_steam_name:
-    st.session_state.uploaded_steam_bytes = uploaded_steam.getvalue()
-    st.session_state.uploaded_steam_name  = uploaded_steam.name
-
-if uploaded_nonsteam and uploaded_nonsteam.name != st.session_state.uploaded_nonsteam_name:
-    st.session_state.uploaded_nonsteam_bytes = uploaded_nonsteam.getvalue()
-    st.session_state.uploaded_nonsteam_name  = uploaded_nonsteam.name
+# Stage timings for this rerun (sidebar breakdown + logs/reruns.jsonl)
+_profile = RerunProfile.start(
+    cprofile=st.session_state.get(CPROFILE_KEY, False),
+    track_alloc=st.session_state.get(ALLOC_SESSION_KEY, False),
+)
 
-# Preview and load — Steam
-if st.session_state.uploaded_steam_bytes:
-    with st.sidebar.expander("👀 Preview Steam File"):
-        try:
-            preview_steam, _ = prepare_steam_upload(st.session_state.uploaded_steam_bytes)
-        except Exception:
-            preview_steam = pd.read_csv(io.BytesIO(st.session_state.uploaded_steam_bytes), encoding="latin-1")
-        st.dataframe(preview_steam.head(3), width='stretch')
-        st.caption(f"Rows: {len(preview_steam)}, Columns: {len(preview_steam.columns)}")
-        _steam_preview_required = ['Name', 'FollowerCount', 'Developers', 'Genres', 'ReleaseDate']
-        _steam_preview_missing = [c for c in _steam_preview_required if c not in preview_steam.columns]
-        if _steam_preview_missing:
-            st.warning(f"⚠️ Missing required columns: {', '.join(_steam_preview_missing)}")
-
-    if st.sidebar.button("📥 Load Steam Data", key="load_steam_btn"):
-        try:
-            steam_df_upload, steam_warnings = prepare_steam_upload(st.session_state.uploaded_steam_bytes)
-            for w in steam_warnings:
-                st.sidebar.info(w)
-            steam_required_cols = ['Name', 'FollowerCount', 'Developers', 'Genres', 'ReleaseDate']
-            steam_missing = [col for col in steam_required_cols if col not in steam_df_upload.columns]
-            if steam_missing:
-                st.sidebar.error(f"Missing columns: {', '.join(steam_missing)}")
-            else:
-                n_updated, n_new = append_from_uploaded_steam_csv(steam_df_upload)
-                reload_steam_from_csv()
-                st.sidebar.success(f"✅ Saved: {n_new} new, {n_updated} updated")
-                if st.session_state.get("df_steam") is not None and st.session_state.get("df_nonsteam") is not None:
-                    run_trends_pipeline(st.session_state.df_steam, st.session_state.df_nonsteam)
-        except Exception as e:
-            st.sidebar.error(f"Error loading file: {e}")
-else:
-    st.sidebar.caption("Using default Steam CSV.")
-
-# Preview and load — Non-Steam
-if st.session_state.uploaded_nonsteam_bytes:
-    with st.sidebar.expander("👀 Preview Non-Steam File"):
+# finish() must run even when a tab calls st.rerun() / st.stop(), which raise
+try:
+    # ── Session state initialisation ──────────────────────────────────────────
+    _SESSION_DEFAULTS = {
+        "df_steam":               None,
+        "df_nonsteam":            None,
+        "steam_cleaned":          False,
+        "nonsteam_cleaned":       False,
+        "uploaded_steam_bytes":   None,
+        "uploaded_steam_name":    None,
+        "uploaded_nonsteam_bytes": None,
+        "uploaded_nonsteam_name": None,
+        "trends_anchor":           None,
+    }
+    for _key, _default in _SESSION_DEFAULTS.items():
+        if _key not in st.session_state:
+            st.session_state[_key] = _default
+
+    get_developer_index()   # st.session_state.dev_list follows the dev-list file's mtime
+    if "genre_list" not in st.session_state:
         try:
-            preview_nonsteam, _ = prepare_nonsteam_upload(st.session_state.uploaded_nonsteam_bytes)
+            st.session_state.genre_list = get_genre_list()
         except Exception:
-            preview_nonsteam = pd.read_csv(io.BytesIO(st.session_state.uploaded_nonsteam_bytes), encoding="latin-1")
-        st.dataframe(preview_nonsteam.head(3), width='stretch')
-        st.caption(f"Rows: {len(preview_nonsteam)}, Columns: {len(preview_nonsteam.columns)}")
-        _ns_preview_required = ['Game Title', 'Developers', 'SteamStatus', 'YouTube Views']
-        _ns_preview_missing = [c for c in _ns_preview_required if c not in preview_nonsteam.columns]
-        if _ns_preview_missing:
-            st.warning(f"⚠️ Missing required columns: {', '.join(_ns_preview_missing)}")
-
-    if st.sidebar.button("📥 Load Non-Steam Data", key="load_nonsteam_btn"):
-        try:
-            nonsteam_df_upload, nonsteam_warnings = prepare_nonsteam_upload(st.session_state.uploaded_nonsteam_bytes)
-            for w in nonsteam_warnings:
-                st.sidebar.info(w)
-            nonsteam_required_cols = ['Game Title', 'Developers', 'SteamStatus', 'YouTube Views']
-            nonsteam_missing = [col for col in nonsteam_required_cols if col not in nonsteam_df_upload.columns]
-            if nonsteam_missing:
-                st.sidebar.error(f"Missing columns: {', '.join(nonsteam_missing)}")
-            else:
-                n_updated, n_new = append_from_uploaded_nonsteam_csv(nonsteam_df_upload)
-                reload_nonsteam_from_csv()
-                st.sidebar.success(f"✅ Saved: {n_new} new, {n_updated} updated")
-                if st.session_state.get("df_steam") is not None and st.session_state.get("df_nonsteam") is not None:
-                    run_trends_pipeline(st.session_state.df_steam, st.session_state.df_nonsteam)
-        except Exception as e:
-            st.sidebar.error(f"Error loading file: {e}")
-else:
-    st.sidebar.caption("Using default Non-Steam CSV.")
-
-st.sidebar.divider()
-if st.sidebar.button("🔄 Reset to Defaults", width="stretch"):
-    load_defaults()
-    st.rerun()
-
-# Load defaults if not already loaded
-try:
-    if st.session_state.df_steam is None or st.session_state.df_nonsteam is None:
-        load_defaults()
-except Exception as e:
-    st.error(f"Error loading data: {e}")
-    st.stop()
-
-# Retrieve data from session state
-df_steam  = st.session_state.df_steam.copy()
-df_nonsteam = st.session_state.df_nonsteam.copy()
-
-# ── Global date range (shared across all tabs) ────────────────────────────────
-def _min_date(series: pd.Series) -> dt.date:
-    parsed = pd.to_datetime(series, format='mixed', errors='coerce').dropna()
-    return parsed.min().date() if len(parsed) else dt.date(2000, 1, 1)
-
-def _max_date(series: pd.Series) -> dt.date:
-    parsed = pd.to_datetime(series, format='mixed', errors='coerce').dropna()
-    return parsed.max().date() if len(parsed) else dt.date.today()
-
-_steam_min = _min_date(df_steam.get('ReleaseDate',            pd.Series(dtype=str)))
-_steam_max = _max_date(df_steam.get('ReleaseDate',            pd.Series(dtype=str)))
-_ns_min    = min(_min_date(df_nonsteam.get('YouTube ReleaseDate', pd.Series(dtype=str))),
-                 _min_date(df_nonsteam.get('Release Date',        pd.Series(dtype=str))))
-_ns_max    = max(_max_date(df_nonsteam.get('YouTube ReleaseDate', pd.Series(dtype=str))),
-                 _max_date(df_nonsteam.get('Release Date',        pd.Series(dtype=str))))
-_inv_min   = _min_date(
-    st.session_state.game_data.get('Date Purchased', pd.Series(dtype=str))
-    if 'game_data' in st.session_state else pd.Series(dtype=str)
-)
-_inv_max   = _max_date(
-    st.session_state.game_data.get('Date Purchased', pd.Series(dtype=str))
-    if 'game_data' in st.session_state else pd.Series(dtype=str)
-)
-GLOBAL_DATE_MIN = min(_steam_min, _ns_min, _inv_min)
-GLOBAL_DATE_MAX = max(_steam_max, _ns_max, _inv_max)
-
-# ── Pre-render resets (must run before ANY widget is instantiated) ────────────
-if (st.session_state.get("steam_reset_filters") or
-        st.session_state.get("ns_reset_filters") or
-        st.session_state.get("inv_reset_filters")):
-    for _k in ("steam_start_date", "ns_start_date", "inv_start_date"):
-        st.session_state[_k] = GLOBAL_DATE_MIN
-    for _k in ("steam_end_date", "ns_end_date", "inv_end_date"):
-        st.session_state[_k] = GLOBAL_DATE_MAX
-    st.session_state["inv_status_quick_filter"] = None
-
-# Clamp stale session-state date values to the computed range
-for _key in ("steam_start_date", "ns_start_date", "inv_start_date"):
-    if _key in st.session_state and isinstance(st.session_state[_key], dt.date):
-        st.session_state[_key] = max(st.session_state[_key], GLOBAL_DATE_MIN)
-for _key in ("steam_end_date", "ns_end_date", "inv_end_date"):
-    if _key in st.session_state and isinstance(st.session_state[_key], dt.date):
-        st.session_state[_key] = min(st.session_state[_key], GLOBAL_DATE_MAX)
-
-# ── Inventory AppID population + hourly player count fetch ────────────────────
-populate_appids()
-_inv_for_fetch = pd.read_csv(INVENTORY_FILE, index_col=0)
-_inv_for_fetch, _n_appids_resolved = resolve_inventory_appids(_inv_for_fetch)
-if _n_appids_resolved > 0:
-    _inv_for_fetch.to_csv(INVENTORY_FILE, index=True)
-    if "game_data" in st.session_state:
-        st.session_state.game_data = pd.read_csv(INVENTORY_FILE, index_col=0)
-st.session_state.player_count_history = fetch_player_counts_if_needed(_inv_for_fetch)
-
-# ── Load cached trends scores ─────────────────────────────────────────────────
-if "nonsteam_trends" not in st.session_state:
-    if TRENDS_CACHE_FILE.exists():
-        _tc = pd.read_csv(TRENDS_CACHE_FILE)
-        st.session_state.nonsteam_trends = dict(zip(_tc["game_name"], _tc["trends_score"]))
-        if "fetched_at" in _tc.columns:
-            _fetched_vals = _tc["fetched_at"].dropna()
-            st.session_state.trends_last_fetched_at = str(_fetched_vals.iloc[-1]) if len(_fetched_vals) else None
-        else:
-            st.session_state.trends_last_fetched_at = None
-        if "anchor" in _tc.columns:
-            _anchor_vals = _tc["anchor"].dropna()
-            if len(_anchor_vals):
-                st.session_state.trends_anchor = str(_anchor_vals.iloc[-1])
+            pass
+
+    # ── SIDEBAR: FILE UPLOADS ──────────────────────────────────────────────────
+    st.sidebar.header("📁 Data")
+
+    uploaded_steam    = st.sidebar.file_uploader("Upload Steam CSV",     type="csv", key="steam_upload")
+    uploaded_nonsteam = st.sidebar.file_uploader("Upload Non-Steam CSV", type="csv", key="nonsteam_upload")
+
+    if uploaded_steam and uploaded_steam.name != st.session_state.uploaded_steam_name:
+        st.session_state.uploaded_steam_bytes = uploaded_steam.getvalue()
+        st.session_state.uploaded_steam_name  = uploaded_steam.name
+
+    if uploaded_nonsteam and uploaded_nonsteam.name != st.session_state.uploaded_nonsteam_name:
+        st.session_state.uploaded_nonsteam_bytes = uploaded_nonsteam.getvalue()
+        st.session_state.uploaded_nonsteam_name  = uploaded_nonsteam.name
+
+    # Preview and load — Steam
+    if st.session_state.uploaded_steam_bytes:
+        with st.sidebar.expander("👀 Preview Steam File"):
+            try:
+                preview_steam, _ = prepare_steam_upload(st.session_state.uploaded_steam_bytes)
+            except Exception:
+                preview_steam = pd.read_csv(io.BytesIO(st.session_state.uploaded_steam_bytes), encoding="latin-1")
+            st.dataframe(preview_steam.head(3), width='stretch')
+            st.caption(f"Rows: {len(preview_steam)}, Columns: {len(preview_steam.columns)}")
+            _steam_preview_required = ['Name', 'FollowerCount', 'Developers', 'Genres', 'ReleaseDate']
+            _steam_preview_missing = [c for c in _steam_preview_required if c not in preview_steam.columns]
+            if _steam_preview_missing:
+                st.warning(f"⚠️ Missing required columns: {', '.join(_steam_preview_missing)}")
+
+        if st.sidebar.button("📥 Load Steam Data", key="load_steam_btn"):
+            try:
+                steam_df_upload, steam_warnings = prepare_steam_upload(st.session_state.uploaded_steam_bytes)
+                for w in steam_warnings:
+                    st.sidebar.info(w)
+                steam_required_cols = ['Name', 'FollowerCount', 'Developers', 'Genres', 'ReleaseDate']
+                steam_missing = [col for col in steam_required_cols if col not in steam_df_upload.columns]
+                if steam_missing:
+                    st.sidebar.error(f"Missing columns: {', '.join(steam_missing)}")
+                else:
+                    n_updated, n_new = append_from_uploaded_steam_csv(steam_df_upload)
+                    reload_steam_from_csv()
+                    st.sidebar.success(f"✅ Saved: {n_new} new, {n_updated} updated")
+                    if st.session_state.get("df_steam") is not None and st.session_state.get("df_nonsteam") is not None:
+                        run_trends_pipeline(st.session_state.df_steam, st.session_state.df_nonsteam)
+            except Exception as e:
+                st.sidebar.error(f"Error loading file: {e}")
     else:
-        st.session_state.nonsteam_trends = {}
-        st.session_state.trends_last_fetched_at = None
-
-# ── Poll background trends pipeline results ───────────────────────────────────
-if _trends_thread_state["result"] is not None:
-    _res = _trends_thread_state["result"]
-    _trends_thread_state["result"] = None
-    if "error" in _res:
-        st.session_state["trends_pipeline_error"] = _res["error"]
+        st.sidebar.caption("Using default Steam CSV.")
+
+    # Preview and load — Non-Steam
+    if st.session_state.uploaded_nonsteam_bytes:
+        with st.sidebar.expander("👀 Preview Non-Steam File"):
+            try:
+                preview_nonsteam, _ = prepare_nonsteam_upload(st.session_state.uploaded_nonsteam_bytes)
+            except Exception:
+                preview_nonsteam = pd.read_csv(io.BytesIO(st.session_state.uploaded_nonsteam_bytes), encoding="latin-1")
+            st.dataframe(preview_nonsteam.head(3), width='stretch')
+            st.caption(f"Rows: {len(preview_nonsteam)}, Columns: {len(preview_nonsteam.columns)}")
+            _ns_preview_required = ['Game Title', 'Developers', 'SteamStatus', 'YouTube Views']
+            _ns_preview_missing = [c for c in _ns_preview_required if c not in preview_nonsteam.columns]
+            if _ns_preview_missing:
+                st.warning(f"⚠️ Missing required columns: {', '.join(_ns_preview_missing)}")
+
+        if st.sidebar.button("📥 Load Non-Steam Data", key="load_nonsteam_btn"):
+            try:
+                nonsteam_df_upload, nonsteam_warnings = prepare_nonsteam_upload(st.session_state.uploaded_nonsteam_bytes)
+                for w in nonsteam_warnings:
+                    st.sidebar.info(w)
+                nonsteam_required_cols = ['Game Title', 'Developers', 'SteamStatus', 'YouTube Views']
+                nonsteam_missing = [col for col in nonsteam_required_cols if col not in nonsteam_df_upload.columns]
+                if nonsteam_missing:
+                    st.sidebar.error(f"Missing columns: {', '.join(nonsteam_missing)}")
+                else:
+                    n_updated, n_new = append_from_uploaded_nonsteam_csv(nonsteam_df_upload)
+                    reload_nonsteam_from_csv()
+                    st.sidebar.success(f"✅ Saved: {n_new} new, {n_updated} updated")
+                    if st.session_state.get("df_steam") is not None and st.session_state.get("df_nonsteam") is not None:
+                        run_trends_pipeline(st.session_state.df_steam, st.session_state.df_nonsteam)
+            except Exception as e:
+                st.sidebar.error(f"Error loading file: {e}")
     else:
-        st.session_state.pop("trends_pipeline_error", None)
-        st.session_state.nonsteam_trends = _res.get("scores", {})
-        st.session_state.trends_anchor = _res["anchor"]
-        st.session_state.tournament_results_auto = _res["tournament_results"]
-        st.session_state.tournament_auto_steam       = _res.get("steam_tournament_results", [])
-        st.session_state.tournament_auto_nonsteam    = _res.get("nonsteam_tournament_results", [])
-        st.session_state.tournament_auto_cross_final = _res.get("cross_final_result")
-
-if _trends_thread_state["running"]:
-    st.sidebar.info(f"🔄 {_trends_thread_state.get('progress', 'Trends updating...')}")
-
-# ── TABS ───────────────────────────────────────────────────────────────────────
-_tab_steam, _tab_nonsteam, _tab_inventory, _tab_tournament = st.tabs(
-    ["🚀 Steam Report", "📽️ Non-Steam Report", "🎮 Game Inventory", "🏆 Trends Tournament"]
-)
+        st.sidebar.caption("Using default Non-Steam CSV.")
 
-with _tab_steam:
-    tab_steam.render(GLOBAL_DATE_MIN, GLOBAL_DATE_MAX)
-
-with _tab_nonsteam:
-    tab_nonsteam.render(df_steam, GLOBAL_DATE_MIN, GLOBAL_DATE_MAX)
+    st.sidebar.divider()
+    if st.sidebar.button("🔄 Reset to Defaults", width="stretch"):
+        load_defaults()
+        st.rerun()
 
-with _tab_inventory:
-    tab_inventory.render(GLOBAL_DATE_MIN, GLOBAL_DATE_MAX)
+    # Load defaults if not already loaded
+    try:
+        with _profile.stage("load_defaults") as _stage:
+            if st.session_state.df_steam is None or st.session_state.df_nonsteam is None:
+                load_defaults()
+            _stage.rows = len(st.session_state.df_steam) + len(st.session_state.df_nonsteam)
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        st.stop()
+
+    # Retrieve data from session state
+    df_steam  = st.session_state.df_steam.copy()
+    df_nonsteam = st.session_state.df_nonsteam.copy()
+
+    # ── Global date range (shared across all tabs) ────────────────────────────
+    def _min_date(series: pd.Series) -> dt.date:
+        parsed = pd.to_datetime(series, format='mixed', errors='coerce').dropna()
+        return parsed.min().date() if len(parsed) else dt.date(2000, 1, 1)
+
+    def _max_date(series: pd.Series) -> dt.date:
+        parsed = pd.to_datetime(series, format='mixed', errors='coerce').dropna()
+        return parsed.max().date() if len(parsed) else dt.date.today()
+
+    _n_inventory = len(st.session_state.game_data) if 'game_data' in st.session_state else 0
+    with _profile.stage("date_range", rows=len(df_steam) + len(df_nonsteam) + _n_inventory):
+        _steam_min = _min_date(df_steam.get('ReleaseDate',            pd.Series(dtype=str)))
+        _steam_max = _max_date(df_steam.get('ReleaseDate',            pd.Series(dtype=str)))
+        _ns_min    = min(_min_date(df_nonsteam.get('YouTube ReleaseDate', pd.Series(dtype=str))),
+                         _min_date(df_nonsteam.get('Release Date',        pd.Series(dtype=str))))
+        _ns_max    = max(_max_date(df_nonsteam.get('YouTube ReleaseDate', pd.Series(dtype=str))),
+                         _max_date(df_nonsteam.get('Release Date',        pd.Series(dtype=str))))
+        _inv_min   = _min_date(
+            st.session_state.game_data.get('Date Purchased', pd.Series(dtype=str))
+            if 'game_data' in st.session_state else pd.Series(dtype=str)
+        )
+        _inv_max   = _max_date(
+            st.session_state.game_data.get('Date Purchased', pd.Series(dtype=str))
+            if 'game_data' in st.session_state else pd.Series(dtype=str)
+        )
+        GLOBAL_DATE_MIN = min(_steam_min, _ns_min, _inv_min)
+        GLOBAL_DATE_MAX = max(_steam_max, _ns_max, _inv_max)
+
+    # ── Pre-render resets (must run before ANY widget is instantiated) ────────
+    if (st.session_state.get("steam_reset_filters") or
+            st.session_state.get("ns_reset_filters") or
+            st.session_state.get("inv_reset_filters")):
+        for _k in ("steam_start_date", "ns_start_date", "inv_start_date"):
+            st.session_state[_k] = GLOBAL_DATE_MIN
+        for _k in ("steam_end_date", "ns_end_date", "inv_end_date"):
+            st.session_state[_k] = GLOBAL_DATE_MAX
+        st.session_state["inv_status_quick_filter"] = None
+
+    # Clamp stale session-state date values to the computed range
+    for _key in ("steam_start_date", "ns_start_date", "inv_start_date"):
+        if _key in st.session_state and isinstance(st.session_state[_key], dt.date):
+            st.session_state[_key] = max(st.session_state[_key], GLOBAL_DATE_MIN)
+    for _key in ("steam_end_date", "ns_end_date", "inv_end_date"):
+        if _key in st.session_state and isinstance(st.session_state[_key], dt.date):
+            st.session_state[_key] = min(st.session_state[_key], GLOBAL_DATE_MAX)
+
+    # ── Inventory AppID population + hourly player count fetch ────────────────
+    with _profile.stage("populate_appids", rows=_n_inventory):
+        populate_appids()
+    with _profile.stage("resolve_inventory_appids") as _stage:
+        _inv_for_fetch = pd.read_csv(INVENTORY_FILE, index_col=0)
+        _inv_for_fetch, _n_appids_resolved = resolve_inventory_appids(_inv_for_fetch)
+        if _n_appids_resolved > 0:
+            _inv_for_fetch.to_csv(INVENTORY_FILE, index=True)
+            if "game_data" in st.session_state:
+                st.session_state.game_data = pd.read_csv(INVENTORY_FILE, index_col=0)
+        _stage.rows = len(_inv_for_fetch)
+    with _profile.stage("fetch_player_counts", rows=len(_inv_for_fetch)):
+        st.session_state.player_count_latest = fetch_player_counts_if_needed(_inv_for_fetch)
+
+    # ── Load cached trends scores ─────────────────────────────────────────────
+    with _profile.stage("trends_cache") as _stage:
+        if "nonsteam_trends" not in st.session_state:
+            _tc = open_trends_store().latest()   # oldest fetch first
+            st.session_state.nonsteam_trends = dict(zip(_tc["game_name"], _tc["trends_score"]))
+            st.session_state.trends_last_fetched_at = str(_tc["fetched_at"].iloc[-1]) if len(_tc) else None
+            _anchor_vals = _tc["anchor"].dropna()
+            if len(_anchor_vals):
+                st.session_state.trends_anchor = str(_anchor_vals.iloc[-1])
+        _stage.rows = len(st.session_state.nonsteam_trends)
 
-with _tab_tournament:
-    tab_tournament.render()
+    # ── Poll background trends pipeline results ───────────────────────────────
+    _res = take_trends_pipeline_result()
+    if _res is not None:
+        if "error" in _res:
+            st.session_state["trends_pipeline_error"] = _res["error"]
+        else:
+            st.session_state.pop("trends_pipeline_error", None)
+            st.session_state.nonsteam_trends = _res.get("scores", {})
+            st.session_state.trends_anchor = _res["anchor"]
+            st.session_state.tournament_results_auto = _res["tournament_results"]
+            st.session_state.tournament_auto_steam       = _res.get("steam_tournament_results", [])
+            st.session_state.tournament_auto_nonsteam    = _res.get("nonsteam_tournament_results", [])
+            st.session_state.tournament_auto_cross_final = _res.get("cross_final_result")
+
+    _trends_progress = trends_pipeline_progress()
+    if _trends_progress:
+        st.sidebar.info(f"🔄 {_trends_progress}")
+
+    # ── TABS ───────────────────────────────────────────────────────────────────
+    _tab_steam, _tab_nonsteam, _tab_inventory, _tab_tournament = st.tabs(
+        ["🚀 Steam Report", "📽️ Non-Steam Report", "🎮 Game Inventory", "🏆 Trends Tournament"]
+    )
+
+    with _tab_steam, _profile.stage("tab_steam", rows=len(df_steam)):
+        tab_steam.render(GLOBAL_DATE_MIN, GLOBAL_DATE_MAX)
+
+    with _tab_nonsteam, _profile.stage("tab_nonsteam", rows=len(df_nonsteam)):
+        tab_nonsteam.render(GLOBAL_DATE_MIN, GLOBAL_DATE_MAX)
+
+    with _tab_inventory, _profile.stage("tab_inventory", rows=_n_inventory):
+        tab_inventory.render(GLOBAL_DATE_MIN, GLOBAL_DATE_MAX)
+
+    with _tab_tournament, _profile.stage("tab_tournament"):
+        tab_tournament.render()
+finally:
+    _profile.finish()
+
+render_rerun_profile(_profile)
@@ -0,0 +1,204 @@
+"""
+Per-rerun stage timing for app/main.py.
+
+Every rerun executes the whole script top to bottom: default loading, the
+global date range, inventory AppID resolution, the hourly player-count fetch,
+the trends-score load and all four tab renders. RerunProfile times each of
+those as a named stage:
+
+    profile = RerunProfile.start()
+    with profile.stage("load_defaults") as s:
+        load_defaults()
+        s.rows = len(st.session_state.df_steam)
+    ...
+    profile.finish()          # log line + optional cProfile dump
+    render_sidebar(profile)   # collapsible breakdown
+
+Per stage it records wall time, the rows it processed (when the caller sets
+them) and, when allocation tracking is on, the net allocation delta and the
+peak above the stage's starting point. Stages are flat — the peak is reset
+at each stage start, so do not nest them.
+
+finish() appends one JSON line per rerun to logs/reruns.jsonl (rotated to
+reruns.jsonl.1 past LOG_MAX_BYTES). cProfile is opt-in — the sidebar checkbox
+or GAME_RANKING_CPROFILE=1 — and only reruns slower than SLOW_RERUN_SECONDS
+are dumped, keeping the KEEP_PROFILES slowest .prof files in logs/profiles/
+(open with `python -m pstats` or snakeviz).
+
+Allocation tracking is opt-in too — the sidebar checkbox or
+GAME_RANKING_PROFILE_ALLOC=1. tracemalloc is process-wide, so while it runs
+it slows every thread (background jobs included) and inflates the very
+timings being recorded; finish() stops it again if this profile started it.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from config import RERUN_LOG_FILE, RERUN_PROFILE_DIR
+
+log = logging.getLogger(__name__)
+
+SLOW_RERUN_SECONDS = 2.0
+KEEP_PROFILES      = 5
+LOG_MAX_BYTES      = 5 * 2**20
+CPROFILE_ENV       = "GAME_RANKING_CPROFILE"
+ALLOC_ENV          = "GAME_RANKING_PROFILE_ALLOC"
+SESSION_KEY        = "rerun_cprofile"   # st.session_state flags behind the sidebar checkboxes
+ALLOC_SESSION_KEY  = "rerun_track_alloc"
+HISTORY_KEY        = "rerun_profile_history"
+HISTORY_LEN        = 10
+
+
+@dataclass
+class Stage:
+    name: str
+    seconds: float = 0.0
+    rows: int | None = None
+    alloc_mib: float | None = None   # net allocations still held when the stage ended
+    peak_mib: float | None = None    # peak traced memory above the stage's start
+
+
+class RerunProfile:
+    """Stage timings for one rerun, plus an optional cProfile of the whole rerun."""
+
+    def __init__(self, track_alloc: bool = False, cprofile: bool = False):
+        self.started_at = datetime.now()
+        self.stages: list[Stage] = []
+        self.total_seconds: float | None = None
+        self.profile_path: Path | None = None
+        self._t0 = time.perf_counter()
+        self._started_tracing = track_alloc and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self._track_alloc = track_alloc and tracemalloc.is_tracing()
+        self._profiler = cProfile.Profile() if cprofile else None
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    @classmethod
+    def start(cls, cprofile: bool = False, track_alloc: bool = False) -> "RerunProfile":
+        """
+        A profile configured from the environment. cprofile=True (or
+        GAME_RANKING_CPROFILE=1) adds cProfile; track_alloc=True (or
+        GAME_RANKING_PROFILE_ALLOC=1) adds allocation tracking.
+        """
+        return cls(
+            track_alloc=track_alloc or os.environ.get(ALLOC_ENV, "") == "1",
+            cprofile=cprofile or os.environ.get(CPROFILE_ENV, "") == "1",
+        )
+
+    @contextmanager
+    def stage(self, name: str, rows: int | None = None):
+        """Time the with-block as stage name; set .rows on the yielded Stage once known."""
+        record = Stage(name, rows=rows)
+        if self._track_alloc:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = round(time.perf_counter() - t0, 4)
+            if self._track_alloc:
+                current, peak = tracemalloc.get_traced_memory()
+                record.alloc_mib = round((current - before) / 2**20, 2)
+                record.peak_mib = round(max(0, peak - before) / 2**20, 2)
+            self.stages.append(record)
+
+    def as_dict(self) -> dict:
+        return {
+            "started_at":    self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": self.total_seconds,
+            "stages":        [asdict(s) for s in self.stages],
+            "profile":       str(self.profile_path) if self.profile_path else None,
+        }
+
+    def finish(self, log_file: Path = RERUN_LOG_FILE, profile_dir: Path = RERUN_PROFILE_DIR) -> dict:
+        """Stop timing, dump cProfile if this rerun was slow, append the JSON line. Returns the record."""
+        self.total_seconds = round(time.perf_counter() - self._t0, 4)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = self._track_alloc = False
+        if self._profiler is not None:
+            self._profiler.disable()
+            if self.total_seconds >= SLOW_RERUN_SECONDS:
+                self.profile_path = _dump_profile(self._profiler, self.total_seconds, Path(profile_dir))
+        record = self.as_dict()
+        try:
+            _append_line(Path(log_file), record)
+        except OSError as exc:
+            log.warning("Could not write rerun timing to %s: %s", log_file, exc)
+        return record
+
+
+def _append_line(path: Path, record: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and path.stat().st_size > LOG_MAX_BYTES:
+        path.replace(path.with_name(path.name + ".1"))
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _dump_profile(profiler: cProfile.Profile, seconds: float, profile_dir: Path) -> Path | None:
+    """Write rerun_<ms>ms_<timestamp>.prof, keeping only the KEEP_PROFILES slowest dumps."""
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / f"rerun_{int(seconds * 1000):07d}ms_{datetime.now():%Y%m%d-%H%M%S-%f}.prof"
+    profiler.dump_stats(path)
+    # Zero-padded milliseconds lead the name, so name order is speed order
+    for stale in sorted(profile_dir.glob("rerun_*ms_*.prof"))[:-KEEP_PROFILES]:
+        stale.unlink(missing_ok=True)
+    return path if path.exists() else None
+
+
+def read_reruns(log_file: Path = RERUN_LOG_FILE, limit: int = 100) -> list[dict]:
+    """The last `limit` rerun records from the log (oldest first)."""
+    log_file = Path(log_file)
+    if not log_file.exists():
+        return []
+    lines = log_file.read_text(encoding="utf-8").splitlines()[-limit:]
+    out = []
+    for line in lines:
+        try:
+            out.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return out
+
+
+def render_sidebar(profile: RerunProfile) -> None:
+    """Collapsible sidebar breakdown of this rerun's stages, with the cProfile opt-in."""
+    import pandas as pd
+    import streamlit as st
+
+    history = st.session_state.setdefault(HISTORY_KEY, [])
+    history.append(profile.total_seconds)
+    del history[:-HISTORY_LEN]
+
+    with st.sidebar.expander(f"⏱️ Rerun timing — {profile.total_seconds:.2f} s"):
+        st.dataframe(
+            pd.DataFrame([asdict(s) for s in profile.stages])
+            .rename(columns={"name": "stage", "seconds": "s", "alloc_mib": "Δ MiB", "peak_mib": "peak MiB"}),
+            hide_index=True, width="stretch",
+        )
+        st.caption(
+            f"Last {len(history)} reruns: " + ", ".join(f"{s:.2f}" for s in history) + " s · "
+            f"log: {RERUN_LOG_FILE.relative_to(RERUN_LOG_FILE.parent.parent)}"
+        )
+        st.checkbox(
+            f"cProfile reruns slower than {SLOW_RERUN_SECONDS:g} s", key=SESSION_KEY,
+            help=f"Dumps to {RERUN_PROFILE_DIR.name}/, keeping the {KEEP_PROFILES} slowest. Applies from the next rerun.",
+        )
+        st.checkbox(
+            "Track allocations per stage", key=ALLOC_SESSION_KEY,
+            help="tracemalloc slows the whole process while it runs. Applies from the next rerun.",
+        )
+        if profile.profile_path is not None:
+            st.caption(f"Profile saved: {profile.profile_path.name}")
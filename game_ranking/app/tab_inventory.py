@@ -14,12 +14,13 @@ try:
 except ImportError:
     _HAS_ALTAIR = False
 
-from config import INVENTORY_FILE, STEAMSPY_CACHE_FILE, TRENDS_CACHE_FILE, INVENTORY_TRENDS_HISTORY_FILE
+from config import INVENTORY_FILE, STEAMSPY_CACHE_FILE
 from calculation.steam_players import fetch_player_data
+from calculation.trends_score_store import open_trends_store
 from calculation.trends_tournament import compare_group, BATCH_SIZE, CALL_SLEEP
 from calculation.dataforseo_trends import load_credentials
 from pipelines.trends_pipeline import load_tournament_anchor
-from app.helpers import filter_stale_trends_games, load_trends_cache_timestamps
+from app.helpers import filter_stale_trends_games
 
 
 def _sync_from_inv_dates():
@@ -265,8 +266,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
 
         if _do_refresh_all:
             _all_inv_games = st.session_state.game_data["Game Name"].dropna().unique().tolist()
-            _cached_ts_all = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-            _stale_all = filter_stale_trends_games(_all_inv_games, _cached_ts_all)
+            _stale_all = filter_stale_trends_games(_all_inv_games)
 
             if not _stale_all:
                 st.toast("All trends data is fresh (< 24 h)", icon="✅")
@@ -283,6 +283,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                     ]
                     _bar_all = st.progress(0, text="Starting…")
                     _refresh_ts_all = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    _trends_store = open_trends_store()
 
                     for _i, _batch in enumerate(_batches_all):
                         _label = ", ".join(_batch[:2]) + ("…" if len(_batch) > 2 else "")
@@ -306,35 +307,16 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                                 st.session_state.nonsteam_trends[_game] = 0
                             st.error(f"Trends fetch failed for batch: {_e}")
                         try:
-                            _cached_ts_all = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-                            pd.DataFrame([
-                                {
-                                    "game_name": k,
-                                    "trends_score": v,
-                                    "fetched_at": _refresh_ts_all
-                                    if k in _stale_all
-                                    else _cached_ts_all.get(k, _refresh_ts_all),
-                                }
-                                for k, v in st.session_state.nonsteam_trends.items()
-                            ]).to_csv(TRENDS_CACHE_FILE, index=False)
+                            # Latest score + history row for this batch only
+                            _trends_store.upsert_scores(
+                                {g: st.session_state.nonsteam_trends.get(g, 0) for g in _batch},
+                                fetched_at=_refresh_ts_all, anchor=_anchor_all,
+                            )
                         except Exception as _e:
                             st.error(f"Cache write failed: {_e}")
                         if _i < len(_batches_all) - 1:
                             time.sleep(CALL_SLEEP)
 
-                    # Append new scores to history file
-                    try:
-                        _new_rows = pd.DataFrame([
-                            {"game_name": g, "trends_score": st.session_state.nonsteam_trends.get(g, 0), "fetched_at": _refresh_ts_all}
-                            for g in _stale_all
-                        ])
-                        if INVENTORY_TRENDS_HISTORY_FILE.exists():
-                            _existing_hist = pd.read_csv(INVENTORY_TRENDS_HISTORY_FILE)
-                            _new_rows = pd.concat([_existing_hist, _new_rows], ignore_index=True)
-                        _new_rows.to_csv(INVENTORY_TRENDS_HISTORY_FILE, index=False)
-                    except Exception as _e:
-                        st.error(f"History write failed: {_e}")
-
                     _bar_all.progress(1.0, text="Done")
                     st.session_state["inv_all_trends_fetched_at"] = _refresh_ts_all
                     st.toast(f"Updated {len(_stale_all)} game(s)", icon="📊")
@@ -344,17 +326,15 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
             st.warning("Install altair to see the chart.")
         else:
             try:
-                _hist_df = pd.read_csv(INVENTORY_TRENDS_HISTORY_FILE) if INVENTORY_TRENDS_HISTORY_FILE.exists() else pd.DataFrame()
+                _hist_df = open_trends_store().history(
+                    st.session_state.game_data["Game Name"].dropna().astype(str).unique().tolist()
+                )
             except Exception:
                 _hist_df = pd.DataFrame()
 
             if _hist_df.empty:
                 st.info("No trends data yet — click **Refresh Trends** above to fetch scores.")
             else:
-                _all_inv_names = set(
-                    st.session_state.game_data["Game Name"].dropna().astype(str).tolist()
-                )
-                _hist_df = _hist_df[_hist_df["game_name"].isin(_all_inv_names)].copy()
                 _hist_df["trends_score"] = pd.to_numeric(_hist_df["trends_score"], errors="coerce").fillna(0)
                 _hist_df["fetched_at"] = pd.to_datetime(_hist_df["fetched_at"], errors="coerce")
                 _hist_df["date_str"] = _hist_df["fetched_at"].dt.strftime("%Y-%m-%d")
@@ -413,8 +393,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
             if st.button("📊 Refresh Trends (Filtered)", key="fetch_inv_trends",
                          help="Fetch Google Trends scores for the currently filtered games only", width="stretch"):
                 games = filtered["Game Name"].dropna().unique().tolist()
-                _cached_ts = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-                games_to_fetch = filter_stale_trends_games(games, _cached_ts)
+                games_to_fetch = filter_stale_trends_games(games)
                 if not games_to_fetch:
                     st.toast("All trends data is fresh (< 24 h)", icon="✅")
                 else:
@@ -427,6 +406,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                         _batches = [games_to_fetch[i:i + BATCH_SIZE] for i in range(0, len(games_to_fetch), BATCH_SIZE)]
                         bar = st.progress(0, text="Starting…")
                         _refresh_ts = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        _trends_store = open_trends_store()
                         for i, batch in enumerate(_batches):
                             _label = ", ".join(batch[:2]) + ("…" if len(batch) > 2 else "")
                             bar.progress(i / len(_batches), text=f"Batch {i+1}/{len(_batches)}: {_label}")
@@ -439,11 +419,10 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                                     st.session_state.nonsteam_trends[game] = 0
                                 st.error(f"Trends fetch failed for batch: {e}")
                             try:
-                                pd.DataFrame([
-                                    {"game_name": k, "trends_score": v,
-                                     "fetched_at": _refresh_ts if k in games_to_fetch else _cached_ts.get(k, _refresh_ts)}
-                                    for k, v in st.session_state.nonsteam_trends.items()
-                                ]).to_csv(TRENDS_CACHE_FILE, index=False)
+                                _trends_store.upsert_scores(
+                                    {g: st.session_state.nonsteam_trends.get(g, 0) for g in batch},
+                                    fetched_at=_refresh_ts, anchor=_anchor,
+                                )
                             except Exception as e:
                                 st.error(f"Cache write failed: {e}")
                             if i < len(_batches) - 1:
@@ -494,7 +473,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
 
                 st.markdown("#### Current vs All-time Peak")
 
-                _hist = st.session_state.player_count_history
+                _hist = st.session_state.player_count_latest
                 if _hist.empty:
                     st.info(
                         "No current player data yet — click **Fetch Now** in the Player Trend section "
@@ -3,15 +3,15 @@ Non-Steam Report tab.
 """
 
 import datetime as dt
-import time
 
 import pandas as pd
 import streamlit as st
 
-from app.thread_state import _trends_thread_state
 from app.helpers import (highlight_new_rows, reload_nonsteam_from_csv,
-                         filter_stale_trends_games, load_trends_cache_timestamps)
-from calculation.process_data import calculate_hybrid_score, calculate_trends_weighted_points
+                         filter_stale_trends_games,
+                         get_ranking_cache, refresh_nonsteam_ready,
+                         reload_trends_scores, render_job_progress, start_background_job)
+from calculation.ranking_cache import dict_fingerprint
 from calculation.dataforseo_trends import load_credentials
 from pipelines.refresh_trends_pipeline import (
     load_anchor_pool,
@@ -19,11 +19,11 @@ from pipelines.refresh_trends_pipeline import (
     save_refresh_anchor,
     load_refresh_anchor,
     submit_refresh,
-    collect_refresh,
-    write_scores_to_csv,
 )
-from config import TRENDS_CACHE_FILE, REFRESH_TRENDS_STATE_FILE_NONSTEAM
-from pipelines.trends_pipeline import load_tournament_anchor
+from config import REFRESH_TRENDS_STATE_FILE_NONSTEAM
+from pipelines.trends_pipeline import load_tournament_anchor, trends_pipeline_progress
+from pipelines.job_runner import is_running
+from pipelines.ranking_pipeline import DEFAULT_WEIGHTS, rank_prepared_nonsteam
 
 
 def _sync_from_ns_dates():
@@ -33,51 +33,17 @@ def _sync_from_ns_dates():
     st.session_state.inv_end_date     = st.session_state.ns_end_date
 
 
-def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt.date):
-    df_nonsteam = st.session_state.df_nonsteam.copy()
+def render(global_date_min: dt.date, global_date_max: dt.date):
     nonsteam_source_name = st.session_state.get("nonsteam_source", "default file")
 
-    # Normalise date_appended to YYYY-MM-DD so sorting and "New Today" checks
-    # work correctly regardless of whether the CSV used M/D/YYYY or ISO format.
-    if 'date_appended' in df_nonsteam.columns:
-        df_nonsteam['date_appended'] = (
-            pd.to_datetime(df_nonsteam['date_appended'], errors='coerce')
-            .dt.strftime('%Y-%m-%d')
-        )
-
-    # ── Deduplicate: keep most recent row per Game Title ──────────────────────
-    _raw_row_count = len(df_nonsteam)
-    if 'Game Title' in df_nonsteam.columns:
-        # Determine recency column: prefer date_appended, then YouTube ReleaseDate, then Release Date
-        if 'date_appended' in df_nonsteam.columns:
-            _sort_col = 'date_appended'
-        elif 'YouTube ReleaseDate' in df_nonsteam.columns:
-            _sort_col = 'YouTube ReleaseDate'
-        elif 'Release Date' in df_nonsteam.columns:
-            _sort_col = 'Release Date'
-        else:
-            _sort_col = None
-
-        if _sort_col:
-            df_nonsteam = (
-                df_nonsteam
-                .sort_values(_sort_col, ascending=True, na_position='first')
-                .drop_duplicates(subset=['Game Title'], keep='last')
-                .reset_index(drop=True)
-            )
-        else:
-            df_nonsteam = df_nonsteam.drop_duplicates(subset=['Game Title'], keep='last').reset_index(drop=True)
-
-    _after_dedup_count = len(df_nonsteam)
-    _dedup_merged = _raw_row_count - _after_dedup_count
-
     st.header("Non-Steam Game Ranking")
     st.caption(f"📊 Loading from {nonsteam_source_name}")
 
     _anchor = st.session_state.get("trends_anchor")
     _anchor_meta_top = load_tournament_anchor()
-    if _trends_thread_state["running"]:
-        st.info(f"🔄 {_trends_thread_state.get('progress', 'Trends updating...')}")
+    _trends_progress = trends_pipeline_progress()
+    if _trends_progress:
+        st.info(f"🔄 {_trends_progress}")
     elif _anchor:
         _run_at_top = _anchor_meta_top.get("run_at") if _anchor_meta_top else None
         if _run_at_top:
@@ -93,102 +59,29 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
 
     # ── Sidebar config ────────────────────────────────────────────────────────
     st.sidebar.header("Non-Steam Scoring")
-    w_youtube = st.sidebar.slider("YouTube Weight", 0, 5, 5)
-    w_trends  = st.sidebar.slider("Trends Weight",  0, 5, 2, key="ns_w_trends")
-
-    # ── Pre-processing: filter to ranked games ────────────────────────────────
-    df_nonsteam['SteamStatus'] = df_nonsteam['SteamStatus'].fillna('Needs Verification')
-    df_nonsteam_filter = df_nonsteam[
-        (df_nonsteam['SteamStatus'] != 'PC Game (on Steam)') &
-        (df_nonsteam['SteamStatus'] != 'Needs Verification') &
-        (df_nonsteam['Category'].str.strip().str.lower() == 'main game')
-    ].copy()
-    # Parse date columns robustly — CSVs may contain mixed D/M/YYYY and M/D/YYYY.
-    # Detection logic: if part[0] > 12 → D/M; if part[1] > 12 → M/D; ambiguous → D/M.
-    # Also replaces literal 'N/A' strings and handles ISO format passthrough.
-    def _parse_date_series(series: pd.Series) -> pd.Series:
-        def _parse(val):
-            if pd.isna(val) or str(val).strip() == '':
-                return pd.NaT
-            s = str(val).strip()
-            if s.lower() in ('n/a', 'na', 'none'):
-                return pd.NaT
-            if len(s) >= 10 and s[4] == '-':
-                return pd.to_datetime(s, errors='coerce')
-            if '/' in s:
-                parts = s.split('/')
-                if len(parts) == 3:
-                    try:
-                        p1, p2 = int(parts[0]), int(parts[1])
-                        if p1 > 12:
-                            dayfirst = True
-                        elif p2 > 12:
-                            dayfirst = False
-                        else:
-                            dayfirst = True   # ambiguous → D/M
-                        return pd.to_datetime(s, dayfirst=dayfirst, errors='coerce')
-                    except (ValueError, TypeError):
-                        pass
-            return pd.to_datetime(s, errors='coerce', format='mixed', dayfirst=True)
-        return series.apply(_parse)
-
-    for _dc in ['YouTube ReleaseDate', 'Release Date']:
-        df_nonsteam_filter[_dc] = _parse_date_series(df_nonsteam_filter[_dc])
-
-    # ── Score calculation ─────────────────────────────────────────────────────
-    today = dt.date.today()
+    w_youtube = st.sidebar.slider("YouTube Weight", 0, 5, DEFAULT_WEIGHTS["non_steam"]["youtube"])
+    w_trends  = st.sidebar.slider("Trends Weight",  0, 5, DEFAULT_WEIGHTS["non_steam"]["trends"], key="ns_w_trends")
 
-    # Fix YouTube Views strings (e.g. "1,234,567" → 1234567)
-    df_nonsteam_filter['YouTube Views'] = pd.to_numeric(
-        df_nonsteam_filter['YouTube Views'].astype(str).str.replace(',', '', regex=False),
-        errors='coerce'
-    ).fillna(0)
-
-    effective_date = df_nonsteam_filter['YouTube ReleaseDate'].fillna(df_nonsteam_filter['Release Date'])
-    df_nonsteam_filter['Days_Since_Release'] = (
-        (pd.to_datetime(today) - effective_date).dt.days
-    ).clip(lower=0)  # future release dates → 0 days decay
-
-    # Time-adjusted views, clamped ≥ 1 to avoid log(0)
-    df_nonsteam_filter['adj_views'] = (
-        df_nonsteam_filter['YouTube Views'] / (1 + df_nonsteam_filter['Days_Since_Release'] / 365)
-    ).clip(lower=1).round(2)
-
-    # Normalise adj_views → 1–5 (hybrid linear/log across dataset)
-    _min_adj = float(max(df_nonsteam_filter['adj_views'].min(), 1))
-    _max_adj = float(max(df_nonsteam_filter['adj_views'].max(), _min_adj + 1))
-    df_nonsteam_filter['youtube_score'] = df_nonsteam_filter['adj_views'].apply(
-        lambda v: calculate_hybrid_score(max(float(v), 1), _min_adj, _max_adj)
-    ).round(2)
-
-    # Raw Google Trends score (0–100)
-    df_nonsteam_filter['trends_score'] = (
-        df_nonsteam_filter['Game Title'].map(st.session_state.nonsteam_trends).fillna(0).astype(int)
+    # ── Ranking (memoized across reruns) ─────────────────────────────────────
+    # Dedup, filtering, date parsing and the Steam cross-check were done once
+    # when the snapshot was loaded; only scoring depends on the sliders.
+    _ready = st.session_state.get("nonsteam_ready") or refresh_nonsteam_ready()
+    today = dt.date.today()
+    _rank_key = (
+        "non_steam",
+        _ready.key,
+        dict_fingerprint(st.session_state.nonsteam_trends),
+        w_youtube, w_trends, today,
     )
-
-    # Normalise trends → 1–5 (linear)
-    df_nonsteam_filter['trends_points'] = df_nonsteam_filter['trends_score'].apply(
-        calculate_trends_weighted_points
-    ).round(2)
-
-    # Weighted priority score (max = 35, same as Steam)
-    df_nonsteam_filter['priority_score'] = (
-        df_nonsteam_filter['youtube_score'] * w_youtube +
-        df_nonsteam_filter['trends_points'] * w_trends
-    ).round(2)
-
-    df_non_steam_ranked = df_nonsteam_filter.sort_values('priority_score', ascending=False, ignore_index=True)
-
-    # Cross-check against Steam titles
-    steam_titles = set(
-        df_steam['Name'].dropna().astype(str).str.strip().str.lower()
-    ) if 'Name' in df_steam.columns else set()
-    df_non_steam_ranked['_on_steam'] = (
-        df_non_steam_ranked['Game Title'].astype(str).str.strip().str.lower().isin(steam_titles)
+    df_non_steam_ranked = get_ranking_cache().get_or_compute(
+        _rank_key,
+        lambda: rank_prepared_nonsteam(
+            _ready, st.session_state.nonsteam_trends,
+            w_youtube, w_trends, today,
+        ),
     )
-    _before_steam_filter = len(df_non_steam_ranked)
-    df_non_steam_ranked = df_non_steam_ranked[~df_non_steam_ranked['_on_steam']].reset_index(drop=True)
-    _steam_removed = _before_steam_filter - len(df_non_steam_ranked)
+    _raw_row_count, _dedup_merged = _ready.raw_rows, _ready.dedup_merged
+    _steam_removed = int(_ready.frame['on_steam'].sum())
 
     # ── Data info caption ─────────────────────────────────────────────────────
     _info_parts = []
@@ -202,7 +95,7 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
     # ── Summary metrics ───────────────────────────────────────────────────────
     _today_str = today.isoformat()
     _new_today = int(
-        df_non_steam_ranked['date_appended'].astype(str).str.startswith(_today_str).sum()
+        (df_non_steam_ranked['date_appended'] == _today_str).sum()
     ) if 'date_appended' in df_non_steam_ranked.columns else 0
     _top_score = df_non_steam_ranked['priority_score'].max() if len(df_non_steam_ranked) else 0
     _trends_cached = int((df_non_steam_ranked['trends_score'] > 0).sum()) if len(df_non_steam_ranked) else 0
@@ -291,7 +184,7 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
 
     if _afns is not None:
         if 'Release Date' in df_filtered_ns.columns:
-            rel_dates = pd.to_datetime(df_filtered_ns['Release Date'], errors='coerce', format='mixed', dayfirst=True)
+            rel_dates = df_filtered_ns['Release Date']
             in_range = rel_dates.between(pd.Timestamp(_afns["start_date"]), pd.Timestamp(_afns["end_date"]))
             df_filtered_ns = df_filtered_ns[rel_dates.isna() | in_range]
 
@@ -319,68 +212,14 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
     _show_collect   = _refresh_state["status"] in ("submitted", "collecting")
     _pending_count  = sum(1 for t in _refresh_state["tasks"] if t["status"] == "pending") if _show_collect else 0
 
-    # ── Collect loop for the Non-Steam tab ───────────────────────────────────
-    def _run_collect_loop(grand_total: int) -> None:
-        _POLL_SLEEP  = 120  # seconds between tasks_ready calls (2 min)
-        _MAX_POLLS   = 200  # safety ceiling (~10 min at 3 s/poll)
-
-        _bar         = st.progress(0.0, text="Checking DataForSEO for ready tasks…")
-        _log         = st.empty()
-        _status_line = st.empty()
-        _log_lines:  list[str] = []
-        _all_scores: dict[str, int] = {}
-
-        def _on_task(game: str, score: int, n_done: int, n_total: int, failed: bool) -> None:
-            _all_scores[game] = score
-            # Update session state immediately so the table reflects the score on rerun
-            st.session_state.nonsteam_trends[game] = score
-            pct = len(_all_scores) / max(grand_total, 1)
-            _bar.progress(min(pct, 1.0), text=f"Collecting… {len(_all_scores)} / {grand_total}")
-            icon = "⚠️" if failed else "✅"
-            _log_lines.append(f"{icon} **{game}** → {score}")
-            _log.markdown("\n\n".join(_log_lines))
-
-        _poll_num = 0
-        while _poll_num < _MAX_POLLS:
-            _poll_num += 1
-            _result = collect_refresh(_login, _password, on_task_complete=_on_task,
-                                      state_file=REFRESH_TRENDS_STATE_FILE_NONSTEAM)
-
-            if _result["complete"]:
-                _bar.progress(1.0, text=f"All done — {_result['collected']} collected, {_result['errors']} failed")
-                _status_line.empty()
-                break
-
-            _remaining = sum(
-                1 for t in load_refresh_state(state_file=REFRESH_TRENDS_STATE_FILE_NONSTEAM)["tasks"]
-                if t["status"] == "pending"
-            )
-            if _remaining == 0:
-                _bar.progress(1.0, text="All done")
-                _status_line.empty()
-                break
-
-            _status_line.caption(
-                f"Poll {_poll_num} — {_remaining} task(s) still pending, "
-                f"next check in {_POLL_SLEEP}s…"
-            )
-            time.sleep(_POLL_SLEEP)
-        else:
-            _bar.progress(1.0, text="Timed out — some tasks may still be pending")
-
-        if _all_scores:
-            _cached_ts = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-            write_scores_to_csv(
-                _all_scores,
-                st.session_state.nonsteam_trends,
-                list(_all_scores.keys()),
-                _cached_ts,
-            )
-            st.session_state.ns_trends_last_fetched_at = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        _ok  = sum(1 for s in _all_scores.values() if s > 0)
-        _bad = sum(1 for s in _all_scores.values() if s == 0)
-        st.toast(f"Done! {_ok} collected, {_bad} zero-score", icon="✅")
-        st.rerun()
+    # ── Background collection (pipelines/job_runner.py) ──────────────────
+    def _on_refresh_done(job: dict) -> None:
+        reload_trends_scores()
+        st.session_state.ns_trends_last_fetched_at = job["finished_at"]
+        st.toast(f"Done! {job['progress']['collected']} collected, {job['progress']['errors']} failed", icon="✅")
+
+    render_job_progress("refresh_nonsteam", on_finish=_on_refresh_done)
+    _show_collect = _show_collect and not is_running("refresh_nonsteam")
 
     tbl_col, btn_col, meta_col = st.columns([4, 1, 1])
     with tbl_col:
@@ -390,8 +229,7 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
                      help="Fetch trends for all stale games in the current filter",
                      width="stretch", disabled=not _has_creds):
             games = df_filtered_ns["Game Title"].dropna().unique().tolist()
-            _cached_ts = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-            games_to_fetch = filter_stale_trends_games(games, _cached_ts)
+            games_to_fetch = filter_stale_trends_games(games)
             if not games_to_fetch:
                 st.toast("All trends data is fresh (< 24 h)", icon="✅")
             elif not _effective_anchor:
@@ -400,11 +238,11 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
                 _state = submit_refresh(games_to_fetch, _effective_anchor, _login, _password,
                                         source="refresh_all",
                                         state_file=REFRESH_TRENDS_STATE_FILE_NONSTEAM)
-                n_submitted = sum(1 for t in _state["tasks"] if t["status"] == "pending")
+                n_submitted = sum(1 for t in _state["tasks"] if t["status"] in ("pending", "chained"))
                 n_failed    = sum(1 for t in _state["tasks"] if t["status"] == "failed")
                 if n_failed:
                     st.warning(f"Submitted {n_submitted} task(s). {n_failed} failed to submit.")
-                _run_collect_loop(n_submitted)  # starts polling immediately after submit
+                start_background_job("refresh_nonsteam", _login, _password)  # starts polling immediately after submit
 
         _collect_clicked = (
             st.button(f"📥 Collect Results ({_pending_count})",
@@ -446,7 +284,7 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
 
     # ── Fallback: resume collection if page reloaded mid-run ─────────────────
     if _collect_clicked:
-        _run_collect_loop(_pending_count)
+        start_background_job("refresh_nonsteam", _login, _password)
 
     cols_to_show = [
         'Game Title', 'priority_score', 'youtube_score', 'trends_points',
@@ -472,7 +310,7 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
 
     for col in ['Release Date', 'YouTube ReleaseDate']:
         if col in df_nonsteam_display.columns:
-            df_nonsteam_display[col] = pd.to_datetime(df_nonsteam_display[col], errors='coerce', format='mixed', dayfirst=True).dt.strftime('%d/%m/%Y').fillna('N/A')
+            df_nonsteam_display[col] = df_nonsteam_display[col].dt.strftime('%d/%m/%Y').fillna('N/A')
 
     if "date_appended" in df_filtered_ns.columns and "date_appended" not in cols_to_show:
         df_nonsteam_display["date_appended"] = df_filtered_ns["date_appended"].values
@@ -520,9 +358,9 @@ def render(df_steam: pd.DataFrame, global_date_min: dt.date, global_date_max: dt
                 _state = submit_refresh(_ns_selected, _effective_anchor, _login, _password,
                                         source="refresh_selected",
                                         state_file=REFRESH_TRENDS_STATE_FILE_NONSTEAM)
-                n_submitted = sum(1 for t in _state["tasks"] if t["status"] == "pending")
+                n_submitted = sum(1 for t in _state["tasks"] if t["status"] in ("pending", "chained"))
                 if n_submitted:
-                    _run_collect_loop(n_submitted)
+                    start_background_job("refresh_nonsteam", _login, _password)
 
     # ── Supporting info ───────────────────────────────────────────────────────
     with st.expander("📐 How scores are calculated"):
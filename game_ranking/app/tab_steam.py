@@ -3,19 +3,15 @@ Steam Report tab.
 """
 
 import datetime as dt
-import time
 
 import pandas as pd
 import streamlit as st
 
-from app.thread_state import _trends_thread_state
 from app.helpers import (highlight_new_rows, reload_steam_from_csv,
-                         filter_stale_trends_games, load_trends_cache_timestamps)
-from calculation.process_data import (
-    calculate_hybrid_score,
-    calculate_developer_weighted_points,
-    calculate_trends_weighted_points,
-)
+                         filter_stale_trends_games,
+                         get_developer_index, get_ranking_cache, session_fingerprint,
+                         reload_trends_scores, render_job_progress, start_background_job)
+from calculation.ranking_cache import dict_fingerprint
 from calculation.steam_players import parse_owners_midpoint, load_appid_cache
 from calculation.dataforseo_trends import load_credentials
 from pipelines.refresh_trends_pipeline import (
@@ -24,11 +20,11 @@ from pipelines.refresh_trends_pipeline import (
     save_refresh_anchor,
     load_refresh_anchor,
     submit_refresh,
-    collect_refresh,
-    write_scores_to_csv,
 )
-from config import TRENDS_CACHE_FILE, REFRESH_TRENDS_STATE_FILE_STEAM
-from pipelines.trends_pipeline import load_tournament_anchor
+from config import REFRESH_TRENDS_STATE_FILE_STEAM
+from pipelines.trends_pipeline import load_tournament_anchor, trends_pipeline_progress
+from pipelines.job_runner import is_running
+from pipelines.ranking_pipeline import DEFAULT_WEIGHTS, rank_steam
 
 
 def _sync_from_steam_dates():
@@ -39,47 +35,36 @@ def _sync_from_steam_dates():
 
 
 def render(global_date_min: dt.date, global_date_max: dt.date):
-    df_steam = st.session_state.df_steam.copy()
     steam_source_name = st.session_state.get("steam_source", "default file")
 
     # ── Sidebar: Steam weights ────────────────────────────────────────────────
     st.sidebar.header("Steam Scoring")
     max_followers = st.sidebar.number_input(
-        "Max Followers (cap)", value=398955,
+        "Max Followers (cap)", value=DEFAULT_WEIGHTS["steam"]["max_followers"],
         help="Follower counts above this are treated as the maximum for scoring purposes."
     )
-    w_followers  = st.sidebar.slider("Follower Weight",  0, 5, 5)
-    w_developers = st.sidebar.slider("Developer Weight", 0, 5, 2)
-    w_trends     = st.sidebar.slider("Trends Weight",    0, 5, 2, key="steam_w_trends")
-
-    # ── Score calculations ────────────────────────────────────────────────────
-    for index, row in df_steam.iterrows():
-        df_steam.loc[index, 'Follower Points'] = calculate_hybrid_score(
-            row['FollowerCount'], min_value=1000, max_value=max_followers
-        )
-
-    for index, row in df_steam.iterrows():
-        points, _ = calculate_developer_weighted_points(row['Developers'])
-        df_steam.loc[index, 'Developer Points'] = points
-
-    df_steam['Follower Points']         = df_steam['Follower Points'].round(2)
-    df_steam['Developer Points']        = df_steam['Developer Points'].round(2)
-    df_steam['trends_score']            = (
-        df_steam['Name'].map(st.session_state.nonsteam_trends).fillna(0).astype(int)
+    w_followers  = st.sidebar.slider("Follower Weight",  0, 5, DEFAULT_WEIGHTS["steam"]["followers"])
+    w_developers = st.sidebar.slider("Developer Weight", 0, 5, DEFAULT_WEIGHTS["steam"]["developers"])
+    w_trends     = st.sidebar.slider("Trends Weight",    0, 5, DEFAULT_WEIGHTS["steam"]["trends"], key="steam_w_trends")
+
+    # ── Score calculations (memoized across reruns) ───────────────────────────
+    _dev_index = get_developer_index()   # picks up dev-list file edits before keying
+    _rank_key = (
+        "steam",
+        session_fingerprint("df_steam", st.session_state.df_steam),
+        session_fingerprint("dev_list", st.session_state.get("dev_list")),
+        dict_fingerprint(st.session_state.nonsteam_trends),
+        w_followers, w_developers, w_trends, max_followers,
     )
-    df_steam['trends_points']           = df_steam['trends_score'].apply(
-        calculate_trends_weighted_points
-    ).round(2)
-    df_steam['Weighted Follower Score'] = df_steam['Follower Points'] * w_followers
-    df_steam['Weighted Dev Score']      = df_steam['Developer Points'] * w_developers
-    df_steam['Weighted Trends Score']   = df_steam['trends_points'] * w_trends
-    df_steam['Final Priority Score']    = (
-        df_steam['Weighted Follower Score'] +
-        df_steam['Weighted Dev Score'] +
-        df_steam['Weighted Trends Score']
-    ).round(2)
-
-    df_ranked = df_steam.sort_values('Final Priority Score', ascending=False, ignore_index=True)
+    df_ranked = get_ranking_cache().get_or_compute(
+        _rank_key,
+        lambda: rank_steam(
+            st.session_state.df_steam, st.session_state.nonsteam_trends,
+            {"max_followers": max_followers, "followers": w_followers,
+             "developers": w_developers, "trends": w_trends},
+            developer_list=_dev_index,
+        ),
+    ).copy()
 
     if "steam_reset_filters" not in st.session_state:
         st.session_state.steam_reset_filters = False
@@ -108,8 +93,9 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
 
     _anchor = st.session_state.get("trends_anchor")
     _anchor_meta_top = load_tournament_anchor()
-    if _trends_thread_state["running"]:
-        st.info(f"🔄 {_trends_thread_state.get('progress', 'Trends updating...')}")
+    _trends_progress = trends_pipeline_progress()
+    if _trends_progress:
+        st.info(f"🔄 {_trends_progress}")
     elif _anchor:
         _run_at_top = _anchor_meta_top.get("run_at") if _anchor_meta_top else None
         if _run_at_top:
@@ -259,68 +245,14 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
         _show_collect   = _refresh_state["status"] in ("submitted", "collecting")
         _pending_count  = sum(1 for t in _refresh_state["tasks"] if t["status"] == "pending") if _show_collect else 0
 
-        # ── Collect loop for the Steam tab ───────────────────────────────────────
-        def _run_collect_loop(grand_total: int) -> None:
-            _POLL_SLEEP  = 120  # seconds between tasks_ready calls (2 min)
-            _MAX_POLLS   = 200  # safety ceiling (~10 min at 3 s/poll)
-
-            _bar         = st.progress(0.0, text="Checking DataForSEO for ready tasks…")
-            _log         = st.empty()
-            _status_line = st.empty()
-            _log_lines:  list[str] = []
-            _all_scores: dict[str, int] = {}
-
-            def _on_task(game: str, score: int, n_done: int, n_total: int, failed: bool) -> None:
-                _all_scores[game] = score
-                # Update session state immediately so the table reflects the score on rerun
-                st.session_state.nonsteam_trends[game] = score
-                pct = len(_all_scores) / max(grand_total, 1)
-                _bar.progress(min(pct, 1.0), text=f"Collecting… {len(_all_scores)} / {grand_total}")
-                icon = "⚠️" if failed else "✅"
-                _log_lines.append(f"{icon} **{game}** → {score}")
-                _log.markdown("\n\n".join(_log_lines))
-
-            _poll_num = 0
-            while _poll_num < _MAX_POLLS:
-                _poll_num += 1
-                _result = collect_refresh(_login, _password, on_task_complete=_on_task,
-                                          state_file=REFRESH_TRENDS_STATE_FILE_STEAM)
-
-                if _result["complete"]:
-                    _bar.progress(1.0, text=f"All done — {_result['collected']} collected, {_result['errors']} failed")
-                    _status_line.empty()
-                    break
-
-                _remaining = sum(
-                    1 for t in load_refresh_state(state_file=REFRESH_TRENDS_STATE_FILE_STEAM)["tasks"]
-                    if t["status"] == "pending"
-                )
-                if _remaining == 0:
-                    _bar.progress(1.0, text="All done")
-                    _status_line.empty()
-                    break
-
-                _status_line.caption(
-                    f"Poll {_poll_num} — {_remaining} task(s) still pending, "
-                    f"next check in {_POLL_SLEEP}s…"
-                )
-                time.sleep(_POLL_SLEEP)
-            else:
-                _bar.progress(1.0, text="Timed out — some tasks may still be pending")
-
-            if _all_scores:
-                _cached_ts = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-                write_scores_to_csv(
-                    _all_scores,
-                    st.session_state.nonsteam_trends,
-                    list(_all_scores.keys()),
-                    _cached_ts,
-                )
-                st.session_state.steam_trends_last_fetched_at = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            _ok  = sum(1 for s in _all_scores.values() if s > 0)
-            _bad = sum(1 for s in _all_scores.values() if s == 0)
-            st.toast(f"Done! {_ok} collected, {_bad} zero-score", icon="✅")
-            st.rerun()
+        # ── Background collection (pipelines/job_runner.py) ──────────────────
+        def _on_refresh_done(job: dict) -> None:
+            reload_trends_scores()
+            st.session_state.steam_trends_last_fetched_at = job["finished_at"]
+            st.toast(f"Done! {job['progress']['collected']} collected, {job['progress']['errors']} failed", icon="✅")
+
+        render_job_progress("refresh_steam", on_finish=_on_refresh_done)
+        _show_collect = _show_collect and not is_running("refresh_steam")
 
         tbl_col, btn_col, meta_col = st.columns([4, 1, 1])
         with tbl_col:
@@ -330,8 +262,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                          help="Fetch trends for all stale games in the current filter",
                          width="stretch", disabled=not _has_creds):
                 games = df_filtered_steam["Name"].dropna().unique().tolist()
-                _cached_ts = load_trends_cache_timestamps(TRENDS_CACHE_FILE)
-                games_to_fetch = filter_stale_trends_games(games, _cached_ts)
+                games_to_fetch = filter_stale_trends_games(games)
                 if not games_to_fetch:
                     st.toast("All trends data is fresh (< 24 h)", icon="✅")
                 elif not _effective_anchor:
@@ -340,11 +271,11 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                     _state = submit_refresh(games_to_fetch, _effective_anchor, _login, _password,
                                             source="refresh_all",
                                             state_file=REFRESH_TRENDS_STATE_FILE_STEAM)
-                    n_submitted = sum(1 for t in _state["tasks"] if t["status"] == "pending")
+                    n_submitted = sum(1 for t in _state["tasks"] if t["status"] in ("pending", "chained"))
                     n_failed    = sum(1 for t in _state["tasks"] if t["status"] == "failed")
                     if n_failed:
                         st.warning(f"Submitted {n_submitted} task(s). {n_failed} failed to submit.")
-                    _run_collect_loop(n_submitted)  # starts polling immediately after submit
+                    start_background_job("refresh_steam", _login, _password)  # starts polling immediately after submit
 
             _collect_clicked = (
                 st.button(f"📥 Collect Results ({_pending_count})",
@@ -386,7 +317,7 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
 
         # ── Fallback: resume collection if page reloaded mid-run ─────────────
         if _collect_clicked:
-            _run_collect_loop(_pending_count)
+            start_background_job("refresh_steam", _login, _password)
 
         cols_to_show = [
             'Name', 'ReleaseDate', 'FollowerCount', 'Follower Points',
@@ -448,9 +379,9 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                     _state = submit_refresh(_selected, _effective_anchor, _login, _password,
                                             source="refresh_selected",
                                             state_file=REFRESH_TRENDS_STATE_FILE_STEAM)
-                    n_submitted = sum(1 for t in _state["tasks"] if t["status"] == "pending")
+                    n_submitted = sum(1 for t in _state["tasks"] if t["status"] in ("pending", "chained"))
                     if n_submitted:
-                        _run_collect_loop(n_submitted)
+                        start_background_job("refresh_steam", _login, _password)
 
         with st.expander("📐 How scores are calculated"):
             st.latex(r"Priority Score = (Follower Score \times w_{followers}) + (Dev Score \times w_{dev}) + (Trends Points \times w_{trends})")
@@ -494,8 +425,8 @@ def render(global_date_min: dt.date, global_date_max: dt.date):
                 else:
                     spy_df = pd.DataFrame(spy_rows)
 
-                    # Map game → developers using df_steam (already in scope)
-                    steam_devs = df_steam[["Name", "Developers"]].copy()
+                    # Map game → developers using the loaded Steam snapshot
+                    steam_devs = st.session_state.df_steam[["Name", "Developers"]].copy()
                     steam_devs["Developers"] = steam_devs["Developers"].apply(
                         lambda x: x if isinstance(x, list)
                         else [d.strip() for d in str(x).split(",")]
@@ -1,24 +1,23 @@
 """
 Trends Tournament tab.
 
-Auto tournament: batch-submits DataForSEO tasks per round, collects via polling.
-Manual brackets: synchronous per-click for Steam / Non-Steam / Grand Final.
+Auto tournament: batch-submits DataForSEO tasks per round, collects in a background job.
+Manual brackets: per-click submits for Steam / Non-Steam / Grand Final, collected the same way.
 All searches scoped to category 41 (Computer & Video Games), worldwide, past month.
 """
 
 import datetime as dt
-import time
 import pandas as pd
 import streamlit as st
 
+from app.helpers import games_appended_since, render_job_progress, start_background_job
 from calculation.trends_tournament import TOURNAMENT_GROUP_SIZE
 from calculation.dataforseo_trends import load_credentials, save_credentials
-from pipelines.tournament_state import load_state, save_state, load_manual_state, save_manual_state, PINGBACK_URL
-from pipelines.tournament_pipeline import (
-    start_tournament, collect_results,
-    start_manual_bracket, collect_manual_bracket,
-    submit_grand_final, collect_grand_final,
+from pipelines.tournament_state import (
+    load_state, save_state, load_manual_state, save_manual_state, PINGBACK_URL,
 )
+from pipelines.tournament_pipeline import start_tournament, start_manual_bracket, submit_grand_final
+from pipelines.job_runner import load_job, is_running, start_job
 from pipelines.trends_pipeline import load_tournament_anchor, save_tournament_anchor
 
 
@@ -33,8 +32,7 @@ def _get_steam_games(n: int | None = None, appended_since=None) -> list[str]:
     if "Name" not in df.columns:
         return []
     if appended_since is not None and "date_appended" in df.columns:
-        da = pd.to_datetime(df["date_appended"], errors="coerce")
-        df = df[da >= pd.Timestamp(appended_since)]
+        df = df[df["Name"].astype(str).isin(games_appended_since("steam", appended_since))]
     series = df["Name"].dropna().astype(str)
     return series.tolist() if n is None else series.head(n).tolist()
 
@@ -54,8 +52,7 @@ def _get_nonsteam_games(n: int | None = None, appended_since=None) -> list[str]:
     if "priority_score" in df.columns:
         df = df.sort_values("priority_score", ascending=False)
     if appended_since is not None and "date_appended" in df.columns:
-        da = pd.to_datetime(df["date_appended"], errors="coerce")
-        df = df[da >= pd.Timestamp(appended_since)]
+        df = df[df[col].astype(str).isin(games_appended_since("non_steam", appended_since))]
     series = df[col].dropna().astype(str)
     return series.tolist() if n is None else series.head(n).tolist()
 
@@ -111,57 +108,23 @@ def _get_creds() -> tuple[str, str]:
     return login, password
 
 
-# ── Auto-poll loops ───────────────────────────────────────────────────────────
+# ── Background collection ─────────────────────────────────────────────────────
 
-def _run_collect_loop_tournament(login: str, password: str) -> None:
+def _watch_job(kind: str, login: str, password: str) -> None:
     """
-    One poll cycle: collect results, sleep 2 min, then st.rerun().
-    Rerunning re-renders the whole page (tables included) with fresh state.
+    Keep kind's collect job (pipelines/job_runner.py) running while its
+    bracket has pending tasks, and show its progress. A failed job is not
+    restarted automatically — it waits for a Retry click.
     """
-    _bar         = st.progress(0.0, text="Checking DataForSEO for ready tasks…")
-    _status_line = st.empty()
-
-    _summary = collect_results(login, password)
-
-    if _summary["complete"] or load_state().get("status") == "complete":
-        _bar.progress(1.0, text="Tournament complete!")
-        _status_line.empty()
-        st.rerun()
-        return
-
-    _bar.progress(
-        1.0,
-        text=f"Collected {_summary['collected']}, "
-             f"{_summary['rounds_advanced']} round(s) advanced, "
-             f"{_summary['errors']} error(s)",
-    )
-    _status_line.caption("Next check in 30s…")
-    time.sleep(30)
-    st.rerun()
-
-
-def _run_collect_loop_manual(bracket_key: str, login: str, password: str) -> None:
-    """One poll cycle for a manual bracket — collect, sleep 30s, rerun."""
-    _bar         = st.progress(0.0, text="Checking DataForSEO for ready tasks…")
-    _status_line = st.empty()
-
-    _sum = collect_manual_bracket(bracket_key, login, password)
-
-    if _sum["complete"]:
-        _bar.progress(1.0, text="Bracket complete!")
-        _status_line.empty()
-        st.rerun()
-        return
-
-    _bar.progress(
-        1.0,
-        text=f"Collected {_sum['collected']}, "
-             f"{_sum['rounds_advanced']} round(s) advanced, "
-             f"{_sum['errors']} error(s)",
-    )
-    _status_line.caption("Next check in 30s…")
-    time.sleep(30)
-    st.rerun()
+    if not is_running(kind):
+        job = load_job(kind)
+        if job and job["status"] == "failed":
+            st.error(f"{job['label']} collection failed: {job['error']}")
+            if st.button("🔄 Retry collection", key=f"retry_job_{kind}"):
+                start_background_job(kind, login, password)
+            return
+        start_job(kind, login, password)
+    render_job_progress(kind)
 
 
 # ── Main render ───────────────────────────────────────────────────────────────
@@ -281,7 +244,7 @@ def render():
                 with st.spinner("Submitting round 1 tasks…"):
                     start_tournament(steam_list, nonsteam_list, login, password,
                                      pingback_url=PINGBACK_URL)
-                _run_collect_loop_tournament(login, password)
+                start_background_job("tournament", login, password)
 
     # ── Status: RUNNING ───────────────────────────────────────────────────────
     elif _status == "running":
@@ -329,7 +292,7 @@ def render():
                     if _rows:
                         st.dataframe(pd.DataFrame(_rows), width="stretch", hide_index=True)
 
-        # Reset must be checked BEFORE the loop so a click during sleep is caught on the next rerun
+        # Reset must be checked BEFORE collecting resumes so the confirmation dialog can pause it
         if st.button("🗑 Reset Tournament", key="reset_running_btn"):
             st.session_state["_confirm_reset"] = True
         if st.session_state.get("_confirm_reset"):
@@ -350,8 +313,8 @@ def render():
                     st.session_state.pop("_confirm_reset", None)
                     st.rerun()
         else:
-            # Auto-resume polling — only when no confirmation dialog is open
-            _run_collect_loop_tournament(login, password)
+            # Keep collecting — only when no confirmation dialog is open
+            _watch_job("tournament", login, password)
 
     # ── Status: COMPLETE ──────────────────────────────────────────────────────
     elif _status == "complete":
@@ -426,7 +389,7 @@ def render():
             )
             with st.expander("Bracket rounds", expanded=True):
                 _render_bracket_rounds(_b)
-            # Reset must be checked BEFORE the loop so a click during sleep is caught on the next rerun
+            # Reset must be checked BEFORE collecting resumes so the confirmation dialog can pause it
             _confirm_key = f"_confirm_reset_manual_{bracket_key}"
             if st.button("🗑 Reset", key=f"reset_manual_{bracket_key}"):
                 st.session_state[_confirm_key] = True
@@ -448,8 +411,8 @@ def render():
                         st.session_state.pop(_confirm_key, None)
                         st.rerun()
             else:
-                # Auto-resume polling — only when no confirmation dialog is open
-                _run_collect_loop_manual(bracket_key, login, password)
+                # Keep collecting — only when no confirmation dialog is open
+                _watch_job(f"manual_{bracket_key}", login, password)
 
         elif _bstatus == "complete":
             finalists = _b.get("finalists", [])
@@ -496,22 +459,16 @@ def render():
                 st.rerun()
 
         elif _gf_status == "pending":
-            st.info("Grand Final task submitted — polling for results…")
-            _gf_res = collect_grand_final(login, password)
-            if _gf_res["complete"]:
-                st.rerun()
-            else:
-                _gc_reset_col, _ = st.columns([1, 3])
-                with _gc_reset_col:
-                    if st.button("🗑 Reset Grand Final", key="reset_gf_pending"):
-                        _m_state2["grand_final"] = {"steam_champion": None, "nonsteam_champion": None,
-                                                    "task_id": None, "keywords": [], "cleaned_keywords": [],
-                                                    "scores": {}, "winner": None, "status": "idle"}
-                        save_manual_state(_m_state2)
-                        st.rerun()
-                st.caption("Result not ready yet — next check in 30s…")
-                time.sleep(30)
-                st.rerun()
+            st.info("Grand Final task submitted — collecting in the background…")
+            _gc_reset_col, _ = st.columns([1, 3])
+            with _gc_reset_col:
+                if st.button("🗑 Reset Grand Final", key="reset_gf_pending"):
+                    _m_state2["grand_final"] = {"steam_champion": None, "nonsteam_champion": None,
+                                                "task_id": None, "keywords": [], "cleaned_keywords": [],
+                                                "scores": {}, "winner": None, "status": "idle"}
+                    save_manual_state(_m_state2)
+                    st.rerun()
+            _watch_job("grand_final", login, password)
 
         elif _gf_status in ("complete", "failed"):
             _winner = _gf.get("winner")
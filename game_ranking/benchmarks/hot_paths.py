@@ -0,0 +1,345 @@
+"""
+hot_paths.py - Time and measure the scoring / ingest hot paths on synthetic data.
+
+Usage (run from repo root):
+    python game_ranking/benchmarks/hot_paths.py [--sizes 1k,10k,100k,1M] [--cases flagging,dedup_nonsteam]
+                                                [--repeat 3] [--seed 2026] [--out results.json]
+                                                [--compare previous.json]
+
+Each case runs on seeded frames from benchmarks/synthetic.py at every size.
+Wall time is the best of --repeat runs (inputs rebuilt outside the timer);
+peak memory is the tracemalloc peak of one extra run, so tracing never skews
+the timings. Results are written as JSON (default: benchmarks/results/
+hot_paths_<timestamp>.json); --compare prints the time / memory ratio of
+every case against an earlier results file.
+
+Ingest cases (append_*, populate_appids) read and write their snapshots in a
+temporary directory — the real raw/ and data/ files are never touched. The
+append cases merge into an already-indexed snapshot, so they time the
+incremental merge, not the one-off index seed.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+# ── sys.path / cwd setup ─────────────────────────────────────────────────────
+# Pipeline internals use bare imports, so game_ranking/ must be on sys.path.
+BENCH_DIR = Path(__file__).resolve().parent          # game_ranking/benchmarks/
+GAME_RANKING_DIR = BENCH_DIR.parent                  # game_ranking/
+
+sys.path.insert(0, str(GAME_RANKING_DIR))
+os.chdir(str(GAME_RANKING_DIR))
+
+# ── Deferred imports (need sys.path set first) ────────────────────────────────
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks import synthetic  # noqa: E402
+from calculation import process_data, scoring  # noqa: E402
+from pipelines import nonsteam_pipeline, normalizer, ranking_pipeline, snapshot_index, steam_pipeline  # noqa: E402
+from pipelines.dates import parse_dates  # noqa: E402
+from pipelines.snapshot_index import SnapshotIndex  # noqa: E402
+from pipelines.snapshot_store import write_snapshot  # noqa: E402
+
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_SIZES = "1k,10k,100k,1M"
+TODAY = date(2026, 6, 1)   # fixed so score_nonsteam's decay is reproducible
+UPLOAD_FRACTION = 0.1      # share of rows in an upload (half updates, half new)
+
+
+def parse_size(text: str) -> int:
+    """'1k' → 1000, '1M' → 1000000, '2500' → 2500."""
+    text = text.strip()
+    mult = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if mult > 1 else text) * mult)
+
+
+# ── Inputs ────────────────────────────────────────────────────────────────────
+
+class Frames:
+    """Synthetic inputs for one size, built lazily and shared by every case."""
+
+    def __init__(self, n: int, seed: int, tmp: Path):
+        self.n, self.seed, self.tmp = n, seed, tmp
+
+    @functools.cached_property
+    def steam(self) -> pd.DataFrame:
+        return synthetic.steam_frame(self.n, self.seed)
+
+    @functools.cached_property
+    def nonsteam(self) -> pd.DataFrame:
+        return synthetic.nonsteam_frame(self.n, self.seed)
+
+    @functools.cached_property
+    def inventory(self) -> pd.DataFrame:
+        return synthetic.inventory_frame(self.n, self.seed)
+
+    @functools.cached_property
+    def dev_index(self) -> process_data.DeveloperIndex:
+        return process_data.DeveloperIndex(synthetic.developer_list(seed=self.seed))
+
+    @functools.cached_property
+    def cleaned(self) -> pd.DataFrame:
+        return process_data.clean_dev_genre_list(self.steam.copy())
+
+    @functools.cached_property
+    def flagged(self) -> pd.DataFrame:
+        flagged = process_data.flagging(self.cleaned)
+        flagged["Developer Points"] = scoring.developer_points(flagged["Developers"], self.dev_index)
+        return flagged
+
+    @functools.cached_property
+    def trends(self) -> dict:
+        """Trends scores for about 10% of the Steam and Non-Steam games."""
+        rng = np.random.default_rng(self.seed)
+        names = pd.concat([self.steam["Name"], self.nonsteam["Game Title"]]).drop_duplicates()
+        picked = names.sample(frac=0.1, random_state=self.seed)
+        return dict(zip(picked, rng.integers(0, 101, size=len(picked)).tolist()))
+
+    @functools.cached_property
+    def nonsteam_ranked_input(self) -> pd.DataFrame:
+        """Deduped, filtered Non-Steam rows with parsed dates — score_nonsteam's input."""
+        df, _ = ranking_pipeline.dedup_nonsteam(self.nonsteam)
+        df = df[(df["SteamStatus"] != "PC Game (on Steam)") & (df["SteamStatus"] != "Needs Verification")
+                & (df["Category"] == "Main Game")].copy()
+        for col in ranking_pipeline.NONSTEAM_DATE_COLUMNS:
+            df[col] = parse_dates(df[col])
+        return df
+
+    def upload(self, frame: pd.DataFrame, key: str) -> pd.DataFrame:
+        """UPLOAD_FRACTION of frame's rows: half existing keys, half new ones."""
+        k = max(2, int(len(frame) * UPLOAD_FRACTION))
+        upload = frame.sample(n=min(k, len(frame)), random_state=self.seed).reset_index(drop=True)
+        new = upload.index[: len(upload) // 2]
+        if key == "AppId":
+            upload.loc[new, "AppId"] = upload.loc[new, "AppId"] + 10_000_000
+        else:
+            upload.loc[new, key] = upload.loc[new, key] + " (New)"
+        return upload
+
+    @functools.cached_property
+    def steam_snapshot(self) -> Path:
+        path = self.tmp / "existing" / "raw_steam_2026-01-01.csv"
+        write_snapshot(self.steam, path)
+        return path
+
+    @functools.cached_property
+    def nonsteam_snapshot(self) -> Path:
+        path = self.tmp / "existing" / "raw_non_steam_2026-01-01.csv"
+        write_snapshot(self.nonsteam, path)
+        return path
+
+
+# ── Cases ─────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Callable[[Frames], Callable[[], tuple]]   # once per size → fresh args per run
+    fn:    Callable[..., Any]
+
+
+def _merge_args(frames: Frames, kind: str, upload: pd.DataFrame) -> Callable[[], tuple]:
+    """Fresh copy of the snapshot as today's file, already indexed — the timed merge is the steady state."""
+    snapshot = frames.steam_snapshot if kind == "steam" else frames.nonsteam_snapshot
+
+    def args() -> tuple:
+        work = frames.tmp / "out" / f"raw_{kind}_{date.today()}.csv"
+        work.parent.mkdir(exist_ok=True)
+        shutil.copyfile(snapshot, work)
+        SnapshotIndex(frames.tmp / "snapshot_index.sqlite").seed(kind, work)
+        return (upload, frames)
+    return args
+
+
+def _append_steam(upload: pd.DataFrame, frames: Frames):
+    with patch.object(snapshot_index, "SNAPSHOT_INDEX_DB", frames.tmp / "snapshot_index.sqlite"), \
+         patch.object(steam_pipeline, "RAW_DIR", frames.tmp / "out"), \
+         patch.object(steam_pipeline, "get_latest_steam_csv",
+                      return_value=frames.tmp / "out" / f"raw_steam_{date.today()}.csv"):
+        return steam_pipeline.append_from_uploaded_steam_csv(upload)
+
+
+def _append_nonsteam(upload: pd.DataFrame, frames: Frames):
+    with patch.object(snapshot_index, "SNAPSHOT_INDEX_DB", frames.tmp / "snapshot_index.sqlite"), \
+         patch.object(nonsteam_pipeline, "RAW_DIR", frames.tmp / "out"), \
+         patch.object(nonsteam_pipeline, "get_latest_nonsteam_csv",
+                      return_value=frames.tmp / "out" / f"raw_non_steam_{date.today()}.csv"):
+        return nonsteam_pipeline.append_from_uploaded_nonsteam_csv(upload)
+
+
+def _inventory_args(frames: Frames) -> Callable[[], tuple]:
+    inv_csv = frames.tmp / "inventory.csv"
+
+    def args() -> tuple:
+        frames.inventory.to_csv(inv_csv, index=True)   # populate_appids rewrites it
+        return (inv_csv, frames.steam_snapshot)
+    return args
+
+
+def _populate_appids(inv_csv: Path, steam_csv: Path):
+    with patch.object(process_data, "INVENTORY_FILE", inv_csv), \
+         patch("config.get_latest_steam_csv", return_value=steam_csv):
+        return process_data.populate_appids()
+
+
+CASES: list[Case] = [
+    Case("clean_dev_genre_list",
+         lambda f: lambda: (f.steam.copy(),),
+         process_data.clean_dev_genre_list),
+    Case("flagging",
+         lambda f: lambda: (f.cleaned,),
+         process_data.flagging),
+    Case("developer_points",
+         lambda f: lambda: (f.cleaned["Developers"], f.dev_index),
+         scoring.developer_points),
+    Case("score_steam",
+         lambda f: lambda: (f.flagged, f.trends),
+         lambda df, trends: scoring.score_steam(df, trends, max_followers=398955,
+                                                w_followers=5, w_developers=2, w_trends=2)),
+    Case("score_nonsteam",
+         lambda f: lambda: (f.nonsteam_ranked_input, f.trends),
+         lambda df, trends: scoring.score_nonsteam(df, trends, w_youtube=5, w_trends=2, today=TODAY)),
+    Case("_normalize_release_date",
+         lambda f: lambda: (f.nonsteam["Release Date"],),
+         nonsteam_pipeline._normalize_release_date),
+    Case("_normalize_steam_release_dates",
+         lambda f: lambda: (f.steam["ReleaseDate"],),
+         normalizer._normalize_steam_release_dates),
+    Case("append_from_uploaded_steam_csv",
+         lambda f: _merge_args(f, "steam", f.upload(f.steam, "AppId")),
+         _append_steam),
+    Case("append_from_uploaded_nonsteam_csv",
+         lambda f: _merge_args(f, "non_steam", f.upload(f.nonsteam, "Game Title")),
+         _append_nonsteam),
+    Case("dedup_nonsteam",
+         lambda f: lambda: (f.nonsteam,),
+         ranking_pipeline.dedup_nonsteam),
+    Case("populate_appids",
+         _inventory_args,
+         _populate_appids),
+]
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def measure(case: Case, frames: Frames, repeat: int) -> dict:
+    """Best-of-repeat seconds plus one traced run's peak memory for case at frames.n rows."""
+    make_args = case.setup(frames)
+    times = []
+    for _ in range(repeat):
+        args = make_args()
+        start = time.perf_counter()
+        case.fn(*args)
+        times.append(time.perf_counter() - start)
+
+    args = make_args()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        case.fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "case": case.name, "rows": frames.n, "repeat": repeat,
+        "seconds": round(min(times), 6), "mean_seconds": round(sum(times) / len(times), 6),
+        "peak_mib": round(peak / 2**20, 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=GAME_RANKING_DIR, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(sizes: list[int], cases: list[Case], repeat: int, seed: int, log=print) -> dict:
+    """Run every case at every size and return the results document."""
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+            frames = Frames(n, seed, Path(tmp))
+            for case in cases:
+                # Fewer repeats for the big sizes — one 1M-row run is already stable
+                row = measure(case, frames, repeat if n < 1_000_000 else 1)
+                results.append(row)
+                log(f"{case.name:<36} {n:>9,} rows  {row['seconds']:>9.4f} s  {row['peak_mib']:>9.1f} MiB")
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """One line per case/size present in both documents: time and memory ratios (current / baseline)."""
+    base = {(r["case"], r["rows"]): r for r in baseline.get("results", [])}
+    lines = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["rows"]))
+        if not b:
+            continue
+        t = r["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        m = r["peak_mib"] / b["peak_mib"] if b["peak_mib"] else float("inf")
+        lines.append(f"{r['case']:<36} {r['rows']:>9,} rows  time ×{t:6.2f}  memory ×{m:6.2f}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated row counts (default {DEFAULT_SIZES})")
+    parser.add_argument("--cases", help="comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    parser.add_argument("--out", type=Path, help="results JSON path")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    cases = CASES
+    if args.cases:
+        wanted = [c.strip() for c in args.cases.split(",") if c.strip()]
+        unknown = set(wanted) - {c.name for c in CASES}
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+        cases = [c for c in CASES if c.name in wanted]
+
+    doc = run([parse_size(s) for s in args.sizes.split(",")], cases, args.repeat, args.seed)
+    out = args.out or RESULTS_DIR / f"hot_paths_{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"Results → {out}")
+
+    if args.compare:
+        for line in compare(doc, json.loads(args.compare.read_text(encoding="utf-8"))):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
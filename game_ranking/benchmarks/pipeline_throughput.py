@@ -0,0 +1,208 @@
+"""
+pipeline_throughput.py - End-to-end throughput of the DataForSEO collectors against the fake API.
+
+Usage (run from repo root):
+    python game_ranking/benchmarks/pipeline_throughput.py [--games 5000] [--modes tournament,refresh]
+        [--poll 1.0] [--deadline 1800] [--out results.json] [--url http://127.0.0.1:8780]
+        [fault options: --latency 0.2 --rate-429 0.05 --task-delay 5 --extra-ready 1200 --pingbacks …]
+
+Runs start_tournament → collect_results until the tournament completes, and
+submit_refresh → collect_refresh until every game is scored, for --games
+synthetic titles, against pipelines/fake_api_server.py — started in-process
+with the given fault options unless --url names one that is already running.
+No live API is called and no credits are spent.
+
+All state (tournament / refresh state files, trends store, pingback queue)
+goes to a temporary GAME_RANKING_CACHE_DIR, so the real cache/ is untouched.
+With --pingbacks a local pingback receiver is started too, and tasks are
+posted with its URL, so the collectors take the pingback path instead of
+polling tasks_ready.
+
+Results (wall time, collect passes, games/s, per-endpoint call and retry
+counts from the shared HTTP client, server-side request counts) are written
+as JSON (default: benchmarks/results/pipeline_throughput_<timestamp>.json).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# ── sys.path / cwd setup ─────────────────────────────────────────────────────
+# Pipeline internals use bare imports, so game_ranking/ must be on sys.path.
+BENCH_DIR = Path(__file__).resolve().parent          # game_ranking/benchmarks/
+GAME_RANKING_DIR = BENCH_DIR.parent                  # game_ranking/
+
+sys.path.insert(0, str(GAME_RANKING_DIR))
+os.chdir(str(GAME_RANKING_DIR))
+
+# ── Deferred imports (need sys.path set first) ────────────────────────────────
+# Only the stdlib-only fake server here: config reads the API base URLs and
+# cache dir from the environment at import, so everything else is imported in
+# run() once those are set.
+from pipelines import fake_api_server  # noqa: E402
+
+RESULTS_DIR = BENCH_DIR / "results"
+LOGIN, PASSWORD = "load-test", "load-test"   # the fake server accepts anything
+
+
+def game_names(n: int) -> list[str]:
+    return [f"Load Test Game {i:06d}" for i in range(n)]
+
+
+def _drain(collect, deadline: float, poll: float) -> tuple[int, bool]:
+    """Call collect() until it reports complete or deadline passes. Returns (passes, completed)."""
+    passes = 0
+    while time.monotonic() < deadline:
+        passes += 1
+        if collect().get("complete"):
+            return passes, True
+        time.sleep(poll)
+    return passes, False
+
+
+def _run_tournament(games: list[str], deadline: float, poll: float) -> dict:
+    from pipelines import tournament_pipeline, tournament_state
+
+    half = len(games) // 2
+    started = time.monotonic()
+    tournament_pipeline.start_tournament(games[:half], games[half:], LOGIN, PASSWORD,
+                                         pingback_url=tournament_state.PINGBACK_URL)
+    submitted = time.monotonic() - started
+    passes, completed = _drain(lambda: tournament_pipeline.collect_results(LOGIN, PASSWORD), deadline, poll)
+    state = tournament_state.load_state()
+    return {
+        "submit_seconds": round(submitted, 3),
+        "seconds":        round(time.monotonic() - started, 3),
+        "collect_passes": passes,
+        "completed":      completed,
+        "rounds":         {b: state[b]["current_round"] for b in tournament_state.BRACKETS},
+        "tasks":          sum(len(r["tasks"]) for b in tournament_state.BRACKETS for r in state[b]["rounds"].values()),
+    }
+
+
+def _run_refresh(games: list[str], deadline: float, poll: float) -> dict:
+    from pipelines import refresh_trends_pipeline
+
+    started = time.monotonic()
+    state = refresh_trends_pipeline.submit_refresh(games[1:], games[0], LOGIN, PASSWORD,
+                                                   source="load_test", use_tournament=False)
+    submitted = time.monotonic() - started
+    passes, completed = _drain(lambda: refresh_trends_pipeline.collect_refresh(LOGIN, PASSWORD), deadline, poll)
+    final = refresh_trends_pipeline.load_state()
+    return {
+        "submit_seconds": round(submitted, 3),
+        "seconds":        round(time.monotonic() - started, 3),
+        "collect_passes": passes,
+        "completed":      completed,
+        "tasks":          len({t["task_id"] for t in state["tasks"] if t.get("task_id")}),
+        "scored":         sum(t["status"] == "complete" for t in final["tasks"]),
+        "failed":         sum(t["status"] == "failed" for t in final["tasks"]),
+    }
+
+
+MODES = {"tournament": _run_tournament, "refresh": _run_refresh}
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Point the pipelines at the fake API and a temporary cache dir, then run each mode."""
+    server = None
+    if args.url:
+        base = args.url.rstrip("/")
+    else:
+        server = fake_api_server.make_server("127.0.0.1", 0, fake_api_server.config_from_args(args))
+        fake_api_server.serve_in_background(server)
+        base = fake_api_server.base_url(server)
+
+    with tempfile.TemporaryDirectory(prefix="throughput_") as cache_dir:
+        os.environ["GAME_RANKING_CACHE_DIR"] = cache_dir
+        os.environ["GAME_RANKING_API_BASE_URL"] = base
+        receiver = None
+        if args.pingbacks:
+            from pipelines import pingback_server
+            receiver = pingback_server.make_server("127.0.0.1", 0)
+            pingback_server.serve_in_background(receiver)
+            os.environ["GAME_RANKING_PINGBACK_URL"] = (
+                f"http://127.0.0.1:{receiver.server_port}{pingback_server.PINGBACK_PATH}?id=$id&tag=$tag"
+            )
+        from calculation.http_client import get_client
+
+        games = game_names(args.games)
+        results = {}
+        try:
+            for mode in args.modes:
+                get_client().reset_stats()
+                before = _server_counts(base)
+                row = MODES[mode](games, time.monotonic() + args.deadline, args.poll)
+                row["games"] = len(games)
+                row["games_per_second"] = round(len(games) / row["seconds"], 2) if row["seconds"] else None
+                row["http"] = get_client().stats().to_dict(orient="records")
+                after = _server_counts(base)
+                row["server_requests"] = {k: after.get(k, 0) - before.get(k, 0) for k in after}
+                results[mode] = row
+                print(f"{mode:<10} {len(games):>7,} games  {row['seconds']:>9.2f} s  "
+                      f"{row['collect_passes']:>5} passes  {row['games_per_second']} games/s"
+                      f"{'' if row['completed'] else '  (deadline hit)'}")
+        finally:
+            if receiver is not None:
+                receiver.shutdown()
+                receiver.server_close()
+            if server is not None:
+                server.shutdown()
+                server.fake_state.close()
+                server.server_close()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python":     platform.python_version(),
+            "api":        base if args.url else "in-process fake",
+            "poll":       args.poll,
+            "fault":      {k: getattr(args, k) for k in ("latency", "jitter", "rate_429", "retry_after",
+                                                          "rate_timeout", "hang", "task_delay", "ready_cap",
+                                                          "extra_ready", "pingbacks", "seed")},
+        },
+        "results": results,
+    }
+
+
+def _server_counts(base: str) -> dict:
+    import requests
+    try:
+        return requests.get(f"{base}/stats", timeout=5).json()
+    except (requests.RequestException, ValueError):
+        return {}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--modes", default="tournament,refresh", help="comma-separated: tournament, refresh")
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between collect passes")
+    parser.add_argument("--deadline", type=float, default=1800.0, help="seconds allowed per mode")
+    parser.add_argument("--url", help="use an already-running fake API server instead of starting one")
+    parser.add_argument("--out", type=Path, help="results JSON path")
+    fake_api_server.add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    args.modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    doc = run(args)
+    out = args.out or RESULTS_DIR / f"pipeline_throughput_{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"Results → {out}")
+    return 0 if all(r["completed"] for r in doc["results"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
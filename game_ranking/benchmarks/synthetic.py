@@ -0,0 +1,157 @@
+"""
+Seeded synthetic frames shaped like the real snapshots, for benchmarks.
+
+Every generator is deterministic for a given (n, seed) and builds its columns
+with vectorised NumPy draws, so 1M rows take seconds rather than minutes.
+Values mimic what the hot paths actually see:
+
+  steam_frame      raw_steam_*.csv — comma-joined Developers / Genres (with
+                   ", Inc." style suffixes), mixed ReleaseDate styles
+                   ("22 Apr, 2026", "Apr 23, 2026", "April 2026", ISO,
+                   dd-mm-yyyy, "Coming Soon"), long-tailed FollowerCount
+  nonsteam_frame   raw_non_steam_*.csv — NONSTEAM_COLUMNS, ~5% duplicate
+                   titles, "1,234" view strings, D/M/Y and M/D/Y dates
+  inventory_frame  team_reviews_game_inventory.csv — Steam and console rows,
+                   some names shared with steam_frame
+  developer_list   developer_list.xlsx — Developer Name + points
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 2026
+
+_GENRES = ["Action", "Adventure", "Indie", "RPG", "Strategy", "Casual", "Simulation", "Puzzle", "Sports", "Racing"]
+_SUFFIXES = np.array(["", "", "", ", Inc.", ", Ltd.", " LLC"])
+_STEAM_STATUSES = ["Console / Other", "PC Game (on Steam)", "Needs Verification", "Not on Steam"]
+_PLATFORMS = ["PC (Steam)", "PlayStation 5", "Nintendo Switch", "Xbox Series X|S", "PC (Epic)"]
+
+
+def _rng(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def _titles(rng: np.random.Generator, n: int, prefix: str) -> np.ndarray:
+    return np.char.add(f"{prefix} ", rng.permutation(n).astype(str))
+
+
+def _join_choices(rng: np.random.Generator, pool: np.ndarray, n: int, max_k: int) -> np.ndarray:
+    """n comma-joined strings of 1..max_k names drawn from pool."""
+    k = rng.integers(1, max_k + 1, size=n)
+    picks = rng.integers(0, len(pool), size=(n, max_k))
+    out = pool[picks[:, 0]].astype(object)
+    for j in range(1, max_k):
+        extra = k > j
+        out[extra] = out[extra] + ", " + pool[picks[extra, j]]
+    return out
+
+
+_CALENDAR = pd.date_range("2018-01-01", periods=365 * 9, freq="D")
+
+
+def _days(rng: np.random.Generator, n: int) -> np.ndarray:
+    """n random day offsets into _CALENDAR."""
+    return rng.integers(0, len(_CALENDAR), size=n)
+
+
+def _fmt(days: np.ndarray, fmt: str) -> np.ndarray:
+    # strftime the ~3k calendar days once, then index — per-row strftime dominates at 1M rows
+    return _CALENDAR.strftime(fmt).to_numpy(dtype=object)[days]
+
+
+def developer_names(n_devs: int = 5000) -> np.ndarray:
+    return np.char.add("Studio ", np.arange(n_devs).astype(str))
+
+
+def developer_list(n_devs: int = 5000, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Reference developer list covering about half the generated developer names."""
+    rng = _rng(seed)
+    names = developer_names(n_devs)[: n_devs // 2]
+    return pd.DataFrame({
+        "No.": np.arange(1, len(names) + 1),
+        "Developer Name": names,
+        "Average Revenue Per Game": rng.integers(1_000, 5_000_000, size=len(names)),
+        "Total Hybrid Weighted Points": np.round(rng.uniform(1, 5, size=len(names)), 6),
+    })
+
+
+def _steam_release_dates(rng: np.random.Generator, n: int) -> np.ndarray:
+    days = _days(rng, n)
+    style = rng.integers(0, 7, size=n)
+    out = np.where(style == 0, _fmt(days, "%-d %b, %Y"),         # 22 Apr, 2026
+          np.where(style == 1, _fmt(days, "%b %-d, %Y"),         # Apr 23, 2026
+          np.where(style == 2, _fmt(days, "%B %Y"),              # April 2026
+          np.where(style == 3, _fmt(days, "%Y-%m-%d"),
+          np.where(style == 4, _fmt(days, "%d-%m-%Y"),
+          np.where(style == 5, "Coming Soon", "TBD"))))))
+    return out.astype(object)
+
+
+def steam_frame(n: int, seed: int = DEFAULT_SEED, n_devs: int = 5000) -> pd.DataFrame:
+    """A raw Steam snapshot with n unique AppIds."""
+    rng = _rng(seed)
+    devs = np.char.add(developer_names(n_devs), _SUFFIXES[rng.integers(0, len(_SUFFIXES), size=n_devs)])
+    followers = np.round(rng.lognormal(mean=7, sigma=2, size=n)).astype(np.int64)
+    return pd.DataFrame({
+        "AppId":         rng.permutation(np.arange(1_000_000, 1_000_000 + n)),
+        "Name":          _titles(rng, n, "Steam Game"),
+        "FollowerCount": np.clip(followers, 0, 5_000_000),
+        "Genres":        _join_choices(rng, np.array(_GENRES), n, 4),
+        "Developers":    _join_choices(rng, devs, n, 3),
+        "ReleaseDate":   _steam_release_dates(rng, n),
+        "date_appended": _fmt(_days(rng, n), "%Y-%m-%d"),
+    })
+
+
+def _slash_dates(rng: np.random.Generator, n: int) -> np.ndarray:
+    days = _days(rng, n)
+    style = rng.integers(0, 4, size=n)
+    out = np.where(style == 0, _fmt(days, "%d/%m/%Y"),
+          np.where(style == 1, _fmt(days, "%m/%d/%Y"),
+          np.where(style == 2, _fmt(days, "%Y-%m-%d"), "TBD")))
+    return out.astype(object)
+
+
+def nonsteam_frame(n: int, seed: int = DEFAULT_SEED, dup_rate: float = 0.05) -> pd.DataFrame:
+    """A raw Non-Steam snapshot with n rows, about dup_rate of them repeated titles."""
+    rng = _rng(seed)
+    titles = _titles(rng, n, "Console Game").astype(object)
+    dups = rng.random(n) < dup_rate
+    titles[dups] = titles[rng.integers(0, n, size=int(dups.sum()))]
+    views = rng.lognormal(mean=9, sigma=2.5, size=n).astype(np.int64)
+    return pd.DataFrame({
+        "Game Title":          titles,
+        "Category":            np.where(rng.random(n) < 0.9, "Main Game", "DLC"),
+        "Release Date":        _slash_dates(rng, n),
+        "Developers":          _join_choices(rng, developer_names(2000), n, 2),
+        "Publishers":          np.char.add("Publisher ", rng.integers(0, 500, size=n).astype(str)).astype(object),
+        "Platforms":           _join_choices(rng, np.array(_PLATFORMS), n, 3),
+        "Genres":              _join_choices(rng, np.array(_GENRES), n, 3),
+        "Themes":              "",
+        "Keywords":            "",
+        "YouTube URL":         np.where(rng.random(n) < 0.8, "https://www.youtube.com/watch?v=x", ""),
+        "YouTube Views":       np.array([f"{v:,}" for v in views], dtype=object),
+        "YouTube Likes":       views // 50,
+        "YouTube ReleaseDate": _slash_dates(rng, n),
+        "SteamStatus":         np.array(_STEAM_STATUSES)[rng.integers(0, len(_STEAM_STATUSES), size=n)],
+        "date_appended":       _fmt(_days(rng, n), "%Y-%m-%d"),
+    })
+
+
+def inventory_frame(n: int, seed: int = DEFAULT_SEED, steam_overlap: float = 0.3) -> pd.DataFrame:
+    """A team inventory with n rows; steam_overlap of them reuse steam_frame names."""
+    rng = _rng(seed)
+    names = _titles(rng, n, "Inventory Game").astype(object)
+    shared = rng.random(n) < steam_overlap
+    names[shared] = np.char.add("Steam Game ", rng.integers(0, n, size=int(shared.sum())).astype(str))
+    platform = np.array(_PLATFORMS)[rng.integers(0, len(_PLATFORMS), size=n)]
+    appid = np.where(rng.random(n) < 0.5, rng.integers(1_000_000, 2_000_000, size=n), np.nan)
+    return pd.DataFrame({
+        "S.NO":           np.arange(n),
+        "Game Name":      names,
+        "Date Purchased": _slash_dates(rng, n),
+        "Platform":       platform,
+        "Reviewed":       rng.random(n) < 0.4,
+        "Price":          np.round(rng.uniform(0, 70, size=n), 2),
+        "steam_appid":    np.where(np.char.find(platform.astype(str), "Steam") >= 0, appid, np.nan),
+    })
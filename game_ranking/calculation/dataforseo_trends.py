@@ -7,18 +7,23 @@ Auth: HTTP Basic (login + password from DataForSEO dashboard).
 
 Uses the task-based endpoint (task_post → task_get).
 This delegates Google Trends rate-limiting to DataForSEO's internal queue.
+All calls go through the shared pooled client (calculation/http_client.py).
 """
 
 import json
 import logging
 import random
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
+
+from calculation.http_client import get_client, is_dns_error
+from config import DATAFORSEO_BASE_URL
 
 log = logging.getLogger(__name__)
 
-BASE_URL       = "https://api.dataforseo.com/v3"
+BASE_URL       = f"{DATAFORSEO_BASE_URL}/v3"
 GAMES_CATEGORY = 41   # Computer & Video Games
 MAX_KEYWORDS   = 5
 MAX_TASKS_PER_POST = 100  # DataForSEO hard limit — >100 tasks per POST returns error 40006
@@ -28,7 +33,10 @@ TASK_GET_URL    = f"{BASE_URL}/keywords_data/google_trends/explore/task_get"
 TASKS_READY_URL = f"{BASE_URL}/keywords_data/google_trends/explore/tasks_ready"
 POLL_INTERVAL = 10   # seconds between task_get polls
 POLL_TIMEOUT  = 120  # total seconds to wait for a task to complete (2 min — fail fast so progress updates appear promptly)
+FETCH_WORKERS = 8    # concurrent task_get calls when collecting already-ready tasks
+DIRECT_CHECK_MAX = 1  # pending sets this small (the Grand Final) are checked directly when tasks_ready omits them
 POST_RETRIES  = 3    # attempts to submit the task
+RETRY_BACKOFF = 10.0 # seconds before the first transport retry (429 / 5xx / connection), then doubled
 
 CREDS_FILE = Path(__file__).parent.parent / "cache" / "dataforseo_creds.json"
 
@@ -71,11 +79,6 @@ def save_credentials(login: str, password: str) -> None:
 
 # ── Task helpers ──────────────────────────────────────────────────────────────
 
-def _is_dns_error(e: Exception) -> bool:
-    s = str(e)
-    return "getaddrinfo failed" in s or "Errno 11001" in s
-
-
 def _post_task(
     payload: list[dict],
     login: str,
@@ -87,28 +90,23 @@ def _post_task(
     """
     for attempt in range(POST_RETRIES):
         try:
-            resp = requests.post(
+            # 429 / 5xx / connection errors are retried inside the client
+            resp = get_client().post(
                 TASK_POST_URL,
                 json=payload,
                 auth=(login, password),
+                endpoint="dataforseo.task_post",
                 timeout=30,
+                retries=POST_RETRIES - 1,
+                backoff=RETRY_BACKOFF,
             )
-            if resp.status_code == 429:
-                wait = 30 * (attempt + 1)
-                log.warning("DataForSEO rate limited (429), waiting %ds before retry", wait)
-                time.sleep(wait)
-                continue
             resp.raise_for_status()
             candidate = resp.json()
         except Exception as e:
-            if _is_dns_error(e):
+            if is_dns_error(e):
                 log.error("DataForSEO DNS resolution failed — check network connectivity")
                 return None
-            log.warning("DataForSEO task_post attempt %d failed: %s", attempt + 1, e)
-            if attempt < POST_RETRIES - 1:
-                time.sleep(5 * (attempt + 1) + random.uniform(0, 2))
-                continue
-            log.error("DataForSEO task_post failed after %d attempts", POST_RETRIES)
+            log.error("DataForSEO task_post failed after %d attempts: %s", POST_RETRIES, e)
             return None
 
         tasks = candidate.get("tasks", [])
@@ -133,6 +131,12 @@ def _post_task(
     return None
 
 
+# Status codes that mean "still working — keep polling"
+_IN_PROGRESS = {20100, 20200, 40600, 40601, 40602}
+# Status codes that mean the task failed and polling is pointless
+_TERMINAL_ERRORS = {40101, 40400}
+
+
 def _poll_task(
     task_id: str,
     login: str,
@@ -142,11 +146,6 @@ def _poll_task(
     Poll task_get/{task_id} until the task completes or POLL_TIMEOUT elapses.
     Returns the completed tasks[0] dict on success, None on failure or timeout.
     """
-    # Status codes that mean "still working — keep polling"
-    _IN_PROGRESS = {20100, 20200, 40600, 40601, 40602}
-    # Status codes that mean the task failed and polling is pointless
-    _TERMINAL_ERRORS = {40101, 40400}
-
     deadline = time.monotonic() + POLL_TIMEOUT
     poll_count = 0
 
@@ -155,15 +154,16 @@ def _poll_task(
         poll_count += 1
 
         try:
-            resp = requests.get(
+            resp = get_client().get(
                 f"{TASK_GET_URL}/{task_id}",
                 auth=(login, password),
+                endpoint="dataforseo.task_get",
                 timeout=30,
             )
             resp.raise_for_status()
             data = resp.json()
         except Exception as e:
-            if _is_dns_error(e):
+            if is_dns_error(e):
                 log.error("DataForSEO DNS resolution failed during polling")
                 return None
             log.warning("DataForSEO poll %d failed: %s — retrying", poll_count, e)
@@ -221,57 +221,51 @@ def post_tasks_bulk(
     chunk = task_payloads[:MAX_TASKS_PER_POST]
     task_ids: list[str | None] = []
 
-    for attempt in range(POST_RETRIES):
-        try:
-            resp = requests.post(
-                TASK_POST_URL,
-                json=chunk,
-                auth=(login, password),
-                timeout=30,
-            )
-            if resp.status_code == 429:
-                wait = 30 * (attempt + 1)
-                log.warning("DataForSEO rate limited (429), waiting %ds", wait)
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            if _is_dns_error(e):
-                log.error("DataForSEO DNS error in post_tasks_bulk")
-                return []
-            log.warning("post_tasks_bulk attempt %d: %s", attempt + 1, e)
-            if attempt < POST_RETRIES - 1:
-                time.sleep(5 * (attempt + 1) + random.uniform(0, 2))
-                continue
-            return []
-
-        for task in data.get("tasks", []):
-            tid = task.get("id")
-            sc  = task.get("status_code")
-            if sc in (20100, 20000) and tid:
-                task_ids.append(tid)
-            else:
-                log.warning("post_tasks_bulk task error %s: %s", sc, task.get("status_message"))
-                task_ids.append(None)
-        break
+    try:
+        # 429 / 5xx / connection errors are retried inside the client
+        resp = get_client().post(
+            TASK_POST_URL,
+            json=chunk,
+            auth=(login, password),
+            endpoint="dataforseo.task_post",
+            timeout=30,
+            retries=POST_RETRIES - 1,
+            backoff=RETRY_BACKOFF,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        if is_dns_error(e):
+            log.error("DataForSEO DNS error in post_tasks_bulk")
+        else:
+            log.warning("post_tasks_bulk failed after %d attempts: %s", POST_RETRIES, e)
+        return []
+
+    for task in data.get("tasks", []):
+        tid = task.get("id")
+        sc  = task.get("status_code")
+        if sc in (20100, 20000) and tid:
+            task_ids.append(tid)
+        else:
+            log.warning("post_tasks_bulk task error %s: %s", sc, task.get("status_message"))
+            task_ids.append(None)
 
     return task_ids
 
 
-def fetch_tasks_ready(login: str, password: str) -> set[str]:
+def fetch_tasks_ready(login: str, password: str) -> set[str] | None:
     """
     GET /v3/keywords_data/google_trends/explore/tasks_ready.
-    Returns the set of task_id strings DataForSEO has completed.
-    Returns empty set on any error.
+    Returns the set of task_id strings DataForSEO has completed, or None when
+    the request failed (so callers can tell "nothing ready" from "unknown").
     """
     try:
-        resp = requests.get(TASKS_READY_URL, auth=(login, password), timeout=30)
+        resp = get_client().get(TASKS_READY_URL, auth=(login, password), endpoint="dataforseo.tasks_ready", timeout=30)
         resp.raise_for_status()
         data = resp.json()
     except Exception as e:
         log.warning("fetch_tasks_ready failed: %s", e)
-        return set()
+        return None
 
     ready_ids: set[str] = set()
     for task in data.get("tasks", []):
@@ -288,27 +282,100 @@ def check_task(task_id: str, login: str, password: str) -> dict | None:
     Returns the task dict if status_code == 20000 (complete), else None.
     Use this when tasks_ready is saturated (>1000 queued tasks).
     """
+    task = _get_task(task_id, login, password)
+    if task is not None and task.get("status_code") == 20000:
+        return task
+    return None
+
+
+def _get_task(task_id: str, login: str, password: str) -> dict | None:
+    """One immediate GET to task_get/{task_id}. Returns tasks[0] (any status), or None on error."""
     try:
-        resp = requests.get(
+        resp = get_client().get(
             f"{TASK_GET_URL}/{task_id}",
             auth=(login, password),
+            endpoint="dataforseo.task_get",
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        tasks = resp.json().get("tasks", [])
     except Exception as e:
-        if _is_dns_error(e):
-            return None
-        log.warning("check_task %s failed: %s", task_id, e)
+        log.warning("task_get %s failed: %s", task_id, e)
         return None
+    return tasks[0] if tasks else None
 
-    tasks = data.get("tasks", [])
-    if not tasks:
-        return None
-    task = tasks[0]
-    if task.get("status_code") == 20000:
-        return task
-    return None
+
+def collect_ready_results(
+    pending: dict[str, list[str]],
+    login: str,
+    password: str,
+    max_workers: int = FETCH_WORKERS,
+    ready_ids: set[str] | None = None,
+    poll: bool = True,
+    on_batch: Callable[[int, int], None] | None = None,
+) -> dict[str, dict[str, float]]:
+    """
+    Fetch and parse every pending task that DataForSEO has finished, in one pass.
+
+    pending maps task_id → keyword list (in submission order). ready_ids
+    (e.g. from pingbacks) is a hint: those IDs are fetched directly, and
+    tasks_ready is still polled whenever some pending ID is not among them,
+    so a lost pingback never stalls collection. poll=False skips tasks_ready
+    and fetches only ready_ids (a pingback wake). The remaining pending IDs
+    are checked directly too when tasks_ready fails, when it is saturated
+    (1000 cap), or when at most DIRECT_CHECK_MAX IDs are pending. Each
+    candidate costs a single task_get (no poll sleep), run max_workers at a
+    time. on_batch(n_fetched, n_total) is called after each batch of
+    max_workers task_gets, so a background job can heartbeat through a long
+    fetch (an exception it raises aborts the collect).
+
+    Returns {task_id: {keyword: score}} for tasks that are done. A task that
+    finished with an error gets all-zero scores. Tasks still running, or whose
+    GET failed, are left out, so callers keep them pending for the next pass.
+    """
+    if not pending:
+        return {}
+    hinted = set(pending) & set(ready_ids or ())
+    polled = poll and len(hinted) < len(pending)
+    polled_ids = fetch_tasks_ready(login, password) if polled else set()
+    known_ready = hinted | (set(pending) & (polled_ids or set()))
+    candidates = set(known_ready)
+    missing = set(pending) - known_ready
+    if polled and missing:
+        if polled_ids is None:
+            log.info("tasks_ready failed; checking %d pending tasks directly", len(missing))
+        elif len(polled_ids) >= 1000:
+            log.info("tasks_ready saturated (1000 cap); checking %d pending tasks directly", len(missing))
+        elif len(pending) > DIRECT_CHECK_MAX:
+            missing = set()
+        candidates |= missing
+    if not candidates:
+        return {}
+
+    ordered = [tid for tid in pending if tid in candidates]
+    batch = max(1, min(max_workers, len(ordered)))
+    tasks: list[dict | None] = []
+    with ThreadPoolExecutor(max_workers=batch) as executor:
+        for start in range(0, len(ordered), batch):
+            tasks += executor.map(lambda tid: _get_task(tid, login, password), ordered[start:start + batch])
+            if on_batch is not None:
+                on_batch(len(tasks), len(ordered))
+
+    results: dict[str, dict[str, float]] = {}
+    for task_id, task in zip(ordered, tasks):
+        kw_list = pending[task_id]
+        status_code = task.get("status_code") if task else None
+        if status_code == 20000:
+            parsed = _parse_task(task, kw_list)
+            results[task_id] = parsed if parsed is not None else {g: 0.0 for g in kw_list}
+        elif task_id in known_ready and status_code is not None and status_code not in _IN_PROGRESS:
+            log.error(
+                "DataForSEO task %s failed with status %s: %s",
+                task_id, status_code, task.get("status_message"),
+            )
+            results[task_id] = {g: 0.0 for g in kw_list}
+    log.info("Collected %d of %d pending DataForSEO tasks", len(results), len(pending))
+    return results
 
 
 def fetch_task_result(
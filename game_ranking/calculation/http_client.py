@@ -0,0 +1,232 @@
+"""
+Shared HTTP client for every outbound API call.
+
+Collection runs make hundreds of calls back-to-back to a handful of hosts
+(DataForSEO, Steam Store, Steam Web API, SteamSpy). A bare requests.get pays a
+fresh TCP + TLS handshake each time; HttpClient keeps one requests.Session per
+host, so calls reuse keep-alive connections from that host's pool.
+
+One retry policy for all call sites:
+  retried      connection errors, timeouts, 429 and 5xx
+  not retried  other 4xx, and DNS failures (the host is unreachable, so
+               retrying only delays the error)
+  backoff      backoff * 2**attempt + jitter, capped at MAX_BACKOFF;
+               Retry-After is honoured when the server sends it
+Once the retries are used up, the last response is returned, or the last
+exception is re-raised, so callers keep their raise_for_status() / except
+handling.
+
+Every call is counted per endpoint (calls, retries, errors, latency) and the
+counters are available from stats(). Project modules are re-imported on each
+Streamlit rerun, so the shared client (get_client()) lives for one rerun or
+one background run, which covers a whole collection.
+"""
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 5.0    # seconds
+READ_TIMEOUT    = 30.0   # seconds
+RETRIES         = 2      # extra attempts after the first
+BACKOFF         = 1.0    # seconds; doubled after each failed attempt
+MAX_BACKOFF     = 60.0
+POOL_SIZE       = 16     # keep-alive connections per host (≥ concurrent workers)
+RETRY_STATUSES  = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/s, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_dns_error(exc: Exception) -> bool:
+    """True for connection errors caused by the host name not resolving."""
+    s = str(exc)
+    return (
+        "getaddrinfo failed" in s or "Errno 11001" in s
+        or "Name or service not known" in s or "NameResolutionError" in s
+        or "nodename nor servname" in s
+    )
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    try:
+        return float(resp.headers.get("Retry-After"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class HttpClient:
+    """Per-host pooled sessions with one retry policy and per-endpoint counters."""
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        pool_size: int = POOL_SIZE,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._sessions: dict[str, requests.Session] = {}
+        self._stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # ── Sessions ──────────────────────────────────────────────────────────────
+
+    def session_for(self, url: str) -> requests.Session:
+        """The keep-alive session for url's scheme + host (created on first use)."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount(host, adapter)
+                self._sessions[host] = session
+            return session
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    # ── Counters ──────────────────────────────────────────────────────────────
+
+    def _record(self, endpoint: str, elapsed: float, retries: int, error: bool) -> None:
+        with self._lock:
+            s = self._stats.setdefault(
+                endpoint, {"calls": 0, "retries": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0},
+            )
+            s["calls"] += 1
+            s["retries"] += retries
+            s["errors"] += int(error)
+            s["total_s"] += elapsed
+            s["max_s"] = max(s["max_s"], elapsed)
+
+    def stats(self) -> pd.DataFrame:
+        """Per-endpoint calls, retries, errors and mean / max latency (ms)."""
+        with self._lock:
+            rows = [
+                {
+                    "endpoint": ep,
+                    "calls":    s["calls"],
+                    "retries":  s["retries"],
+                    "errors":   s["errors"],
+                    "mean_ms":  round(1000 * s["total_s"] / s["calls"], 1) if s["calls"] else 0.0,
+                    "max_ms":   round(1000 * s["max_s"], 1),
+                }
+                for ep, s in sorted(self._stats.items())
+            ]
+        return pd.DataFrame(rows, columns=["endpoint", "calls", "retries", "errors", "mean_ms", "max_ms"])
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    # ── Requests ──────────────────────────────────────────────────────────────
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        retries: int | None = None,
+        backoff: float | None = None,
+        limiter: TokenBucket | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send one request with the shared retry policy. endpoint names the
+        counter bucket (default: host + path — pass one for URLs carrying IDs).
+        limiter, when given, is acquired before every attempt, retries included.
+        """
+        parts = urlsplit(url)
+        endpoint = endpoint or f"{parts.netloc}{parts.path}"
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        backoff = self.backoff if backoff is None else backoff
+        session = self.session_for(url)
+
+        started = time.monotonic()
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            wait = None
+            try:
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt == retries or is_dns_error(exc):
+                    self._record(endpoint, time.monotonic() - started, attempt, error=True)
+                    raise
+                log.debug("%s %s attempt %d failed: %s", method, endpoint, attempt + 1, exc)
+            except Exception:
+                self._record(endpoint, time.monotonic() - started, attempt, error=True)
+                raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                    self._record(endpoint, time.monotonic() - started, attempt, error=resp.status_code >= 400)
+                    return resp
+                wait = _retry_after(resp)
+                log.debug("%s %s attempt %d: HTTP %d", method, endpoint, attempt + 1, resp.status_code)
+            if wait is None:
+                wait = backoff * 2 ** attempt + random.uniform(0, backoff / 2)
+            time.sleep(min(wait, MAX_BACKOFF))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """The process-wide shared HttpClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,137 @@
+"""
+Append-only time-series store for hourly Steam player counts.
+
+player_counts_history.csv used to be re-read and rewritten in full on every
+hourly fetch, and the "already fetched this hour?" check scanned the whole
+date column. At hourly cadence for a growing inventory that file reaches
+millions of rows within a year, so the history now lives in SQLite (stdlib):
+
+  player_counts  (steam_appid, hour) PRIMARY KEY → game_name, player_count
+                 clustered on the key, so per-game range reads are index scans
+  fetched_hours  one row per collected UTC hour → O(1) "fetched already?"
+
+Writes only ever insert the new hour's rows; nothing is rewritten. Hours use
+the same "%Y-%m-%d %H:00" text as the legacy CSV, which sorts chronologically.
+
+The legacy CSV (still tracked in git) is imported once, the first time the
+store is opened empty, and is never written again.
+"""
+
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from config import PLAYER_COUNTS_DB
+
+log = logging.getLogger(__name__)
+
+HISTORY_COLUMNS = ["date", "game_name", "steam_appid", "player_count"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_counts (
+    steam_appid  INTEGER NOT NULL,
+    hour         TEXT    NOT NULL,
+    game_name    TEXT,
+    player_count INTEGER,
+    PRIMARY KEY (steam_appid, hour)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS player_counts_hour ON player_counts (hour);
+CREATE TABLE IF NOT EXISTS fetched_hours (
+    hour       TEXT PRIMARY KEY,
+    fetched_at TEXT NOT NULL DEFAULT (datetime('now'))
+) WITHOUT ROWID;
+"""
+
+_SELECT = "SELECT hour AS date, game_name, steam_appid, player_count FROM player_counts"
+
+
+class PlayerCountStore:
+    """SQLite-backed player-count history keyed by (steam_appid, hour)."""
+
+    def __init__(self, path: Path = PLAYER_COUNTS_DB, legacy_csv: Path | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+            empty = conn.execute("SELECT 1 FROM fetched_hours LIMIT 1").fetchone() is None
+        if empty and legacy_csv is not None and Path(legacy_csv).exists():
+            self._import_csv(Path(legacy_csv))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _import_csv(self, csv_path: Path) -> None:
+        try:
+            legacy = pd.read_csv(csv_path, dtype={"steam_appid": "Int64"})
+        except Exception as exc:
+            log.warning("Could not import %s (%s) — starting empty", csv_path.name, exc)
+            return
+        legacy = legacy.dropna(subset=["steam_appid", "date"])
+        # Later rows win, as they did when the CSV was read back
+        legacy = legacy.drop_duplicates(subset=["steam_appid", "date"], keep="last")
+        for hour, rows in legacy.groupby("date", sort=True):
+            self.append(hour, rows)
+        log.info("Imported %d player-count rows from %s", len(legacy), csv_path.name)
+
+    # ── Writes ────────────────────────────────────────────────────────────────
+
+    def append(self, hour: str, rows: pd.DataFrame, replace: bool = False) -> int:
+        """
+        Record one hour's counts (columns game_name, steam_appid, player_count)
+        and mark the hour as fetched. Re-appending an hour overwrites the apps
+        it contains; replace=True drops everything recorded for the hour first.
+        Returns the number of rows written.
+        """
+        records = [
+            (int(appid), hour, name, None if pd.isna(count) else int(count))
+            for name, appid, count in zip(rows["game_name"], rows["steam_appid"], rows["player_count"])
+        ]
+        with closing(self._connect()) as conn, conn:
+            if replace:
+                conn.execute("DELETE FROM player_counts WHERE hour = ?", (hour,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO player_counts (steam_appid, hour, game_name, player_count) "
+                "VALUES (?, ?, ?, ?)",
+                records,
+            )
+            conn.execute("INSERT OR REPLACE INTO fetched_hours (hour) VALUES (?)", (hour,))
+        return len(records)
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def has_hour(self, hour: str) -> bool:
+        """True when a collection for hour has already been recorded."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM fetched_hours WHERE hour = ?", (hour,)).fetchone() is not None
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        df = df.reindex(columns=HISTORY_COLUMNS)
+        df["steam_appid"] = df["steam_appid"].astype("Int64")
+        return df
+
+    def read_range(self, steam_appid: int, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+        """One game's counts with start <= hour <= end (either bound optional), oldest first."""
+        sql, params = _SELECT + " WHERE steam_appid = ?", [int(steam_appid)]
+        if start is not None:
+            sql, params = sql + " AND hour >= ?", params + [start]
+        if end is not None:
+            sql, params = sql + " AND hour <= ?", params + [end]
+        return self._query(sql + " ORDER BY hour", tuple(params))
+
+    def latest(self) -> pd.DataFrame:
+        """The most recent recorded count for every game."""
+        return self._query(
+            _SELECT + " AS p WHERE hour = (SELECT MAX(hour) FROM player_counts WHERE steam_appid = p.steam_appid)"
+            " ORDER BY game_name"
+        )
+
+    def history(self) -> pd.DataFrame:
+        """Every recorded count (legacy CSV layout), oldest first."""
+        return self._query(_SELECT + " ORDER BY hour, steam_appid")
@@ -1,16 +1,66 @@
 import pandas as pd
+import numpy as np
 import math
 import requests
 from config import DEV_LIST, GENRE_LIST, INVENTORY_FILE
 
-# LOAD DEVELOPER AND GENRE LIST
-developer_list = pd.read_excel(DEV_LIST)
-genre_list = pd.read_excel(GENRE_LIST)
-inventory = pd.read_csv(INVENTORY_FILE, index_col=0)
+# ── Reference data (developer list, genre list, inventory) ───────────────────
+# Loaded lazily on first use and reloaded when the file's mtime changes, so
+# importing this module does no I/O and edited files are picked up without a
+# restart. The old module attributes (developer_list, genre_list, inventory,
+# developer_index) still resolve, via __getattr__ below.
+
+_reference_cache: dict[str, tuple[int, object]] = {}
+
+
+def _load_reference(name: str, path, loader):
+    """Return loader(path), re-running it only when path's mtime has changed."""
+    mtime = path.stat().st_mtime_ns
+    cached = _reference_cache.get(name)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, loader(path))
+        _reference_cache[name] = cached
+    return cached[1]
+
+
+def get_developer_list() -> pd.DataFrame:
+    return _load_reference('developer_list', DEV_LIST, pd.read_excel)
+
+
+def get_genre_list() -> pd.DataFrame:
+    return _load_reference('genre_list', GENRE_LIST, pd.read_excel)
+
+
+def get_inventory() -> pd.DataFrame:
+    return _load_reference('inventory', INVENTORY_FILE, lambda p: pd.read_csv(p, index_col=0))
+
+
+def get_developer_index() -> "DeveloperIndex":
+    """DeveloperIndex over the current developer list, rebuilt when the list reloads."""
+    dev_list = get_developer_list()
+    cached = _reference_cache.get('developer_index')
+    if cached is None or cached[1].source is not dev_list:
+        cached = (0, DeveloperIndex(dev_list))
+        _reference_cache['developer_index'] = cached
+    return cached[1]
+
+
+_LAZY_ATTRIBUTES = {
+    'developer_list':  get_developer_list,
+    'genre_list':      get_genre_list,
+    'inventory':       get_inventory,
+    'developer_index': get_developer_index,
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def load_data(steam_report=None, non_steam_report=None, steam_df=None, nonsteam_df=None,
-              developer_list=developer_list, genre_list=genre_list, inventory=inventory):
+              developer_list=None, genre_list=None, inventory=None):
     """
     Load data from files or use provided DataFrames.
 
@@ -19,7 +69,14 @@ def load_data(steam_report=None, non_steam_report=None, steam_df=None, nonsteam_
         non_steam_report: Path to Non-Steam CSV (used if nonsteam_df is None)
         steam_df: Pre-loaded Steam DataFrame (takes precedence)
         nonsteam_df: Pre-loaded Non-Steam DataFrame (takes precedence)
+        developer_list / genre_list / inventory: override the reference data
     """
+    if developer_list is None:
+        developer_list = get_developer_list()
+    if genre_list is None:
+        genre_list = get_genre_list()
+    if inventory is None:
+        inventory = get_inventory()
     if steam_df is None:
         steam_df = pd.read_csv(steam_report)
     if nonsteam_df is None:
@@ -27,14 +84,20 @@ def load_data(steam_report=None, non_steam_report=None, steam_df=None, nonsteam_
     return steam_df, nonsteam_df, developer_list, genre_list, inventory
 
 
+_COMPANY_SUFFIXES = {'inc': 'Inc.', 'ltd': 'Ltd.', 'llc': 'LLC.'}
+_COMPANY_SUFFIX_RE = r',\s*(inc|ltd|llc)\.?'
+
+
 def clean_dev_genre_list(df):
     df['Developers'] = df['Developers'].astype(str)
     df['Genres'] = df['Genres'].astype(str)
 
-    # Replace common suffixes to avoid splitting issues
-    df['Developers'] = df['Developers'].str.replace(r',\s*inc\.?', ' Inc.', case=False, regex=True)
-    df['Developers'] = df['Developers'].str.replace(r',\s*ltd\.?', ' Ltd.', case=False, regex=True)
-    df['Developers'] = df['Developers'].str.replace(r',\s*llc\.?', ' LLC.', case=False, regex=True)
+    # Replace common suffixes to avoid splitting issues (", Inc." → " Inc.", etc.)
+    df['Developers'] = df['Developers'].str.replace(
+        _COMPANY_SUFFIX_RE,
+        lambda m: ' ' + _COMPANY_SUFFIXES[m.group(1).lower()],
+        case=False, regex=True,
+    )
 
     # Split the string at the comma to create a list
     df['Developers'] = df['Developers'].str.split(',')
@@ -42,28 +105,27 @@ def clean_dev_genre_list(df):
     return df
 
 
+def _as_lists(col: pd.Series) -> pd.Series:
+    """Coerce cells to lists: lists pass through, NaN → [], anything else → [str(cell)]."""
+    return col.map(lambda v: v if isinstance(v, list) else [] if isinstance(v, float) else [str(v)])
+
+
 def flagging(df):
     extra_cols = [c for c in ["date_appended"] if c in df.columns]
     df_calculation = df[["Name", "ReleaseDate", "Developers", "Genres", "FollowerCount"] + extra_cols].copy()
 
-    for index, row in df_calculation.iterrows():
-        genres = row['Genres']
-        if not isinstance(genres, list):
-            genres = [str(genres)] if not (isinstance(genres, float)) else []
-        indie_flag = False
-        for genre in genres:
-            if str(genre).strip().lower() == 'indie':
-                indie_flag = True
-                break
-        df_calculation.loc[index, 'Is_Indie'] = indie_flag
-
-        developers = row['Developers']
-        if not isinstance(developers, list):
-            developers = [str(developers)] if not isinstance(developers, float) else []
-        df_calculation.loc[index, 'Has_Multiple_Developers'] = len(developers) > 1
+    genres = _as_lists(df_calculation['Genres'])
+    developers = _as_lists(df_calculation['Developers'])
 
-        df_calculation.loc[index, 'Has_Multiple_Genres'] = len(genres) > 1
+    # Explode on a positional index so duplicate row labels can't collide
+    exploded = pd.Series(genres.to_numpy(), index=np.arange(len(genres)), dtype=object).explode()
+    is_indie = exploded.astype(str).str.strip().str.lower().eq('indie') & exploded.notna()
+    is_indie = is_indie.groupby(level=0).any().reindex(np.arange(len(genres)), fill_value=False)
 
+    # object dtype holding Python bools, as the old per-row .loc writes produced
+    df_calculation['Is_Indie'] = is_indie.to_numpy(dtype=bool).astype(object)
+    df_calculation['Has_Multiple_Developers'] = (developers.str.len().to_numpy() > 1).astype(object)
+    df_calculation['Has_Multiple_Genres'] = (genres.str.len().to_numpy() > 1).astype(object)
     return df_calculation
 
 
@@ -84,18 +146,96 @@ def calculate_trends_weighted_points(trends_score: float) -> float:
     return (trends_score / 100) * (5 - 1) + 1
 
 
-def calculate_developer_weighted_points(developers, developer_list=developer_list):
+class DeveloperIndex:
+    """
+    Precompiled lookup over the developer list.
+
+    The 'Developer Name' column is normalised (strip + lower) once, into a
+    name → Total Hybrid Weighted Points hash map. When a name appears twice,
+    the first row wins, matching the old row-scan lookup. Build one per
+    loaded developer list and reuse it for every game.
+    """
+
+    def __init__(self, developer_list: pd.DataFrame):
+        self.source = developer_list
+        names = developer_list['Developer Name'].astype(str).str.strip().str.lower()
+        points = pd.Series(developer_list['Total Hybrid Weighted Points'].to_numpy(), index=names)
+        self.points = points[~points.index.duplicated(keep='first')]
+        self._map = self.points.to_dict()
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, developer):
+        return str(developer).strip().lower() in self._map
+
+    def get(self, developer, default=None):
+        """Points for one developer name, or default when not in the list."""
+        return self._map.get(str(developer).strip().lower(), default)
+
+    def lookup(self, developers: pd.Series) -> pd.Series:
+        """
+        Batch lookup for an exploded Developers column (one name per row).
+        Returns points aligned to the input index; NaN for unknown names and
+        for non-name cells (NaN left over from exploding empty lists).
+        """
+        # .str yields NaN for every non-string cell, so no per-cell type check
+        return developers.astype(object).str.strip().str.lower().map(self._map)
+
+    def score(self, developers: pd.Series) -> tuple[pd.Series, list[str]]:
+        """
+        Average developer points per game for a whole Developers column, plus
+        every developer not found in the list, in one pass.
+
+        Cells may be lists of names (after clean_dev_genre_list), bare strings
+        or NaN. Unknown developers score 1; games with no developers score 1.
+        Returns (points aligned to developers.index, sorted unique missing names).
+        """
+        positional = pd.Series(developers.to_numpy(), index=np.arange(len(developers)), dtype=object)
+        exploded = positional.explode()   # lists → one row per name; scalars pass through
+        game = exploded.index.to_numpy()
+        cells = pd.Series(exploded.to_numpy(), dtype=object)
+        names = cells.str.strip()
+        # Non-string scalars other than floats (e.g. int ids) count as names, stringified
+        stray = cells[cells.notna() & names.isna()]
+        if not stray.empty:
+            stray = stray[~stray.map(pd.api.types.is_float)]
+            names[stray.index] = stray.astype(str).str.strip()
+        is_name = names.notna()
+        keys = names.str.lower()
+
+        missing_mask = is_name & ~keys.isin(self.points.index)
+        missing = sorted(set(names[missing_mask]))
+
+        found = keys.map(self._map).where(~missing_mask, 1)
+        averaged = pd.Series(found.to_numpy(dtype=float), index=game).groupby(level=0).mean()
+        points = averaged.reindex(positional.index).fillna(1)
+        return pd.Series(points.to_numpy(), index=developers.index), missing
+
+
+def calculate_developer_weighted_points(developers, developer_list=None):
+    """
+    Average developer points for one game, plus the developers not found.
+
+    developer_list may be the raw DataFrame, a prebuilt DeveloperIndex, or
+    None for the current reference list; prefer the index (or
+    DeveloperIndex.score) when scoring many games.
+    """
+    if developer_list is None:
+        index = get_developer_index()
+    elif isinstance(developer_list, pd.DataFrame):
+        index = DeveloperIndex(developer_list)
+    else:
+        index = developer_list
+
     if not isinstance(developers, list):
         developers = [str(developers)] if not isinstance(developers, float) else []
     missing_devs = []
     dev_points = []
     for developer in developers:
-        weighted_point = developer_list.loc[
-            developer_list['Developer Name'].str.strip().str.lower() == developer.strip().lower(),
-            'Total Hybrid Weighted Points'
-        ]
-        if not weighted_point.empty:
-            dev_points.append(weighted_point.iloc[0].item())
+        weighted_point = index.get(developer)
+        if weighted_point is not None:
+            dev_points.append(weighted_point)
         else:
             dev_points.append(1)
             missing_devs.append(developer.strip())
@@ -103,7 +243,6 @@ def calculate_developer_weighted_points(developers, developer_list=developer_lis
     return avg_weighted_point, missing_devs
 
 
-
 def populate_appids():
     """
     Cross-reference inventory game names against raw_steam.csv to populate
@@ -111,6 +250,7 @@ def populate_appids():
     is missing. Saves the updated inventory back to CSV.
     """
     from config import get_latest_steam_csv
+    from pipelines.snapshot_store import read_snapshot
 
     inv = pd.read_csv(INVENTORY_FILE, index_col=0)
 
@@ -124,7 +264,7 @@ def populate_appids():
     if to_match.empty:
         return
 
-    raw_steam = pd.read_csv(get_latest_steam_csv())
+    raw_steam = read_snapshot(get_latest_steam_csv(), columns=['Name', 'AppId'])
     name_to_appid = {
         str(row['Name']).strip().lower(): row['AppId']
         for _, row in raw_steam.iterrows()
@@ -0,0 +1,89 @@
+"""
+Cross-rerun memo of scored ranking frames.
+
+Streamlit reruns the whole script on every widget change, so without a memo the
+Steam and Non-Steam tabs re-score every game even when only a filter moved.
+RankingCache is a small bounded LRU keyed by everything a ranking depends on:
+
+  (tab, source snapshot fingerprint, dev-list fingerprint, trends fingerprint,
+   weights…, max_followers cap / today)
+
+Project modules are re-imported on every rerun (see streamlit_app.py), so the
+cache object itself must live in st.session_state — not in a module global.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+import pandas as pd
+
+MAX_ENTRIES = 8   # a handful of weight combinations per tab is plenty
+
+
+def frame_fingerprint(df: pd.DataFrame | None) -> str:
+    """
+    Content hash of a DataFrame (values, index and column names).
+
+    Object columns are hashed via repr() so list cells (Developers / Genres
+    after clean_dev_genre_list) hash deterministically.
+    """
+    if df is None:
+        return "none"
+    h = hashlib.sha1()
+    h.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+    hashable = df.copy()
+    for col in hashable.columns:
+        if hashable[col].dtype == object:
+            hashable[col] = hashable[col].map(repr)
+    h.update(pd.util.hash_pandas_object(hashable, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def dict_fingerprint(d: dict | None) -> str:
+    """Content hash of a flat {key: value} mapping such as the trends scores."""
+    payload = json.dumps(sorted((str(k), v) for k, v in (d or {}).items()), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RankingCache:
+    """Bounded LRU of computed rankings. Values are returned as stored — copy before mutating."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached value for key (marking it most-recently used), or None."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value) -> None:
+        """Store value under key, evicting the least-recently used entries past max_entries."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,200 @@
+"""
+Persisted per-row derived values for the raw snapshots.
+
+Raw snapshots only ever grow by a few appended rows a day, yet every load used
+to re-clean, re-flag and re-score the whole history. RowStore remembers what
+was derived from each row, keyed by a digest of that row's identity (AppId /
+normalised Game Title) plus the input cells the values depend on. Loading a
+snapshot then computes only rows whose digest is new and reuses the rest.
+
+A store-level `context` string (e.g. the dev-list fingerprint) scopes every
+entry: a changed context simply misses, and entries from the old one age out.
+
+Store schema (SQLite, stdlib):
+
+  rows  (scope, digest) PRIMARY KEY → payload (JSON list of values), created
+
+scope fingerprints the context plus the derived column list. Writes are
+insert-only — a load adds just its new digests in one transaction and never
+rewrites existing rows or drops rows missing from its own frame, so sessions
+loading different snapshots share one store. Entries older than MAX_AGE_DAYS are pruned when new
+rows are written; a pruned row that is still in use is simply derived again.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from calculation import process_data
+from calculation.ranking_cache import frame_fingerprint
+from config import ROW_STORE_STEAM_FILE
+
+log = logging.getLogger(__name__)
+
+MAX_AGE_DAYS = 30
+
+STEAM_INPUT_COLUMNS = ["Developers", "Genres"]
+STEAM_DERIVED_COLUMNS = [
+    "Developers", "Genres",
+    "Is_Indie", "Has_Multiple_Developers", "Has_Multiple_Genres",
+    "Developer Points",
+]
+_FLAG_COLUMNS = ["Is_Indie", "Has_Multiple_Developers", "Has_Multiple_Genres"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    scope   TEXT NOT NULL,
+    digest  TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created TEXT NOT NULL,
+    PRIMARY KEY (scope, digest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rows_created ON rows (created);
+"""
+
+_CHUNK = 500   # digests per IN (...) query, well under SQLite's variable limit
+
+
+def row_digests(keys: pd.Series, inputs: pd.DataFrame) -> pd.Series:
+    """
+    One hex digest per row from its key plus the given input cells (as strings).
+    Vectorized via pandas' row hashing; aligned to inputs.index.
+    """
+    frame = inputs.astype(str)
+    frame.insert(0, "__key__", keys.astype(str).to_numpy())
+    hashed = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return pd.Series([format(h, "016x") for h in hashed], index=inputs.index)
+
+
+class RowStore:
+    """SQLite-backed {row digest → derived values} map, scoped by context."""
+
+    def __init__(self, path: Path, columns: list[str], context: str = "", max_age_days: int = MAX_AGE_DAYS):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.context = context
+        self.max_age_days = max_age_days
+        self.scope = hashlib.sha1(json.dumps([context, self.columns]).encode("utf-8")).hexdigest()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def lookup(self, digests: list[str]) -> dict[str, list]:
+        """{digest: values} for the given digests already in the store."""
+        found: dict[str, list] = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(digests), _CHUNK):
+                chunk = digests[i:i + _CHUNK]
+                found.update(
+                    (d, json.loads(payload)) for d, payload in conn.execute(
+                        f"SELECT digest, payload FROM rows WHERE scope = ? AND digest IN ({','.join('?' * len(chunk))})",
+                        [self.scope, *chunk],
+                    )
+                )
+        return found
+
+    def insert(self, rows: dict[str, list]) -> None:
+        """Add new {digest: values} entries and prune entries past max_age_days."""
+        now = datetime.now()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO rows (scope, digest, payload, created) VALUES (?, ?, ?, ?)",
+                [(self.scope, d, json.dumps(v, ensure_ascii=False), now.isoformat()) for d, v in rows.items()],
+            )
+            pruned = conn.execute(
+                "DELETE FROM rows WHERE created < ?", ((now - timedelta(days=self.max_age_days)).isoformat(),),
+            ).rowcount
+        if pruned:
+            log.info("Row store %s: pruned %d row(s) older than %d days", self.path.name, pruned, self.max_age_days)
+
+    def apply(
+        self,
+        df: pd.DataFrame,
+        digests: pd.Series,
+        compute: Callable[[pd.DataFrame], pd.DataFrame],
+    ) -> tuple[pd.DataFrame, int]:
+        """
+        Return the derived columns for every row of df (aligned to df.index),
+        calling compute() only on rows whose digest is not in the store.
+
+        compute receives the subset of df to derive and must return a frame
+        with self.columns in the same row order. Only the new rows are
+        written. Returns (derived, rows computed).
+        """
+        digest_list = digests.tolist()
+        try:
+            known = self.lookup(list(dict.fromkeys(digest_list)))
+        except sqlite3.Error as exc:
+            log.warning("Row store %s unreadable (%s) — deriving every row", self.path.name, exc)
+            known = {}
+        is_new = ~digests.isin(known.keys()).to_numpy()
+        n_new = int(is_new.sum())
+
+        if n_new:
+            fresh = compute(df[is_new])[self.columns]
+            records = fresh.astype(object).where(fresh.notna(), None).to_numpy().tolist()
+            added = dict(zip(digests[is_new], records))
+            known.update(added)
+            try:
+                self.insert(added)
+            except sqlite3.Error as exc:
+                log.warning("Could not write row store %s: %s", self.path.name, exc)
+
+        derived = pd.DataFrame([known[d] for d in digest_list], columns=self.columns, index=df.index)
+        return derived.where(derived.notna(), np.nan), n_new  # JSON null → NaN
+
+
+# ── Steam ─────────────────────────────────────────────────────────────────────
+
+def prepare_steam(
+    raw: pd.DataFrame,
+    developer_list: "pd.DataFrame | process_data.DeveloperIndex | None" = None,
+    store_path: Path = ROW_STORE_STEAM_FILE,
+) -> pd.DataFrame:
+    """
+    Incremental clean_dev_genre_list + flagging + Developer Points for a raw
+    Steam snapshot. Output matches flagging(clean_dev_genre_list(raw)) with a
+    'Developer Points' column added; only rows new or changed since the last
+    load (by AppId + Developers + Genres) are actually derived.
+    """
+    if developer_list is None:
+        index = process_data.get_developer_index()
+    elif isinstance(developer_list, pd.DataFrame):
+        index = process_data.DeveloperIndex(developer_list)
+    else:
+        index = developer_list
+
+    key_col = "AppId" if "AppId" in raw.columns else "Name"
+    digests = row_digests(raw[key_col], raw[STEAM_INPUT_COLUMNS])
+    store = RowStore(store_path, STEAM_DERIVED_COLUMNS, context=frame_fingerprint(index.source))
+
+    def _compute(rows: pd.DataFrame) -> pd.DataFrame:
+        flagged = process_data.flagging(process_data.clean_dev_genre_list(rows.copy()))
+        flagged["Developer Points"], _ = index.score(flagged["Developers"])
+        return flagged
+
+    derived, n_new = store.apply(raw, digests, _compute)
+    log.info("Steam row store: %d of %d rows derived, %d reused", n_new, len(raw), len(raw) - n_new)
+
+    extra_cols = [c for c in ["date_appended"] if c in raw.columns]
+    out = raw[["Name", "ReleaseDate", "FollowerCount"] + extra_cols].copy()
+    out.insert(2, "Developers", derived["Developers"].to_numpy())
+    out.insert(3, "Genres", derived["Genres"].to_numpy())
+    for col in _FLAG_COLUMNS:
+        # object dtype holding Python bools, as flagging() produces
+        out[col] = derived[col].to_numpy(dtype=bool).astype(object)
+    out["Developer Points"] = derived["Developer Points"].to_numpy(dtype=float)
+    return out
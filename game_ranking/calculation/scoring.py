@@ -0,0 +1,160 @@
+"""
+Vectorized scoring engine shared by the Steam and Non-Steam tabs.
+
+Every function here works on whole columns with NumPy / pandas operations —
+no iterrows(), no per-row .loc writes, no apply(lambda …). The formulas are
+the same as the scalar helpers in process_data.py:
+
+  Follower Points / YouTube score  hybrid linear/log normalisation → 1–5
+  Developer Points                 mean dev-list points per game (unknown = 1)
+  trends_points                    0–100 Google Trends score → 1–5 (linear)
+  Final Priority Score             weighted sum of the above
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from calculation import process_data
+
+STEAM_FOLLOWER_MIN = 1000   # follower floor used for the Steam hybrid score
+
+
+# ── Column-level primitives ───────────────────────────────────────────────────
+
+def hybrid_scores(values, min_value: float, max_value: float) -> np.ndarray:
+    """
+    Vectorized calculate_hybrid_score: 0.5 * linear_norm + 0.5 * log_norm on a
+    1–5 scale. Accepts any array-like; returns a float ndarray.
+    """
+    v = np.asarray(values, dtype=float)
+    linear_norm = ((v - min_value) / (max_value - min_value)) * (5 - 1) + 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_norm = ((np.log(v) - np.log(min_value)) /
+                    (np.log(max_value) - np.log(min_value))) * (5 - 1) + 1
+    return 0.5 * linear_norm + 0.5 * log_norm
+
+
+def trends_points(trends_scores) -> np.ndarray:
+    """Vectorized calculate_trends_weighted_points: 0–100 → 1–5 (linear)."""
+    return (np.asarray(trends_scores, dtype=float) / 100) * (5 - 1) + 1
+
+
+def map_trends_scores(names: pd.Series, trends: dict) -> pd.Series:
+    """Look up raw Google Trends scores by game name; missing games score 0."""
+    return names.map(trends or {}).fillna(0).astype(int)
+
+
+def developer_points(
+    developers: pd.Series,
+    developer_list: "pd.DataFrame | process_data.DeveloperIndex | None" = None,
+) -> pd.Series:
+    """
+    Vectorized calculate_developer_weighted_points for a whole Developers column.
+
+    developer_list may be a prebuilt DeveloperIndex (cheapest), the raw dev
+    list DataFrame, or None for the current reference list. Unknown developers
+    (and games with no developers) score 1.
+    """
+    if developer_list is None:
+        index = process_data.get_developer_index()
+    elif isinstance(developer_list, pd.DataFrame):
+        index = process_data.DeveloperIndex(developer_list)
+    else:
+        index = developer_list  # DeveloperIndex (possibly from an earlier rerun's module)
+    points, _ = index.score(developers)
+    return points
+
+
+# ── Steam ─────────────────────────────────────────────────────────────────────
+
+def score_steam(
+    df: pd.DataFrame,
+    trends: dict,
+    max_followers: float,
+    w_followers: float,
+    w_developers: float,
+    w_trends: float,
+    developer_list: "pd.DataFrame | process_data.DeveloperIndex | None" = None,
+) -> pd.DataFrame:
+    """
+    Add Follower Points, Developer Points, trends_score, trends_points, the three
+    weighted components and Final Priority Score to a copy of the flagged Steam
+    frame. Output columns and rounding match the original per-row loop. An
+    existing 'Developer Points' column (from row_store.prepare_steam) is reused.
+    """
+    out = df.copy()
+    out["Follower Points"]  = np.round(hybrid_scores(out["FollowerCount"], STEAM_FOLLOWER_MIN, max_followers), 2)
+    if "Developer Points" not in out.columns:  # row_store.prepare_steam precomputes it
+        out["Developer Points"] = developer_points(out["Developers"], developer_list)
+    out["Developer Points"] = out["Developer Points"].round(2)
+    out["trends_score"]     = map_trends_scores(out["Name"], trends)
+    out["trends_points"]    = np.round(trends_points(out["trends_score"]), 2)
+    out["Weighted Follower Score"] = out["Follower Points"] * w_followers
+    out["Weighted Dev Score"]      = out["Developer Points"] * w_developers
+    out["Weighted Trends Score"]   = out["trends_points"] * w_trends
+    out["Final Priority Score"]    = (
+        out["Weighted Follower Score"] +
+        out["Weighted Dev Score"] +
+        out["Weighted Trends Score"]
+    ).round(2)
+    return out
+
+
+# ── Non-Steam ─────────────────────────────────────────────────────────────────
+
+def coerce_views(series: pd.Series) -> pd.Series:
+    """YouTube view counts as floats: "1,234,567" → 1234567.0, unparseable → 0."""
+    return pd.to_numeric(series.astype(str).str.replace(",", "", regex=False), errors="coerce").fillna(0)
+
+
+def score_nonsteam(
+    df: pd.DataFrame,
+    trends: dict,
+    w_youtube: float,
+    w_trends: float,
+    today: dt.date | None = None,
+) -> pd.DataFrame:
+    """
+    Score a filtered Non-Steam frame whose 'YouTube ReleaseDate' and
+    'Release Date' columns are already parsed to datetimes.
+
+    Adds YouTube Views (numeric), Days_Since_Release, adj_views, youtube_score,
+    trends_score, trends_points and priority_score to a copy of df.
+    """
+    out = df.copy()
+    today = today or dt.date.today()
+
+    # Already numeric when the frame comes from ranking_pipeline.prepare_nonsteam
+    if pd.api.types.is_numeric_dtype(out["YouTube Views"]):
+        out["YouTube Views"] = out["YouTube Views"].fillna(0)
+    else:
+        out["YouTube Views"] = coerce_views(out["YouTube Views"])
+
+    effective_date = out["YouTube ReleaseDate"].fillna(out["Release Date"])
+    out["Days_Since_Release"] = (
+        (pd.to_datetime(today) - effective_date).dt.days
+    ).clip(lower=0)  # future release dates → 0 days decay
+
+    # Time-adjusted views, clamped ≥ 1 to avoid log(0)
+    out["adj_views"] = (
+        out["YouTube Views"] / (1 + out["Days_Since_Release"] / 365)
+    ).clip(lower=1).round(2)
+
+    # Normalise adj_views → 1–5 (hybrid linear/log across dataset)
+    min_adj = float(max(out["adj_views"].min(), 1))
+    max_adj = float(max(out["adj_views"].max(), min_adj + 1))
+    out["youtube_score"] = np.round(
+        hybrid_scores(np.maximum(out["adj_views"].to_numpy(dtype=float), 1), min_adj, max_adj), 2
+    )
+
+    out["trends_score"]  = map_trends_scores(out["Game Title"], trends)
+    out["trends_points"] = np.round(trends_points(out["trends_score"]), 2)
+
+    # Weighted priority score (max = 35, same as Steam)
+    out["priority_score"] = (
+        out["youtube_score"] * w_youtube +
+        out["trends_points"] * w_trends
+    ).round(2)
+    return out
@@ -8,27 +8,34 @@ Two data-fetch modes:
    App IDs are resolved via Steam Store search and cached locally.
    Cache: game_ranking/cache/steam_appid_cache.json
 
-2. Daily concurrent player snapshots (fetch_player_counts_if_needed)
-   Calls the Steam ISteamUserStats API once per day for Steam games
-   in the inventory and appends results to a history CSV.
-   History: game_ranking/cache/player_counts_history.csv
+2. Hourly concurrent player snapshots (fetch_player_counts_if_needed)
+   Calls the Steam ISteamUserStats API once per UTC hour for Steam games
+   in the inventory (concurrently, see player_collector.py) and appends
+   results to the player-count store (see player_count_store.py).
+   History: game_ranking/cache/player_counts.sqlite
+   (seeded once from the legacy game_ranking/cache/player_counts_history.csv)
 """
 
 import time
 import json
 import difflib
-import requests
+import logging
 import pandas as pd
 from datetime import datetime, timedelta
-from config import CACHE_DIR
+from config import CACHE_DIR, STEAM_STORE_BASE_URL, STEAMSPY_BASE_URL
+from calculation.http_client import get_client
+from calculation.player_collector import collect_player_counts
+from calculation.player_count_store import HISTORY_COLUMNS, PlayerCountStore
+
+log = logging.getLogger(__name__)
 
 CACHE_FILE    = CACHE_DIR / "steam_appid_cache.json"
-HISTORY_FILE  = CACHE_DIR / "player_counts_history.csv"
+HISTORY_FILE  = CACHE_DIR / "player_counts_history.csv"   # legacy, import-only
 CCU_TTL_HOURS = 24
 MIN_STEAMSPY_INTERVAL  = 0.25   # seconds between SteamSpy requests (≤4 req/s)
 MIN_STORE_INTERVAL     = 0.5    # seconds between Steam Store search requests
-CONCURRENT_PLAYERS_URL = "https://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/"
-HISTORY_COLUMNS        = ["date", "game_name", "steam_appid", "player_count"]
+STORE_SEARCH_URL = f"{STEAM_STORE_BASE_URL}/api/storesearch/"
+STEAMSPY_URL     = f"{STEAMSPY_BASE_URL}/api.php"
 
 _last_request_time: float = 0.0
 
@@ -82,8 +89,8 @@ def search_steam_appid(game_name: str, cache: dict) -> int | None:
 
     _throttle(MIN_STORE_INTERVAL)
     try:
-        resp = requests.get(
-            "https://store.steampowered.com/api/storesearch/",
+        resp = get_client().get(
+            STORE_SEARCH_URL,
             params={"term": game_name, "cc": "us", "l": "en"},
             timeout=10,
         )
@@ -114,31 +121,29 @@ def get_steamspy_peak_ccu(appid: int, max_retries: int = 3) -> dict | None:
     Returns a dict with keys: peak_ccu, avg_2weeks_hrs, owners_range,
     initialprice_cents — or None on failure.
     """
-    url = "https://steamspy.com/api.php"
-    for attempt in range(max_retries):
-        _throttle(MIN_STEAMSPY_INTERVAL)
-        try:
-            resp = requests.get(
-                url,
-                params={"request": "appdetails", "appid": appid},
-                timeout=15,
-            )
-            if resp.status_code == 429 or resp.status_code >= 500:
-                time.sleep(2 ** (attempt + 1))
-                continue
-            resp.raise_for_status()
-            data = resp.json()
-            avg_2wk_mins = data.get("average_2weeks") or 0
-            return {
-                "peak_ccu":          data.get("ccu"),
-                "avg_2weeks_hrs":    round(avg_2wk_mins / 60, 1) if avg_2wk_mins else None,
-                "owners_range":      data.get("owners", ""),
-                "initialprice_cents": int(data.get("initialprice") or 0),
-            }
-        except Exception:
-            if attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
-    return None
+    _throttle(MIN_STEAMSPY_INTERVAL)
+    try:
+        # 429 / 5xx / connection errors are retried by the shared client;
+        # the 2 s+ backoff keeps retries well under SteamSpy's rate limit
+        resp = get_client().get(
+            STEAMSPY_URL,
+            params={"request": "appdetails", "appid": appid},
+            endpoint="steamspy.appdetails",
+            timeout=15,
+            retries=max_retries - 1,
+            backoff=2.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception:
+        return None
+    avg_2wk_mins = data.get("average_2weeks") or 0
+    return {
+        "peak_ccu":          data.get("ccu"),
+        "avg_2weeks_hrs":    round(avg_2wk_mins / 60, 1) if avg_2wk_mins else None,
+        "owners_range":      data.get("owners", ""),
+        "initialprice_cents": int(data.get("initialprice") or 0),
+    }
 
 
 def fetch_player_data(game_names: list, progress_callback=None) -> pd.DataFrame:
@@ -229,65 +234,59 @@ def fetch_player_data(game_names: list, progress_callback=None) -> pd.DataFrame:
     ])
 
 
-def fetch_player_counts_if_needed(inventory_df: pd.DataFrame, force: bool = False) -> pd.DataFrame:
+def fetch_player_counts_if_needed(
+    inventory_df: pd.DataFrame,
+    force: bool = False,
+    store: PlayerCountStore | None = None,
+) -> pd.DataFrame:
     """
-    Fetch current concurrent player counts for Steam games and append to
-    player_counts_history.csv. Runs at most once per UTC hour.
+    Fetch current concurrent player counts for Steam games and append them to
+    the player-count store. Runs at most once per UTC hour.
 
-    Returns the full history DataFrame (all dates).
+    Returns the latest recorded count per game (columns: date, game_name,
+    steam_appid, player_count). Use PlayerCountStore.read_range() for a
+    game's full series.
     """
     current_hour = datetime.utcnow().strftime("%Y-%m-%d %H:00")
+    store = store or PlayerCountStore(legacy_csv=HISTORY_FILE)
 
-    if HISTORY_FILE.exists():
-        history = pd.read_csv(HISTORY_FILE, dtype={"steam_appid": "Int64"})
-    else:
-        history = pd.DataFrame(columns=HISTORY_COLUMNS)
-
-    if not force and not history.empty and (history["date"] == current_hour).any():
-        return history
-
-    if force and not history.empty:
-        history = history[history["date"] != current_hour]
+    if not force and store.has_hour(current_hour):
+        return store.latest()
 
     required_cols = {"steam_appid", "Game Name"}
     if not required_cols.issubset(inventory_df.columns):
-        return history
+        return store.latest()
 
     try:
         has_id = inventory_df["steam_appid"].notna()
         games_to_fetch = inventory_df[has_id][["Game Name", "steam_appid"]].drop_duplicates()
     except Exception:
-        return history
+        return store.latest()
+
+    games_to_fetch = games_to_fetch.assign(steam_appid=games_to_fetch["steam_appid"].astype(int))
+    counts, failures = collect_player_counts(games_to_fetch["steam_appid"].tolist())
+    if failures:
+        log.warning(
+            "Player counts: %d of %d apps failed (%s)", len(failures), len(games_to_fetch),
+            ", ".join(f"{appid}: {reason}" for appid, reason in list(failures.items())[:5]),
+        )
 
-    new_rows = []
-    for _, row in games_to_fetch.iterrows():
-        appid = int(row["steam_appid"])
-        try:
-            _throttle(MIN_STORE_INTERVAL)
-            resp = requests.get(
-                CONCURRENT_PLAYERS_URL,
-                params={"appid": appid},
-                timeout=10,
-            )
-            resp.raise_for_status()
-            response_data = resp.json().get("response", {})
-            if response_data.get("result") == 1:
-                new_rows.append({
-                    "date":         current_hour,
-                    "game_name":    row["Game Name"],
-                    "steam_appid":  appid,
-                    "player_count": response_data["player_count"],
-                })
-        except Exception:
-            continue
+    # Partial results are kept — failed apps are simply missing for this hour
+    new_rows = [
+        {
+            "date":         current_hour,
+            "game_name":    name,
+            "steam_appid":  appid,
+            "player_count": counts[appid],
+        }
+        for name, appid in zip(games_to_fetch["Game Name"], games_to_fetch["steam_appid"])
+        if appid in counts
+    ]
 
     if new_rows:
-        new_df  = pd.DataFrame(new_rows)
-        history = pd.concat([history, new_df], ignore_index=True)
-        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        history.to_csv(HISTORY_FILE, index=False)
+        store.append(current_hour, pd.DataFrame(new_rows, columns=HISTORY_COLUMNS), replace=force)
 
-    return history
+    return store.latest()
 
 
 def resolve_inventory_appids(inventory_df: pd.DataFrame) -> tuple:
@@ -0,0 +1,277 @@
+"""
+Transactional store for every Google Trends score the app keeps.
+
+Trends data used to live in three files, each re-read and rewritten in full
+on every refresh batch:
+  nonsteam_trends_cache.csv     latest score per game
+  inventory_trends_history.csv  score history (read-concat-write)
+  trends_results_cache.json     raw group comparisons (tournament cache)
+
+They now share one SQLite database (stdlib):
+
+  trends_latest   game_name PRIMARY KEY → trends_score, fetched_at, anchor
+  trends_history  (game_name, fetched_at) PRIMARY KEY → trends_score, anchor
+  comparisons     cache_key PRIMARY KEY → keywords, scores (JSON), fetched_date
+
+Writes are indexed upserts of just the rows that changed, in one transaction;
+lookups by game are primary-key point reads. fetched_at keeps the legacy
+"%Y-%m-%d %H:%M:%S" text, which sorts chronologically.
+
+The legacy files are imported once, the first time the store is opened
+empty, and are never written again.
+"""
+
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from config import (
+    TRENDS_SCORES_DB,
+    TRENDS_CACHE_FILE,
+    INVENTORY_TRENDS_HISTORY_FILE,
+    TRENDS_RESULTS_CACHE_FILE,
+)
+
+log = logging.getLogger(__name__)
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+LATEST_COLUMNS  = ["game_name", "trends_score", "fetched_at", "anchor"]
+HISTORY_COLUMNS = ["game_name", "trends_score", "fetched_at"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trends_latest (
+    game_name    TEXT PRIMARY KEY,
+    trends_score NUMERIC NOT NULL,
+    fetched_at   TEXT    NOT NULL,
+    anchor       TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trends_history (
+    game_name    TEXT    NOT NULL,
+    fetched_at   TEXT    NOT NULL,
+    trends_score NUMERIC NOT NULL,
+    anchor       TEXT,
+    PRIMARY KEY (game_name, fetched_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trends_history_fetched ON trends_history (fetched_at);
+CREATE TABLE IF NOT EXISTS comparisons (
+    cache_key    TEXT PRIMARY KEY,
+    keywords     TEXT NOT NULL,
+    scores       TEXT NOT NULL,
+    fetched_date TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS comparisons_fetched ON comparisons (fetched_date);
+"""
+
+_CHUNK = 500   # names per IN (...) query, well under SQLite's variable limit
+
+
+class TrendsScoreStore:
+    """SQLite-backed latest scores, score history and raw group comparisons."""
+
+    def __init__(
+        self,
+        path: Path = TRENDS_SCORES_DB,
+        legacy_latest_csv: Path | None = None,
+        legacy_history_csv: Path | None = None,
+        legacy_comparisons_json: Path | None = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+            empty = not any(
+                conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()
+                for table in ("trends_latest", "trends_history", "comparisons")
+            )
+        if empty:
+            self._import_legacy(legacy_latest_csv, legacy_history_csv, legacy_comparisons_json)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _import_legacy(
+        self,
+        latest_csv: Path | None,
+        history_csv: Path | None,
+        comparisons_json: Path | None,
+    ) -> None:
+        def _read_csv(path: Path | None) -> pd.DataFrame | None:
+            if path is None or not Path(path).exists():
+                return None
+            try:
+                df = pd.read_csv(path)
+            except Exception as exc:
+                log.warning("Could not import %s (%s) — skipping", Path(path).name, exc)
+                return None
+            return df.dropna(subset=["game_name", "trends_score", "fetched_at"])
+
+        history = _read_csv(history_csv)
+        if history is not None:
+            for fetched_at, rows in history.groupby("fetched_at", sort=True):
+                self._write_scores(dict(zip(rows["game_name"], rows["trends_score"])), fetched_at, None, latest=False)
+            log.info("Imported %d trends history rows from %s", len(history), Path(history_csv).name)
+
+        latest = _read_csv(latest_csv)
+        if latest is not None:
+            anchors = latest["anchor"] if "anchor" in latest.columns else [None] * len(latest)
+            for (fetched_at, anchor), rows in pd.DataFrame({
+                "game_name": latest["game_name"], "trends_score": latest["trends_score"],
+                "fetched_at": latest["fetched_at"], "anchor": list(anchors),
+            }).groupby(["fetched_at", "anchor"], sort=True, dropna=False):
+                self._write_scores(
+                    dict(zip(rows["game_name"], rows["trends_score"])), fetched_at,
+                    None if pd.isna(anchor) else anchor,
+                )
+            log.info("Imported %d latest trends scores from %s", len(latest), Path(latest_csv).name)
+
+        if comparisons_json is not None and Path(comparisons_json).exists():
+            try:
+                entries = json.loads(Path(comparisons_json).read_text(encoding="utf-8"))
+            except Exception as exc:
+                log.warning("Could not import %s (%s) — skipping", Path(comparisons_json).name, exc)
+            else:
+                self.upsert_comparisons(entries)
+                log.info("Imported %d trends comparisons from %s", len(entries), Path(comparisons_json).name)
+
+    # ── Scores ────────────────────────────────────────────────────────────────
+
+    def _write_scores(
+        self, scores: dict[str, float], fetched_at: str, anchor: str | None, latest: bool = True,
+    ) -> int:
+        rows = [
+            (str(game), score.item() if hasattr(score, "item") else score, fetched_at, anchor)
+            for game, score in scores.items()
+        ]
+        with closing(self._connect()) as conn, conn:
+            if latest:
+                # Never let an older write replace a newer latest score
+                conn.executemany(
+                    "INSERT INTO trends_latest (game_name, trends_score, fetched_at, anchor) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (game_name) DO UPDATE SET trends_score = excluded.trends_score, "
+                    "fetched_at = excluded.fetched_at, anchor = COALESCE(excluded.anchor, anchor) "
+                    "WHERE excluded.fetched_at >= trends_latest.fetched_at",
+                    rows,
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO trends_history (game_name, trends_score, fetched_at, anchor) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def upsert_scores(
+        self, scores: dict[str, float], fetched_at: str | None = None, anchor: str | None = None,
+    ) -> int:
+        """
+        Record {game: score} as each game's latest score and append it to the
+        history, in one transaction. Games not in scores are untouched.
+        Returns the number of games written.
+        """
+        if not scores:
+            return 0
+        return self._write_scores(scores, fetched_at or datetime.now().strftime(TS_FMT), anchor)
+
+    def _latest_rows(self, columns: str, games: Iterable[str] | None) -> list[tuple]:
+        with closing(self._connect()) as conn:
+            if games is None:
+                return conn.execute(f"SELECT {columns} FROM trends_latest ORDER BY fetched_at, game_name").fetchall()
+            names = list(dict.fromkeys(str(g) for g in games))
+            rows: list[tuple] = []
+            for i in range(0, len(names), _CHUNK):
+                chunk = names[i:i + _CHUNK]
+                rows += conn.execute(
+                    f"SELECT {columns} FROM trends_latest WHERE game_name IN ({','.join('?' * len(chunk))})", chunk,
+                ).fetchall()
+            return rows
+
+    def scores(self, games: Iterable[str] | None = None) -> dict[str, float]:
+        """{game: latest score} for games (default: every game)."""
+        return dict(self._latest_rows("game_name, trends_score", games))
+
+    def timestamps(self, games: Iterable[str] | None = None) -> dict[str, str]:
+        """{game: fetched_at} of the latest score for games (default: every game)."""
+        return dict(self._latest_rows("game_name, fetched_at", games))
+
+    def latest(self) -> pd.DataFrame:
+        """Every game's latest score, oldest fetch first (legacy trends cache CSV layout + anchor)."""
+        return pd.DataFrame(self._latest_rows(", ".join(LATEST_COLUMNS), None), columns=LATEST_COLUMNS)
+
+    def history(self, games: Iterable[str] | None = None) -> pd.DataFrame:
+        """Every recorded score for games (default: all), oldest first."""
+        sql = "SELECT game_name, trends_score, fetched_at FROM trends_history"
+        with closing(self._connect()) as conn:
+            if games is None:
+                rows = conn.execute(sql + " ORDER BY fetched_at, game_name").fetchall()
+            else:
+                names = list(dict.fromkeys(str(g) for g in games))
+                rows = []
+                for i in range(0, len(names), _CHUNK):
+                    chunk = names[i:i + _CHUNK]
+                    rows += conn.execute(
+                        sql + f" WHERE game_name IN ({','.join('?' * len(chunk))})", chunk,
+                    ).fetchall()
+                rows.sort(key=lambda r: (r[2], r[0]))
+        return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+    # ── Comparisons ───────────────────────────────────────────────────────────
+
+    def upsert_comparisons(self, entries: dict[str, dict]) -> int:
+        """
+        Upsert raw group comparisons {cache_key: {"keywords", "scores",
+        "fetched_date"}}. Rows whose content is unchanged are not rewritten.
+        """
+        rows = [
+            (
+                key,
+                json.dumps(e.get("keywords") or key.split("|"), ensure_ascii=False),
+                json.dumps(e.get("scores", {}), ensure_ascii=False, sort_keys=True),
+                e["fetched_date"],
+            )
+            for key, e in entries.items()
+            if e.get("fetched_date")
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO comparisons (cache_key, keywords, scores, fetched_date) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (cache_key) DO UPDATE SET keywords = excluded.keywords, "
+                "scores = excluded.scores, fetched_date = excluded.fetched_date "
+                "WHERE excluded.fetched_date IS NOT comparisons.fetched_date "
+                "OR excluded.scores IS NOT comparisons.scores",
+                rows,
+            )
+        return len(rows)
+
+    def comparisons(self, since: str | None = None) -> dict[str, dict]:
+        """Raw group comparisons fetched on or after since (ISO date; default: all)."""
+        sql, params = "SELECT cache_key, keywords, scores, fetched_date FROM comparisons", ()
+        if since is not None:
+            sql, params = sql + " WHERE fetched_date >= ?", (since,)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return {
+            key: {"keywords": json.loads(kws), "scores": json.loads(scores), "fetched_date": fetched}
+            for key, kws, scores, fetched in rows
+        }
+
+    def prune_comparisons(self, before: str) -> int:
+        """Delete comparisons fetched before the given ISO date. Returns rows deleted."""
+        with closing(self._connect()) as conn, conn:
+            return conn.execute("DELETE FROM comparisons WHERE fetched_date < ?", (before,)).rowcount
+
+
+def open_trends_store(path: Path = TRENDS_SCORES_DB) -> TrendsScoreStore:
+    """The app's store, importing the legacy CSV / JSON caches on first open."""
+    return TrendsScoreStore(
+        path,
+        legacy_latest_csv=TRENDS_CACHE_FILE,
+        legacy_history_csv=INVENTORY_TRENDS_HISTORY_FILE,
+        legacy_comparisons_json=TRENDS_RESULTS_CACHE_FILE,
+    )
@@ -1,17 +1,22 @@
+import os
 from pathlib import Path
 
 BASE_DIR  = Path(__file__).resolve().parent
 RAW_DIR   = BASE_DIR / 'raw'
 DATA_DIR  = BASE_DIR / 'data'
-CACHE_DIR = BASE_DIR / 'cache'
+CACHE_DIR = Path(os.environ.get('GAME_RANKING_CACHE_DIR') or BASE_DIR / 'cache')
+RANKED_DIR = BASE_DIR / 'ranked'
+LOG_DIR    = BASE_DIR / 'logs'
 
 CSV_STEAM        = RAW_DIR  / 'raw_steam.csv'
 CSV_NON_STEAM    = RAW_DIR  / 'raw_non_steam.csv'
 DEV_LIST         = DATA_DIR / 'developer_list.xlsx'
 GENRE_LIST       = DATA_DIR / 'genre_list.xlsx'
 INVENTORY_FILE   = DATA_DIR / 'team_reviews_game_inventory.csv'
-TRENDS_CACHE_FILE        = CACHE_DIR / 'nonsteam_trends_cache.csv'
-INVENTORY_TRENDS_HISTORY_FILE = CACHE_DIR / 'inventory_trends_history.csv'
+RANKING_WEIGHTS_FILE = DATA_DIR / 'ranking_weights.json'
+TRENDS_CACHE_FILE        = CACHE_DIR / 'nonsteam_trends_cache.csv'      # legacy, imported into TRENDS_SCORES_DB
+INVENTORY_TRENDS_HISTORY_FILE = CACHE_DIR / 'inventory_trends_history.csv'  # legacy, imported into TRENDS_SCORES_DB
+TRENDS_RESULTS_CACHE_FILE = CACHE_DIR / 'trends_results_cache.json'    # legacy, imported into TRENDS_SCORES_DB
 STEAMSPY_CACHE_FILE      = CACHE_DIR / 'steamspy_cache.csv'
 TOURNAMENT_ANCHOR_FILE   = CACHE_DIR / 'tournament_anchor.json'
 TOURNAMENT_STATE_FILE        = CACHE_DIR / 'tournament_state.json'
@@ -19,6 +24,31 @@ MANUAL_TOURNAMENT_STATE_FILE = CACHE_DIR / 'manual_tournament_state.json'
 REFRESH_TRENDS_STATE_FILE         = CACHE_DIR / 'refresh_trends_state.json'
 REFRESH_TRENDS_STATE_FILE_STEAM   = CACHE_DIR / 'refresh_trends_state_steam.json'
 REFRESH_TRENDS_STATE_FILE_NONSTEAM = CACHE_DIR / 'refresh_trends_state_nonsteam.json'
+ROW_STORE_STEAM_FILE     = CACHE_DIR / 'row_store_steam.sqlite'
+ROW_STORE_NONSTEAM_FILE  = CACHE_DIR / 'row_store_nonsteam.sqlite'
+PLAYER_COUNTS_DB         = CACHE_DIR / 'player_counts.sqlite'
+PINGBACK_DB              = CACHE_DIR / 'pingbacks.sqlite'
+TRENDS_SCORES_DB         = CACHE_DIR / 'trends_scores.sqlite'
+JOBS_DB                  = CACHE_DIR / 'jobs.sqlite'
+SNAPSHOT_INDEX_DB        = CACHE_DIR / 'snapshot_index.sqlite'
+NONSTEAM_READY_FILE      = CACHE_DIR / 'nonsteam_ready.pkl'
+RERUN_LOG_FILE           = LOG_DIR / 'reruns.jsonl'
+RERUN_PROFILE_DIR        = LOG_DIR / 'profiles'
+
+# Outbound API hosts. GAME_RANKING_API_BASE_URL points all four at one host —
+# e.g. the local stand-in (scripts/fake_api_server.py) for load tests that must
+# not spend DataForSEO credits; the per-service variables override it.
+_API_BASE_URL = os.environ.get('GAME_RANKING_API_BASE_URL', '')
+
+
+def _api_base(env_var: str, live: str) -> str:
+    return (os.environ.get(env_var) or _API_BASE_URL or live).rstrip('/')
+
+
+DATAFORSEO_BASE_URL  = _api_base('GAME_RANKING_DATAFORSEO_URL', 'https://api.dataforseo.com')
+STEAM_STORE_BASE_URL = _api_base('GAME_RANKING_STEAM_STORE_URL', 'https://store.steampowered.com')
+STEAM_API_BASE_URL   = _api_base('GAME_RANKING_STEAM_API_URL', 'https://api.steampowered.com')
+STEAMSPY_BASE_URL    = _api_base('GAME_RANKING_STEAMSPY_URL', 'https://steamspy.com')
 
 
 def get_latest_steam_csv() -> "Path":
@@ -0,0 +1,167 @@
+"""
+Shared vectorized date parsing for Steam / Non-Steam release dates.
+
+Raw exports mix several date styles in one column. Instead of calling
+pd.to_datetime once per cell, parse_dates() works on the unique stripped
+strings only (repeated values are parsed once), classifies them with
+vectorized regex matches and parses each class in one go:
+
+  blank      NaN / empty                         → NaT
+  sentinel   TBD, Coming Soon, N/A, …            → NaT
+  iso        2026-04-23, 2026-04-23T10:00:00     → as written
+  numeric    15/1/2026, 3/17/2026, 23-04-2026    → D/M vs M/D by the >12 rule:
+                                                   part[0] > 12 → D/M,
+                                                   part[1] > 12 → M/D,
+                                                   both ≤ 12    → D/M (default)
+  day-month  22 Apr, 2026 / 22 April 2026        → as written
+  month-day  Apr 23, 2026 / April 23 2026        → as written
+  month-year April 2026, Jan-26                  → 1st of the month (YY → 20YY)
+  other      anything else                       → pd.to_datetime(dayfirst=True)
+                                                   per unique value, NaT on failure
+
+The call-site wrappers keep each caller's output contract:
+  to_steam_release_dates  → "%d-%m-%Y" strings (pipelines/normalizer.py)
+  to_iso_dates            → "%Y-%m-%d" strings (pipelines/nonsteam_pipeline.py)
+  parse_dates             → datetime64 Series (app/tab_nonsteam.py)
+Unparseable non-blank values are kept as their stripped text by the string
+wrappers, exactly as the old per-cell parsers did.
+"""
+
+import functools
+import warnings
+
+import numpy as np
+import pandas as pd
+
+SENTINELS = frozenset({
+    "tbd", "tba", "to be announced", "to be determined", "coming soon",
+    "n/a", "na", "none", "nan", "unknown",
+})
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}
+
+_ISO_RE        = r"^\d{4}-\d{1,2}-\d{1,2}(?:[T ].*)?$"
+_NUMERIC_RE    = r"^(\d{1,2})[/.-](\d{1,2})[/.-](\d{2}|\d{4})$"
+_DAY_MONTH_RE  = r"^(\d{1,2})\s+([A-Za-z]+)\.?,?\s+(\d{4})$"
+_MONTH_DAY_RE  = r"^([A-Za-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})$"
+_MONTH_YEAR_RE = r"^([A-Za-z]+)\.?,?(?:\s+|[-'/])(\d{4}|\d{2})$"
+
+
+def _from_parts(year: pd.Series, month: pd.Series, day: pd.Series) -> pd.Series:
+    """Vectorized Y/M/D → datetime64; invalid combinations become NaT."""
+    return pd.to_datetime(
+        pd.DataFrame({"year": year, "month": month, "day": day}).astype(float),
+        errors="coerce",
+    )
+
+
+def _month_numbers(names: pd.Series) -> pd.Series:
+    return names.str.lower().map(_MONTHS)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_other(value: str) -> pd.Timestamp:
+    """Last-resort parse for one unclassified string (memoized across calls)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            ts = pd.to_datetime(value, dayfirst=True)
+        except (ValueError, TypeError, OverflowError):
+            return pd.NaT
+    if ts is pd.NaT:
+        return ts
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts if pd.Timestamp.min < ts < pd.Timestamp.max else pd.NaT
+
+
+def _parse_unique(values: pd.Series) -> pd.Series:
+    """Parse unique, stripped, non-blank strings. Returns datetime64 aligned to values."""
+    out = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    pending = ~values.str.lower().isin(SENTINELS)
+
+    iso = pending & values.str.match(_ISO_RE)
+    if iso.any():
+        parsed = pd.to_datetime(values[iso], format="ISO8601", errors="coerce", utc=True)
+        out[iso] = parsed.dt.tz_convert(None).astype("datetime64[ns]")
+        pending &= ~iso
+
+    parts = values.str.extract(_NUMERIC_RE)
+    numeric = pending & parts[0].notna()
+    if numeric.any():
+        p1, p2, yr = (parts.loc[numeric, i].astype(int) for i in range(3))
+        yr = yr.where(yr >= 100, yr + 2000)
+        month_first = (p1 <= 12) & (p2 > 12)
+        day = p1.where(~month_first, p2)
+        month = p2.where(~month_first, p1)
+        out[numeric] = _from_parts(yr, month, day)
+        pending &= ~numeric
+
+    for pattern, day_g, month_g, year_g in ((_DAY_MONTH_RE, 0, 1, 2), (_MONTH_DAY_RE, 1, 0, 2)):
+        parts = values.str.extract(pattern)
+        month = _month_numbers(parts[month_g])
+        hit = pending & month.notna()
+        if hit.any():
+            out[hit] = _from_parts(parts.loc[hit, year_g].astype(int), month[hit], parts.loc[hit, day_g].astype(int))
+            pending &= ~hit
+
+    parts = values.str.extract(_MONTH_YEAR_RE)
+    month = _month_numbers(parts[0])
+    month_year = pending & month.notna()
+    if month_year.any():
+        yr = parts.loc[month_year, 1].astype(int)
+        out[month_year] = _from_parts(yr.where(yr >= 100, yr + 2000), month[month_year], 1)
+        pending &= ~month_year
+
+    if pending.any():
+        out[pending] = [_parse_other(v) for v in values[pending]]
+    return out
+
+
+def _strip(series: pd.Series) -> tuple[pd.Series, np.ndarray]:
+    """Stripped string view of series plus a mask of blank (NaN / empty) cells."""
+    stripped = series.astype(object).where(series.notna(), "").astype(str).str.strip()
+    return stripped, (stripped == "").to_numpy()
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """
+    Parse a column of mixed-format dates to datetime64 (NaT for blanks,
+    sentinels and anything unparseable). Aligned to series.index.
+    """
+    stripped, _ = _strip(series)
+    codes, uniques = pd.factorize(stripped)
+    uniques = pd.Series(uniques, dtype=object).astype(str)
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype="datetime64[ns]")
+    non_blank = uniques != ""
+    if non_blank.any():
+        parsed[non_blank] = _parse_unique(uniques[non_blank])
+    return pd.Series(parsed.to_numpy()[codes], index=series.index, name=series.name)
+
+
+_KEEP = object()   # sentinel: leave blank cells exactly as they were
+
+
+def _format(series: pd.Series, fmt: str, blank_value) -> pd.Series:
+    stripped, blank = _strip(series)
+    parsed = parse_dates(series)
+    out = parsed.dt.strftime(fmt).astype(object)
+    unparsed = parsed.isna().to_numpy()
+    out[unparsed] = stripped[unparsed]
+    out[blank] = series.to_numpy()[blank] if blank_value is _KEEP else blank_value
+    return out
+
+
+def to_steam_release_dates(series: pd.Series) -> pd.Series:
+    """"%d-%m-%Y" strings; blanks kept as-is, unparseable values kept as stripped text."""
+    return _format(series, "%d-%m-%Y", _KEEP)
+
+
+def to_iso_dates(series: pd.Series) -> pd.Series:
+    """"%Y-%m-%d" strings; blanks become None, unparseable values kept as stripped text."""
+    return _format(series, "%Y-%m-%d", None)
@@ -0,0 +1,360 @@
+"""
+Local stand-in for the DataForSEO, Steam Store, Steam Web API and SteamSpy hosts.
+
+Every collector builds its URLs from the base URLs in config.py, so setting
+
+    GAME_RANKING_API_BASE_URL="http://127.0.0.1:8780"
+
+before the app (or a script) starts sends all outbound calls here instead of
+the live, credit-charging APIs. One server answers for all four hosts:
+
+  POST /v3/keywords_data/google_trends/explore/task_post        ≤100 tasks per call
+  GET  /v3/keywords_data/google_trends/explore/tasks_ready      ≤ready_cap IDs
+  GET  /v3/keywords_data/google_trends/explore/task_get/<id>
+  GET  /api/storesearch/?term=…                                 Steam Store
+  GET  /api/appdetails?appids=…                                 Steam Store
+  GET  /ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid=…   Steam Web API
+  GET  /api.php?request=appdetails&appid=…                      SteamSpy
+  GET  /health, /stats                                          liveness, per-endpoint counts
+
+Responses have the live shapes the parsers expect, with deterministic values
+derived from the keyword / app ID, so repeated runs score identically. A task
+becomes ready task_delay seconds after it is posted and leaves tasks_ready once
+task_get has returned it, as on DataForSEO.
+
+FakeApiConfig injects the failure modes the collectors have to survive:
+latency, 429s (with optional Retry-After), timeouts (the request hangs for
+hang_seconds before answering) and tasks_ready saturation (extra_ready phantom
+IDs from "other users" fill the ready_cap window, so our own ready tasks fall
+off the list and the collectors must check them directly).
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8780
+MAX_TASKS_PER_POST = 100
+_TRENDS_PREFIX = "/v3/keywords_data/google_trends/explore"
+
+
+@dataclass
+class FakeApiConfig:
+    latency:        float = 0.0    # seconds added to every response
+    latency_jitter: float = 0.0    # up to this many extra seconds, uniformly drawn
+    rate_429:       float = 0.0    # share of requests answered with HTTP 429
+    retry_after:    float | None = None  # Retry-After header on 429s (None = no header)
+    rate_timeout:   float = 0.0    # share of requests that hang for hang_seconds first
+    hang_seconds:   float = 60.0   # longer than the clients' read timeouts
+    task_delay:     float = 0.0    # seconds from task_post until a task is ready
+    ready_cap:      int   = 1000   # DataForSEO returns at most 1000 IDs from tasks_ready
+    extra_ready:    int   = 0      # phantom ready IDs listed ahead of ours
+    pingbacks:      bool  = False  # fire each task's pingback_url once it is ready
+    seed:           int | None = None
+
+
+def _stable(text: str, modulo: int) -> int:
+    """Deterministic non-negative int < modulo for text (same across runs and processes)."""
+    return zlib.crc32(text.encode("utf-8")) % modulo
+
+
+def keyword_score(keyword: str) -> float:
+    """The fake Google Trends average for keyword (1–100)."""
+    return float(1 + _stable(keyword.strip().lower(), 100))
+
+
+def fake_appid(name: str) -> int:
+    return 100_000 + _stable(name.strip().lower(), 2_000_000)
+
+
+class FakeApiState:
+    """Posted tasks, ready queue and request counters; shared by all handler threads."""
+
+    def __init__(self, config: FakeApiConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._tasks: dict[str, dict] = {}      # id → {"keywords", "ready_at", "pingback_url", "fetched"}
+        self._phantoms = [uuid.UUID(int=i + 1).hex for i in range(config.extra_ready)]
+        self.counts: dict[str, int] = {}
+        self._timers: list[threading.Timer] = []
+
+    def draw(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def count(self, endpoint: str) -> None:
+        with self._lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def post_tasks(self, payloads: list[dict]) -> list[dict]:
+        now = time.monotonic()
+        out = []
+        with self._lock:
+            for payload in payloads:
+                keywords = [str(k) for k in payload.get("keywords") or []]
+                if not keywords or len(keywords) > 5:
+                    out.append({"id": None, "status_code": 40503, "status_message": "Invalid keywords."})
+                    continue
+                task_id = uuid.uuid4().hex
+                self._tasks[task_id] = {
+                    "keywords": keywords, "ready_at": now + self.config.task_delay,
+                    "pingback_url": payload.get("pingback_url"), "fetched": False,
+                }
+                out.append({"id": task_id, "status_code": 20100, "status_message": "Task Created."})
+                if self.config.pingbacks and payload.get("pingback_url"):
+                    timer = threading.Timer(self.config.task_delay, _send_pingback,
+                                            (payload["pingback_url"], task_id, payload.get("tag", "")))
+                    timer.daemon = True
+                    timer.start()
+                    self._timers.append(timer)
+        return out
+
+    def ready_ids(self) -> list[str]:
+        now = time.monotonic()
+        with self._lock:
+            ours = [tid for tid, t in self._tasks.items() if t["ready_at"] <= now and not t["fetched"]]
+        return (self._phantoms + ours)[: self.config.ready_cap]
+
+    def get_task(self, task_id: str) -> dict:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return {"id": task_id, "status_code": 40400, "status_message": "Not Found.", "result": None}
+            if task["ready_at"] > time.monotonic():
+                return {"id": task_id, "status_code": 40602, "status_message": "Task In Queue.", "result": None}
+            task["fetched"] = True
+            keywords = task["keywords"]
+        scores = [keyword_score(k) for k in keywords]
+        return {
+            "id": task_id, "status_code": 20000, "status_message": "Ok.",
+            "result": [{
+                "keywords": keywords,
+                "items": [{
+                    "type": "google_trends_graph",
+                    "keywords": keywords,
+                    "averages": scores,
+                    "data": [{"values": scores}],
+                }],
+            }],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for timer in self._timers:
+                timer.cancel()
+            self._timers.clear()
+
+
+def _send_pingback(url: str, task_id: str, tag: str) -> None:
+    try:
+        requests.get(url.replace("$id", task_id).replace("$tag", tag or ""), timeout=30)
+    except requests.RequestException as exc:
+        log.debug("Fake pingback for %s failed: %s", task_id, exc)
+
+
+def _endpoint(path: str) -> str | None:
+    if path == f"{_TRENDS_PREFIX}/task_post":
+        return "dataforseo.task_post"
+    if path == f"{_TRENDS_PREFIX}/tasks_ready":
+        return "dataforseo.tasks_ready"
+    if path.startswith(f"{_TRENDS_PREFIX}/task_get/"):
+        return "dataforseo.task_get"
+    return {
+        "/api/storesearch/":                             "steam_store.storesearch",
+        "/api/storesearch":                              "steam_store.storesearch",
+        "/api/appdetails":                               "steam_store.appdetails",
+        "/ISteamUserStats/GetNumberOfCurrentPlayers/v1/": "steam_api.current_players",
+        "/api.php":                                      "steamspy.appdetails",
+    }.get(path)
+
+
+def _make_handler(state: FakeApiState) -> type[BaseHTTPRequestHandler]:
+    cfg = state.config
+
+    class FakeApiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the live hosts
+
+        def _reply(self, status: int, body, headers: dict | None = None) -> None:
+            payload = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json" if not isinstance(body, str) else "text/plain")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _inject(self) -> bool:
+            """Apply latency / timeout / 429 injection. True when the request was answered here."""
+            if cfg.latency or cfg.latency_jitter:
+                time.sleep(cfg.latency + cfg.latency_jitter * state.draw())
+            if cfg.rate_timeout and state.draw() < cfg.rate_timeout:
+                time.sleep(cfg.hang_seconds)
+            if cfg.rate_429 and state.draw() < cfg.rate_429:
+                state.count("http_429")
+                headers = {"Retry-After": f"{cfg.retry_after:g}"} if cfg.retry_after is not None else None
+                self._reply(429, {"status_code": 40202, "status_message": "Rate limit exceeded."}, headers)
+                return True
+            return False
+
+        def _dispatch(self, method: str) -> None:
+            parts = urlsplit(self.path)
+            if parts.path == "/health":
+                self._reply(200, "ok")
+                return
+            if parts.path == "/stats":
+                self._reply(200, dict(state.counts))
+                return
+            endpoint = _endpoint(parts.path)
+            if endpoint is None:
+                self._reply(404, {"status_code": 40400, "status_message": "Not Found."})
+                return
+            state.count(endpoint)
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0)) if method == "POST" else b""
+            if self._inject():
+                return
+            params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            handler = getattr(self, "_" + endpoint.replace(".", "_"))
+            handler(parts.path, params, body)
+
+        # ── DataForSEO ────────────────────────────────────────────────────────
+
+        def _dataforseo_task_post(self, _path, _params, body):
+            try:
+                payloads = json.loads(body.decode("utf-8") or "[]")
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                self._reply(400, {"status_code": 40501, "status_message": "Invalid JSON."})
+                return
+            if len(payloads) > MAX_TASKS_PER_POST:
+                self._reply(200, {"status_code": 40006, "tasks_count": 0, "tasks": [],
+                                  "status_message": "You can set only 100 tasks in one request."})
+                return
+            tasks = state.post_tasks(payloads)
+            self._reply(200, {"status_code": 20000, "tasks_count": len(tasks), "tasks": tasks})
+
+        def _dataforseo_tasks_ready(self, _path, _params, _body):
+            ids = state.ready_ids()
+            self._reply(200, {"status_code": 20000, "tasks": [{
+                "status_code": 20000, "result_count": len(ids),
+                "result": [{"id": tid, "se": "google_trends", "function": "explore"} for tid in ids],
+            }]})
+
+        def _dataforseo_task_get(self, path, _params, _body):
+            task = state.get_task(path.rsplit("/", 1)[-1])
+            self._reply(200, {"status_code": 20000, "tasks_count": 1, "tasks": [task]})
+
+        # ── Steam / SteamSpy ──────────────────────────────────────────────────
+
+        def _steam_store_storesearch(self, _path, params, _body):
+            term = params.get("term", "")
+            items = [{"type": "app", "name": term, "id": fake_appid(term)}] if term else []
+            self._reply(200, {"total": len(items), "items": items})
+
+        def _steam_store_appdetails(self, _path, params, _body):
+            appids = [a for a in params.get("appids", "").split(",") if a.isdigit()]
+            self._reply(200, {a: {"success": True, "data": {"type": "game", "steam_appid": int(a), "name": f"App {a}"}}
+                              for a in appids})
+
+        def _steam_api_current_players(self, _path, params, _body):
+            appid = params.get("appid", "0")
+            self._reply(200, {"response": {"player_count": _stable(appid, 50_000), "result": 1}})
+
+        def _steamspy_appdetails(self, _path, params, _body):
+            appid = params.get("appid", "0")
+            owners = 20_000 * (1 + _stable(appid, 50))
+            self._reply(200, {
+                "appid": int(appid) if appid.isdigit() else 0,
+                "ccu": _stable(appid, 20_000),
+                "average_2weeks": _stable(appid + "/2w", 600),
+                "owners": f"{owners:,} .. {owners * 2:,}",
+                "initialprice": str(99 + 100 * _stable(appid + "/p", 60)),
+            })
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def log_message(self, fmt, *args):  # route access logs through logging
+            log.debug("%s - %s", self.address_string(), fmt % args)
+
+    return FakeApiHandler
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the FakeApiConfig options (--latency, --rate-429, …) to a CLI parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="share of requests that hang first")
+    parser.add_argument("--hang", type=float, default=60.0, help="seconds a hanging request waits")
+    parser.add_argument("--task-delay", type=float, default=0.0, help="seconds until a posted task is ready")
+    parser.add_argument("--ready-cap", type=int, default=1000, help="max IDs returned by tasks_ready")
+    parser.add_argument("--extra-ready", type=int, default=0, help="phantom ready IDs listed ahead of ours")
+    parser.add_argument("--pingbacks", action="store_true", help="call each task's pingback_url when ready")
+    parser.add_argument("--seed", type=int, help="seed for the fault injection draws")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeApiConfig:
+    return FakeApiConfig(
+        latency=args.latency, latency_jitter=args.jitter,
+        rate_429=args.rate_429, retry_after=args.retry_after,
+        rate_timeout=args.rate_timeout, hang_seconds=args.hang,
+        task_delay=args.task_delay, ready_cap=args.ready_cap, extra_ready=args.extra_ready,
+        pingbacks=args.pingbacks, seed=args.seed,
+    )
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    config: FakeApiConfig | None = None,
+) -> ThreadingHTTPServer:
+    """Build (but do not start) a fake API server bound to host:port (port 0 = any free port)."""
+    state = FakeApiState(config if config is not None else FakeApiConfig())
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    server.fake_state = state
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """http://host:port of a server built by make_server()."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def serve_in_background(server: ThreadingHTTPServer) -> threading.Thread:
+    """Run server.serve_forever() on a daemon thread; stop it with server.shutdown()."""
+    thread = threading.Thread(target=server.serve_forever, name="fake-api-server", daemon=True)
+    thread.start()
+    return thread
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, config: FakeApiConfig | None = None) -> None:
+    """Run the fake API server in the foreground until interrupted."""
+    server = make_server(host, port, config)
+    log.info("Fake API server listening on %s", base_url(server))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.fake_state.close()
+        server.server_close()
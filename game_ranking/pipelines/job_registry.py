@@ -0,0 +1,204 @@
+"""
+Durable registry of background jobs, one row per job kind.
+
+Background threads cannot touch st.session_state, so they used to report
+through module-level dicts (app/thread_state.py). streamlit_app.py drops every
+project module from sys.modules on each rerun, which re-created those dicts
+empty: a running worker's progress and result were orphaned, and the
+"running" guard no longer stopped a second worker from starting.
+
+The registry keeps that state in SQLite (stdlib), outside the module system
+and the process:
+
+  jobs  kind PRIMARY KEY → job_id, label, status, progress, result (JSON),
+                           error, started_at, updated_at, finished_at, consumed
+
+  claim(kind, label, stale_after)   start a job — None if one is still alive
+  heartbeat(kind, job_id, progress) record progress; False once superseded
+                                    (workers stop, e.g. by raising JobSuperseded)
+  finish(kind, job_id, status, ...) record the outcome ("done" / "failed" / …)
+  get(kind) / is_running(kind, …)   read the current job
+  take_result(kind)                 finished job, handed out once
+
+A job is alive while its status is "running" and its heartbeat (updated_at)
+is younger than stale_after seconds. A worker lost with its process stops
+heartbeating, so the kind can be claimed again once the heartbeat goes stale.
+claim() checks and replaces the row in one IMMEDIATE transaction, so two
+sessions (or processes) cannot both start the same kind.
+"""
+
+import json
+import logging
+import sqlite3
+import uuid
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import JOBS_DB
+
+log = logging.getLogger(__name__)
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_STALE_AFTER = 600   # seconds without a heartbeat before a running job counts as dead
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    kind        TEXT PRIMARY KEY,
+    job_id      TEXT NOT NULL,
+    label       TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    progress    TEXT NOT NULL DEFAULT '{}',
+    result      TEXT,
+    error       TEXT,
+    started_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    finished_at TEXT,
+    consumed    INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = ("kind", "job_id", "label", "status", "progress", "result", "error",
+            "started_at", "updated_at", "finished_at", "consumed")
+
+
+def _now() -> str:
+    return datetime.now().strftime(TS_FMT)
+
+
+def _dumps(value) -> str:
+    # numpy scalars (pandas-derived scores) serialise as their Python value
+    return json.dumps(value, ensure_ascii=False, default=lambda o: o.item() if hasattr(o, "item") else str(o))
+
+
+class JobSuperseded(Exception):
+    """Raised inside a worker once heartbeat() reports another job owns its kind."""
+
+
+class JobRegistry:
+    """SQLite-backed job records, safe across threads, re-imports and processes."""
+
+    def __init__(self, path: Path = JOBS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _row_to_job(row: tuple | None) -> dict | None:
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["progress"] = json.loads(job["progress"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        job["consumed"] = bool(job["consumed"])
+        return job
+
+    @staticmethod
+    def _alive(job: dict | None, stale_after: float) -> bool:
+        if not job or job["status"] != "running":
+            return False
+        try:
+            beat = datetime.strptime(job["updated_at"], TS_FMT)
+        except (TypeError, ValueError):
+            return False
+        return datetime.now() - beat < timedelta(seconds=stale_after)
+
+    def get(self, kind: str) -> dict | None:
+        """The latest job of kind (running or finished), or None if it never ran."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE kind = ?", (kind,)).fetchone()
+        return self._row_to_job(row)
+
+    def is_running(self, kind: str, stale_after: float = DEFAULT_STALE_AFTER) -> bool:
+        """True while a job of kind is running and heartbeating."""
+        return self._alive(self.get(kind), stale_after)
+
+    def claim(
+        self, kind: str, label: str, stale_after: float = DEFAULT_STALE_AFTER, progress: dict | None = None,
+    ) -> str | None:
+        """
+        Start a new job of kind and return its job_id, or None when a live job
+        of kind already exists. The previous record of kind is replaced.
+        """
+        job_id = uuid.uuid4().hex
+        now = _now()
+        with closing(self._connect()) as conn:
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE kind = ?", (kind,)).fetchone()
+                current = self._row_to_job(row)
+                if self._alive(current, stale_after):
+                    conn.execute("ROLLBACK")
+                    return None
+                if current and current["status"] == "running":
+                    log.warning("[jobs] %s job %s stopped heartbeating — replacing it", kind, current["job_id"])
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (kind, job_id, label, status, progress, started_at, updated_at) "
+                    "VALUES (?, ?, ?, 'running', ?, ?, ?)",
+                    (kind, job_id, label, _dumps(progress or {}), now, now),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def heartbeat(self, kind: str, job_id: str, progress: dict | None = None) -> bool:
+        """
+        Refresh job_id's heartbeat, replacing its progress when given. Returns
+        False when kind now belongs to another job (this worker should stop).
+        """
+        with closing(self._connect()) as conn, conn:
+            if progress is None:
+                cur = conn.execute(
+                    "UPDATE jobs SET updated_at = ? WHERE kind = ? AND job_id = ? AND status = 'running'",
+                    (_now(), kind, job_id),
+                )
+            else:
+                cur = conn.execute(
+                    "UPDATE jobs SET updated_at = ?, progress = ? WHERE kind = ? AND job_id = ? AND status = 'running'",
+                    (_now(), _dumps(progress), kind, job_id),
+                )
+            return cur.rowcount == 1
+
+    def finish(
+        self,
+        kind: str,
+        job_id: str,
+        status: str,
+        result: dict | None = None,
+        error: str | None = None,
+        progress: dict | None = None,
+    ) -> bool:
+        """Record job_id's outcome. Returns False when kind belongs to another job."""
+        now = _now()
+        with closing(self._connect()) as conn, conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, finished_at = ?, "
+                "progress = COALESCE(?, progress), consumed = 0 WHERE kind = ? AND job_id = ?",
+                (
+                    status,
+                    _dumps(result) if result is not None else None,
+                    error, now, now,
+                    _dumps(progress) if progress is not None else None,
+                    kind, job_id,
+                ),
+            )
+            return cur.rowcount == 1
+
+    def take_result(self, kind: str) -> dict | None:
+        """The finished job of kind if nobody has taken it yet, else None."""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                f"UPDATE jobs SET consumed = 1 WHERE kind = ? AND status != 'running' AND consumed = 0 "
+                f"RETURNING {', '.join(_COLUMNS)}",
+                (kind,),
+            ).fetchone()
+        return self._row_to_job(row)
@@ -0,0 +1,234 @@
+"""
+Background job runner for DataForSEO collect cycles.
+
+The Refresh Trends, tournament, manual bracket and Grand Final collect loops
+used to run inside the Streamlit script: sleep, collect, sleep again, for up
+to 200 polls. That held a script thread per user and froze the tab until the
+loop ended. Collection now runs on a daemon thread in the server process,
+which keeps going when the browser tab is closed. The UI only reads job
+progress.
+
+  start_job(kind, login, password)  start collecting (no-op if already running)
+  load_job(kind)                    latest job record, for progress display
+  is_running(kind)                  True while a live worker owns the kind
+
+Job kinds (JOB_KINDS):
+  refresh_steam, refresh_nonsteam   collect_refresh() + write_scores()
+  tournament                        collect_results()
+  manual_steam, manual_non_steam    collect_manual_bracket()
+  grand_final                       collect_grand_final()
+
+Each cycle collects whatever is ready, records progress, then waits for a
+pingback (or the poll interval) before the next one. A cycle woken by a
+pingback fetches only the pingbacked tasks; tasks_ready is polled at most
+once per interval. A job ends when its collector reports complete, nothing
+is pending, or max_polls polling cycles have run — pingback wakes do not
+count towards max_polls.
+
+Job records live in the JobRegistry (pipelines/job_registry.py): status,
+progress counters {"polls", "wakes", "collected", "errors", "pending", "last_summary"}
+and a heartbeat written every cycle and after every batch of fetched tasks
+inside a collect, so a long collect never looks dead to other sessions. A
+worker whose heartbeat finds the kind taken over stops at once. Task state lives in the pipelines' own
+state files, so a job lost with the process is resumed by starting it again.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from config import (
+    REFRESH_TRENDS_STATE_FILE_STEAM,
+    REFRESH_TRENDS_STATE_FILE_NONSTEAM,
+)
+from pipelines import pingback_queue
+from pipelines.job_registry import JobRegistry, JobSuperseded
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class JobKind:
+    label:     str
+    collect:   Callable[..., dict]          # (login, password, poll=, on_batch=) → summary with "complete"
+    pending:   Callable[[], list[str]]      # task IDs still pending
+    interval:  float                        # max seconds between collect cycles
+    max_polls: int = 200
+
+
+# ── Collectors ────────────────────────────────────────────────────────────────
+
+def _refresh_collect(state_file: Path) -> Callable[..., dict]:
+    def collect(login: str, password: str, poll: bool = True, on_batch=None) -> dict:
+        from pipelines.refresh_trends_pipeline import collect_refresh, write_scores
+        summary = collect_refresh(login, password, state_file=state_file, poll=poll, on_batch=on_batch)
+        if summary["scores"]:
+            write_scores(summary["scores"], fetched_at=summary.get("fetched_at"))
+        return summary
+    return collect
+
+
+def _refresh_pending(state_file: Path) -> Callable[[], list[str]]:
+    def pending() -> list[str]:
+        from pipelines.refresh_trends_pipeline import load_state
+        tasks = load_state(state_file=state_file).get("tasks", [])
+        return list(dict.fromkeys(t["task_id"] for t in tasks if t["status"] == "pending" and t.get("task_id")))
+    return pending
+
+
+def _tournament_collect(login: str, password: str, poll: bool = True, on_batch=None) -> dict:
+    from pipelines.tournament_pipeline import collect_results
+    return collect_results(login, password, poll=poll, on_batch=on_batch)
+
+
+def _tournament_pending() -> list[str]:
+    from pipelines.tournament_state import get_pending_task_ids, load_state
+    return list(get_pending_task_ids(load_state()))
+
+
+def _manual_collect(bracket: str) -> Callable[..., dict]:
+    def collect(login: str, password: str, poll: bool = True, on_batch=None) -> dict:
+        from pipelines.tournament_pipeline import collect_manual_bracket
+        return collect_manual_bracket(bracket, login, password, poll=poll, on_batch=on_batch)
+    return collect
+
+
+def _manual_pending(bracket: str) -> Callable[[], list[str]]:
+    def pending() -> list[str]:
+        from pipelines.tournament_state import get_manual_pending_task_ids, load_manual_state
+        return list(get_manual_pending_task_ids(load_manual_state(), bracket))
+    return pending
+
+
+def _grand_final_collect(login: str, password: str, poll: bool = True, on_batch=None) -> dict:
+    from pipelines.tournament_pipeline import collect_grand_final
+    return collect_grand_final(login, password, poll=poll, on_batch=on_batch)
+
+
+def _grand_final_pending() -> list[str]:
+    from pipelines.tournament_state import load_manual_state
+    gf = load_manual_state().get("grand_final") or {}
+    return [gf["task_id"]] if gf.get("status") == "pending" and gf.get("task_id") else []
+
+
+JOB_KINDS: dict[str, JobKind] = {
+    "refresh_steam": JobKind(
+        "Steam trends refresh",
+        _refresh_collect(REFRESH_TRENDS_STATE_FILE_STEAM), _refresh_pending(REFRESH_TRENDS_STATE_FILE_STEAM), 120,
+    ),
+    "refresh_nonsteam": JobKind(
+        "Non-Steam trends refresh",
+        _refresh_collect(REFRESH_TRENDS_STATE_FILE_NONSTEAM), _refresh_pending(REFRESH_TRENDS_STATE_FILE_NONSTEAM), 120,
+    ),
+    "tournament":       JobKind("Auto tournament", _tournament_collect, _tournament_pending, 30),
+    "manual_steam":     JobKind("Steam bracket", _manual_collect("steam"), _manual_pending("steam"), 30),
+    "manual_non_steam": JobKind("Non-Steam bracket", _manual_collect("non_steam"), _manual_pending("non_steam"), 30),
+    "grand_final":      JobKind("Grand Final", _grand_final_collect, _grand_final_pending, 30),
+}
+
+
+# ── Job records ───────────────────────────────────────────────────────────────
+
+def _stale_after(kind: str) -> float:
+    """Heartbeat age after which kind's worker counts as dead: two poll intervals plus a minute."""
+    return 2 * JOB_KINDS[kind].interval + 60
+
+
+def _new_progress() -> dict:
+    return {"polls": 0, "wakes": 0, "collected": 0, "errors": 0, "pending": None, "last_summary": None}
+
+
+def load_job(kind: str, registry: JobRegistry | None = None) -> dict | None:
+    """The latest job record for kind, or None if it never ran."""
+    return (registry if registry is not None else JobRegistry()).get(kind)
+
+
+def is_running(kind: str, registry: JobRegistry | None = None) -> bool:
+    """True while a worker owns kind and keeps heartbeating."""
+    return (registry if registry is not None else JobRegistry()).is_running(kind, _stale_after(kind))
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def run_job(
+    kind: str,
+    login: str,
+    password: str,
+    job_id: str | None = None,
+    wait: Callable | None = None,
+    registry: JobRegistry | None = None,
+) -> dict:
+    """
+    Run kind's collect cycles to the end on the calling thread and return the
+    final record. job_id is the claim made by start_job(); without one the
+    kind is claimed here (ValueError if a live worker owns it).
+    wait(task_ids, timeout) defaults to pingback_queue.wait_for; when it
+    returns pingbacked IDs the next cycle fetches just those (no tasks_ready
+    poll) unless the interval has passed since the last poll.
+    """
+    spec = JOB_KINDS[kind]
+    wait = wait or pingback_queue.wait_for
+    registry = registry if registry is not None else JobRegistry()
+    if job_id is None:
+        job_id = registry.claim(kind, spec.label, _stale_after(kind), _new_progress())
+        if job_id is None:
+            raise ValueError(f"A {kind} job is already running")
+
+    progress = _new_progress()
+    status, error = "timed_out", None
+    woke, last_poll = False, 0.0
+
+    def _beat(*_batch) -> None:
+        if not registry.heartbeat(kind, job_id, progress):
+            raise JobSuperseded(kind)
+
+    try:
+        while progress["polls"] < spec.max_polls:
+            poll = not woke or time.monotonic() - last_poll >= spec.interval
+            if poll:
+                last_poll = time.monotonic()
+            summary = spec.collect(login, password, poll=poll, on_batch=_beat)
+            pending = spec.pending()
+            progress["polls" if poll else "wakes"] += 1
+            progress["collected"] += summary.get("collected", 0)
+            progress["errors"] += summary.get("errors", 0)
+            progress["pending"] = len(pending)
+            progress["last_summary"] = {k: v for k, v in summary.items() if k != "scores"}
+            if summary.get("complete") or not pending:
+                status = "done"
+                break
+            _beat()
+            woke = bool(wait(pending, timeout=max(0.0, last_poll + spec.interval - time.monotonic())))
+    except JobSuperseded:
+        log.warning("[job/%s] superseded by another worker — stopping", kind)
+        status = "superseded"
+    except Exception as exc:
+        log.exception("[job/%s] failed", kind)
+        status, error = "failed", str(exc)
+    if status != "superseded":
+        registry.finish(kind, job_id, status, error=error, progress=progress)
+    log.info("[job/%s] %s after %d poll(s): %d collected, %d error(s)",
+             kind, status, progress["polls"], progress["collected"], progress["errors"])
+    return registry.get(kind)
+
+
+def start_job(kind: str, login: str, password: str, registry: JobRegistry | None = None) -> bool:
+    """
+    Start collecting kind on a daemon thread. Returns False (and does nothing)
+    when a live worker already owns kind.
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    registry = registry if registry is not None else JobRegistry()
+    # Claim the kind before the thread starts so a quick rerun cannot start a second one
+    job_id = registry.claim(kind, JOB_KINDS[kind].label, _stale_after(kind), _new_progress())
+    if job_id is None:
+        return False
+    threading.Thread(
+        target=run_job, args=(kind, login, password, job_id),
+        kwargs={"registry": registry}, name=f"job-{kind}", daemon=True,
+    ).start()
+    return True
@@ -26,7 +26,11 @@ from pathlib import Path
 import pandas as pd
 import requests
 
-from config import RAW_DIR, CACHE_DIR, get_latest_nonsteam_csv
+from config import RAW_DIR, CACHE_DIR, STEAM_STORE_BASE_URL, get_latest_nonsteam_csv
+from calculation.http_client import get_client
+from pipelines.snapshot_index import merge_snapshot
+from pipelines.snapshot_store import read_snapshot, write_snapshot
+from pipelines.dates import to_iso_dates
 from pipelines.state import get_next_window, mark_run_complete
 
 logger = logging.getLogger(__name__)
@@ -281,8 +285,8 @@ _NONSTEAM_RENAME = {
     "steam_status":        "SteamStatus",
 }
 
-_STEAM_API        = "https://store.steampowered.com/api/appdetails"
-_STEAM_SEARCH_API = "https://store.steampowered.com/api/storesearch/"
+_STEAM_API        = f"{STEAM_STORE_BASE_URL}/api/appdetails"
+_STEAM_SEARCH_API = f"{STEAM_STORE_BASE_URL}/api/storesearch/"
 _PC_PLATFORM_KEYWORDS = ("pc (microsoft windows)", "windows")
 
 
@@ -299,7 +303,7 @@ def _extract_platforms_from_release_info(release_info_val) -> str:
 
 def _detect_steam_status(app_id, platforms_str: str = "") -> str:
     try:
-        resp = requests.get(
+        resp = get_client().get(
             _STEAM_API,
             params={"appids": int(app_id), "filters": "basic"},
             timeout=5,
@@ -316,7 +320,7 @@ def _detect_steam_status(app_id, platforms_str: str = "") -> str:
 
 def _search_steam_app_id(name: str):
     try:
-        resp = requests.get(
+        resp = get_client().get(
             _STEAM_SEARCH_API,
             params={"term": name, "l": "english", "cc": "US"},
             timeout=5,
@@ -395,7 +399,7 @@ def backfill_steam_status(log=None) -> int:
             log("No non-steam CSV found.")
         return 0
 
-    df = pd.read_csv(source_path, encoding='utf-8-sig')
+    df = read_snapshot(source_path)
     df = _normalize_nonsteam_df(df)
     n = len(df)
     if log:
@@ -432,7 +436,7 @@ def backfill_steam_status(log=None) -> int:
 
         time.sleep(1.5)
 
-    df.to_csv(source_path, index=False)
+    write_snapshot(df, source_path)
     if log:
         log(f"Done. SteamStatus updated for all {n} games.")
     return n
@@ -456,42 +460,9 @@ def _normalize_release_date(series: pd.Series) -> pd.Series:
       - part[1] > 12  → must be M/D/YYYY  (e.g. 3/17/2026)
       - both ≤ 12     → ambiguous; defaults to D/M/YYYY
     Non-date strings like 'Coming Soon' or 'TBD' are kept as-is.
+    Parsing is shared with the other date call sites via pipelines/dates.py.
     """
-    def _parse(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return None
-        s = str(val).strip()
-
-        # Already ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS...)
-        if len(s) >= 10 and s[4] == '-':
-            try:
-                return pd.to_datetime(s).strftime("%Y-%m-%d")
-            except Exception:
-                return s
-
-        # Slash-separated: detect format from numeric parts
-        if '/' in s:
-            parts = s.split('/')
-            if len(parts) == 3:
-                try:
-                    p1, p2 = int(parts[0]), int(parts[1])
-                    if p1 > 12:
-                        dayfirst = True   # e.g. 15/1/2026 → day=15
-                    elif p2 > 12:
-                        dayfirst = False  # e.g. 3/17/2026 → month=3
-                    else:
-                        dayfirst = True   # ambiguous → default D/M
-                    return pd.to_datetime(s, dayfirst=dayfirst).strftime("%Y-%m-%d")
-                except Exception:
-                    return s
-
-        # Fallback for any other format pandas can parse (e.g. 'Jan 15, 2026')
-        try:
-            return pd.to_datetime(s, dayfirst=True).strftime("%Y-%m-%d")
-        except Exception:
-            return s  # 'Coming Soon', 'TBD', 'N/A', etc.
-
-    return series.apply(_parse)
+    return to_iso_dates(series)
 
 
 def _append_to_raw_nonsteam(log) -> int:
@@ -522,49 +493,31 @@ def _append_to_raw_nonsteam(log) -> int:
     )
     new_df.loc[no_video, "YouTube URL"] = "No YouTube video found"
 
+    new_df["date_appended"] = date.today().isoformat()
     source_path = get_latest_nonsteam_csv()
     out_path = RAW_DIR / f"raw_non_steam_{date.today()}.csv"
+    created = not source_path.exists()
 
-    if source_path.exists():
-        from pipelines.normalizer import read_csv_auto_encoding
-        existing_df, _ = read_csv_auto_encoding(source_path.read_bytes())
-        existing_df = _normalize_nonsteam_df(existing_df)
-
-        existing_names = set(
-            existing_df["Game Title"].astype(str).str.strip().str.lower()
-        )
-        new_only = new_df[
-            ~new_df["Game Title"].astype(str).str.strip().str.lower().isin(existing_names)
-        ].copy()
-
-        if new_only.empty:
-            log("No new unique games -- CSV already up to date")
-            return 0
-
-        new_only["date_appended"] = date.today().isoformat()
-
-        combined = pd.concat([existing_df, new_only], ignore_index=True)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        combined.to_csv(out_path, index=False)
-        log(f"Saved {len(new_only)} new rows → {out_path.name}")
-        return len(new_only)
+    result = merge_snapshot("non_steam", new_df, source_path, out_path, _normalize_nonsteam_df, insert_only=True)
+    if not result.rows_written:
+        log("No new unique games -- CSV already up to date")
+    elif created:
+        log(f"Created {out_path.name} with {result.rows_written} rows")
     else:
-        new_df["date_appended"] = date.today().isoformat()
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        new_df.to_csv(out_path, index=False)
-        log(f"Created {out_path.name} with {len(new_df)} rows")
-        return len(new_df)
+        log(f"Saved {result.rows_written} new rows → {out_path.name}")
+    return result.rows_written
 
 
 def append_from_uploaded_nonsteam_csv(uploaded_df: pd.DataFrame) -> tuple:
     """
     Merge an externally uploaded non-steam DataFrame into the persistent CSV.
-    - Rows whose Game Title already exists are OVERWRITTEN.
-    - New rows are APPENDED.
+    - Rows whose Game Title already exists with different content are
+      OVERWRITTEN (moved to the end with date_appended = today).
+    - New rows are APPENDED with date_appended = today.
+    - Rows identical to the stored one are left untouched.
+    Only the new and changed rows are written (pipelines/snapshot_index.py).
     Returns (n_updated, n_new).
     """
-    today = date.today().isoformat()
-
     uploaded_df = uploaded_df.copy()
     uploaded_df = _normalize_nonsteam_df(uploaded_df)
     uploaded_df["Release Date"] = _normalize_release_date(uploaded_df["Release Date"])
@@ -576,30 +529,8 @@ def append_from_uploaded_nonsteam_csv(uploaded_df: pd.DataFrame) -> tuple:
     )
     uploaded_df.loc[no_video, "YouTube URL"] = "No YouTube video found"
 
-    uploaded_df["date_appended"] = today
-
-    upload_names = set(uploaded_df["Game Title"].astype(str).str.strip().str.lower())
-
-    source_path = get_latest_nonsteam_csv()
-    out_path = RAW_DIR / f"raw_non_steam_{date.today()}.csv"
-
-    if source_path.exists():
-        from pipelines.normalizer import read_csv_auto_encoding
-        existing_df, _ = read_csv_auto_encoding(source_path.read_bytes())
-        existing_df = _normalize_nonsteam_df(existing_df)
-
-        existing_names = set(existing_df["Game Title"].astype(str).str.strip().str.lower())
-        n_updated = len(upload_names & existing_names)
-        n_new = len(upload_names - existing_names)
-
-        kept = existing_df[
-            ~existing_df["Game Title"].astype(str).str.strip().str.lower().isin(upload_names)
-        ]
-        combined = pd.concat([kept, uploaded_df], ignore_index=True)
-    else:
-        n_updated, n_new = 0, len(uploaded_df)
-        combined = uploaded_df
+    uploaded_df["date_appended"] = date.today().isoformat()
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(out_path, index=False)
-    return n_updated, n_new
+    result = merge_snapshot("non_steam", uploaded_df, get_latest_nonsteam_csv(),
+                            RAW_DIR / f"raw_non_steam_{date.today()}.csv", _normalize_nonsteam_df)
+    return result.n_updated, result.n_new
@@ -7,10 +7,11 @@ encoding issues or unusual date formats.
 """
 
 import io
-import re
 
 import pandas as pd
 
+from pipelines.dates import to_steam_release_dates
+
 _ENCODINGS = ["utf-8", "utf-8-sig", "cp1252", "latin-1"]
 
 
@@ -35,7 +36,7 @@ def read_csv_auto_encoding(raw_bytes: bytes, **kwargs) -> tuple[pd.DataFrame, st
 
 def _normalize_steam_release_dates(series: pd.Series) -> tuple[pd.Series, int]:
     """
-    Per-cell date normalization for Steam ReleaseDate values.
+    Date normalization for Steam ReleaseDate values (see pipelines/dates.py).
     Handles:
       - "22 Apr, 2026"   (DD Mon, YYYY)
       - "Apr 23, 2026"   (Mon DD, YYYY)
@@ -45,40 +46,8 @@ def _normalize_steam_release_dates(series: pd.Series) -> tuple[pd.Series, int]:
     Output format: "%d-%m-%Y" (consistent with existing stored data).
     Returns (normalized_series, count_of_values_changed).
     """
-    _MONTH_NAMES = {
-        "january": 1, "february": 2, "march": 3, "april": 4,
-        "may": 5, "june": 6, "july": 7, "august": 8,
-        "september": 9, "october": 10, "november": 11, "december": 12,
-    }
-    _MONTH_YEAR_RE = re.compile(
-        r"^([A-Za-z]+)\s+(\d{4})$"
-    )
-
-    def _parse(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return val
-        s = str(val).strip()
-
-        # "Month YYYY" — no day present
-        m = _MONTH_YEAR_RE.match(s)
-        if m:
-            month_str, year_str = m.group(1).lower(), m.group(2)
-            month_num = _MONTH_NAMES.get(month_str)
-            if month_num:
-                try:
-                    return pd.Timestamp(int(year_str), month_num, 1).strftime("%d-%m-%Y")
-                except Exception:
-                    pass
-
-        # Try pandas per-cell (handles "22 Apr, 2026", "Apr 23, 2026", ISO, etc.)
-        try:
-            return pd.to_datetime(s, dayfirst=True).strftime("%d-%m-%Y")
-        except Exception:
-            return s  # "Coming Soon", "TBD", etc.
-
-    original = series.copy()
-    normalized = series.apply(_parse)
-    changed = int((normalized != original).sum())
+    normalized = to_steam_release_dates(series)
+    changed = int((normalized != series).sum())
     return normalized, changed
 
 
@@ -0,0 +1,135 @@
+"""
+Durable queue of DataForSEO task IDs reported complete by pingback.
+
+The pingback receiver (pipelines/pingback_server.py) runs as its own process
+and pushes every completed task ID it is told about into this SQLite queue.
+The collectors (collect_results, collect_manual_bracket, collect_grand_final,
+collect_refresh) consume it:
+
+  ready_from_queue(pending)   pingbacked IDs among the pending ones,
+                              or None when there are none yet
+  ack(task_ids)               drop IDs whose results have been stored
+  wait_for(pending, timeout)  block until a new pending ID arrives (or
+                              timeout); used by the job loop instead of a
+                              fixed sleep
+
+Pingbacks are a hint. Collectors fetch pingbacked IDs directly and still poll
+tasks_ready for pending IDs that have none (receiver not running, pingback
+lost, or DataForSEO could not reach us), so pingbacks only ever make
+collection faster. An ID whose task_get failed stays queued and is retried on
+the next cycle, but wait_for does not wake for it again.
+"""
+
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable
+
+from config import PINGBACK_DB
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pingbacks (
+    task_id     TEXT PRIMARY KEY,
+    tag         TEXT,
+    received_at TEXT NOT NULL DEFAULT (datetime('now'))
+) WITHOUT ROWID;
+"""
+
+WAIT_INTERVAL = 1.0   # seconds between queue checks in wait_for()
+_CHUNK = 500          # IDs per IN (...) query, well under SQLite's variable limit
+
+
+class PingbackQueue:
+    """SQLite-backed set of completed task IDs, safe across processes."""
+
+    def __init__(self, path: Path = PINGBACK_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def push(self, task_id: str, tag: str | None = None) -> None:
+        """Record task_id as complete (idempotent)."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO pingbacks (task_id, tag) VALUES (?, ?)", (task_id, tag),
+            )
+
+    def ready(self, task_ids: Iterable[str]) -> set[str]:
+        """The subset of task_ids that have been pingbacked."""
+        ids = list(task_ids)
+        found: set[str] = set()
+        with closing(self._connect()) as conn:
+            for i in range(0, len(ids), _CHUNK):
+                chunk = ids[i:i + _CHUNK]
+                rows = conn.execute(
+                    f"SELECT task_id FROM pingbacks WHERE task_id IN ({','.join('?' * len(chunk))})", chunk,
+                ).fetchall()
+                found.update(r[0] for r in rows)
+        return found
+
+    def ack(self, task_ids: Iterable[str]) -> None:
+        """Remove consumed task IDs."""
+        ids = [(tid,) for tid in task_ids]
+        if ids:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("DELETE FROM pingbacks WHERE task_id = ?", ids)
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM pingbacks").fetchone()[0]
+
+
+def ready_from_queue(task_ids: Iterable[str], queue: PingbackQueue | None = None) -> set[str] | None:
+    """
+    Pingbacked IDs among task_ids, or None when there are none (the caller
+    should then poll tasks_ready). Never raises — a broken queue means polling.
+    """
+    try:
+        found = (queue if queue is not None else PingbackQueue()).ready(task_ids)
+    except Exception as exc:
+        log.warning("Pingback queue unavailable (%s) — polling tasks_ready", exc)
+        return None
+    return found or None
+
+
+def ack(task_ids: Iterable[str], queue: PingbackQueue | None = None) -> None:
+    """Drop consumed IDs from the queue (no-op if the queue is unavailable)."""
+    try:
+        (queue if queue is not None else PingbackQueue()).ack(task_ids)
+    except Exception as exc:
+        log.warning("Could not ack pingbacks: %s", exc)
+
+
+def wait_for(
+    task_ids: Iterable[str],
+    timeout: float,
+    queue: PingbackQueue | None = None,
+    interval: float = WAIT_INTERVAL,
+) -> set[str]:
+    """
+    Sleep up to timeout seconds, returning early as soon as any of task_ids
+    is pingbacked. IDs already queued when the wait starts were seen by the
+    cycle that just ran and do not end it. Returns the newly pingbacked IDs
+    (empty on timeout).
+    """
+    ids = list(task_ids)
+    deadline = time.monotonic() + timeout
+    seen = (ready_from_queue(ids, queue) or set()) if ids else set()
+    while True:
+        found = (ready_from_queue(ids, queue) or set()) - seen if ids else None
+        if found:
+            return found
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return set()
+        time.sleep(min(interval, remaining))
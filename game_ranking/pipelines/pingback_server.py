@@ -0,0 +1,133 @@
+"""
+Standalone HTTP receiver for DataForSEO task pingbacks.
+
+DataForSEO calls a task's pingback_url with a GET once the task completes,
+substituting $id / $tag in the URL. Point PINGBACK_URL at this receiver, e.g.
+
+    GAME_RANKING_PINGBACK_URL="https://<public host>/pingback?id=$id&tag=$tag"
+
+and run it next to the app (scripts/pingback_receiver.py serve). Each task ID
+it receives is pushed into the durable PingbackQueue, which the collectors
+read instead of polling tasks_ready.
+
+Accepted requests:
+  GET  /pingback?id=<task_id>[&tag=<tag>]   DataForSEO pingback
+  POST /pingback                             postback-style JSON body
+                                             ({"tasks": [{"id": ...}, ...]})
+  GET  /health                               liveness check → "ok"
+
+send_pingback() is the local stand-in for DataForSEO: it fires the same GET
+at a receiver, for tests and for exercising the collect loop offline.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from pipelines.pingback_queue import PingbackQueue
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8765
+PINGBACK_PATH = "/pingback"
+
+
+def _task_ids_from_body(body: bytes) -> list[str]:
+    try:
+        data = json.loads(body.decode("utf-8") or "{}")
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return []
+    tasks = data.get("tasks", []) if isinstance(data, dict) else []
+    return [str(t["id"]) for t in tasks if isinstance(t, dict) and t.get("id")]
+
+
+def _make_handler(queue: PingbackQueue) -> type[BaseHTTPRequestHandler]:
+    class PingbackHandler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, text: str) -> None:
+            payload = text.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _record(self, task_ids: list[str], tag: str | None) -> None:
+            for task_id in task_ids:
+                queue.push(task_id, tag)
+            log.info("Pingback: %s", ", ".join(task_ids))
+            self._reply(200, "ok")
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/health":
+                self._reply(200, "ok")
+                return
+            if parts.path != PINGBACK_PATH:
+                self._reply(404, "not found")
+                return
+            params = parse_qs(parts.query)
+            task_ids = [v for v in params.get("id", []) if v and v != "$id"]
+            if not task_ids:
+                self._reply(400, "missing id")
+                return
+            self._record(task_ids, (params.get("tag") or [None])[0])
+
+        def do_POST(self):
+            parts = urlsplit(self.path)
+            if parts.path != PINGBACK_PATH:
+                self._reply(404, "not found")
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            task_ids = _task_ids_from_body(self.rfile.read(length))
+            if not task_ids:
+                self._reply(400, "no task ids")
+                return
+            self._record(task_ids, None)
+
+        def log_message(self, fmt, *args):  # route access logs through logging
+            log.debug("%s - %s", self.address_string(), fmt % args)
+
+    return PingbackHandler
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    queue: PingbackQueue | None = None,
+) -> ThreadingHTTPServer:
+    """Build (but do not start) a receiver bound to host:port (port 0 = any free port)."""
+    return ThreadingHTTPServer((host, port), _make_handler(queue if queue is not None else PingbackQueue()))
+
+
+def serve_in_background(server: ThreadingHTTPServer) -> threading.Thread:
+    """Run server.serve_forever() on a daemon thread; stop it with server.shutdown()."""
+    thread = threading.Thread(target=server.serve_forever, name="pingback-receiver", daemon=True)
+    thread.start()
+    return thread
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Run the receiver in the foreground until interrupted."""
+    server = make_server(host, port)
+    log.info("Pingback receiver listening on http://%s:%d%s", host, server.server_port, PINGBACK_PATH)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def send_pingback(base_url: str, task_id: str, tag: str = "", timeout: float = 5.0) -> int:
+    """Fire a DataForSEO-style pingback GET at a receiver. Returns the HTTP status."""
+    resp = requests.get(
+        base_url.rstrip("/") + PINGBACK_PATH,
+        params={"id": task_id, "tag": tag},
+        timeout=timeout,
+    )
+    return resp.status_code
@@ -0,0 +1,380 @@
+"""
+Headless ranking engine — the Steam / Non-Steam priority rankings without Streamlit.
+
+The Report tabs score the session's snapshots with the sidebar weights; this
+module does the same from files so rankings (and the tournament seeding that
+reads 'Final Priority Score' / 'priority_score') can run from cron:
+
+  load_weights(path)           weights JSON merged over DEFAULT_WEIGHTS
+  rank_steam(...)              prepare_steam → score_steam, sorted
+  dedup_nonsteam(df)           most recent row per Game Title
+  prepare_nonsteam(...)        dedup → filter → dates → numeric views → on_steam flag
+  load_prepared_nonsteam(...)  prepare_nonsteam, materialized once per snapshot pair
+  rank_prepared_nonsteam(...)  score_nonsteam over a prepared frame, sorted
+  rank_nonsteam(...)           prepare + rank in one call (no Steam cross-check)
+  exclude_on_steam(ns, steam)  drop Non-Steam titles that are already on Steam
+  run_ranking(...)             latest snapshots + stored trends → ranked CSVs
+
+Everything in a Non-Steam ranking that does not depend on the weights or the
+trends scores is done by prepare_nonsteam. load_prepared_nonsteam keeps its
+result in NONSTEAM_READY_FILE keyed on the size and mtime of the Non-Steam and
+Steam snapshots it was built from, so it is rebuilt only when an ingest or
+upload writes a new snapshot; the Non-Steam tab and run_ranking rank from it.
+Entry point: python -m game_ranking.rank (see rank.py).
+"""
+
+import datetime as dt
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from calculation.process_data import DeveloperIndex, get_developer_index
+from calculation.ranking_cache import frame_fingerprint
+from calculation.row_store import RowStore, prepare_steam, row_digests
+from calculation.scoring import coerce_views, score_nonsteam, score_steam
+from calculation.trends_score_store import open_trends_store
+from config import (
+    NONSTEAM_READY_FILE,
+    RANKED_DIR,
+    RANKING_WEIGHTS_FILE,
+    ROW_STORE_NONSTEAM_FILE,
+    get_latest_nonsteam_csv,
+    get_latest_steam_csv,
+)
+from pipelines.dates import parse_dates
+from pipelines.snapshot_store import read_snapshot
+
+log = logging.getLogger(__name__)
+
+# Same defaults as the Report tab sidebars
+DEFAULT_WEIGHTS: dict[str, dict[str, float]] = {
+    "steam":     {"max_followers": 398955, "followers": 5, "developers": 2, "trends": 2},
+    "non_steam": {"youtube": 5, "trends": 2},
+}
+
+NONSTEAM_DATE_COLUMNS = ['YouTube ReleaseDate', 'Release Date']
+_DATE_STORE_FMT = "%Y-%m-%dT%H:%M:%S"
+_READY_VERSION = 1   # bump when prepare_nonsteam's output changes shape
+
+
+# ── Weights ───────────────────────────────────────────────────────────────────
+
+def load_weights(path: Path = RANKING_WEIGHTS_FILE) -> dict[str, dict[str, float]]:
+    """
+    Weights from a JSON file shaped like DEFAULT_WEIGHTS; missing sections or
+    keys keep their defaults. A missing file means all defaults. Unknown keys
+    raise ValueError so a typo does not silently fall back to a default.
+    """
+    weights = {section: dict(values) for section, values in DEFAULT_WEIGHTS.items()}
+    path = Path(path)
+    if not path.exists():
+        return weights
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for section, values in data.items():
+        if section not in weights:
+            raise ValueError(f"{path.name}: unknown section '{section}'")
+        unknown = set(values) - set(weights[section])
+        if unknown:
+            raise ValueError(f"{path.name}: unknown {section} weight(s): {', '.join(sorted(unknown))}")
+        weights[section].update({k: float(v) for k, v in values.items()})
+    return weights
+
+
+# ── Steam ─────────────────────────────────────────────────────────────────────
+
+def rank_steam(
+    df_steam: pd.DataFrame,
+    trends: dict,
+    weights: dict[str, float],
+    developer_list: "pd.DataFrame | DeveloperIndex | None" = None,
+) -> pd.DataFrame:
+    """Score a prepared (flagged) Steam frame and sort it by Final Priority Score."""
+    return score_steam(
+        df_steam, trends,
+        max_followers=weights["max_followers"],
+        w_followers=weights["followers"], w_developers=weights["developers"], w_trends=weights["trends"],
+        developer_list=developer_list,
+    ).sort_values('Final Priority Score', ascending=False, ignore_index=True)
+
+
+# ── Non-Steam ─────────────────────────────────────────────────────────────────
+
+def _parse_dates_incremental(df: pd.DataFrame, store_path: Path = ROW_STORE_NONSTEAM_FILE) -> pd.DataFrame:
+    """
+    parse_dates for both date columns, computed only for rows whose
+    normalised Game Title or raw date strings are new since the last load.
+    """
+    keys = df['Game Title'].astype(str).str.strip().str.lower()
+    store = RowStore(store_path, NONSTEAM_DATE_COLUMNS)
+
+    def _compute(rows: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({
+            c: parse_dates(rows[c]).dt.strftime(_DATE_STORE_FMT)
+            for c in NONSTEAM_DATE_COLUMNS
+        })
+
+    derived, _ = store.apply(df, row_digests(keys, df[NONSTEAM_DATE_COLUMNS]), _compute)
+    return pd.DataFrame({
+        c: pd.to_datetime(derived[c], format=_DATE_STORE_FMT, errors='coerce') for c in NONSTEAM_DATE_COLUMNS
+    }, index=df.index)
+
+
+def dedup_nonsteam(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Keep the most recent row per Game Title. Returns (deduped frame, rows merged).
+    """
+    if 'Game Title' not in df.columns:
+        return df, 0
+    # Determine recency column: prefer date_appended, then YouTube ReleaseDate, then Release Date
+    if 'date_appended' in df.columns:
+        _sort_col = 'date_appended'
+    elif 'YouTube ReleaseDate' in df.columns:
+        _sort_col = 'YouTube ReleaseDate'
+    elif 'Release Date' in df.columns:
+        _sort_col = 'Release Date'
+    else:
+        _sort_col = None
+
+    if _sort_col:
+        deduped = (
+            df
+            .sort_values(_sort_col, ascending=True, na_position='first')
+            .drop_duplicates(subset=['Game Title'], keep='last')
+            .reset_index(drop=True)
+        )
+    else:
+        deduped = df.drop_duplicates(subset=['Game Title'], keep='last').reset_index(drop=True)
+    return deduped, len(df) - len(deduped)
+
+
+@dataclass
+class NonSteamReady:
+    """
+    A ranking-ready Non-Steam frame: deduplicated, filtered to ranked games,
+    typed dates and views, and an on_steam flag. source identifies the
+    snapshots it was built from (None when built from an in-memory frame).
+    """
+    frame: pd.DataFrame
+    raw_rows: int
+    dedup_merged: int
+    source: dict | None = field(default=None)
+
+    @property
+    def key(self) -> str:
+        """Stable string for ranking cache keys."""
+        return json.dumps(self.source, sort_keys=True) if self.source else frame_fingerprint(self.frame)
+
+
+def _normalized_titles(values: pd.Series) -> pd.Series:
+    return values.astype(str).str.strip().str.lower()
+
+
+def prepare_nonsteam(
+    df_raw: pd.DataFrame,
+    steam_names: pd.Series | None = None,
+    store_path: Path = ROW_STORE_NONSTEAM_FILE,
+) -> NonSteamReady:
+    """
+    Dedup, filter, parse dates and coerce YouTube Views on the raw Non-Steam
+    frame, and flag rows whose Game Title matches one of steam_names (case-
+    and whitespace-insensitive) in a boolean on_steam column.
+    """
+    df_nonsteam = df_raw.copy()
+
+    # Normalise date_appended to YYYY-MM-DD so sorting and "New Today" checks
+    # work correctly regardless of whether the CSV used M/D/YYYY or ISO format.
+    if 'date_appended' in df_nonsteam.columns:
+        df_nonsteam['date_appended'] = (
+            pd.to_datetime(df_nonsteam['date_appended'], errors='coerce')
+            .dt.strftime('%Y-%m-%d')
+        )
+
+    # ── Deduplicate: keep most recent row per Game Title ──────────────────────
+    _raw_row_count = len(df_nonsteam)
+    df_nonsteam, _dedup_merged = dedup_nonsteam(df_nonsteam)
+
+    # ── Pre-processing: filter to ranked games ────────────────────────────────
+    df_nonsteam['SteamStatus'] = df_nonsteam['SteamStatus'].fillna('Needs Verification')
+    df_nonsteam_filter = df_nonsteam[
+        (df_nonsteam['SteamStatus'] != 'PC Game (on Steam)') &
+        (df_nonsteam['SteamStatus'] != 'Needs Verification') &
+        (df_nonsteam['Category'].str.strip().str.lower() == 'main game')
+    ].reset_index(drop=True)
+    # Parsed dates are reused from the row store for rows seen on earlier loads
+    df_nonsteam_filter[NONSTEAM_DATE_COLUMNS] = _parse_dates_incremental(df_nonsteam_filter, store_path)
+    df_nonsteam_filter['YouTube Views'] = coerce_views(df_nonsteam_filter['YouTube Views'])
+
+    steam_titles = set(_normalized_titles(steam_names.dropna())) if steam_names is not None else set()
+    df_nonsteam_filter['on_steam'] = _normalized_titles(df_nonsteam_filter['Game Title']).isin(steam_titles)
+    return NonSteamReady(df_nonsteam_filter, _raw_row_count, _dedup_merged)
+
+
+def _snapshot_signature(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return {"path": str(path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_ready(path: Path) -> NonSteamReady | None:
+    if not path.exists():
+        return None
+    try:
+        return NonSteamReady(**pd.read_pickle(path))
+    except Exception as exc:
+        log.warning("Could not read %s (%s) — rebuilding", path.name, exc)
+        return None
+
+
+def _write_ready(ready: NonSteamReady, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    # A plain dict, so the file does not depend on the NonSteamReady class
+    pd.to_pickle({"frame": ready.frame, "raw_rows": ready.raw_rows,
+                  "dedup_merged": ready.dedup_merged, "source": ready.source}, tmp)
+    tmp.replace(path)
+
+
+def load_prepared_nonsteam(
+    nonsteam_csv: Path | None = None,
+    steam_csv: Path | None = None,
+    path: Path = NONSTEAM_READY_FILE,
+    store_path: Path = ROW_STORE_NONSTEAM_FILE,
+) -> NonSteamReady:
+    """
+    prepare_nonsteam for the latest (or given) Non-Steam snapshot, flagged
+    against the latest (or given) Steam snapshot's Names. Served from `path`
+    while both snapshots have the size and mtime it was built from; rebuilt
+    and rewritten otherwise.
+    """
+    nonsteam_csv = Path(nonsteam_csv) if nonsteam_csv else get_latest_nonsteam_csv()
+    steam_csv = Path(steam_csv) if steam_csv else get_latest_steam_csv()
+    path = Path(path)
+    source = {
+        "version":   _READY_VERSION,
+        "non_steam": _snapshot_signature(nonsteam_csv),
+        "steam":     _snapshot_signature(steam_csv),
+    }
+    cached = _read_ready(path)
+    if cached is not None and cached.source == source:
+        return cached
+
+    steam_names = read_snapshot(steam_csv, columns=['Name'])['Name'] if source["steam"] else None
+    ready = prepare_nonsteam(read_snapshot(nonsteam_csv), steam_names, store_path)
+    ready.source = source
+    try:
+        _write_ready(ready, path)
+    except OSError as exc:
+        log.warning("Could not write %s: %s", path, exc)
+    log.info("Prepared %d ranked Non-Steam rows from %s (%d on Steam)",
+             len(ready.frame), nonsteam_csv.name, int(ready.frame['on_steam'].sum()))
+    return ready
+
+
+def rank_prepared_nonsteam(
+    ready: NonSteamReady,
+    trends: dict,
+    w_youtube: float,
+    w_trends: float,
+    today: dt.date,
+    exclude_steam: bool = True,
+) -> pd.DataFrame:
+    """
+    Score a prepared frame and sort it by priority_score. Scores are normalised
+    over every prepared row, so dropping on_steam rows afterwards (exclude_steam)
+    ranks the rest exactly as rank_nonsteam followed by exclude_on_steam would.
+    """
+    ranked = score_nonsteam(
+        ready.frame, trends,
+        w_youtube=w_youtube, w_trends=w_trends, today=today,
+    ).sort_values('priority_score', ascending=False, ignore_index=True)
+    if exclude_steam:
+        ranked = ranked[~ranked['on_steam']].reset_index(drop=True)
+    return ranked.drop(columns='on_steam')
+
+
+def rank_nonsteam(
+    df_raw: pd.DataFrame,
+    trends: dict,
+    w_youtube: float,
+    w_trends: float,
+    today: dt.date,
+    store_path: Path = ROW_STORE_NONSTEAM_FILE,
+) -> tuple[pd.DataFrame, int, int]:
+    """
+    Dedup, filter, parse dates and score the raw Non-Steam frame.
+    Returns (ranked frame sorted by priority_score, raw row count, duplicates merged).
+    """
+    ready = prepare_nonsteam(df_raw, store_path=store_path)
+    ranked = rank_prepared_nonsteam(ready, trends, w_youtube, w_trends, today, exclude_steam=False)
+    return ranked, ready.raw_rows, ready.dedup_merged
+
+
+def exclude_on_steam(df_ranked: pd.DataFrame, df_steam: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Drop Non-Steam rows whose Game Title matches a Steam Name (case- and
+    whitespace-insensitive). Returns (remaining rows, number removed).
+    """
+    steam_titles = set(
+        df_steam['Name'].dropna().astype(str).str.strip().str.lower()
+    ) if 'Name' in df_steam.columns else set()
+    on_steam = df_ranked['Game Title'].astype(str).str.strip().str.lower().isin(steam_titles)
+    return df_ranked[~on_steam].reset_index(drop=True), int(on_steam.sum())
+
+
+# ── Batch run ─────────────────────────────────────────────────────────────────
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    df.to_csv(tmp, index=False, encoding="utf-8-sig")
+    tmp.replace(path)
+
+
+def run_ranking(
+    weights: dict[str, dict[str, float]] | None = None,
+    out_dir: Path = RANKED_DIR,
+    steam_csv: Path | None = None,
+    nonsteam_csv: Path | None = None,
+    trends: dict | None = None,
+    today: dt.date | None = None,
+) -> dict:
+    """
+    Rank the latest (or given) Steam and Non-Steam snapshots and write
+    ranked_steam_<date>.csv and ranked_non_steam_<date>.csv to out_dir.
+    trends defaults to every stored trends score. Returns a summary with the
+    output paths and row counts.
+    """
+    weights = weights or load_weights()
+    today = today or dt.date.today()
+    steam_csv = Path(steam_csv) if steam_csv else get_latest_steam_csv()
+    nonsteam_csv = Path(nonsteam_csv) if nonsteam_csv else get_latest_nonsteam_csv()
+    if trends is None:
+        trends = open_trends_store().scores()
+
+    dev_index = get_developer_index()
+    df_steam = prepare_steam(read_snapshot(steam_csv), dev_index)
+    steam_ranked = rank_steam(df_steam, trends, weights["steam"], dev_index)
+
+    ns_weights = weights["non_steam"]
+    ready = load_prepared_nonsteam(nonsteam_csv, steam_csv)
+    ns_ranked = rank_prepared_nonsteam(ready, trends, ns_weights["youtube"], ns_weights["trends"], today)
+    raw_rows, dedup_merged = ready.raw_rows, ready.dedup_merged
+    on_steam = int(ready.frame['on_steam'].sum())
+
+    out_dir = Path(out_dir)
+    steam_out = out_dir / f"ranked_steam_{today.isoformat()}.csv"
+    nonsteam_out = out_dir / f"ranked_non_steam_{today.isoformat()}.csv"
+    _write_csv(steam_ranked, steam_out)
+    _write_csv(ns_ranked, nonsteam_out)
+    log.info("Ranked %d Steam games (%s) → %s", len(steam_ranked), steam_csv.name, steam_out.name)
+    log.info("Ranked %d Non-Steam games (%s; %d raw rows, %d duplicates merged, %d on Steam) → %s",
+             len(ns_ranked), nonsteam_csv.name, raw_rows, dedup_merged, on_steam, nonsteam_out.name)
+    return {
+        "steam":     {"source": str(steam_csv), "output": str(steam_out), "ranked": len(steam_ranked)},
+        "non_steam": {"source": str(nonsteam_csv), "output": str(nonsteam_out), "ranked": len(ns_ranked),
+                      "raw_rows": raw_rows, "duplicates_merged": dedup_merged, "on_steam_removed": on_steam},
+    }
@@ -2,11 +2,28 @@
 Refresh Trends pipeline — async batch-POST pattern for the Refresh Trends buttons.
 
 Flow:
-  submit_refresh()   → build one [anchor, game] task per game → bulk POST → save state
-  collect_refresh()  → poll tasks_ready → fetch results → normalize → return scores
+  submit_refresh()   → pack games into [anchor, game × 4] tasks → bulk POST → save state
+  collect_refresh()  → pingbacked IDs (or poll tasks_ready) → fetch results → normalize → return scores
 
-Each task contains exactly 2 keywords: [cleaned_anchor, cleaned_game].
+Each task contains the cleaned anchor plus up to BATCH_SIZE (4) cleaned games —
+Google Trends' 5-keyword limit — so values within a task share one scale.
+batch_size=1 gives the old one-task-per-game [anchor, game] layout.
 Normalization: score = (game_raw / anchor_raw) * 100  (anchor = 100 reference).
+
+State keeps one entry per game; games packed into the same task share its
+task_id, and each game gets its own status and scores on collection. When a
+packed task comes back with the anchor under MIN_RAW_SCORE (one game so big
+it flattens the anchor), its games are resubmitted as single [anchor, game]
+tasks instead of being scored 0 — one outlier no longer zeroes its
+batch-mates. A game whose anchor is 0 even on its own is marked failed.
+
+Games the saved tournament already links to the anchor with a high-confidence
+chain (pipelines/tournament_chain.py) get no task: they are recorded as
+"chained" with their score filled in, and collect_refresh() reports them
+alongside the first collected batch. Only today's tournament results are
+chained (CHAIN_MAX_AGE_DAYS), and a chained score is written with the fetch
+date of its oldest link rather than the refresh time, so a refresh never
+passes off old results as fresh.
 """
 
 import json
@@ -14,26 +31,30 @@ import logging
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
-import pandas as pd
 
 from config import (
     REFRESH_TRENDS_STATE_FILE,
     TOURNAMENT_STATE_FILE,
-    TRENDS_CACHE_FILE,
 )
 from calculation.dataforseo_trends import (
     post_tasks_bulk,
-    fetch_tasks_ready,
-    fetch_task_result,
-    check_task,
+    collect_ready_results,
     GAMES_CATEGORY,
 )
-from calculation.trends_tournament import strip_edition_suffix
+from calculation.trends_score_store import TS_FMT, TrendsScoreStore, open_trends_store
+from calculation.trends_tournament import strip_edition_suffix, BATCH_SIZE
+from pipelines import pingback_queue
+from pipelines.tournament_chain import MIN_RAW_SCORE, chain_scores
+from pipelines.tournament_state import PINGBACK_URL
 
 log = logging.getLogger(__name__)
 
 _DATE_FMT = "%Y-%m-%d %H:%M:%S"
 _MAX_TASKS_PER_POST = 100
+# Refresh targets scores past the trends TTL (24 h): only same-day tournament
+# results can stand in for a refresh. Older chains would be stamped with an
+# already-stale date and come straight back on the next refresh.
+CHAIN_MAX_AGE_DAYS = 0
 
 
 # ── State helpers ─────────────────────────────────────────────────────────────
@@ -150,6 +171,49 @@ def _date_range() -> tuple[str, str]:
     return (today - timedelta(days=30)).isoformat(), today.isoformat()
 
 
+# ── Packing ───────────────────────────────────────────────────────────────────
+
+def _pack_games(games: list[str], cleaned_anchor: str, batch_size: int) -> list[list[tuple[str, str]]]:
+    """
+    Split games into per-task batches of (game, cleaned_game) with at most
+    batch_size distinct cleaned keywords besides the anchor. Games whose
+    cleaned name is already in the batch (or is the anchor) ride along free.
+    """
+    batches: list[list[tuple[str, str]]] = []
+    batch: list[tuple[str, str]] = []
+    keywords: set[str] = set()
+    for game in games:
+        cleaned = strip_edition_suffix(game)
+        is_new = cleaned != cleaned_anchor and cleaned not in keywords
+        if is_new and len(keywords) >= batch_size:
+            batches.append(batch)
+            batch, keywords = [], set()
+        batch.append((game, cleaned))
+        if cleaned != cleaned_anchor:
+            keywords.add(cleaned)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _task_keywords(cleaned_anchor: str, cleaned_games: list[str]) -> list[str]:
+    """[anchor, game, ...] with duplicates dropped — the order the task was submitted in."""
+    return list(dict.fromkeys([cleaned_anchor, *cleaned_games]))
+
+
+def _task_payload(keywords: list[str]) -> dict:
+    date_from, date_to = _date_range()
+    return {
+        "keywords":      keywords,
+        "category_code": GAMES_CATEGORY,
+        "date_from":     date_from,
+        "date_to":       date_to,
+        "type":          "web",
+        "item_types":    ["google_trends_graph"],
+        "pingback_url":  PINGBACK_URL,
+    }
+
+
 # ── Submit ────────────────────────────────────────────────────────────────────
 
 def submit_refresh(
@@ -159,31 +223,37 @@ def submit_refresh(
     password: str,
     source: str = "refresh_all",
     state_file=None,
+    use_tournament: bool = True,
+    batch_size: int = BATCH_SIZE,
 ) -> dict:
     """
-    Build one DataForSEO task per game (keywords=[cleaned_anchor, cleaned_game]),
-    batch-POST all tasks at once, persist state. Returns the new state dict.
+    Pack games into DataForSEO tasks of the anchor plus batch_size games
+    (keywords=[cleaned_anchor, cleaned_game, ...]), batch-POST all tasks at
+    once, persist state. Returns the new state dict.
+
+    With use_tournament, games whose score can be chained from the saved
+    tournament results are not submitted; they are stored as "chained" tasks.
 
     Overwrites any previous refresh state — callers should not call this while
     a previous run has pending tasks unless they intend to discard it.
     """
     cleaned_anchor = strip_edition_suffix(anchor)
-    date_from, date_to = _date_range()
+
+    chained: dict[str, dict] = {}
+    if use_tournament:
+        try:
+            chained, games = chain_scores(games, anchor, max_age_days=CHAIN_MAX_AGE_DAYS)
+        except Exception as exc:
+            log.warning("Chain normalization unavailable (%s) — refreshing every game", exc)
 
     task_payloads: list[dict] = []
     task_metas:    list[dict] = []
 
-    for game in games:
-        cleaned_game = strip_edition_suffix(game)
-        task_payloads.append({
-            "keywords":      [cleaned_anchor, cleaned_game],
-            "category_code": GAMES_CATEGORY,
-            "date_from":     date_from,
-            "date_to":       date_to,
-            "type":          "web",
-            "item_types":    ["google_trends_graph"],
-        })
-        task_metas.append({"game": game, "cleaned_game": cleaned_game})
+    for batch in _pack_games(games, cleaned_anchor, max(1, batch_size)):
+        task_payloads.append(_task_payload(
+            _task_keywords(cleaned_anchor, [cleaned for _game, cleaned in batch]),
+        ))
+        task_metas.append({"games": batch})
 
     # Chunk into MAX_TASKS_PER_POST=100 per POST call
     all_task_ids: list[str | None] = []
@@ -195,21 +265,35 @@ def submit_refresh(
             ids.append(None)
         all_task_ids.extend(ids)
 
-    tasks = []
-    for meta, task_id in zip(task_metas, all_task_ids):
-        tasks.append({
-            "game":             meta["game"],
-            "cleaned_game":     meta["cleaned_game"],
-            "task_id":          task_id,
-            "status":           "pending" if task_id else "failed",
+    tasks = [
+        {
+            "game":             game,
+            "cleaned_game":     strip_edition_suffix(game),
+            "task_id":          None,
+            "status":           "chained",
             "raw_game_score":   None,
             "raw_anchor_score": None,
-            "normalized_score": None,
-        })
+            "normalized_score": info["score"],
+            "fetched_date":     info["fetched_date"],
+        }
+        for game, info in chained.items()
+    ]
+    for meta, task_id in zip(task_metas, all_task_ids):
+        for game, cleaned_game in meta["games"]:
+            tasks.append({
+                "game":             game,
+                "cleaned_game":     cleaned_game,
+                "task_id":          task_id,
+                "status":           "pending" if task_id else "failed",
+                "raw_game_score":   None,
+                "raw_anchor_score": None,
+                "normalized_score": None,
+            })
+        game_names = [game for game, _cleaned in meta["games"]]
         if task_id:
-            log.info("Submitted refresh task %s for %s", task_id, meta["game"])
+            log.info("Submitted refresh task %s for %s", task_id, game_names)
         else:
-            log.warning("Refresh task submission failed for %s", meta["game"])
+            log.warning("Refresh task submission failed for %s", game_names)
 
     state = {
         "status":          "submitted",
@@ -232,6 +316,8 @@ def collect_refresh(
     password: str,
     on_task_complete=None,
     state_file=None,
+    poll: bool = True,
+    on_batch=None,
 ) -> dict:
     """
     Poll DataForSEO tasks_ready, fetch completed tasks, normalize scores.
@@ -240,67 +326,89 @@ def collect_refresh(
       on_task_complete: optional callable(game, score, n_done, n_total, failed)
         called immediately after each task result is processed. Use this to
         drive real-time progress UI in the caller (e.g. Streamlit widgets).
+      poll: False fetches only pingbacked tasks, without polling tasks_ready.
+      on_batch: optional callable(n_fetched, n_total) passed to
+        collect_ready_results, called after each batch of task_gets.
 
     Returns:
       {
         "checked":   int,           # tasks from tasks_ready that were ours
-        "collected": int,           # tasks successfully parsed (anchor_raw > 0)
-        "errors":    int,           # tasks with all-zero scores
+        "collected": int,           # games successfully scored
+        "errors":    int,           # games with all-zero scores
         "complete":  bool,          # True when no pending tasks remain
         "scores":    {game: int},   # normalized scores for collected tasks
+        "fetched_at": {game: str},  # chained scores' fetch time (TS_FMT);
+                                    # other scores were fetched now
       }
 
-    Caller is responsible for applying scores to session_state and writing CSV.
+    Caller is responsible for applying scores to session_state and
+    write_scores(scores, fetched_at=fetched_at).
     """
     state = load_state(state_file=state_file)
     if state["status"] not in ("submitted", "collecting"):
-        return {"checked": 0, "collected": 0, "errors": 0, "complete": False, "scores": {}}
+        return {"checked": 0, "collected": 0, "errors": 0, "complete": False, "scores": {}, "fetched_at": {}}
 
     state["status"] = "collecting"
 
-    # Build pending map: task_id → task index
-    pending_map: dict[str, int] = {
-        t["task_id"]: i
-        for i, t in enumerate(state["tasks"])
-        if t["status"] == "pending" and t.get("task_id")
-    }
+    # Chained scores need no API call — report them with the first collect
+    chained = [t for t in state["tasks"] if t["status"] == "chained"]
+    scores:  dict[str, int] = {}
+    for n_done, task in enumerate(chained, start=1):
+        task["status"] = "complete"
+        scores[task["game"]] = int(task["normalized_score"])
+        if on_task_complete is not None:
+            try:
+                on_task_complete(task["game"], int(task["normalized_score"]), n_done, len(chained), False)
+            except Exception:
+                pass  # never let a UI callback crash the pipeline
+
+    # Build pending map: task_id → indices of the games packed into it
+    pending_map: dict[str, list[int]] = {}
+    for i, t in enumerate(state["tasks"]):
+        if t["status"] == "pending" and t.get("task_id"):
+            pending_map.setdefault(t["task_id"], []).append(i)
 
     if not pending_map:
         state["status"] = "complete"
+        state["collected_count"] = state.get("collected_count", 0) + len(chained)
         save_state(state, state_file=state_file)
         return {
-            "checked": 0, "collected": 0, "errors": 0,
+            "checked": 0, "collected": len(chained), "errors": 0,
             "complete": True, "scores": _extract_scores(state),
+            "fetched_at": _chain_fetched_at(state["tasks"]),
         }
 
-    ready_ids = fetch_tasks_ready(login, password)
-    our_ready = set(pending_map.keys()) & ready_ids
-
-    if len(ready_ids) >= 1000:
-        missing_from_ready = set(pending_map.keys()) - our_ready
-        if missing_from_ready:
-            log.info("tasks_ready saturated (1000 cap); checking %d pending tasks directly", len(missing_from_ready))
-            for tid in missing_from_ready:
-                if check_task(tid, login, password) is not None:
-                    our_ready.add(tid)
-
-    checked   = len(our_ready)
-    collected = 0
-    errors    = 0
-    scores:   dict[str, int] = {}
-    n_total   = len(our_ready)
-    n_done    = 0
-
     anchor_cleaned = state["anchor_cleaned"]
 
-    for task_id in list(our_ready):
-        task_idx = pending_map[task_id]
+    # kw_list must match the submission order: [anchor, game, ...]
+    pending_kws = {
+        tid: _task_keywords(anchor_cleaned, [state["tasks"][i]["cleaned_game"] for i in idxs])
+        for tid, idxs in pending_map.items()
+    }
+    # Pingbacked IDs are fetched directly; tasks_ready covers the rest
+    ready_results = collect_ready_results(
+        pending_kws, login, password, ready_ids=pingback_queue.ready_from_queue(pending_kws), poll=poll,
+        on_batch=on_batch,
+    )
+    pingback_queue.ack(ready_results)
+
+    # Packed tasks whose anchor collapsed: rescore each game on its own
+    collapsed = {
+        i for tid, raw in ready_results.items()
+        if len(pending_map[tid]) > 1 and raw.get(anchor_cleaned, 0.0) < MIN_RAW_SCORE
+        for i in pending_map[tid]
+    }
+    checked   = len(ready_results)
+    collected = len(chained)
+    errors    = _resubmit_singles(state, sorted(collapsed), login, password) if collapsed else 0
+    ready_games = [(tid, i) for tid in ready_results for i in pending_map[tid] if i not in collapsed]
+    n_total   = len(ready_games) + len(chained)
+    n_done    = len(chained)
+
+    for task_id, task_idx in ready_games:
+        raw  = ready_results[task_id]
         task = state["tasks"][task_idx]
 
-        # kw_list must match the submission order: [anchor, game]
-        kw_list = [anchor_cleaned, task["cleaned_game"]]
-        raw = fetch_task_result(task_id, kw_list, login, password)
-
         anchor_raw = raw.get(anchor_cleaned, 0.0)
         game_raw   = raw.get(task["cleaned_game"], 0.0)
 
@@ -312,19 +420,18 @@ def collect_refresh(
         task["raw_anchor_score"] = anchor_raw
         task["raw_game_score"]   = game_raw
         task["normalized_score"] = normalized
-        # Mark "complete" if at least one score is non-zero, else "failed"
-        failed = not (anchor_raw > 0 or game_raw > 0)
+        # Without an anchor value there is no score — never record 0 as complete
+        failed = not anchor_raw > 0
         task["status"] = "failed" if failed else "complete"
-
-        scores[task["game"]] = int(normalized)
         n_done += 1
 
         if not failed:
+            scores[task["game"]] = int(normalized)
             collected += 1
             log.info("Collected refresh task %s: %s → %.1f", task_id, task["game"], normalized)
         else:
             errors += 1
-            log.warning("Refresh task %s all-zero scores for %s", task_id, task["game"])
+            log.warning("Refresh task %s has no anchor score for %s", task_id, task["game"])
 
         if on_task_complete is not None:
             try:
@@ -347,6 +454,38 @@ def collect_refresh(
         "errors":    errors,
         "complete":  state["status"] == "complete",
         "scores":    scores,
+        "fetched_at": _chain_fetched_at(chained),
+    }
+
+
+def _resubmit_singles(state: dict, task_idxs: list[int], login: str, password: str) -> int:
+    """
+    Resubmit state["tasks"][i] for each i as its own [anchor, game] task.
+    Returns how many could not be submitted (marked failed).
+    """
+    anchor_cleaned = state["anchor_cleaned"]
+    tasks = [state["tasks"][i] for i in task_idxs]
+    task_ids: list[str | None] = []
+    for start in range(0, len(tasks), _MAX_TASKS_PER_POST):
+        chunk = tasks[start:start + _MAX_TASKS_PER_POST]
+        ids = post_tasks_bulk(
+            [_task_payload(_task_keywords(anchor_cleaned, [t["cleaned_game"]])) for t in chunk], login, password,
+        )
+        task_ids.extend(ids + [None] * (len(chunk) - len(ids)))
+    for task, task_id in zip(tasks, task_ids):
+        task["task_id"] = task_id
+        task["status"] = "pending" if task_id else "failed"
+    log.info("Anchor flattened in a packed task; resubmitted %d game(s) one per task: %s",
+             sum(1 for t in task_ids if t), [t["game"] for t in tasks])
+    return sum(1 for t in task_ids if not t)
+
+
+def _chain_fetched_at(tasks: list[dict]) -> dict[str, str]:
+    """{game: fetch timestamp} for chained tasks, from their oldest link's fetch date."""
+    return {
+        t["game"]: datetime.fromisoformat(t["fetched_date"]).strftime(TS_FMT)
+        for t in tasks
+        if t["status"] == "complete" and t.get("fetched_date")
     }
 
 
@@ -359,32 +498,28 @@ def _extract_scores(state: dict) -> dict[str, int]:
     }
 
 
-# ── CSV write ─────────────────────────────────────────────────────────────────
+# ── Score write ───────────────────────────────────────────────────────────────
 
-def write_scores_to_csv(
+def write_scores(
     scores: dict[str, int],
-    existing_trends: dict,
-    games_fetched: list[str],
-    cached_ts: dict,
+    anchor: str | None = None,
+    store: TrendsScoreStore | None = None,
+    fetched_at: dict[str, str] | None = None,
 ) -> None:
     """
-    Merge new scores into existing_trends and write to TRENDS_CACHE_FILE.
-    Format matches the existing CSV: game_name, trends_score, fetched_at.
-    Existing entries for games not in `scores` are preserved with their original timestamps.
+    Upsert the newly fetched scores into the trends score store (latest score
+    + history). Games not in `scores` keep their stored score and timestamp.
+    fetched_at overrides the stored timestamp per game (chained scores keep
+    their tournament fetch time); other games are stamped now.
     """
-    now = datetime.now().strftime(_DATE_FMT)
-    merged = dict(existing_trends)
-    merged.update(scores)
-    rows = [
-        {
-            "game_name":    g,
-            "trends_score": s,
-            "fetched_at":   now if g in games_fetched else cached_ts.get(g, now),
-        }
-        for g, s in merged.items()
-    ]
+    fetched_at = fetched_at or {}
+    by_time: dict[str | None, dict[str, int]] = {}
+    for game, score in scores.items():
+        by_time.setdefault(fetched_at.get(game), {})[game] = score
     try:
-        pd.DataFrame(rows).to_csv(TRENDS_CACHE_FILE, index=False)
+        store = store if store is not None else open_trends_store()
+        for ts, group in by_time.items():
+            store.upsert_scores(group, fetched_at=ts, anchor=anchor)
     except Exception as e:
-        log.error("Failed to write trends cache CSV: %s", e)
+        log.error("Failed to write trends scores: %s", e)
         raise
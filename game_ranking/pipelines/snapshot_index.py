@@ -0,0 +1,400 @@
+"""
+Key-indexed incremental merges into the raw Steam / Non-Steam snapshots.
+
+The append paths (scraper exports and uploaded CSVs) used to read the whole
+latest snapshot, build a set of every AppId / title in it, then concat and
+write a complete new dated CSV — for uploads of a few hundred rows against a
+history of tens of thousands.
+
+SnapshotIndex keeps, per snapshot kind, one row per CSV record of the latest
+snapshot (SQLite, stdlib):
+
+  snapshots  kind PRIMARY KEY → path, size, mtime_ns, header (JSON), vend
+  rows       kind, key, digest, start, length
+  holes      kind, start, length
+
+key is the normalised AppId / lowercased Game Title, digest a hash of the
+record's cells (date_appended excluded), start / length the record's byte
+span. Starts are virtual: a replaced row's span becomes a hole instead of
+every later row being renumbered, and a row's byte offset in the file is its
+start minus the holes before it. Once holes outnumber an eighth of the rows
+the starts are rewritten and the holes dropped.
+
+merge_snapshot() looks up only the upload's keys, classifies each as new,
+changed or unchanged, and writes only the new and changed rows:
+
+  - new rows are appended to the CSV (in place when the snapshot is already
+    today's file, otherwise after a byte copy into raw_*_YYYY-MM-DD.csv),
+  - a changed row's old byte span is skipped in a copy of the file and the
+    new version appended, so updated rows still move to the end,
+  - unchanged rows are left where they are, date_appended included.
+
+Neither side is parsed into a DataFrame: the upload is serialised once with
+to_csv and the history is only byte-copied. The index is (re)seeded by one
+scan of the CSV when the latest snapshot is not the file it last wrote —
+first use, a new file dropped into raw/, or an in-place rewrite such as
+backfill_steam_status(). Snapshots not yet in the canonical layout (missing
+date_appended, Non-Steam alias columns, non-UTF-8 text) are rewritten once
+through write_snapshot() first.
+
+The Parquet sidecar is not touched by a merge; read_snapshot() sees the CSV
+is newer and rebuilds it on the next read.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from config import SNAPSHOT_INDEX_DB
+from pipelines.snapshot_store import read_snapshot, write_snapshot
+
+log = logging.getLogger(__name__)
+
+KEY_COLUMNS = {"steam": "AppId", "non_steam": "Game Title"}
+_LOOKUP_CHUNK = 500        # keys per IN (...) query, under SQLite's host-parameter limit
+_COMPACT_MIN_HOLES = 1000   # holes tolerated before virtual starts are rewritten as file offsets
+_BOM = b"\xef\xbb\xbf"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    kind     TEXT PRIMARY KEY,
+    path     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    header   TEXT NOT NULL,
+    vend     INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rows (
+    kind   TEXT NOT NULL,
+    key    TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    start  INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_by_key ON rows (kind, key);
+CREATE TABLE IF NOT EXISTS holes (
+    kind   TEXT NOT NULL,
+    start  INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS holes_by_start ON holes (kind, start);
+"""
+
+
+def row_key(kind: str, value: str) -> str:
+    """Merge key for a raw cell: AppId without a float '.0' tail, or the stripped, lowercased title."""
+    value = value.strip()
+    if kind == "steam":
+        head, dot, tail = value.partition(".")
+        return head if dot and head.isdigit() and tail.strip("0") == "" else value
+    return value.lower()
+
+
+def _digest(fields: list[str], skip: int | None) -> str:
+    cells = fields if skip is None else fields[:skip] + fields[skip + 1:]
+    return hashlib.blake2b("\x1f".join(cells).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _records(data: bytes):
+    """
+    Yield (fields, start, end) for each CSV record in data, as byte offsets.
+    Quoted fields may span lines. Blank lines are counted into the preceding
+    record, so the spans tile the data exactly.
+    Raises UnicodeDecodeError for non-UTF-8 text.
+    """
+    offset = len(_BOM) if data.startswith(_BOM) else 0
+    pos = offset
+
+    def lines():
+        nonlocal pos
+        for line in data[offset:].splitlines(keepends=True):
+            pos += len(line)
+            yield line.decode("utf-8")
+
+    pending, start = None, offset
+    for fields in csv.reader(lines()):
+        if fields:
+            if pending is not None:
+                yield pending[0], pending[1], start
+            pending = (fields, start)
+        start = pos
+    if pending is not None:
+        yield pending[0], pending[1], pos
+
+
+def _read_header(csv_path: Path) -> list[str]:
+    with open(csv_path, "rb") as f:
+        first = f.readline()
+    if first.startswith(_BOM):
+        first = first[len(_BOM):]
+    return next(csv.reader([first.decode("utf-8", errors="replace")]), [])
+
+
+@dataclass
+class MergeResult:
+    n_new: int = 0           # distinct keys not in the snapshot before
+    n_updated: int = 0       # distinct keys whose row content changed
+    n_unchanged: int = 0     # distinct keys uploaded with identical content (not rewritten)
+    rows_written: int = 0    # rows appended to the CSV
+    path: Path | None = None
+
+
+class SnapshotIndex:
+    """SQLite-backed key → (digest, byte span) index over the latest raw snapshots."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path is not None else SNAPSHOT_INDEX_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def indexed(self, kind: str) -> dict | None:
+        """The snapshot the index currently describes: {path, size, mtime_ns, header}, or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT path, size, mtime_ns, header FROM snapshots WHERE kind = ?", (kind,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"path": row[0], "size": row[1], "mtime_ns": row[2], "header": json.loads(row[3])}
+
+    def is_current(self, kind: str, csv_path: Path) -> bool:
+        """True when the index was last written for csv_path exactly as it is on disk."""
+        info = self.indexed(kind)
+        if info is None or info["path"] != str(Path(csv_path).resolve()):
+            return False
+        stat = Path(csv_path).stat()
+        return (info["size"], info["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns)
+
+    def seed(self, kind: str, csv_path: Path) -> int:
+        """Rebuild the kind's index from one scan of csv_path. Returns the number of records indexed."""
+        csv_path = Path(csv_path)
+        records = _records(csv_path.read_bytes())
+        header, _, _ = next(records, ([], 0, 0))
+        key_at = header.index(KEY_COLUMNS[kind])
+        skip = header.index("date_appended") if "date_appended" in header else None
+        rows = [
+            (kind, row_key(kind, fields[key_at] if key_at < len(fields) else ""),
+             _digest(fields, skip), start, end - start)
+            for fields, start, end in records
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM rows WHERE kind = ?", (kind,))
+            conn.execute("DELETE FROM holes WHERE kind = ?", (kind,))
+            conn.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?)", rows)
+            self._record(conn, kind, csv_path, header, csv_path.stat().st_size)
+        log.info("Indexed %d %s rows from %s", len(rows), kind, csv_path.name)
+        return len(rows)
+
+    def lookup(self, kind: str, keys) -> dict[str, list[tuple[str, int, int]]]:
+        """{key: [(digest, start, length), …]} (one per stored row, virtual start) for keys in the index."""
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, list[tuple[str, int, int]]] = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i:i + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for key, digest, start, length in conn.execute(
+                    f"SELECT key, digest, start, length FROM rows WHERE kind = ? AND key IN ({marks})",
+                    (kind, *chunk),
+                ):
+                    found.setdefault(key, []).append((digest, start, length))
+        return found
+
+    def file_spans(self, kind: str, spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Map (virtual start, length) spans to sorted byte spans in the file as it is now."""
+        if not spans:
+            return []
+        with closing(self._connect()) as conn:
+            holes = conn.execute("SELECT start, length FROM holes WHERE kind = ? ORDER BY start", (kind,)).fetchall()
+        starts = np.array([h[0] for h in holes], dtype=np.int64)
+        removed = np.concatenate([[0], np.cumsum([h[1] for h in holes], dtype=np.int64)])
+        spans = sorted(spans)
+        shift = removed[np.searchsorted(starts, [start for start, _ in spans])]
+        return [(int(start - sh), length) for (start, length), sh in zip(spans, shift)]
+
+    def apply(self, kind: str, csv_path: Path, replaced: list[str], holes: list[tuple[int, int]],
+              added: list[tuple[str, str, int]], padded: bool = False) -> None:
+        """
+        Record a spliced write: every row of the replaced keys was dropped
+        (their virtual spans become holes) and the added (key, digest, length)
+        rows appended — after one newline byte when padded.
+        """
+        with closing(self._connect()) as conn, conn:
+            header, vend = conn.execute("SELECT header, vend FROM snapshots WHERE kind = ?", (kind,)).fetchone()
+            conn.executemany("DELETE FROM rows WHERE kind = ? AND key = ?", [(kind, key) for key in replaced])
+            conn.executemany("INSERT INTO holes VALUES (?, ?, ?)", [(kind, *hole) for hole in holes])
+            pos, rows = vend + padded, []
+            for key, digest, length in added:
+                rows.append((kind, key, digest, pos, length))
+                pos += length
+            conn.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?)", rows)
+            n_holes, n_rows = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM holes WHERE kind = ?), (SELECT COUNT(*) FROM rows WHERE kind = ?)",
+                (kind, kind),
+            ).fetchone()
+            if n_holes > max(_COMPACT_MIN_HOLES, n_rows // 8):
+                pos -= self._close_holes(conn, kind)
+            self._record(conn, kind, Path(csv_path), json.loads(header), pos)
+
+    @staticmethod
+    def _close_holes(conn: sqlite3.Connection, kind: str) -> int:
+        """Rewrite virtual starts as file offsets and drop the holes. Returns the bytes reclaimed."""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS shifts (start INTEGER PRIMARY KEY, shift INTEGER)")
+        conn.execute("DELETE FROM shifts")
+        conn.execute(
+            "INSERT INTO shifts SELECT start, SUM(length) OVER (ORDER BY start) FROM holes WHERE kind = ?", (kind,)
+        )
+        conn.execute(
+            "UPDATE rows SET start = start - COALESCE((SELECT shift FROM shifts WHERE shifts.start < rows.start"
+            " ORDER BY shifts.start DESC LIMIT 1), 0) WHERE kind = ?",
+            (kind,),
+        )
+        reclaimed = conn.execute("SELECT COALESCE(MAX(shift), 0) FROM shifts").fetchone()[0]
+        conn.execute("DELETE FROM holes WHERE kind = ?", (kind,))
+        return reclaimed
+
+    @staticmethod
+    def _record(conn: sqlite3.Connection, kind: str, csv_path: Path, header: list[str], vend: int) -> None:
+        stat = csv_path.stat()
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, str(csv_path.resolve()), stat.st_size, stat.st_mtime_ns, json.dumps(header), vend),
+        )
+
+
+def _splice(source: Path, out_path: Path, removed: list[tuple[int, int]], tail: bytes) -> bool:
+    """
+    Write source minus the removed byte spans, plus tail, to out_path —
+    appending in place when out_path is source and nothing is removed.
+    Returns True when a newline had to be added before tail.
+    """
+    if out_path == source and not removed:
+        with open(out_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            padded = f.tell() > 0 and _last_byte(f) not in (b"\n", b"\r")
+            f.write(b"\n" * padded + tail)
+        return padded
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(".csv.tmp")
+    with open(source, "rb") as src, open(tmp, "wb+") as dst:
+        pos = 0
+        for start, length in removed:
+            dst.write(src.read(start - pos))
+            src.seek(start + length)
+            pos = start + length
+        while chunk := src.read(1 << 20):
+            dst.write(chunk)
+        padded = dst.tell() > 0 and _last_byte(dst) not in (b"\n", b"\r")
+        dst.write(b"\n" * padded + tail)
+    tmp.replace(out_path)
+    return padded
+
+
+def _last_byte(f) -> bytes:
+    end = f.tell()
+    f.seek(end - 1)
+    byte = f.read(1)
+    f.seek(end)
+    return byte
+
+
+def merge_snapshot(
+    kind: str,
+    upload: pd.DataFrame,
+    source_path: Path,
+    out_path: Path,
+    conform: Callable[[pd.DataFrame], pd.DataFrame],
+    insert_only: bool = False,
+    index: SnapshotIndex | None = None,
+) -> MergeResult:
+    """
+    Merge upload into the latest snapshot at source_path, writing out_path.
+
+    conform maps a snapshot frame to the canonical layout; a snapshot whose
+    header it would change is rewritten through it once before merging.
+    upload rows are written in that layout (missing columns empty, extra
+    columns dropped). With insert_only, rows whose key is already present are
+    skipped instead of replacing the existing row.
+    """
+    source_path, out_path = Path(source_path), Path(out_path)
+    if not source_path.exists():
+        upload = conform(upload)
+        write_snapshot(upload, out_path)
+        n_keys = upload[KEY_COLUMNS[kind]].astype(str).map(lambda v: row_key(kind, v)).nunique()
+        return MergeResult(n_new=n_keys, rows_written=len(upload), path=out_path)
+
+    index = index if index is not None else SnapshotIndex()
+    header = _read_header(source_path)
+    if list(conform(pd.DataFrame(columns=header)).columns) != header:
+        source_path = _rewrite(source_path, out_path, conform)
+        header = _read_header(source_path)
+    if not index.is_current(kind, source_path):
+        try:
+            index.seed(kind, source_path)
+        except UnicodeDecodeError:
+            source_path = _rewrite(source_path, out_path, conform)
+            index.seed(kind, source_path)
+
+    key_at = header.index(KEY_COLUMNS[kind])
+    skip = header.index("date_appended") if "date_appended" in header else None
+    text = upload.reindex(columns=header).to_csv(header=False, index=False).encode("utf-8")
+    uploaded = [(row_key(kind, fields[key_at]), _digest(fields, skip), text[start:end])
+                for fields, start, end in _records(text)]
+
+    existing = index.lookup(kind, (key for key, _, _ in uploaded))
+    per_key: dict[str, list[int]] = {}
+    for i, (key, _, _) in enumerate(uploaded):
+        per_key.setdefault(key, []).append(i)
+
+    result = MergeResult(path=out_path)
+    keep: list[int] = []
+    replaced: list[str] = []
+    holes: list[tuple[int, int]] = []
+    for key, rows in per_key.items():
+        old = existing.get(key)
+        if old is None:
+            result.n_new += 1
+            keep.extend(rows)
+        elif insert_only:
+            continue
+        elif len(old) == 1 and len(rows) == 1 and old[0][0] == uploaded[rows[0]][1]:
+            result.n_unchanged += 1
+        else:
+            result.n_updated += 1
+            keep.extend(rows)
+            replaced.append(key)
+            holes.extend((start, length) for _, start, length in old)
+
+    if not keep:
+        return result
+    keep.sort()
+    tail = b"".join(uploaded[i][2] for i in keep)
+    padded = _splice(source_path, out_path, index.file_spans(kind, holes), tail)
+    index.apply(kind, out_path, replaced, holes,
+                [(uploaded[i][0], uploaded[i][1], len(uploaded[i][2])) for i in keep], padded)
+    result.rows_written = len(keep)
+    return result
+
+
+def _rewrite(source_path: Path, out_path: Path, conform: Callable[[pd.DataFrame], pd.DataFrame]) -> Path:
+    """Rewrite a snapshot into the canonical layout and UTF-8 once; returns the path written."""
+    log.info("Rewriting %s into the canonical snapshot layout", source_path.name)
+    write_snapshot(conform(read_snapshot(source_path)), out_path)
+    return out_path
@@ -0,0 +1,154 @@
+"""
+Columnar storage for the raw Steam / Non-Steam snapshots.
+
+Every raw_steam_YYYY-MM-DD.csv / raw_non_steam_YYYY-MM-DD.csv gets a Parquet
+sidecar with the same stem (raw_steam_2026-06-24.parquet). The CSV stays the
+human-facing export (merges append to it, see snapshot_index.py); the
+dashboard and ranking read through read_snapshot(), which:
+
+  - reads the Parquet sidecar when it is at least as new as the CSV,
+  - projects only the requested columns,
+  - pushes the date_appended predicate down into the Parquet scan,
+  - falls back to the CSV (building the sidecar on the way) otherwise.
+
+A typed helper column, _date_appended, is stored in the sidecar for the
+predicate and never returned; it is parsed with pipelines.dates.parse_dates,
+like every other snapshot date column.
+
+pyarrow is optional. Without it, everything reads and writes CSV exactly as
+before, and the filters are applied in pandas after the read.
+"""
+
+import datetime as dt
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+from pipelines.dates import parse_dates
+
+log = logging.getLogger(__name__)
+
+_DATE_APPENDED_COL = "_date_appended"
+_HELPER_COLUMNS = [_DATE_APPENDED_COL, "_release_date"]   # _release_date: older sidecars only
+
+
+def snapshot_kind(csv_path: Path) -> str:
+    """'non_steam' for raw_non_steam_*.csv files, 'steam' for everything else."""
+    return "non_steam" if Path(csv_path).name.startswith("raw_non_steam") else "steam"
+
+
+def columnar_path(csv_path: Path) -> Path:
+    """Parquet sidecar path for a raw snapshot CSV."""
+    return Path(csv_path).with_suffix(".parquet")
+
+
+def _read_csv(csv_path: Path) -> pd.DataFrame:
+    if snapshot_kind(csv_path) == "steam":
+        return pd.read_csv(csv_path)
+    try:
+        return pd.read_csv(csv_path, encoding="utf-8-sig")
+    except UnicodeDecodeError:
+        from pipelines.normalizer import read_csv_auto_encoding
+        df, _ = read_csv_auto_encoding(Path(csv_path).read_bytes())
+        return df
+
+
+def _predicate_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Typed date columns the read predicates are evaluated against."""
+    if "date_appended" in df.columns:
+        appended = parse_dates(df["date_appended"])
+    else:
+        appended = pd.Series(pd.NaT, index=df.index)
+    return pd.DataFrame({_DATE_APPENDED_COL: appended.astype("datetime64[ms]")}, index=df.index)
+
+
+def _is_fresh(csv_path: Path) -> bool:
+    pq_path = columnar_path(csv_path)
+    if not pq_path.exists():
+        return False
+    if not Path(csv_path).exists():
+        return True
+    return pq_path.stat().st_mtime_ns >= Path(csv_path).stat().st_mtime_ns
+
+
+def build_columnar(csv_path: Path, df: pd.DataFrame | None = None) -> bool:
+    """
+    (Re)write the Parquet sidecar for csv_path from df (or the CSV itself).
+    Returns False when pyarrow is unavailable or the write fails.
+    """
+    if not _HAS_ARROW:
+        return False
+    if df is None:
+        df = _read_csv(csv_path)
+    pq_path = columnar_path(csv_path)
+    tmp = pq_path.with_suffix(".parquet.tmp")
+    try:
+        table = pd.concat([df, _predicate_columns(df)], axis=1)
+        table.to_parquet(tmp, index=False)
+        tmp.replace(pq_path)
+        return True
+    except Exception as exc:
+        log.warning("Could not write columnar snapshot %s: %s", pq_path.name, exc)
+        tmp.unlink(missing_ok=True)
+        return False
+
+
+def write_snapshot(df: pd.DataFrame, csv_path: Path) -> None:
+    """
+    Write a raw snapshot: the CSV export plus its Parquet sidecar.
+    The sidecar is built from the CSV as written, so both reads agree on dtypes.
+    """
+    csv_path = Path(csv_path)
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(csv_path, index=False)
+    if _HAS_ARROW:
+        build_columnar(csv_path)
+
+
+def _as_timestamp(value) -> pd.Timestamp | None:
+    return None if value is None else pd.Timestamp(value)
+
+
+def read_snapshot(
+    csv_path: Path,
+    columns: list[str] | None = None,
+    appended_since: dt.date | str | None = None,
+) -> pd.DataFrame:
+    """
+    Read a raw snapshot, optionally projecting columns and filtering rows.
+
+    appended_since keeps rows whose date_appended is on/after the date; rows
+    with an unparseable date_appended never match.
+    """
+    csv_path = Path(csv_path)
+    since = _as_timestamp(appended_since)
+
+    if _HAS_ARROW and _is_fresh(csv_path):
+        filters = [(_DATE_APPENDED_COL, ">=", since)] if since is not None else []
+        if columns is None:
+            schema_names = pq.read_schema(columnar_path(csv_path)).names
+            read_cols = [c for c in schema_names if c not in _HELPER_COLUMNS]
+        else:
+            read_cols = list(columns)
+        try:
+            table = pq.read_table(columnar_path(csv_path), columns=read_cols, filters=filters or None)
+            return table.to_pandas()
+        except Exception as exc:
+            log.warning("Columnar read of %s failed (%s) — falling back to CSV", csv_path.name, exc)
+
+    df = _read_csv(csv_path)
+    if _HAS_ARROW:
+        build_columnar(csv_path, df)
+
+    if since is not None:
+        df = df[_predicate_columns(df)[_DATE_APPENDED_COL] >= since].reset_index(drop=True)
+    if columns is not None:
+        df = df[list(columns)]
+    return df
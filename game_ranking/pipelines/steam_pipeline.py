@@ -20,6 +20,7 @@ from datetime import datetime, date
 from pathlib import Path
 from config import CSV_STEAM, BASE_DIR, RAW_DIR, CACHE_DIR, get_latest_steam_csv
 from pipelines.state import get_next_window, mark_run_complete, load_state
+from pipelines.snapshot_index import merge_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +132,13 @@ def _normalize_release_dates(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _with_date_appended(df: pd.DataFrame) -> pd.DataFrame:
+    """Canonical raw_steam layout: the scraper's columns plus a trailing date_appended."""
+    if "date_appended" in df.columns:
+        return df
+    return df.assign(date_appended=None)
+
+
 def _append_to_raw_steam(start_date: str, end_date: str, log) -> int:
     """
     Read the temp export CSV and append only new rows (by AppId) to a timestamped
@@ -151,55 +159,31 @@ def _append_to_raw_steam(start_date: str, end_date: str, log) -> int:
     if "AppId" not in new_df.columns and "appid" in new_df.columns.str.lower().tolist():
         new_df = new_df.rename(columns={c: "AppId" for c in new_df.columns if c.lower() == "appid"})
 
+    new_df["date_appended"] = date.today().isoformat()
     source_path = get_latest_steam_csv()
     out_path = RAW_DIR / f"raw_steam_{date.today()}.csv"
+    created = not source_path.exists()
 
-    if source_path.exists():
-        existing_df = pd.read_csv(source_path)
-        existing_ids = set(existing_df["AppId"].astype(str))
-        new_only = new_df[~new_df["AppId"].astype(str).isin(existing_ids)].copy()
-
-        if new_only.empty:
-            log("ℹ️ No new unique AppIds found — CSV already up to date")
-            return 0
-
-        new_only["date_appended"] = date.today().isoformat()
-
-        all_cols = existing_df.columns.tolist()
-        if "date_appended" not in all_cols:
-            all_cols.append("date_appended")
-        for col in all_cols:
-            if col not in new_only.columns:
-                new_only[col] = None
-        for col in all_cols:
-            if col not in existing_df.columns:
-                existing_df[col] = None
-        new_only = new_only[all_cols]
-        existing_df = existing_df[all_cols]
-
-        combined = pd.concat([existing_df, new_only], ignore_index=True)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        combined.to_csv(out_path, index=False)
-        log(f"📝 Saved {len(new_only)} new rows → {out_path.name}")
-        return len(new_only)
+    result = merge_snapshot("steam", new_df, source_path, out_path, _with_date_appended, insert_only=True)
+    if not result.rows_written:
+        log("ℹ️ No new unique AppIds found — CSV already up to date")
+    elif created:
+        log(f"📝 Created {out_path.name} with {result.rows_written} rows")
     else:
-        new_df["date_appended"] = date.today().isoformat()
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        new_df.to_csv(out_path, index=False)
-        log(f"📝 Created {out_path.name} with {len(new_df)} rows")
-        return len(new_df)
+        log(f"📝 Saved {result.rows_written} new rows → {out_path.name}")
+    return result.rows_written
 
 
 def append_from_uploaded_steam_csv(uploaded_df: pd.DataFrame) -> tuple:
     """
     Merge an externally uploaded steam DataFrame into the persistent CSV.
-    - Rows whose AppId already exists are OVERWRITTEN.
-    - New rows are APPENDED.
-    - ALL uploaded rows get date_appended = today.
+    - Rows whose AppId already exists with different content are OVERWRITTEN
+      (moved to the end with date_appended = today).
+    - New rows are APPENDED with date_appended = today.
+    - Rows identical to the stored one are left untouched.
+    Only the new and changed rows are written (pipelines/snapshot_index.py).
     Returns (n_updated, n_new).
     """
-    today = date.today().isoformat()
-
     uploaded_df = uploaded_df.copy()
 
     for col in list(uploaded_df.columns):
@@ -207,36 +191,8 @@ def append_from_uploaded_steam_csv(uploaded_df: pd.DataFrame) -> tuple:
             uploaded_df = uploaded_df.rename(columns={col: "AppId"})
 
     uploaded_df = _normalize_release_dates(uploaded_df)
-    uploaded_df["date_appended"] = today
-    upload_ids = set(uploaded_df["AppId"].astype(str))
-
-    source_path = get_latest_steam_csv()
-    out_path = RAW_DIR / f"raw_steam_{date.today()}.csv"
-
-    if source_path.exists():
-        existing_df = pd.read_csv(source_path)
-        existing_ids = set(existing_df["AppId"].astype(str))
-        n_updated = len(upload_ids & existing_ids)
-        n_new = len(upload_ids - existing_ids)
-
-        kept = existing_df[~existing_df["AppId"].astype(str).isin(upload_ids)].copy()
-
-        all_cols = existing_df.columns.tolist()
-        if "date_appended" not in all_cols:
-            all_cols.append("date_appended")
-        for col in all_cols:
-            if col not in uploaded_df.columns:
-                uploaded_df[col] = None
-            if col not in kept.columns:
-                kept[col] = None
-        uploaded_df = uploaded_df[all_cols]
-        kept = kept[all_cols]
-
-        combined = pd.concat([kept, uploaded_df], ignore_index=True)
-    else:
-        n_updated, n_new = 0, len(uploaded_df)
-        combined = uploaded_df
+    uploaded_df["date_appended"] = date.today().isoformat()
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(out_path, index=False)
-    return n_updated, n_new
+    result = merge_snapshot("steam", uploaded_df, get_latest_steam_csv(),
+                            RAW_DIR / f"raw_steam_{date.today()}.csv", _with_date_appended)
+    return result.n_updated, result.n_new
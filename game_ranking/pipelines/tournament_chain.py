@@ -0,0 +1,200 @@
+"""
+Chain normalization — anchor-relative scores for every game from tournament results.
+
+Every tournament group is one Google Trends request, so the raw values inside
+a group share a scale. A group winner plays again in the next round, which
+chains the groups together: with the anchor at 100, a game's score is
+
+    anchor 100 × (r_next / r_anchor) × … × (r_game / r_winner)
+
+along the path of groups linking it to the anchor. This gives the same number
+the refresh pass would compute (game_raw / anchor_raw × 100) without a task
+per game.
+
+Chains are flagged low-confidence, and left to a targeted refresh, when:
+  zero       the game scored 0 in its group (below Trends' resolution)
+  failed     the game's only groups failed (all-zero / API error)
+  weak_link  a raw value along the path is under MIN_RAW_SCORE, so rounding
+             in Trends' integer series dominates the ratio
+  unlinked   no scored path reaches the anchor (e.g. the other bracket when
+             no grand final was played), or the results are older than
+             MAX_AGE_DAYS
+
+Matches are plain dicts {"scores": {game: raw}, "status", "fetched_date"},
+built from tournament state (bracket_matches / state_matches) or from
+run_tournament() output (matches_from_results).
+"""
+
+import logging
+from collections import deque
+from datetime import date, timedelta
+
+from pipelines.tournament_state import BRACKETS, load_manual_state, load_state
+
+log = logging.getLogger(__name__)
+
+MIN_RAW_SCORE = 2.0   # raw Trends average below which a ratio is too coarse to trust
+MAX_AGE_DAYS  = 30    # same window as the trends results cache TTL
+
+_SCORED = ("complete", "cached")
+
+
+# ── Match extraction ──────────────────────────────────────────────────────────
+
+def bracket_matches(state: dict, bracket: str) -> list[dict]:
+    """Every scored or failed group in one bracket of a tournament state (any round)."""
+    matches: list[dict] = []
+    rounds = state.get(bracket, {}).get("rounds", {})
+    for rnum_str in sorted(rounds, key=int):
+        for task in rounds[rnum_str].get("tasks", []):
+            if task.get("status") in _SCORED + ("failed",):
+                matches.append({
+                    "scores":       {g: task.get("scores", {}).get(g, 0.0) for g in task.get("keywords", [])},
+                    "status":       task["status"],
+                    "fetched_date": task.get("fetched_date"),
+                })
+    return matches
+
+
+def state_matches(state: dict) -> list[dict]:
+    """Matches from both brackets, plus the grand final when the state has one."""
+    matches = [m for bracket in BRACKETS for m in bracket_matches(state, bracket)]
+    gf = state.get("grand_final") or {}
+    if gf.get("status") in ("complete", "failed"):
+        matches.append({
+            "scores":       {g: gf.get("scores", {}).get(g, 0.0) for g in gf.get("keywords", [])},
+            "status":       gf["status"],
+            "fetched_date": gf.get("fetched_date"),
+        })
+    return matches
+
+
+def matches_from_results(results: list[dict], fetched_date: str | None = None) -> list[dict]:
+    """Matches from run_tournament() rows (byes skipped); fetched_date defaults to today."""
+    fetched_date = fetched_date or date.today().isoformat()
+    groups: dict[tuple[int, int], dict] = {}
+    for r in results:
+        if r.get("score") is None:
+            continue
+        m = groups.setdefault((r["round"], r["group"]), {
+            "scores": {}, "status": "complete", "fetched_date": fetched_date,
+        })
+        m["scores"][r["game"]] = float(r["score"])
+        if r.get("api_failed"):
+            m["status"] = "failed"
+    return list(groups.values())
+
+
+# ── Propagation ───────────────────────────────────────────────────────────────
+
+def _is_fresh(match: dict, max_age_days: int) -> bool:
+    try:
+        fetched = date.fromisoformat(match.get("fetched_date") or "")
+    except ValueError:
+        return False
+    return date.today() - fetched <= timedelta(days=max_age_days)
+
+
+def chain_normalize(
+    matches: list[dict],
+    anchor: str,
+    min_raw: float = MIN_RAW_SCORE,
+    max_age_days: int = MAX_AGE_DAYS,
+) -> dict[str, dict]:
+    """
+    Propagate score ratios from anchor (= 100) through matches.
+
+    Returns {game: {"score", "confidence", "reason", "hops", "fetched_date"}}
+    for every game appearing in matches: confidence "high" (reason None) or
+    "low" with a reason from the module docstring. score is None when no ratio
+    reaches the game. fetched_date is the oldest fetch along the game's path
+    (None for the anchor and unscored games) — a chained score is only as
+    recent as its stalest link. Where several paths exist the shortest wins
+    (fewest multiplied ratios).
+    """
+    games = {g for m in matches for g in m["scores"]}
+    usable = [m for m in matches if m["status"] in _SCORED and _is_fresh(m, max_age_days)]
+    by_game: dict[str, list[dict]] = {}
+    for m in usable:
+        for g in m["scores"]:
+            by_game.setdefault(g, []).append(m)
+
+    out: dict[str, dict] = {}
+    zero_hops: dict[str, int] = {}
+    if anchor in by_game:
+        out[anchor] = {
+            "score": 100.0, "confidence": "high", "reason": None, "hops": 0,
+            "fetched_date": None, "_min_raw": float("inf"),
+        }
+        queue = deque([anchor])
+        while queue:
+            known = queue.popleft()
+            info = out[known]
+            for m in by_game.get(known, []):
+                r_known = float(m["scores"][known])
+                if r_known <= 0:
+                    continue
+                for g, r in m["scores"].items():
+                    r = float(r)
+                    if g in out:
+                        continue
+                    if r <= 0:
+                        zero_hops.setdefault(g, info["hops"] + 1)
+                        continue
+                    out[g] = {
+                        "score":    info["score"] * r / r_known,
+                        "hops":     info["hops"] + 1,
+                        "fetched_date": min(d for d in (info["fetched_date"], m["fetched_date"]) if d),
+                        "_min_raw": min(info["_min_raw"], r_known, r),
+                    }
+                    queue.append(g)
+        for g, info in out.items():
+            weak = info.pop("_min_raw") < min_raw
+            info["score"] = round(info["score"], 2)
+            info["confidence"] = "low" if weak else "high"
+            info["reason"] = "weak_link" if weak else None
+
+    failed = {g for m in matches if m["status"] == "failed" for g in m["scores"]}
+    for g in games - out.keys():
+        if g in zero_hops:
+            out[g] = {"score": 0.0, "confidence": "low", "reason": "zero", "hops": zero_hops[g], "fetched_date": None}
+        elif g in failed and g not in by_game:
+            out[g] = {"score": None, "confidence": "low", "reason": "failed", "hops": None, "fetched_date": None}
+        else:
+            out[g] = {"score": None, "confidence": "low", "reason": "unlinked", "hops": None, "fetched_date": None}
+    return out
+
+
+# ── Refresh planning ──────────────────────────────────────────────────────────
+
+def tournament_matches() -> list[dict]:
+    """Matches from the saved auto tournament and manual brackets (incl. grand final)."""
+    return state_matches(load_state()) + state_matches(load_manual_state())
+
+
+def chain_scores(
+    games: list[str],
+    anchor: str,
+    matches: list[dict] | None = None,
+    max_age_days: int = MAX_AGE_DAYS,
+) -> tuple[dict[str, dict], list[str]]:
+    """
+    Split games into ({game: {"score", "fetched_date"}} for high-confidence
+    chains, [games that still need a refresh task]). fetched_date is the
+    chain's oldest fetch (None for the anchor itself). matches defaults to the
+    saved tournament states; only results at most max_age_days old are chained.
+    """
+    if matches is None:
+        matches = tournament_matches()
+    chained = chain_normalize(matches, anchor, max_age_days=max_age_days)
+    scores: dict[str, dict] = {}
+    needs_refresh: list[str] = []
+    for g in games:
+        info = chained.get(g)
+        if info and info["confidence"] == "high":
+            scores[g] = {"score": info["score"], "fetched_date": info["fetched_date"]}
+        else:
+            needs_refresh.append(g)
+    if scores:
+        log.info("Chain normalization: %d/%d game(s) scored from tournament results", len(scores), len(games))
+    return scores, needs_refresh
@@ -17,9 +17,7 @@ from datetime import date, timedelta
 
 from calculation.dataforseo_trends import (
     post_tasks_bulk,
-    fetch_tasks_ready,
-    fetch_task_result,
-    check_task,
+    collect_ready_results,
     GAMES_CATEGORY,
 )
 from pipelines.trends_cache import (
@@ -27,8 +25,10 @@ from pipelines.trends_cache import (
     save_trends_cache,
     lookup_cached_scores,
     write_cached_scores,
+    build_keyword_index,
 )
 from calculation.trends_tournament import strip_edition_suffix, TOURNAMENT_GROUP_SIZE
+from pipelines import pingback_queue
 from pipelines.tournament_state import (
     load_state,
     save_state,
@@ -101,6 +101,7 @@ def submit_round(
     task_metas:  list[dict] = []  # parallel list: original + cleaned keywords
 
     groups = [pool[i:i + _GROUP_SIZE] for i in range(0, len(pool), _GROUP_SIZE)]
+    cache_index = build_keyword_index(cache) if cache is not None else None
 
     for group in groups:
         if len(group) == 1:
@@ -116,8 +117,9 @@ def submit_round(
 
         # Check cache before submitting to DataForSEO
         if cache is not None:
-            cached_scores = lookup_cached_scores(cleaned, cache)
-            if cached_scores is not None:
+            cached = lookup_cached_scores(cleaned, cache, cache_index)
+            if cached is not None:
+                cached_scores, fetched_date = cached
                 scores_orig = {orig: cached_scores.get(clean, 0.0)
                                for orig, clean in zip(group, cleaned)}
                 winner = max(scores_orig, key=scores_orig.get) if any(v > 0 for v in scores_orig.values()) else None
@@ -128,6 +130,7 @@ def submit_round(
                     "scores":           scores_orig,
                     "winner":           winner,
                     "status":           "cached",
+                    "fetched_date":     fetched_date,   # the comparison's age, not today
                 })
                 log.info("[%s] Round %d: cache hit for %s — winner: %s", bracket, rnum, group, winner)
                 continue
@@ -175,11 +178,13 @@ def submit_round(
 
 # ── Result collection ─────────────────────────────────────────────────────────
 
-def collect_results(login: str, password: str) -> dict:
+def collect_results(login: str, password: str, poll: bool = True, on_batch=None) -> dict:
     """
     Poll DataForSEO tasks_ready, fetch completed tasks, update state.
     Advances complete rounds and submits the next round automatically.
     Assembles the anchor pool when both brackets have finalists.
+    poll=False fetches only pingbacked tasks, without polling tasks_ready.
+    on_batch is passed to collect_ready_results (per fetched batch).
 
     Returns:
       {
@@ -202,30 +207,28 @@ def collect_results(login: str, password: str) -> dict:
         save_state(state)
         return {"checked": 0, "collected": 0, "rounds_advanced": 0, "errors": 0, "complete": state["status"] == "complete"}
 
-    ready_ids = fetch_tasks_ready(login, password)
-    our_ready = set(pending_map.keys()) & ready_ids
-
-    if len(ready_ids) >= 1000:
-        missing_from_ready = set(pending_map.keys()) - our_ready
-        if missing_from_ready:
-            log.info("tasks_ready saturated (1000 cap); checking %d pending tasks directly", len(missing_from_ready))
-            for tid in missing_from_ready:
-                if check_task(tid, login, password) is not None:
-                    our_ready.add(tid)
-
-    checked = len(our_ready)
+    pending_kws = {
+        tid: state[brk]["rounds"][str(rnum)]["tasks"][idx]["cleaned_keywords"]
+        for tid, (brk, rnum, idx) in pending_map.items()
+    }
+    # Pingbacked IDs are fetched directly; tasks_ready covers the rest
+    ready_results = collect_ready_results(
+        pending_kws, login, password, ready_ids=pingback_queue.ready_from_queue(pending_kws), poll=poll,
+        on_batch=on_batch,
+    )
+    pingback_queue.ack(ready_results)
+
+    checked = len(ready_results)
     collected = 0
     errors = 0
 
-    for task_id in list(our_ready):
+    for task_id, scores_raw in ready_results.items():
         bracket, rnum, task_idx = pending_map[task_id]
         rdata = state[bracket]["rounds"][str(rnum)]
         task = rdata["tasks"][task_idx]
         cleaned_kws = task["cleaned_keywords"]
         orig_kws    = task["keywords"]
 
-        scores_raw = fetch_task_result(task_id, cleaned_kws, login, password)
-
         # Map cleaned → original names
         scores_orig = {orig: scores_raw.get(clean, 0.0) for orig, clean in zip(orig_kws, cleaned_kws)}
         winner = max(scores_orig, key=scores_orig.get) if any(v > 0 for v in scores_orig.values()) else None
@@ -326,7 +329,7 @@ def start_manual_bracket(bracket: str, games: list[str], login: str, password: s
     return state
 
 
-def collect_manual_bracket(bracket: str, login: str, password: str) -> dict:
+def collect_manual_bracket(bracket: str, login: str, password: str, poll: bool = True, on_batch=None) -> dict:
     """
     Poll tasks_ready for one manual bracket, fetch completed tasks, advance rounds.
     Returns a summary dict identical in shape to collect_results().
@@ -341,29 +344,28 @@ def collect_manual_bracket(bracket: str, login: str, password: str) -> dict:
         return {"checked": 0, "collected": 0, "rounds_advanced": rounds_advanced,
                 "errors": 0, "complete": bool(state[bracket].get("finalists"))}
 
-    ready_ids = fetch_tasks_ready(login, password)
-    our_ready = set(pending_map.keys()) & ready_ids
-
-    if len(ready_ids) >= 1000:
-        missing_from_ready = set(pending_map.keys()) - our_ready
-        if missing_from_ready:
-            log.info("tasks_ready saturated (1000 cap); checking %d pending tasks directly", len(missing_from_ready))
-            for tid in missing_from_ready:
-                if check_task(tid, login, password) is not None:
-                    our_ready.add(tid)
-
-    checked = len(our_ready)
+    pending_kws = {
+        tid: state[bracket]["rounds"][str(rnum)]["tasks"][idx]["cleaned_keywords"]
+        for tid, (_brk, rnum, idx) in pending_map.items()
+    }
+    # Pingbacked IDs are fetched directly; tasks_ready covers the rest
+    ready_results = collect_ready_results(
+        pending_kws, login, password, ready_ids=pingback_queue.ready_from_queue(pending_kws), poll=poll,
+        on_batch=on_batch,
+    )
+    pingback_queue.ack(ready_results)
+
+    checked = len(ready_results)
     collected = 0
     errors = 0
 
-    for task_id in list(our_ready):
+    for task_id, scores_raw in ready_results.items():
         _brk, rnum, task_idx = pending_map[task_id]
         rdata   = state[bracket]["rounds"][str(rnum)]
         task    = rdata["tasks"][task_idx]
         cleaned_kws = task["cleaned_keywords"]
         orig_kws    = task["keywords"]
 
-        scores_raw  = fetch_task_result(task_id, cleaned_kws, login, password)
         scores_orig = {orig: scores_raw.get(clean, 0.0)
                        for orig, clean in zip(orig_kws, cleaned_kws)}
         winner = max(scores_orig, key=scores_orig.get) if any(v > 0 for v in scores_orig.values()) else None
@@ -446,7 +448,7 @@ def submit_grand_final(steam_champ: str, ns_champ: str, login: str, password: st
     return state
 
 
-def collect_grand_final(login: str, password: str) -> dict:
+def collect_grand_final(login: str, password: str, poll: bool = True, on_batch=None) -> dict:
     """
     Poll tasks_ready for the Grand Final task and fetch result if ready.
     Returns {"complete": bool, "winner": str|None, "scores": dict}.
@@ -458,21 +460,23 @@ def collect_grand_final(login: str, password: str) -> dict:
     if not task_id or gf.get("status") != "pending":
         return {"complete": gf.get("status") == "complete", "winner": gf.get("winner"), "scores": gf.get("scores", {})}
 
-    ready_ids = fetch_tasks_ready(login, password)
-    if task_id not in ready_ids:
-        # tasks_ready may be saturated (>1000 queued) — try direct task_get
-        if check_task(task_id, login, password) is None:
-            return {"complete": False, "winner": None, "scores": {}}
-
     kws_orig  = gf["keywords"]
     kws_clean = gf["cleaned_keywords"]
-    scores_raw  = fetch_task_result(task_id, kws_clean, login, password)
+    scores_raw = collect_ready_results(
+        {task_id: kws_clean}, login, password, ready_ids=pingback_queue.ready_from_queue([task_id]), poll=poll,
+        on_batch=on_batch,
+    ).get(task_id)
+    if scores_raw is None:
+        return {"complete": False, "winner": None, "scores": {}}
+
     scores_orig = {orig: scores_raw.get(clean, 0.0) for orig, clean in zip(kws_orig, kws_clean)}
     winner = max(scores_orig, key=scores_orig.get) if any(v > 0 for v in scores_orig.values()) else None
 
+    pingback_queue.ack([task_id])
     gf["scores"] = scores_orig
     gf["winner"] = winner
     gf["status"] = "complete" if winner else "failed"
+    gf["fetched_date"] = date.today().isoformat()
     state["grand_final"] = gf
     save_manual_state(state)
     log.info("[grand_final] Complete — winner: %s", winner)
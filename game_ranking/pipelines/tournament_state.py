@@ -18,7 +18,8 @@ State schema:
             "cleaned_keywords": ["game a", ...],
             "scores": {},
             "winner": null,
-            "status": "pending|complete|failed"
+            "status": "pending|complete|failed|cached",
+            "fetched_date": "YYYY-MM-DD"   # set once scored (see tournament_chain.py)
           }
         ],
         "bye_games": ["Lone Game X"]
@@ -37,6 +38,7 @@ State schema:
 
 import json
 import logging
+from datetime import date
 import tempfile
 import os
 from pathlib import Path
@@ -45,7 +47,9 @@ log = logging.getLogger(__name__)
 
 from config import TOURNAMENT_STATE_FILE, MANUAL_TOURNAMENT_STATE_FILE
 
-PINGBACK_URL = "https://gameranking-research-ags.streamlit.app/"
+# DataForSEO GETs this URL when a task completes ($id / $tag are substituted).
+# Point it at pipelines/pingback_server.py to collect without polling tasks_ready.
+PINGBACK_URL = os.environ.get("GAME_RANKING_PINGBACK_URL", "https://gameranking-research-ags.streamlit.app/")
 BRACKETS = ("steam", "non_steam")
 
 
@@ -152,6 +156,7 @@ def update_task_result(
     task["scores"] = scores
     task["winner"] = winner
     task["status"] = "complete" if any(v > 0 for v in scores.values()) else "failed"
+    task["fetched_date"] = date.today().isoformat()
 
 
 # ── Round advancement ─────────────────────────────────────────────────────────
@@ -4,21 +4,31 @@ Keyword-level Google Trends results cache.
 Stores DataForSEO comparison results so that re-running a tournament with the
 same games skips API calls for groups already compared within the past 30 days.
 
-Cache file: cache/trends_results_cache.json
+Storage:    comparisons table of the trends score store
+            (calculation/trends_score_store.py); only entries within TTL are
+            loaded, and saving upserts just the entries that changed.
 Cache key:  "|".join(sorted(cleaned_keywords))
 TTL:        30 days — matches the DataForSEO "past 30 days" query window, so
             a cached result is never older than the data it represents.
+
+Subset lookups: values within one Google Trends request share a scale, so
+any cached comparison containing every keyword of a new group already fixes
+their ranking and ratios. build_keyword_index() maps keyword → cache keys,
+and lookup_cached_scores() resolves a group from the freshest such superset
+entry. The group's values are returned on that entry's scale, together with
+the entry's own fetched_date so callers never treat cached data as newer than
+it is. Superset entries
+are only used when every keyword in the group scored > 0 there; a keyword
+flattened to 0 next to a much bigger game carries no ratio information.
 """
 
-import json
 import logging
 from datetime import date, timedelta
 
-from config import CACHE_DIR
+from calculation.trends_score_store import TrendsScoreStore, open_trends_store
 
 log = logging.getLogger(__name__)
 
-_CACHE_FILE  = CACHE_DIR / "trends_results_cache.json"
 _TTL_DAYS    = 30
 
 
@@ -26,54 +36,104 @@ def _cache_key(cleaned_kws: list[str]) -> str:
     return "|".join(sorted(cleaned_kws))
 
 
+def _entry_keywords(key: str, entry: dict) -> list[str]:
+    return entry.get("keywords") or key.split("|")
+
+
+def _is_fresh(entry: dict) -> bool:
+    try:
+        fetched = date.fromisoformat(entry["fetched_date"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return date.today() - fetched <= timedelta(days=_TTL_DAYS)
+
+
+def build_keyword_index(cache: dict) -> dict[str, set[str]]:
+    """Inverted index: cleaned keyword → keys of the cache entries that contain it."""
+    index: dict[str, set[str]] = {}
+    for key, entry in cache.items():
+        for kw in _entry_keywords(key, entry):
+            index.setdefault(kw, set()).add(key)
+    return index
+
+
 # ── Load / save ───────────────────────────────────────────────────────────────
 
-def load_trends_cache() -> dict:
-    """Load cache from disk. Returns empty dict on missing or corrupt file."""
-    if _CACHE_FILE.exists():
-        try:
-            return json.loads(_CACHE_FILE.read_text(encoding="utf-8"))
-        except Exception as e:
-            log.warning("trends_results_cache.json corrupt — starting fresh: %s", e)
-    return {}
+def _ttl_cutoff() -> str:
+    return (date.today() - timedelta(days=_TTL_DAYS)).isoformat()
 
 
-def save_trends_cache(cache: dict) -> None:
-    """Atomically write cache to disk (tmp-rename pattern)."""
-    _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    tmp = _CACHE_FILE.with_suffix(".tmp")
-    tmp.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding="utf-8")
-    tmp.replace(_CACHE_FILE)
+def load_trends_cache(store: TrendsScoreStore | None = None) -> dict:
+    """Load the in-TTL comparisons. Returns an empty dict if the store is unavailable."""
+    try:
+        return (store if store is not None else open_trends_store()).comparisons(since=_ttl_cutoff())
+    except Exception as e:
+        log.warning("Trends comparison cache unavailable — starting fresh: %s", e)
+        return {}
+
+
+def save_trends_cache(cache: dict, store: TrendsScoreStore | None = None) -> None:
+    """Upsert new / changed entries and drop comparisons older than the TTL."""
+    store = store if store is not None else open_trends_store()
+    store.upsert_comparisons(cache)
+    store.prune_comparisons(before=_ttl_cutoff())
 
 
 # ── Lookup / write ────────────────────────────────────────────────────────────
 
-def lookup_cached_scores(cleaned_kws: list[str], cache: dict) -> dict[str, float] | None:
+def lookup_cached_scores(
+    cleaned_kws: list[str],
+    cache: dict,
+    index: dict[str, set[str]] | None = None,
+) -> tuple[dict[str, float], str] | None:
     """
-    Return cached scores for cleaned_kws if present and within TTL, else None.
-    Scores are keyed by cleaned keyword name (same as what DataForSEO returns).
+    Return (scores, fetched_date) for cleaned_kws if cached within TTL, else
+    None. Scores are keyed by cleaned keyword name (same as what DataForSEO
+    returns); fetched_date is the ISO date of the entry they came from.
+
+    An exact entry for the group wins. Otherwise, the freshest in-TTL entry
+    containing every keyword (with all of them > 0) is used; ties go to the
+    smallest such comparison. Pass a prebuilt build_keyword_index(cache) when
+    looking up many groups.
     """
-    key   = _cache_key(cleaned_kws)
-    entry = cache.get(key)
-    if not entry:
-        return None
-    try:
-        fetched = date.fromisoformat(entry["fetched_date"])
-    except (KeyError, ValueError):
+    entry = cache.get(_cache_key(cleaned_kws))
+    if entry and _is_fresh(entry):
+        scores = entry.get("scores", {})
+        return {kw: float(scores.get(kw, 0.0)) for kw in cleaned_kws}, entry["fetched_date"]
+
+    if not cleaned_kws:
         return None
-    if date.today() - fetched > timedelta(days=_TTL_DAYS):
+    if index is None:
+        index = build_keyword_index(cache)
+    candidates = set.intersection(*(index.get(kw, set()) for kw in cleaned_kws))
+
+    best_key, best_rank = None, None
+    for key in candidates:
+        entry = cache.get(key)
+        if not entry or not _is_fresh(entry):
+            continue
+        scores = entry.get("scores", {})
+        if not all(float(scores.get(kw, 0.0)) > 0 for kw in cleaned_kws):
+            continue
+        rank = (entry["fetched_date"], -len(_entry_keywords(key, entry)))
+        if best_rank is None or rank > best_rank:
+            best_key, best_rank = key, rank
+    if best_key is None:
         return None
-    scores = entry.get("scores", {})
-    return {kw: float(scores.get(kw, 0.0)) for kw in cleaned_kws}
+
+    best = cache[best_key]
+    log.info("trends cache: %s resolved from superset entry %s", cleaned_kws, best_key)
+    return {kw: float(best["scores"][kw]) for kw in cleaned_kws}, best["fetched_date"]
 
 
 def write_cached_scores(
     cleaned_kws: list[str],
     scores: dict[str, float],
     cache: dict,
+    index: dict[str, set[str]] | None = None,
 ) -> None:
     """
-    Write a result into the in-memory cache dict.
+    Write a result into the in-memory cache dict (and index, when given).
     Caller is responsible for calling save_trends_cache() afterwards.
     Skips entries where all scores are zero (API-error results).
     """
@@ -85,3 +145,6 @@ def write_cached_scores(
         "scores":       {kw: scores.get(kw, 0.0) for kw in cleaned_kws},
         "fetched_date": date.today().isoformat(),
     }
+    if index is not None:
+        for kw in cleaned_kws:
+            index.setdefault(kw, set()).add(key)
@@ -7,9 +7,15 @@ Phase 2  — Cross-final: Steam champion vs Non-Steam champion.
            Anchor = runner-up (2nd most popular game).
 
 Scoring all games against the anchor is a separate flow (see tab_steam, tab_nonsteam, tab_inventory).
+
+The worker reports progress and its result through the JobRegistry (kind
+JOB_KIND), so both survive Streamlit's module reloads and only one pipeline
+runs at a time. A worker whose heartbeat finds the kind taken over (its own
+heartbeat went stale) stops at its next progress report.
 """
 
 import json
+import logging
 import time
 import threading
 import traceback
@@ -30,8 +36,13 @@ from calculation.dataforseo_trends import (
     fetch_comparison,
     load_credentials,
 )
-from app.thread_state import _trends_thread_state
 from config import TOURNAMENT_ANCHOR_FILE
+from pipelines.job_registry import JobRegistry, JobSuperseded
+
+log = logging.getLogger(__name__)
+
+JOB_KIND  = "trends_pipeline"
+JOB_LABEL = "Trends pipeline"
 
 
 # ── Anchor persistence ────────────────────────────────────────────────────────
@@ -54,40 +65,62 @@ def load_tournament_anchor() -> dict | None:
 
 # ── Pipeline entry point ──────────────────────────────────────────────────────
 
-def run_trends_pipeline(steam_df, nonsteam_df, appended_since=None, top_n=None):
+def run_trends_pipeline(steam_df, nonsteam_df, appended_since=None, top_n=None, registry=None):
     """Spawn background thread. Called after CSV load or manually from the tournament tab.
 
     top_n: if set, each bracket is limited to the top N games by priority score.
+    Does nothing while another trends pipeline job is alive.
     """
-    if _trends_thread_state["running"]:
+    registry = registry if registry is not None else JobRegistry()
+    job_id = registry.claim(JOB_KIND, JOB_LABEL, progress={"message": "Starting..."})
+    if job_id is None:
         return
 
     login, password = load_credentials()
     if not login or not password:
-        _trends_thread_state["result"] = {"error": "DataForSEO credentials not configured."}
+        registry.finish(JOB_KIND, job_id, "failed", error="DataForSEO credentials not configured.")
         return
 
     steam_names    = _all_games(steam_df,    "Final Priority Score", "Name",       appended_since=appended_since, top_n=top_n)
     nonsteam_names = _all_games(nonsteam_df, "priority_score",       "Game Title", appended_since=appended_since, top_n=top_n)
 
     if not steam_names and not nonsteam_names:
-        _trends_thread_state["result"] = {
-            "error": (
-                "No games found for the current date filter "
-                f"(appended_since={appended_since}). "
-                "Try checking 'Include all games' in Settings."
-            )
-        }
+        registry.finish(JOB_KIND, job_id, "failed", error=(
+            "No games found for the current date filter "
+            f"(appended_since={appended_since}). "
+            "Try checking 'Include all games' in Settings."
+        ))
         return
 
-    _trends_thread_state.update({"running": True, "result": None, "progress": "Starting..."})
     threading.Thread(
         target=_worker,
-        args=(steam_names, nonsteam_names, login, password),
+        args=(steam_names, nonsteam_names, login, password, job_id, registry),
         daemon=True,
     ).start()
 
 
+def trends_pipeline_progress(registry=None) -> str | None:
+    """The running pipeline's latest progress message, or None when none is running."""
+    registry = registry if registry is not None else JobRegistry()
+    job = registry.get(JOB_KIND)
+    if not registry.is_running(JOB_KIND):
+        return None
+    return job["progress"].get("message") or "Trends updating..."
+
+
+def take_trends_pipeline_result(registry=None) -> dict | None:
+    """
+    The finished pipeline's result, handed out once: the worker's result dict,
+    or {"error": str} when it failed. None while running or already taken.
+    """
+    job = (registry if registry is not None else JobRegistry()).take_result(JOB_KIND)
+    if job is None:
+        return None
+    if job["status"] != "done":
+        return {"error": job["error"] or f"Trends pipeline {job['status']}"}
+    return job["result"]
+
+
 # ── Internal helpers ──────────────────────────────────────────────────────────
 
 def _all_games(df, score_col, name_col, appended_since=None, top_n=None):
@@ -117,9 +150,10 @@ def _extract_champion(results: list[dict]) -> str | None:
 
 # ── Background worker ─────────────────────────────────────────────────────────
 
-def _worker(steam_names, nonsteam_names, login, password):
+def _worker(steam_names, nonsteam_names, login, password, job_id, registry):
     def _progress(msg):
-        _trends_thread_state["progress"] = msg
+        if not registry.heartbeat(JOB_KIND, job_id, {"message": msg}):
+            raise JobSuperseded(JOB_KIND)
 
     try:
         # ── Phase 1a: Steam Tournament ────────────────────────────────────────
@@ -199,15 +233,15 @@ def _worker(steam_names, nonsteam_names, login, password):
         save_tournament_anchor(anchor)
         _progress(f"Done. Anchor: {anchor}")
 
-        _trends_thread_state["result"] = {
+        registry.finish(JOB_KIND, job_id, "done", result={
             "anchor":                      anchor,
             "steam_tournament_results":    steam_results,
             "nonsteam_tournament_results": nonsteam_results,
             "cross_final_result":          cross_final_result,
             "tournament_results":          steam_results + nonsteam_results,  # backward compat
-        }
+        })
 
+    except JobSuperseded:
+        log.warning("[%s] superseded by another worker — stopping", JOB_KIND)
     except Exception as e:
-        _trends_thread_state["result"] = {"error": f"{e}\n{traceback.format_exc()}"}
-    finally:
-        _trends_thread_state["running"] = False
+        registry.finish(JOB_KIND, job_id, "failed", error=f"{e}\n{traceback.format_exc()}")
@@ -0,0 +1,66 @@
+"""
+rank.py - Headless Steam / Non-Steam priority ranking (no Streamlit).
+
+Usage (run from repo root):
+    python -m game_ranking.rank [--weights data/ranking_weights.json] [--out ranked/]
+                                [--steam-csv PATH] [--nonsteam-csv PATH]
+
+Loads the latest raw_steam / raw_non_steam snapshots (or the given CSVs) and
+every stored Google Trends score, scores them with the weights file (same
+keys and defaults as the Report tab sidebars), dedups Non-Steam titles,
+drops Non-Steam games that are already on Steam, and writes
+ranked_steam_<date>.csv / ranked_non_steam_<date>.csv.
+
+Suitable for cron, e.g. nightly before tournament seeding:
+    0 3 * * *  cd /path/to/repo && python -m game_ranking.rank
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# ── sys.path / cwd setup ─────────────────────────────────────────────────────
+# Pipeline internals use bare imports, so game_ranking/ must be on sys.path.
+GAME_RANKING_DIR = Path(__file__).resolve().parent
+
+_LAUNCH_DIR = Path.cwd()  # save original cwd before we change it
+
+sys.path.insert(0, str(GAME_RANKING_DIR))
+os.chdir(str(GAME_RANKING_DIR))
+
+# ── Deferred imports (need sys.path set first) ────────────────────────────────
+from config import RANKED_DIR, RANKING_WEIGHTS_FILE  # noqa: E402
+from pipelines.ranking_pipeline import load_weights, run_ranking  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", type=Path, default=RANKING_WEIGHTS_FILE,
+                        help="weights JSON (missing file or keys = sidebar defaults)")
+    parser.add_argument("--out", type=Path, default=RANKED_DIR, help="output directory")
+    parser.add_argument("--steam-csv", type=Path, help="Steam snapshot (default: latest raw_steam_*.csv)")
+    parser.add_argument("--nonsteam-csv", type=Path, help="Non-Steam snapshot (default: latest raw_non_steam_*.csv)")
+    args = parser.parse_args(argv)
+    # Paths on the command line are relative to where the command was run
+    for name in ("weights", "out", "steam_csv", "nonsteam_csv"):
+        if getattr(args, name) is not None:
+            setattr(args, name, (_LAUNCH_DIR / getattr(args, name)).resolve())
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    try:
+        weights = load_weights(args.weights)
+    except (ValueError, json.JSONDecodeError) as exc:
+        print(f"Invalid weights file: {exc}", file=sys.stderr)
+        return 2
+
+    summary = run_ranking(weights, out_dir=args.out, steam_csv=args.steam_csv, nonsteam_csv=args.nonsteam_csv)
+    for kind in ("steam", "non_steam"):
+        print(f"{kind}: {summary[kind]['ranked']} ranked → {summary[kind]['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+fake_api_server.py - Run the local DataForSEO / Steam / SteamSpy stand-in.
+
+Usage (run from repo root):
+    python game_ranking/scripts/fake_api_server.py [--host 127.0.0.1] [--port 8780]
+        [--latency 0.2] [--jitter 0.1] [--rate-429 0.05] [--retry-after 1]
+        [--rate-timeout 0.01] [--hang 60] [--task-delay 5]
+        [--extra-ready 1200] [--pingbacks] [--seed 1]
+
+Then start the app (or any script) with the APIs pointed at it:
+    GAME_RANKING_API_BASE_URL=http://127.0.0.1:8780 streamlit run game_ranking/streamlit_app.py
+
+No credits are spent and any login / password is accepted. --extra-ready
+lists that many phantom task IDs ahead of ours in tasks_ready, pushing the
+ready queue past DataForSEO's 1000-ID cap. For an end-to-end throughput run
+of the tournament and refresh collectors see benchmarks/pipeline_throughput.py.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# ── sys.path / cwd setup ─────────────────────────────────────────────────────
+# Pipeline internals use bare imports, so game_ranking/ must be on sys.path.
+SCRIPT_DIR = Path(__file__).resolve().parent        # game_ranking/scripts/
+GAME_RANKING_DIR = SCRIPT_DIR.parent                # game_ranking/
+
+sys.path.insert(0, str(GAME_RANKING_DIR))
+os.chdir(str(GAME_RANKING_DIR))
+
+# ── Deferred imports (need sys.path set first) ────────────────────────────────
+from pipelines.fake_api_server import DEFAULT_HOST, DEFAULT_PORT, add_fault_arguments, config_from_args, serve  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    serve(args.host, args.port, config_from_args(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
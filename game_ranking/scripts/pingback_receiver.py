@@ -0,0 +1,89 @@
+"""
+pingback_receiver.py - Run the DataForSEO pingback receiver, or fake pingbacks.
+
+Usage (run from repo root):
+    python game_ranking/scripts/pingback_receiver.py serve [--host 0.0.0.0] [--port 8765]
+    python game_ranking/scripts/pingback_receiver.py send <task_id> [<task_id> ...] [--url http://localhost:8765]
+    python game_ranking/scripts/pingback_receiver.py send --pending [--url http://localhost:8765]
+
+`serve` records every pingbacked task ID in cache/pingbacks.sqlite, where the
+tournament / refresh collectors pick them up instead of polling tasks_ready.
+Tasks only send pingbacks when GAME_RANKING_PINGBACK_URL points at this
+receiver (with ?id=$id&tag=$tag) before they are submitted.
+
+`send` is the local stand-in for DataForSEO: it posts fake pingbacks to a
+running receiver. --pending sends one for every task still pending in the
+tournament and refresh state files.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# ── sys.path / cwd setup ─────────────────────────────────────────────────────
+# Pipeline internals use bare imports, so game_ranking/ must be on sys.path.
+SCRIPT_DIR = Path(__file__).resolve().parent        # game_ranking/scripts/
+GAME_RANKING_DIR = SCRIPT_DIR.parent                # game_ranking/
+
+sys.path.insert(0, str(GAME_RANKING_DIR))
+os.chdir(str(GAME_RANKING_DIR))
+
+# ── Deferred imports (need sys.path set first) ────────────────────────────────
+from pipelines.pingback_server import DEFAULT_HOST, DEFAULT_PORT, send_pingback, serve  # noqa: E402
+
+
+def _pending_task_ids() -> list[str]:
+    from config import (
+        REFRESH_TRENDS_STATE_FILE, REFRESH_TRENDS_STATE_FILE_STEAM, REFRESH_TRENDS_STATE_FILE_NONSTEAM,
+    )
+    from pipelines import refresh_trends_pipeline, tournament_state
+
+    ids = list(tournament_state.get_pending_task_ids(tournament_state.load_state()))
+    manual = tournament_state.load_manual_state()
+    for bracket in tournament_state.BRACKETS:
+        ids += list(tournament_state.get_manual_pending_task_ids(manual, bracket))
+    gf = manual.get("grand_final") or {}
+    if gf.get("status") == "pending" and gf.get("task_id"):
+        ids.append(gf["task_id"])
+    for state_file in (REFRESH_TRENDS_STATE_FILE, REFRESH_TRENDS_STATE_FILE_STEAM, REFRESH_TRENDS_STATE_FILE_NONSTEAM):
+        state = refresh_trends_pipeline.load_state(state_file=state_file)
+        ids += [t["task_id"] for t in state.get("tasks", []) if t.get("status") == "pending" and t.get("task_id")]
+    return list(dict.fromkeys(ids))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="run the pingback receiver")
+    p_serve.add_argument("--host", default=DEFAULT_HOST)
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    p_send = sub.add_parser("send", help="send fake pingbacks to a running receiver")
+    p_send.add_argument("task_ids", nargs="*")
+    p_send.add_argument("--pending", action="store_true", help="send for every pending task in the state files")
+    p_send.add_argument("--url", default=f"http://localhost:{DEFAULT_PORT}")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "serve":
+        serve(args.host, args.port)
+        return 0
+
+    task_ids = list(args.task_ids) + (_pending_task_ids() if args.pending else [])
+    if not task_ids:
+        print("No task IDs to send.")
+        return 1
+    failed = 0
+    for task_id in task_ids:
+        status = send_pingback(args.url, task_id)
+        print(f"{task_id}: HTTP {status}")
+        failed += status != 200
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,11 +11,13 @@ Run with:
 import io
 import sys
 import os
+import sqlite3
 import tempfile
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -160,6 +162,202 @@ class TestFlagging:
         assert result["Has_Multiple_Genres"].iloc[0] is True
 
 
+def _legacy_flagging(df):
+    """The original per-row flagging() loop, kept as the parity reference."""
+    extra_cols = [c for c in ["date_appended"] if c in df.columns]
+    out = df[["Name", "ReleaseDate", "Developers", "Genres", "FollowerCount"] + extra_cols].copy()
+    for index, row in out.iterrows():
+        genres = row["Genres"]
+        if not isinstance(genres, list):
+            genres = [str(genres)] if not isinstance(genres, float) else []
+        out.loc[index, "Is_Indie"] = any(str(g).strip().lower() == "indie" for g in genres)
+        developers = row["Developers"]
+        if not isinstance(developers, list):
+            developers = [str(developers)] if not isinstance(developers, float) else []
+        out.loc[index, "Has_Multiple_Developers"] = len(developers) > 1
+        out.loc[index, "Has_Multiple_Genres"] = len(genres) > 1
+    return out
+
+
+def _legacy_clean_developers(col):
+    col = col.astype(str)
+    col = col.str.replace(r",\s*inc\.?", " Inc.", case=False, regex=True)
+    col = col.str.replace(r",\s*ltd\.?", " Ltd.", case=False, regex=True)
+    col = col.str.replace(r",\s*llc\.?", " LLC.", case=False, regex=True)
+    return col.str.split(",")
+
+
+class TestReferenceData:
+    """Lazy, mtime-invalidated reference-data accessors in process_data."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation import process_data
+        self.pd_mod = process_data
+
+    def test_reload_on_mtime_change(self, tmp_path):
+        inv = tmp_path / "inventory.csv"
+        pd.DataFrame({"Game Name": ["A"]}).to_csv(inv)
+        with patch.object(self.pd_mod, "INVENTORY_FILE", inv), \
+             patch.dict(self.pd_mod._reference_cache, clear=True):
+            first = self.pd_mod.get_inventory()
+            assert self.pd_mod.get_inventory() is first          # cached
+            pd.DataFrame({"Game Name": ["A", "B"]}).to_csv(inv)
+            os.utime(inv, ns=(inv.stat().st_mtime_ns + 1_000_000,) * 2)
+            assert self.pd_mod.get_inventory()["Game Name"].tolist() == ["A", "B"]
+
+    def test_legacy_module_attributes_still_resolve(self):
+        assert self.pd_mod.developer_list is self.pd_mod.get_developer_list()
+        assert self.pd_mod.developer_index.source is self.pd_mod.developer_list
+
+
+class TestFlaggingParity:
+    """Vectorized flagging / clean_dev_genre_list match the old row loop on real snapshots."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.process_data import clean_dev_genre_list, flagging
+        from config import RAW_DIR
+        self.flagging = flagging
+        self.clean = clean_dev_genre_list
+        self.snapshots = sorted(RAW_DIR.glob("raw_steam_????-??-??.csv"))
+
+    def test_real_snapshots_match_legacy(self):
+        if not self.snapshots:
+            pytest.skip("no raw_steam_*.csv snapshots on disk")
+        for path in self.snapshots:
+            raw = pd.read_csv(path)
+            cleaned = self.clean(raw.copy())
+            assert cleaned["Developers"].tolist() == _legacy_clean_developers(raw["Developers"]).tolist(), path.name
+            pd.testing.assert_frame_equal(self.flagging(cleaned), _legacy_flagging(cleaned), obj=path.name)
+
+    def test_mixed_cells_and_duplicate_index(self):
+        df = pd.DataFrame({
+            "Name": ["A", "B", "C", "D"],
+            "ReleaseDate": ["2025-01-01"] * 4,
+            "Developers": [["X", "Y"], float("nan"), "Solo", []],
+            "Genres": [[" INDIE "], float("nan"), "Indie", ["Action", "RPG"]],
+            "FollowerCount": [1000] * 4,
+        }, index=[0, 0, 1, 2])
+        result = self.flagging(df)
+        assert result["Is_Indie"].tolist() == [True, False, True, False]
+        assert result["Has_Multiple_Developers"].tolist() == [True, False, False, False]
+        assert result["Has_Multiple_Genres"].tolist() == [False, False, False, True]
+
+
+class TestDeveloperIndex:
+    """calculation.process_data.DeveloperIndex — precompiled dev-list lookups."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.process_data import DeveloperIndex, calculate_developer_weighted_points
+        self.DeveloperIndex = DeveloperIndex
+        self.fn = calculate_developer_weighted_points
+        self.dev_list = pd.DataFrame({
+            "Developer Name": [" Dev A", "dev b", "DEV A"],
+            "Total Hybrid Weighted Points": [4.0, 2.0, 3.0],
+        })
+
+    def test_lookup_is_normalised_and_first_match_wins(self):
+        index = self.DeveloperIndex(self.dev_list)
+        assert len(index) == 2
+        assert index.get("dev a ") == 4.0
+        assert "DEV B" in index
+        assert index.get("Nobody") is None
+
+    def test_score_averages_and_reports_missing(self):
+        index = self.DeveloperIndex(self.dev_list)
+        devs = pd.Series([["Dev A", " Nobody"], [], float("nan"), "Dev B", ["Ghost"]], index=list("vwxyz"))
+        points, missing = index.score(devs)
+        assert points.to_dict() == {"v": 2.5, "w": 1.0, "x": 1.0, "y": 2.0, "z": 1.0}
+        assert missing == ["Ghost", "Nobody"]
+
+    def test_batch_lookups_handle_mixed_cells(self):
+        index = self.DeveloperIndex(self.dev_list)
+        cells = [["dev a", 7], "  DEV B ", 3.5, None, 42, ["Dev A", float("nan")]]
+        points, missing = index.score(pd.Series(cells, dtype=object))
+        assert points.tolist() == [2.5, 2.0, 1.0, 1.0, 1.0, 4.0]
+        assert missing == ["42", "7"]   # int cells are names; float / None cells are not
+        assert self.fn(42, index) == (1.0, ["42"]) and self.fn(3.5, index) == (1, [])
+        exploded = pd.Series(["Dev A", float("nan"), " dev b", "Ghost"], index=[0, 0, 1, 1])
+        assert index.lookup(exploded).tolist()[::2] == [4.0, 2.0]
+        assert index.lookup(exploded).isna().tolist()[1::2] == [True, True]
+
+    def test_scalar_function_accepts_index(self):
+        index = self.DeveloperIndex(self.dev_list)
+        assert self.fn(["Dev A", "Nobody"], index) == (2.5, ["Nobody"])
+        assert self.fn(["Dev A", "Nobody"], self.dev_list) == (2.5, ["Nobody"])
+
+
+class TestVectorizedScoring:
+    """calculation.scoring — whole-column scoring matches the scalar helpers."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation import scoring
+        from calculation.process_data import (
+            calculate_hybrid_score,
+            calculate_developer_weighted_points,
+            calculate_trends_weighted_points,
+        )
+        self.scoring = scoring
+        self.hybrid = calculate_hybrid_score
+        self.dev_points = calculate_developer_weighted_points
+        self.trends_points = calculate_trends_weighted_points
+
+    def _dev_list(self):
+        return pd.DataFrame({
+            "Developer Name": ["Dev A", " dev b ", "Dev A"],
+            "Total Hybrid Weighted Points": [4.0, 2.0, 3.0],
+        })
+
+    def test_hybrid_scores_match_scalar(self):
+        values = [1000, 1500, 25_000, 398_955]
+        result = self.scoring.hybrid_scores(values, 1000, 398_955)
+        expected = [self.hybrid(v, 1000, 398_955) for v in values]
+        assert result.tolist() == pytest.approx(expected)
+
+    def test_trends_points_match_scalar(self):
+        result = self.scoring.trends_points([0, 37, 100])
+        assert result.tolist() == pytest.approx([self.trends_points(v) for v in (0, 37, 100)])
+
+    def test_developer_points_match_scalar(self):
+        dev_list = self._dev_list()
+        devs = pd.Series([["Dev A", " Dev B"], ["Unknown"], [], float("nan"), "dev a"], index=[5, 6, 7, 8, 9])
+        result = self.scoring.developer_points(devs, dev_list)
+        expected = [self.dev_points(d, dev_list)[0] for d in devs]
+        assert result.tolist() == pytest.approx(expected)
+        assert list(result.index) == [5, 6, 7, 8, 9]
+
+    def test_score_steam_final_priority(self):
+        df = pd.DataFrame({
+            "Name": ["Alpha", "Beta"],
+            "FollowerCount": [1000, 100_000],
+            "Developers": [["Dev A"], ["Nobody"]],
+        })
+        out = self.scoring.score_steam(df, {"Beta": 50}, max_followers=100_000,
+                                       w_followers=5, w_developers=2, w_trends=2,
+                                       developer_list=self._dev_list())
+        assert out["Follower Points"].tolist() == [1.0, 5.0]
+        assert out["Developer Points"].tolist() == [4.0, 1.0]
+        assert out["trends_score"].tolist() == [0, 50]
+        assert out["Final Priority Score"].tolist() == [5 + 8 + 2, 25 + 2 + 6]
+
+    def test_score_nonsteam_priority(self):
+        df = pd.DataFrame({
+            "Game Title": ["Low", "High"],
+            "YouTube Views": ["1,000", "50,000"],
+            "YouTube ReleaseDate": pd.to_datetime(["2026-01-01", "2026-01-01"]),
+            "Release Date": pd.to_datetime([None, None]),
+        })
+        out = self.scoring.score_nonsteam(df, {"High": 100}, w_youtube=5, w_trends=2,
+                                          today=date(2026, 1, 1))
+        assert out["YouTube Views"].tolist() == [1000, 50000]
+        assert out["Days_Since_Release"].tolist() == [0, 0]
+        assert out["youtube_score"].tolist() == [1.0, 5.0]
+        assert out["priority_score"].tolist() == [5 + 2, 25 + 10]
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # 2. NORMALISER  (pipelines/normalizer.py)
 # ══════════════════════════════════════════════════════════════════════════════
@@ -387,7 +585,8 @@ class TestAppendFromUploadedSteamCsv:
     """append_from_uploaded_steam_csv — merge logic."""
 
     @pytest.fixture(autouse=True)
-    def _import(self):
+    def _import(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("pipelines.snapshot_index.SNAPSHOT_INDEX_DB", tmp_path / "snapshot_index.sqlite")
         from pipelines.steam_pipeline import append_from_uploaded_steam_csv
         self.fn = append_from_uploaded_steam_csv
 
@@ -487,7 +686,8 @@ class TestAppendFromUploadedNonSteamCsv:
     """append_from_uploaded_nonsteam_csv — merge logic."""
 
     @pytest.fixture(autouse=True)
-    def _import(self):
+    def _import(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("pipelines.snapshot_index.SNAPSHOT_INDEX_DB", tmp_path / "snapshot_index.sqlite")
         from pipelines.nonsteam_pipeline import append_from_uploaded_nonsteam_csv
         self.fn = append_from_uploaded_nonsteam_csv
 
@@ -626,3 +826,1639 @@ class TestGetLatestCsvHelpers:
         with patch.object(config, "RAW_DIR", tmp_path):
             result = config.get_latest_nonsteam_csv()
         assert result == config.CSV_NON_STEAM
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 7. RANKING CACHE  (calculation/ranking_cache.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestRankingCache:
+    """RankingCache — bounded LRU of computed rankings."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.ranking_cache import RankingCache
+        self.RankingCache = RankingCache
+
+    def test_hit_skips_compute(self):
+        cache = self.RankingCache()
+        calls = []
+        compute = lambda: calls.append(1) or "ranked"
+        assert cache.get_or_compute(("steam", 1), compute) == "ranked"
+        assert cache.get_or_compute(("steam", 1), compute) == "ranked"
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = self.RankingCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")          # "b" is now the oldest
+        cache.put("c", 3)
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+
+class TestFingerprints:
+    """frame_fingerprint / dict_fingerprint — content hashes used in cache keys."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.ranking_cache import frame_fingerprint, dict_fingerprint
+        self.frame_fp = frame_fingerprint
+        self.dict_fp = dict_fingerprint
+
+    def test_frame_fingerprint_handles_list_cells(self):
+        df = pd.DataFrame({"Name": ["A"], "Developers": [["Dev A", "Dev B"]]})
+        assert self.frame_fp(df) == self.frame_fp(df.copy())
+        changed = df.copy()
+        changed.at[0, "Developers"] = ["Dev A"]
+        assert self.frame_fp(df) != self.frame_fp(changed)
+
+    def test_dict_fingerprint_ignores_order(self):
+        assert self.dict_fp({"a": 1, "b": 2}) == self.dict_fp({"b": 2, "a": 1})
+        assert self.dict_fp({"a": 1}) != self.dict_fp({"a": 2})
+        assert self.dict_fp(None) == self.dict_fp({})
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 8. ROW STORE  (calculation/row_store.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestRowStore:
+    """RowStore — derives only rows whose digest is new, reuses the rest."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.row_store import RowStore, row_digests
+        self.RowStore = RowStore
+        self.digests = row_digests
+
+    def _apply(self, path, df, calls, context=""):
+        store = self.RowStore(path, ["double"], context=context)
+
+        def compute(rows):
+            calls.append(len(rows))
+            return pd.DataFrame({"double": rows["v"] * 2})
+
+        derived, n_new = store.apply(df, self.digests(df["k"], df[["v"]]), compute)
+        return derived, n_new
+
+    def test_only_new_or_changed_rows_are_computed(self, tmp_path):
+        path = tmp_path / "store.sqlite"
+        calls = []
+        df = pd.DataFrame({"k": ["a", "b", "c"], "v": [1, 2, 3]})
+        self._apply(path, df, calls)
+        appended = pd.DataFrame({"k": ["a", "b", "c", "d"], "v": [1, 20, 3, 4]})
+        derived, n_new = self._apply(path, appended, calls)
+        assert calls == [3, 2]          # "b" changed, "d" appended
+        assert n_new == 2
+        assert derived["double"].tolist() == [2, 40, 6, 8]
+
+    def test_context_change_invalidates_everything(self, tmp_path):
+        path = tmp_path / "store.sqlite"
+        calls = []
+        df = pd.DataFrame({"k": ["a", "b"], "v": [1, 2]})
+        self._apply(path, df, calls, context="dev-list-1")
+        self._apply(path, df, calls, context="dev-list-2")
+        assert calls == [2, 2]
+
+    def test_alternating_frames_keep_each_others_rows(self, tmp_path):
+        path = tmp_path / "store.sqlite"
+        calls = []
+        old = pd.DataFrame({"k": ["a", "b"], "v": [1, 2]})
+        new = pd.DataFrame({"k": ["c", "d"], "v": [3, 4]})
+        for df in (old, new, old, new):
+            self._apply(path, df, calls)
+        assert calls == [2, 2]
+
+    def test_rows_past_max_age_are_pruned(self, tmp_path):
+        path = tmp_path / "store.sqlite"
+        calls = []
+        df = pd.DataFrame({"k": ["a"], "v": [1]})
+        self._apply(path, df, calls)
+        store = self.RowStore(path, ["double"], max_age_days=-1)   # everything is past the cutoff
+        store.insert({"z": [0]})
+        assert store.lookup(["z"]) == {} and self._apply(path, df, calls)[1] == 1
+
+
+class TestPrepareSteam:
+    """prepare_steam — incremental clean/flag/Developer Points match the full pass."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.row_store import prepare_steam
+        from calculation.process_data import clean_dev_genre_list, flagging
+        from calculation.scoring import developer_points
+        from config import RAW_DIR
+        self.prepare = prepare_steam
+        self.clean = clean_dev_genre_list
+        self.flagging = flagging
+        self.dev_points = developer_points
+        self.snapshots = sorted(RAW_DIR.glob("raw_steam_????-??-??.csv"))
+
+    def test_real_snapshots_match_full_pass(self, tmp_path):
+        if not self.snapshots:
+            pytest.skip("no raw_steam_*.csv snapshots on disk")
+        store = tmp_path / "row_store_steam.sqlite"
+        for path in self.snapshots:   # oldest → newest, so later loads reuse rows
+            raw = pd.read_csv(path)
+            result = self.prepare(raw, store_path=store)
+            expected = self.flagging(self.clean(raw.copy()))
+            pd.testing.assert_frame_equal(result.drop(columns="Developer Points"), expected, obj=path.name)
+            assert result["Developer Points"].tolist() == pytest.approx(
+                self.dev_points(expected["Developers"]).tolist()
+            )
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 9. SNAPSHOT STORE  (pipelines/snapshot_store.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestSnapshotStore:
+    """read_snapshot / write_snapshot — CSV export plus columnar sidecar."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from pipelines import snapshot_store
+        self.store = snapshot_store
+
+    def _steam(self):
+        return pd.DataFrame({
+            "AppId": [1, 2, 3],
+            "Name": ["Old", "Mid", "New"],
+            "ReleaseDate": ["15-01-2026", "20-05-2026", "Coming Soon"],
+            "date_appended": ["2026-01-10", "2026-05-01", "2026-06-20"],
+        })
+
+    def test_roundtrip_matches_csv(self, tmp_path):
+        path = tmp_path / "raw_steam_2026-06-20.csv"
+        self.store.write_snapshot(self._steam(), path)
+        assert path.exists()
+        pd.testing.assert_frame_equal(self.store.read_snapshot(path), pd.read_csv(path))
+
+    def test_projection_and_predicates(self, tmp_path):
+        path = tmp_path / "raw_steam_2026-06-20.csv"
+        self.store.write_snapshot(self._steam(), path)
+        recent = self.store.read_snapshot(path, columns=["Name"], appended_since=date(2026, 5, 1))
+        assert recent.columns.tolist() == ["Name"]
+        assert recent["Name"].tolist() == ["Mid", "New"]
+
+    def test_mixed_format_date_appended_is_parsed(self, tmp_path):
+        path = tmp_path / "raw_non_steam_2026-06-20.csv"
+        df = pd.DataFrame({
+            "Game Title":    ["A", "B", "C", "D"],
+            "date_appended": ["2026-02-01", "20-06-2026", "2026-06-01 10:00:00", "Unknown"],
+        })
+        self.store.write_snapshot(df, path)
+        since = date(2026, 5, 1)
+        assert self.store.read_snapshot(path, appended_since=since)["Game Title"].tolist() == ["B", "C"]
+        with patch.object(self.store, "_HAS_ARROW", False):
+            assert self.store.read_snapshot(path, appended_since=since)["Game Title"].tolist() == ["B", "C"]
+
+    def test_stale_sidecar_falls_back_to_csv(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "raw_steam_2026-06-20.csv"
+        self.store.write_snapshot(self._steam(), path)
+        assert self.store.columnar_path(path).exists()
+        edited = self._steam()
+        edited.loc[0, "Name"] = "Edited by hand"
+        edited.to_csv(path, index=False)
+        os.utime(path, ns=(self.store.columnar_path(path).stat().st_mtime_ns + 1_000_000,) * 2)
+        assert self.store.read_snapshot(path)["Name"].iloc[0] == "Edited by hand"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 10. DATES  (pipelines/dates.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestParseDates:
+    """parse_dates — vectorized multi-format date parsing."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from pipelines.dates import parse_dates, to_iso_dates, to_steam_release_dates
+        self.parse = parse_dates
+        self.to_iso = to_iso_dates
+        self.to_steam = to_steam_release_dates
+
+    def _iso(self, values):
+        return self.to_iso(pd.Series(values)).tolist()
+
+    def test_each_format_class(self):
+        values = ["2026-04-15", "15/1/2026", "3/17/2026", "5/6/2026", "23-04-2026",
+                  "22 Apr, 2026", "Apr 23, 2026", "April 2026", "Jan-26"]
+        assert self._iso(values) == ["2026-04-15", "2026-01-15", "2026-03-17", "2026-06-05",
+                                     "2026-04-23", "2026-04-22", "2026-04-23", "2026-04-01",
+                                     "2026-01-01"]
+
+    def test_sentinels_and_blanks(self):
+        parsed = self.parse(pd.Series(["Coming Soon", "TBD", "N/A", "", None]))
+        assert parsed.isna().all()
+        assert self._iso(["Coming Soon", "", None]) == ["Coming Soon", None, None]
+
+    def test_invalid_day_month_is_kept_as_text(self):
+        assert self._iso(["13/13/2026", "31/02/2026"]) == ["13/13/2026", "31/02/2026"]
+
+    def test_repeated_values_and_index_alignment(self):
+        series = pd.Series(["15/1/2026", "15/1/2026", None, "Apr 23, 2026"], index=[10, 11, 12, 13])
+        parsed = self.parse(series)
+        assert list(parsed.index) == [10, 11, 12, 13]
+        assert parsed.dt.strftime("%Y-%m-%d").tolist()[:2] == ["2026-01-15", "2026-01-15"]
+
+    def test_steam_format_keeps_iso_year_month_day(self):
+        assert self.to_steam(pd.Series(["2026-01-02", " 22 Apr, 2026 "])).tolist() == ["02-01-2026", "22-04-2026"]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 11. PLAYER COLLECTOR  (calculation/player_collector.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class _FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class TestTokenBucket:
+    """TokenBucket — burst capacity, then the sustained rate."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.player_collector import TokenBucket
+        self.TokenBucket = TokenBucket
+
+    def test_burst_is_immediate_then_rate_limited(self):
+        import time
+        bucket = self.TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.05
+        for _ in range(5):
+            bucket.acquire()
+        assert time.monotonic() - start >= 0.08   # 5 more tokens at 50/s ≈ 0.1s
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            self.TokenBucket(rate=0)
+
+
+class TestCollectPlayerCounts:
+    """collect_player_counts — concurrency, retries and partial results."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation import player_collector
+        self.pc = player_collector
+
+    def _collect(self, appids, fake_get, **kwargs):
+        import requests
+        kwargs = {"rate": 1000, "burst": 1000, "backoff_base": 0, **kwargs}
+        with patch.object(requests.Session, "request", side_effect=fake_get):
+            return self.pc.collect_player_counts(appids, **kwargs)
+
+    def test_all_succeed(self):
+        def fake_get(method, url, params, timeout):
+            return _FakeResponse(payload={"response": {"result": 1, "player_count": params["appid"] * 10}})
+        counts, failures = self._collect([1, 2, 3, 2], fake_get)
+        assert counts == {1: 10, 2: 20, 3: 30}
+        assert failures == {}
+
+    def test_transient_errors_are_retried(self):
+        import requests
+        calls = {}
+
+        def fake_get(method, url, params, timeout):
+            n = calls[params["appid"]] = calls.get(params["appid"], 0) + 1
+            if params["appid"] == 1 and n == 1:
+                raise requests.Timeout("slow")
+            if params["appid"] == 2 and n < 3:
+                return _FakeResponse(status_code=503)
+            return _FakeResponse(payload={"response": {"result": 1, "player_count": 5}})
+
+        counts, failures = self._collect([1, 2], fake_get)
+        assert counts == {1: 5, 2: 5}
+        assert calls == {1: 2, 2: 3}
+
+    def test_partial_results_when_some_calls_fail(self):
+        import requests
+
+        def fake_get(method, url, params, timeout):
+            if params["appid"] == 2:
+                raise requests.ConnectionError("down")
+            if params["appid"] == 3:
+                return _FakeResponse(status_code=404)
+            if params["appid"] == 4:
+                return _FakeResponse(payload={"response": {"result": 42}})
+            return _FakeResponse(payload={"response": {"result": 1, "player_count": 7}})
+
+        counts, failures = self._collect([1, 2, 3, 4], fake_get, max_retries=2)
+        assert counts == {1: 7}
+        assert set(failures) == {2, 3, 4}
+        assert failures[2] == "ConnectionError"
+
+    def test_history_keeps_successful_rows(self, tmp_path):
+        from calculation import steam_players
+        from calculation.player_count_store import PlayerCountStore
+        store = PlayerCountStore(tmp_path / "counts.sqlite")
+        inventory = pd.DataFrame({"Game Name": ["A", "B", "C"], "steam_appid": [1, 2, None]})
+        with patch.object(steam_players, "collect_player_counts", return_value=({1: 100}, {2: "HTTP 503"})):
+            latest = steam_players.fetch_player_counts_if_needed(inventory, store=store)
+        assert latest["game_name"].tolist() == ["A"]
+        assert latest["player_count"].tolist() == [100]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 12. PLAYER COUNT STORE  (calculation/player_count_store.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestPlayerCountStore:
+    """PlayerCountStore — append-only (steam_appid, hour) history."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation.player_count_store import PlayerCountStore
+        self.Store = PlayerCountStore
+
+    def _rows(self, *records):
+        return pd.DataFrame(records, columns=["game_name", "steam_appid", "player_count"])
+
+    def test_append_and_has_hour(self, tmp_path):
+        store = self.Store(tmp_path / "c.sqlite")
+        assert not store.has_hour("2026-06-01 10:00")
+        store.append("2026-06-01 10:00", self._rows(("A", 1, 10), ("B", 2, 20)))
+        assert store.has_hour("2026-06-01 10:00")
+        assert not store.has_hour("2026-06-01 11:00")
+        assert len(store.history()) == 2
+
+    def test_latest_and_range(self, tmp_path):
+        store = self.Store(tmp_path / "c.sqlite")
+        store.append("2026-06-01 10:00", self._rows(("A", 1, 10), ("B", 2, 20)))
+        store.append("2026-06-01 11:00", self._rows(("A", 1, 11)))
+        store.append("2026-06-01 12:00", self._rows(("A", 1, 12)))
+        latest = store.latest()
+        assert dict(zip(latest["game_name"], latest["player_count"])) == {"A": 12, "B": 20}
+        rng = store.read_range(1, start="2026-06-01 11:00")
+        assert rng["date"].tolist() == ["2026-06-01 11:00", "2026-06-01 12:00"]
+        assert str(rng["steam_appid"].dtype) == "Int64"
+
+    def test_replace_drops_the_hour_first(self, tmp_path):
+        store = self.Store(tmp_path / "c.sqlite")
+        store.append("2026-06-01 10:00", self._rows(("A", 1, 10), ("B", 2, 20)))
+        store.append("2026-06-01 10:00", self._rows(("A", 1, 15)), replace=True)
+        assert store.history()[["game_name", "player_count"]].values.tolist() == [["A", 15]]
+
+    def test_legacy_csv_imported_once(self, tmp_path):
+        legacy = tmp_path / "history.csv"
+        pd.DataFrame({
+            "date": ["2026-03-25 13:00", "2026-03-25 14:00", "2026-03-25 14:00"],
+            "game_name": ["A", "A", "A"],
+            "steam_appid": [1, 1, 1],
+            "player_count": [5, 6, 7],
+        }).to_csv(legacy, index=False)
+        store = self.Store(tmp_path / "c.sqlite", legacy_csv=legacy)
+        assert store.has_hour("2026-03-25 14:00")
+        assert store.history()["player_count"].tolist() == [5, 7]   # later duplicate wins
+        legacy.write_text("date,game_name,steam_appid,player_count\n2026-03-26 00:00,B,2,1\n")
+        assert len(self.Store(tmp_path / "c.sqlite", legacy_csv=legacy).history()) == 2
+
+    def test_fetch_skips_an_already_fetched_hour(self, tmp_path):
+        from datetime import datetime
+        from calculation import steam_players
+        store = self.Store(tmp_path / "c.sqlite")
+        hour = datetime.utcnow().strftime("%Y-%m-%d %H:00")
+        store.append(hour, self._rows(("A", 1, 10)))
+        inventory = pd.DataFrame({"Game Name": ["A"], "steam_appid": [1]})
+        with patch.object(steam_players, "collect_player_counts") as collect:
+            latest = steam_players.fetch_player_counts_if_needed(inventory, store=store)
+        collect.assert_not_called()
+        assert latest["player_count"].tolist() == [10]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 13. HTTP CLIENT  (calculation/http_client.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestHttpClient:
+    """HttpClient — pooled sessions, shared retry policy, per-endpoint counters."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        import requests
+        from calculation import http_client
+        self.requests = requests
+        self.hc = http_client
+        self.client = http_client.HttpClient(backoff=0)
+
+    def _send(self, responses, method="get", url="https://api.example.com/v1/thing", **kwargs):
+        calls = []
+
+        def fake_request(method, url, **kw):
+            calls.append((method, url))
+            result = responses[min(len(calls), len(responses)) - 1]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch.object(self.requests.Session, "request", side_effect=fake_request), \
+             patch.object(self.hc.time, "sleep") as sleep:
+            try:
+                resp = getattr(self.client, method)(url, **kwargs)
+            except Exception as exc:
+                resp = exc
+        return resp, calls, sleep
+
+    def test_one_session_per_host(self):
+        a = self.client.session_for("https://api.example.com/a")
+        assert self.client.session_for("https://api.example.com/b?x=1") is a
+        assert self.client.session_for("https://other.example.com/a") is not a
+
+    def test_retries_transient_status_then_succeeds(self):
+        resp, calls, _ = self._send([_FakeResponse(503), _FakeResponse(429), _FakeResponse(200)])
+        assert resp.status_code == 200
+        assert len(calls) == 3
+        stats = self.client.stats().set_index("endpoint").loc["api.example.com/v1/thing"]
+        assert (stats["calls"], stats["retries"], stats["errors"]) == (1, 2, 0)
+
+    def test_gives_back_last_response_when_retries_run_out(self):
+        resp, calls, _ = self._send([_FakeResponse(503)], retries=1, endpoint="thing")
+        assert resp.status_code == 503
+        assert len(calls) == 2
+        assert self.client.stats()["errors"].tolist() == [1]
+
+    def test_client_errors_are_not_retried(self):
+        resp, calls, _ = self._send([_FakeResponse(404)], method="post")
+        assert resp.status_code == 404
+        assert calls == [("POST", "https://api.example.com/v1/thing")]
+
+    def test_connection_errors_retried_but_dns_errors_are_not(self):
+        resp, calls, _ = self._send([self.requests.ConnectionError("reset"), _FakeResponse(200)])
+        assert resp.status_code == 200 and len(calls) == 2
+        resp, calls, _ = self._send([self.requests.ConnectionError("[Errno 11001] getaddrinfo failed")])
+        assert isinstance(resp, self.requests.ConnectionError) and len(calls) == 1
+
+    def test_retry_after_is_honoured(self):
+        _, _, sleep = self._send([_FakeResponse(429, headers={"Retry-After": "7"}), _FakeResponse(200)])
+        sleep.assert_called_once_with(7.0)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 14. READY-TASK COLLECTION  (calculation/dataforseo_trends.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _trends_task(status_code, averages=None):
+    task = {"status_code": status_code, "status_message": "msg"}
+    if averages is not None:
+        task["result"] = [{"items": [{"type": "google_trends_graph", "averages": averages}]}]
+    return task
+
+
+class TestCollectReadyResults:
+    """collect_ready_results — one immediate task_get per ready task, parsed in one pass."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation import dataforseo_trends
+        self.dfs = dataforseo_trends
+
+    def _collect(self, pending, ready_ids, tasks):
+        fetched = []
+
+        def fake_get_task(task_id, login, password):
+            fetched.append(task_id)
+            return tasks.get(task_id)
+
+        with patch.object(self.dfs, "fetch_tasks_ready", return_value=set(ready_ids)), \
+             patch.object(self.dfs, "_get_task", side_effect=fake_get_task), \
+             patch.object(self.dfs.time, "sleep") as sleep:
+            results = self.dfs.collect_ready_results(pending, "login", "pw")
+        sleep.assert_not_called()
+        return results, sorted(fetched)
+
+    def test_only_ready_tasks_are_fetched_and_parsed(self):
+        pending = {"t1": ["A", "B"], "t2": ["C", "D"], "t3": ["E", "F"]}
+        tasks = {"t1": _trends_task(20000, [10, 20]), "t2": _trends_task(20000, [30, 40])}
+        results, fetched = self._collect(pending, {"t1", "t2", "other"}, tasks)
+        assert fetched == ["t1", "t2"]
+        assert results == {"t1": {"A": 10.0, "B": 20.0}, "t2": {"C": 30.0, "D": 40.0}}
+
+    def test_failed_ready_task_scores_zero_but_running_or_unreachable_stay_pending(self):
+        pending = {"t1": ["A"], "t2": ["B"], "t3": ["C"]}
+        tasks = {"t1": _trends_task(40400), "t2": _trends_task(20100)}   # t3: GET failed
+        results, _ = self._collect(pending, {"t1", "t2", "t3"}, tasks)
+        assert results == {"t1": {"A": 0.0}}
+
+    def test_failed_poll_or_single_pending_task_is_checked_directly(self):
+        pending = {"t1": ["A"], "t2": ["B"]}
+        tasks = {"t1": _trends_task(20000, [5]), "t2": _trends_task(20100)}
+        with patch.object(self.dfs, "fetch_tasks_ready", return_value=None), \
+             patch.object(self.dfs, "_get_task", side_effect=lambda tid, *_: tasks.get(tid)) as get_task:
+            assert self.dfs.collect_ready_results(pending, "login", "pw") == {"t1": {"A": 5.0}}
+        assert get_task.call_count == 2                      # t2 still running → stays pending
+        results, fetched = self._collect({"gf": ["A", "B"]}, set(), {"gf": _trends_task(20000, [3, 4])})
+        assert fetched == ["gf"] and results == {"gf": {"A": 3.0, "B": 4.0}}
+
+    def test_pingback_wake_fetches_only_pingbacked_tasks(self):
+        tasks = {"t1": _trends_task(20000, [5]), "t2": _trends_task(20000, [6])}
+        with patch.object(self.dfs, "fetch_tasks_ready", return_value={"t2"}) as tasks_ready, \
+             patch.object(self.dfs, "_get_task", side_effect=lambda tid, *_: tasks.get(tid)):
+            results = self.dfs.collect_ready_results({"t1": ["A"], "t2": ["B"]}, "login", "pw",
+                                                     ready_ids={"t1"}, poll=False)
+        tasks_ready.assert_not_called()
+        assert results == {"t1": {"A": 5.0}}
+
+    def test_saturated_tasks_ready_checks_remaining_pending_directly(self):
+        pending = {"t1": ["A"], "t2": ["B"], "t3": ["C"]}
+        ready = {f"x{i}" for i in range(1000)} | {"t1"}
+        tasks = {"t1": _trends_task(20000, [5]), "t2": _trends_task(20000, [6]), "t3": _trends_task(40400)}
+        results, fetched = self._collect(pending, ready, tasks)
+        assert fetched == ["t1", "t2", "t3"]
+        assert results == {"t1": {"A": 5.0}, "t2": {"B": 6.0}}   # t3 not known-ready → left pending
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 15. PINGBACKS  (pipelines/pingback_queue.py, pipelines/pingback_server.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestPingbackQueue:
+    """PingbackQueue — durable set of task IDs reported complete."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from pipelines import pingback_queue
+        self.pq = pingback_queue
+        self.queue = pingback_queue.PingbackQueue(tmp_path / "pingbacks.sqlite")
+
+    def test_push_ready_ack(self):
+        self.queue.push("t1")
+        self.queue.push("t1")          # idempotent
+        self.queue.push("t2", "tag")
+        assert self.queue.ready(["t1", "t3"]) == {"t1"}
+        self.queue.ack(["t1"])
+        assert len(self.queue) == 1
+
+    def test_ready_from_queue_is_none_when_nothing_arrived(self):
+        assert self.pq.ready_from_queue(["t1"], self.queue) is None
+        self.queue.push("t1")
+        assert self.pq.ready_from_queue(["t1", "t2"], self.queue) == {"t1"}
+
+    def test_wait_for_returns_early_on_pingback(self):
+        import threading, time
+        threading.Timer(0.1, self.queue.push, args=("t9",)).start()
+        start = time.monotonic()
+        assert self.pq.wait_for(["t9"], timeout=5, queue=self.queue, interval=0.05) == {"t9"}
+        assert time.monotonic() - start < 2
+        assert self.pq.wait_for(["nope"], timeout=0.1, queue=self.queue, interval=0.05) == set()
+
+    def test_wait_for_ignores_ids_already_queued(self):
+        import time
+        self.queue.push("stuck")
+        start = time.monotonic()
+        assert self.pq.wait_for(["stuck"], timeout=0.2, queue=self.queue, interval=0.05) == set()
+        assert time.monotonic() - start >= 0.2
+
+
+class TestPingbackServer:
+    """Receiver end-to-end, with send_pingback standing in for DataForSEO."""
+
+    @pytest.fixture(autouse=True)
+    def _server(self, tmp_path):
+        from pipelines import pingback_queue, pingback_server
+        self.srv_mod = pingback_server
+        self.queue = pingback_queue.PingbackQueue(tmp_path / "pingbacks.sqlite")
+        self.server = pingback_server.make_server("127.0.0.1", 0, self.queue)
+        pingback_server.serve_in_background(self.server)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fake_pingbacks_land_in_the_queue(self):
+        assert self.srv_mod.send_pingback(self.url, "task-a", tag="steam") == 200
+        assert self.srv_mod.send_pingback(self.url, "task-b") == 200
+        assert self.queue.ready(["task-a", "task-b", "task-c"]) == {"task-a", "task-b"}
+
+    def test_postback_body_and_bad_requests(self):
+        import requests
+        resp = requests.post(f"{self.url}/pingback", json={"tasks": [{"id": "p1"}, {"id": "p2"}]}, timeout=5)
+        assert resp.status_code == 200
+        assert self.queue.ready(["p1", "p2"]) == {"p1", "p2"}
+        assert requests.get(f"{self.url}/pingback", timeout=5).status_code == 400
+        assert requests.get(f"{self.url}/pingback?id=$id", timeout=5).status_code == 400
+        assert requests.get(f"{self.url}/elsewhere", timeout=5).status_code == 404
+        assert requests.get(f"{self.url}/health", timeout=5).text == "ok"
+
+    _DONE = {"status_code": 20000, "result": [{"items": [{"type": "google_trends_graph", "averages": [50, 25]}]}]}
+
+    def _refresh_state(self, tmp_path):
+        from pipelines import refresh_trends_pipeline as rtp
+        state_file = tmp_path / "refresh_state.json"
+        state = rtp._empty_state()
+        state.update({
+            "status": "submitted", "anchor": "Minecraft", "anchor_cleaned": "Minecraft",
+            "tasks": [
+                {"task_id": "r1", "game": "Game A", "cleaned_game": "Game A", "status": "pending"},
+                {"task_id": "r2", "game": "Game B", "cleaned_game": "Game B", "status": "pending"},
+            ],
+        })
+        rtp.save_state(state, state_file=state_file)
+        return rtp, state_file
+
+    def test_collect_refresh_consumes_pingbacks_and_polls_for_the_rest(self, tmp_path):
+        rtp, state_file = self._refresh_state(tmp_path)
+        self.srv_mod.send_pingback(self.url, "r1")
+
+        with patch("pipelines.pingback_queue.PingbackQueue", return_value=self.queue), \
+             patch("calculation.dataforseo_trends.fetch_tasks_ready", return_value=set()) as tasks_ready, \
+             patch("calculation.dataforseo_trends._get_task", return_value=self._DONE) as get_task:
+            result = rtp.collect_refresh("login", "pw", state_file=state_file)
+
+        tasks_ready.assert_called_once()            # r2 has no pingback
+        assert [c.args[0] for c in get_task.call_args_list] == ["r1"]
+        assert result["collected"] == 1
+        assert result["scores"] == {"Game A": 50}
+        assert len(self.queue) == 0                  # consumed
+        tasks = rtp.load_state(state_file=state_file)["tasks"]
+        assert [t["status"] for t in tasks] == ["complete", "pending"]
+
+    def test_stuck_pingback_does_not_stop_polling_or_waiting(self, tmp_path, monkeypatch):
+        import time
+        from pipelines import job_runner
+        from pipelines.job_registry import JobRegistry
+        rtp, state_file = self._refresh_state(tmp_path)
+        self.srv_mod.send_pingback(self.url, "r1")
+        r1_gets = []
+
+        def get_task(task_id, login, password):
+            if task_id == "r1":
+                r1_gets.append(1)
+                return self._DONE if len(r1_gets) > 2 else None   # GET fails twice, then succeeds
+            return self._DONE
+
+        monkeypatch.setitem(job_runner.JOB_KINDS, "test", job_runner.JobKind(
+            "Test job", job_runner._refresh_collect(state_file), job_runner._refresh_pending(state_file),
+            interval=0.2, max_polls=5,
+        ))
+        start = time.monotonic()
+        with patch("pipelines.pingback_queue.PingbackQueue", return_value=self.queue), \
+             patch("calculation.dataforseo_trends.fetch_tasks_ready", return_value={"r2"}) as tasks_ready, \
+             patch("calculation.dataforseo_trends._get_task", side_effect=get_task), \
+             patch.object(rtp, "write_scores"):
+            job = job_runner.run_job("test", "u", "p", registry=JobRegistry(tmp_path / "jobs.sqlite"))
+
+        assert job["status"] == "done"
+        assert job["progress"]["polls"] == 3
+        assert tasks_ready.call_count == 1          # r2 collected by polling on the first cycle
+        assert len(r1_gets) == 3
+        assert time.monotonic() - start >= 0.4      # both waits ran their interval
+        assert len(self.queue) == 0
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 16. TRENDS CACHE  (pipelines/trends_cache.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestTrendsCacheSubsetLookup:
+    """lookup_cached_scores — exact hits, and groups resolved from superset entries."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from pipelines import trends_cache
+        self.tc = trends_cache
+
+    def _cache(self, *entries):
+        cache = {}
+        for scores, fetched in entries:
+            kws = list(scores)
+            cache["|".join(sorted(kws))] = {"keywords": kws, "scores": scores, "fetched_date": fetched}
+        return cache
+
+    def test_exact_entry_wins(self):
+        today = date.today().isoformat()
+        cache = self._cache(({"A": 10, "B": 20}, today), ({"A": 1, "B": 4, "C": 9}, today))
+        assert self.tc.lookup_cached_scores(["B", "A"], cache) == ({"B": 20.0, "A": 10.0}, today)
+
+    def test_subset_resolved_from_freshest_superset(self):
+        old = (date.today() - timedelta(days=3)).isoformat()
+        today = date.today().isoformat()
+        cache = self._cache(
+            ({"A": 10, "B": 30, "C": 5, "D": 1, "E": 2}, old),
+            ({"A": 40, "B": 20, "C": 7, "X": 9, "Y": 3}, today),
+        )
+        index = self.tc.build_keyword_index(cache)
+        assert self.tc.lookup_cached_scores(["A", "B"], cache, index) == ({"A": 40.0, "B": 20.0}, today)
+
+    def test_superset_not_used_when_stale_or_zero(self):
+        from datetime import timedelta
+        stale = (date.today() - timedelta(days=40)).isoformat()
+        today = date.today().isoformat()
+        cache = self._cache(({"A": 10, "B": 30, "C": 5}, stale), ({"A": 0, "B": 100, "C": 3}, today))
+        assert self.tc.lookup_cached_scores(["A", "B"], cache) is None
+        assert self.tc.lookup_cached_scores(["B", "C"], cache) == ({"B": 100.0, "C": 3.0}, today)
+        assert self.tc.lookup_cached_scores(["B", "Z"], cache) is None
+
+    def test_write_updates_index(self):
+        cache, index = {}, {}
+        self.tc.write_cached_scores(["A", "B", "C"], {"A": 1, "B": 2, "C": 3}, cache, index)
+        assert index == {"A": {"A|B|C"}, "B": {"A|B|C"}, "C": {"A|B|C"}}
+        assert self.tc.lookup_cached_scores(["C", "A"], cache, index) == ({"C": 3.0, "A": 1.0}, date.today().isoformat())
+
+    def test_cached_round_task_keeps_the_entry_fetched_date(self):
+        from datetime import timedelta
+        from pipelines import tournament_pipeline, tournament_state
+        old = (date.today() - timedelta(days=20)).isoformat()
+        cache = self._cache(({"A": 40, "B": 20, "C": 7}, old))
+        state = tournament_state._empty_state()
+        state["steam"]["pool"] = ["A", "B"]
+        with patch.object(tournament_pipeline, "post_tasks_bulk") as post:
+            tournament_pipeline.submit_round(state, "steam", "u", "p", save_fn=lambda s: None, cache=cache)
+        post.assert_not_called()
+        task, = state["steam"]["rounds"]["1"]["tasks"]
+        assert (task["status"], task["winner"], task["fetched_date"]) == ("cached", "A", old)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 17. TOURNAMENT CHAIN  (pipelines/tournament_chain.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _bracket_state(rounds):
+    today = date.today().isoformat()
+    state = {"steam": {"rounds": {}}, "non_steam": {"rounds": {}}}
+    for rnum, groups in enumerate(rounds, start=1):
+        tasks = []
+        for scores in groups:
+            status = "complete" if any(v > 0 for v in scores.values()) else "failed"
+            tasks.append({"keywords": list(scores), "scores": scores, "status": status, "fetched_date": today})
+        state["steam"]["rounds"][str(rnum)] = {"tasks": tasks, "bye_games": []}
+    return state
+
+
+class TestChainNormalize:
+    """chain_normalize — anchor-relative scores propagated through the bracket."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from pipelines import tournament_chain
+        self.tc = tournament_chain
+
+    def _chain(self, rounds, anchor):
+        return self.tc.chain_normalize(self.tc.state_matches(_bracket_state(rounds)), anchor)
+
+    def test_ratios_chain_through_winners(self):
+        out = self._chain([
+            [{"A": 50, "B": 25, "C": 10}, {"D": 40, "E": 20}],
+            [{"A": 80, "D": 40}],
+        ], anchor="D")
+        assert out["D"]["score"] == 100.0
+        assert out["E"]["score"] == 50.0
+        assert out["A"]["score"] == 200.0
+        assert out["B"]["score"] == 100.0 and out["B"]["hops"] == 2
+        assert out["C"]["score"] == 40.0
+        assert all(info["confidence"] == "high" for info in out.values())
+
+    def test_low_confidence_chains_are_flagged(self):
+        out = self._chain([
+            [{"A": 60, "B": 0, "C": 1.5}, {"D": 0, "E": 0}, {"F": 30, "G": 20}],
+            [{"A": 90, "F": 30}],
+        ], anchor="A")
+        assert out["B"] == {"score": 0.0, "confidence": "low", "reason": "zero", "hops": 1, "fetched_date": None}
+        assert out["C"]["reason"] == "weak_link"
+        assert out["D"]["reason"] == "failed" and out["D"]["score"] is None
+        assert out["G"]["confidence"] == "high" and out["G"]["score"] == pytest.approx(22.22)
+
+    def test_stale_or_missing_anchor_leaves_games_unlinked(self):
+        state = _bracket_state([[{"A": 60, "B": 30}]])
+        state["steam"]["rounds"]["1"]["tasks"][0]["fetched_date"] = "2000-01-01"
+        out = self.tc.chain_normalize(self.tc.state_matches(state), "A")
+        assert out["B"]["reason"] == "unlinked"
+        assert self._chain([[{"A": 60, "B": 30}]], "Z")["B"]["reason"] == "unlinked"
+
+    def test_chained_score_carries_its_oldest_fetch_date(self):
+        state = _bracket_state([[{"A": 50, "B": 25}, {"D": 40, "E": 20}], [{"A": 80, "D": 40}]])
+        old = (date.today() - timedelta(days=5)).isoformat()
+        state["steam"]["rounds"]["1"]["tasks"][0]["fetched_date"] = old
+        out = self.tc.chain_normalize(self.tc.state_matches(state), "D")
+        assert out["D"]["fetched_date"] is None
+        assert out["A"]["fetched_date"] == out["E"]["fetched_date"] == date.today().isoformat()
+        assert out["B"]["fetched_date"] == old
+
+    def test_matches_from_run_tournament_results(self):
+        results = [
+            {"game": "A", "score": 40.0, "round": 1, "group": 1, "api_failed": False},
+            {"game": "B", "score": 10.0, "round": 1, "group": 1, "api_failed": False},
+            {"game": "C", "score": None, "round": 1, "group": 2, "api_failed": False},
+            {"game": "A", "score": 20.0, "round": 2, "group": 1, "api_failed": False},
+            {"game": "C", "score": 40.0, "round": 2, "group": 1, "api_failed": False},
+        ]
+        out = self.tc.chain_normalize(self.tc.matches_from_results(results), "C")
+        assert out["A"]["score"] == 50.0 and out["B"]["score"] == 12.5
+
+    def test_submit_refresh_only_posts_low_confidence_games(self, tmp_path):
+        from pipelines import refresh_trends_pipeline as rtp
+        matches = self.tc.state_matches(_bracket_state([[{"A": 60, "B": 30, "C": 0}]]))
+        state_file = tmp_path / "refresh_state.json"
+        with patch.object(self.tc, "tournament_matches", return_value=matches), \
+             patch.object(rtp, "post_tasks_bulk", return_value=["t-c"]) as post:
+            state = rtp.submit_refresh(["B", "C"], "A", "login", "pw", state_file=state_file)
+        assert [p["keywords"] for p in post.call_args[0][0]] == [["A", "C"]]
+        assert {t["game"]: t["status"] for t in state["tasks"]} == {"B": "chained", "C": "pending"}
+
+        seen = []
+        with patch("calculation.dataforseo_trends.fetch_tasks_ready", return_value=set()), \
+             patch.object(rtp.pingback_queue, "ready_from_queue", return_value=None), \
+             patch.object(rtp.pingback_queue, "ack"):
+            result = rtp.collect_refresh("login", "pw", on_task_complete=lambda g, s, *a: seen.append((g, s)),
+                                         state_file=state_file)
+        assert seen == [("B", 50)]
+        assert result["scores"] == {"B": 50} and not result["complete"]
+        assert result["fetched_at"] == {"B": f"{date.today().isoformat()} 00:00:00"}
+
+    def test_refresh_does_not_chain_results_older_than_today(self, tmp_path):
+        from pipelines import refresh_trends_pipeline as rtp
+        state = _bracket_state([[{"A": 60, "B": 30}]])
+        state["steam"]["rounds"]["1"]["tasks"][0]["fetched_date"] = (date.today() - timedelta(days=1)).isoformat()
+        with patch.object(self.tc, "tournament_matches", return_value=self.tc.state_matches(state)), \
+             patch.object(rtp, "post_tasks_bulk", return_value=["t-b"]) as post:
+            state = rtp.submit_refresh(["B"], "A", "login", "pw", state_file=tmp_path / "refresh_state.json")
+        assert [p["keywords"] for p in post.call_args[0][0]] == [["A", "B"]]
+        assert state["tasks"][0]["status"] == "pending"
+
+    def test_write_scores_keeps_chained_fetch_time(self, tmp_path):
+        from calculation.trends_score_store import TrendsScoreStore
+        from pipelines import refresh_trends_pipeline as rtp
+        store = TrendsScoreStore(tmp_path / "trends.sqlite")
+        rtp.write_scores({"B": 50, "C": 20}, store=store, fetched_at={"B": "2026-01-02 00:00:00"})
+        stamps = store.timestamps()
+        assert stamps["B"] == "2026-01-02 00:00:00"
+        assert stamps["C"][:10] == date.today().isoformat()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 18. PACKED REFRESH  (pipelines/refresh_trends_pipeline.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestPackedRefresh:
+    """submit_refresh packs 4 games + anchor per task; collect_refresh unpacks per game."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from pipelines import refresh_trends_pipeline
+        self.rtp = refresh_trends_pipeline
+        self.state_file = tmp_path / "refresh_state.json"
+
+    def _submit(self, games, **kw):
+        posted = []
+
+        def fake_post(payloads, login, password):
+            posted.extend(p["keywords"] for p in payloads)
+            return [f"t{len(posted) - len(payloads) + i}" for i in range(len(payloads))]
+
+        with patch.object(self.rtp, "post_tasks_bulk", side_effect=fake_post):
+            state = self.rtp.submit_refresh(games, "Anchor", "login", "pw", state_file=self.state_file,
+                                            use_tournament=False, **kw)
+        return state, posted
+
+    def test_games_are_packed_four_per_task(self):
+        games = ["G1", "G2", "G3", "G4", "G5", "G5: Deluxe Edition", "Anchor"]
+        state, posted = self._submit(games)
+        assert posted == [["Anchor", "G1", "G2", "G3", "G4"], ["Anchor", "G5"]]
+        assert [t["task_id"] for t in state["tasks"]] == ["t0"] * 4 + ["t1"] * 3
+        _, single = self._submit(["G1", "G2"], batch_size=1)
+        assert single == [["Anchor", "G1"], ["Anchor", "G2"]]
+
+    def test_collect_unpacks_per_game_scores_and_status(self):
+        self._submit(["G1", "G2", "G3", "G4", "G5"])
+        raw = {"t0": {"Anchor": 50.0, "G1": 100.0, "G2": 25.0, "G3": 0.0, "G4": 5.0}}
+        seen = []
+        with patch.object(self.rtp, "collect_ready_results", return_value=raw) as collect, \
+             patch.object(self.rtp.pingback_queue, "ready_from_queue", return_value=None), \
+             patch.object(self.rtp.pingback_queue, "ack"):
+            result = self.rtp.collect_refresh("login", "pw", state_file=self.state_file,
+                                              on_task_complete=lambda g, s, *a: seen.append((g, s)))
+        assert collect.call_args[0][0] == {"t0": ["Anchor", "G1", "G2", "G3", "G4"], "t1": ["Anchor", "G5"]}
+        assert result["scores"] == {"G1": 200, "G2": 50, "G3": 0, "G4": 10}
+        assert result["collected"] == 4 and not result["complete"]
+        assert [g for g, _ in seen] == ["G1", "G2", "G3", "G4"]
+        statuses = {t["game"]: t["status"] for t in self.rtp.load_state(state_file=self.state_file)["tasks"]}
+        assert statuses == {"G1": "complete", "G2": "complete", "G3": "complete", "G4": "complete", "G5": "pending"}
+
+    def _collect(self, raw, post_ids=()):
+        with patch.object(self.rtp, "collect_ready_results", return_value=raw), \
+             patch.object(self.rtp, "post_tasks_bulk", return_value=list(post_ids)) as post, \
+             patch.object(self.rtp.pingback_queue, "ready_from_queue", return_value=None), \
+             patch.object(self.rtp.pingback_queue, "ack"):
+            result = self.rtp.collect_refresh("login", "pw", state_file=self.state_file)
+        tasks = self.rtp.load_state(state_file=self.state_file)["tasks"]
+        return result, post, {t["game"]: (t["status"], t["task_id"]) for t in tasks}
+
+    def test_flattened_anchor_resubmits_the_batch_one_game_per_task(self):
+        self._submit(["G1", "G2", "G3", "G4"])
+        result, post, tasks = self._collect(
+            {"t0": {"Anchor": 0.0, "G1": 100.0, "G2": 1.0, "G3": 0.0, "G4": 1.0}}, post_ids=["s1", "s2", "s3", "s4"],
+        )
+        assert [p["keywords"] for p in post.call_args[0][0]] == [["Anchor", g] for g in ("G1", "G2", "G3", "G4")]
+        assert result["scores"] == {} and result["collected"] == 0 and not result["complete"]
+        assert tasks == {"G1": ("pending", "s1"), "G2": ("pending", "s2"), "G3": ("pending", "s3"), "G4": ("pending", "s4")}
+
+        raw = {"s1": {"Anchor": 0.0, "G1": 100.0}, "s2": {"Anchor": 40.0, "G2": 20.0},
+               "s3": {"Anchor": 50.0, "G3": 5.0}, "s4": {"Anchor": 10.0, "G4": 30.0}}
+        result, post, tasks = self._collect(raw)
+        post.assert_not_called()                     # single tasks are never resubmitted
+        assert result["scores"] == {"G2": 50, "G3": 10, "G4": 300}
+        assert result["errors"] == 1 and result["complete"]
+        assert tasks["G1"][0] == "failed"            # no anchor value on its own either: no 0 recorded
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 19. TRENDS SCORE STORE  (calculation/trends_score_store.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestTrendsScoreStore:
+    """TrendsScoreStore — latest scores, history and comparisons in one SQLite file."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from calculation import trends_score_store
+        self.mod = trends_score_store
+        self.tmp = tmp_path
+        self.store = trends_score_store.TrendsScoreStore(tmp_path / "trends.sqlite")
+
+    def test_upsert_keeps_latest_and_appends_history(self):
+        self.store.upsert_scores({"A": 10, "B": 20}, fetched_at="2026-01-01 10:00:00", anchor="X")
+        self.store.upsert_scores({"A": 15}, fetched_at="2026-01-02 10:00:00")
+        self.store.upsert_scores({"B": 5}, fetched_at="2025-12-31 10:00:00")   # older: history only
+        assert self.store.scores() == {"A": 15, "B": 20}
+        assert self.store.timestamps(["A", "missing"]) == {"A": "2026-01-02 10:00:00"}
+        latest = self.store.latest()
+        assert latest["game_name"].tolist() == ["B", "A"]
+        assert latest["anchor"].tolist() == ["X", "X"]
+        assert self.store.history(["A"])["trends_score"].tolist() == [10, 15]
+        assert len(self.store.history()) == 4
+
+    def test_legacy_files_imported_once(self):
+        latest_csv = self.tmp / "latest.csv"
+        history_csv = self.tmp / "history.csv"
+        results_json = self.tmp / "results.json"
+        pd.DataFrame({"game_name": ["A", "B"], "trends_score": [30, 40],
+                      "fetched_at": ["2026-02-01 09:00:00"] * 2}).to_csv(latest_csv, index=False)
+        pd.DataFrame({"game_name": ["A"], "trends_score": [25],
+                      "fetched_at": ["2026-01-01 09:00:00"]}).to_csv(history_csv, index=False)
+        results_json.write_text('{"A|B": {"keywords": ["A", "B"], "scores": {"A": 1, "B": 2}, '
+                                '"fetched_date": "2026-02-01"}}', encoding="utf-8")
+
+        def _open():
+            return self.mod.TrendsScoreStore(self.tmp / "legacy.sqlite", latest_csv, history_csv, results_json)
+
+        store = _open()
+        assert store.scores() == {"A": 30, "B": 40}
+        assert store.history(["A"])["trends_score"].tolist() == [25, 30]
+        assert store.comparisons()["A|B"]["scores"] == {"A": 1, "B": 2}
+        store.upsert_scores({"A": 99})
+        assert _open().scores()["A"] == 99   # not re-imported over newer data
+
+    def test_trends_cache_round_trip_and_ttl(self):
+        from datetime import timedelta
+        from pipelines import trends_cache
+        old = (date.today() - timedelta(days=40)).isoformat()
+        self.store.upsert_comparisons({"X|Y": {"keywords": ["X", "Y"], "scores": {"X": 1}, "fetched_date": old}})
+        cache = trends_cache.load_trends_cache(self.store)
+        assert cache == {}
+        trends_cache.write_cached_scores(["A", "B"], {"A": 3.0, "B": 6.0}, cache)
+        trends_cache.save_trends_cache(cache, self.store)
+        assert list(self.store.comparisons()) == ["A|B"]    # stale entry pruned
+        assert trends_cache.lookup_cached_scores(["B", "A"], trends_cache.load_trends_cache(self.store)) == (
+            {"B": 6.0, "A": 3.0}, date.today().isoformat(),
+        )
+
+    def test_refresh_write_scores_upserts_only_new_games(self):
+        from pipelines import refresh_trends_pipeline as rtp
+        self.store.upsert_scores({"Old": 7}, fetched_at="2026-01-01 00:00:00")
+        rtp.write_scores({"New": 42}, store=self.store)
+        assert self.store.scores() == {"Old": 7, "New": 42}
+        assert self.store.timestamps(["Old"]) == {"Old": "2026-01-01 00:00:00"}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 20. JOB RUNNER  (pipelines/job_runner.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestJobRunner:
+    """run_job / start_job — background collect cycles and their job records."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path, monkeypatch):
+        from pipelines import job_runner
+        from pipelines.job_registry import JobRegistry
+        self.mod = job_runner
+        self.registry = JobRegistry(tmp_path / "jobs.sqlite")
+        self.pending = ["t1", "t2"]
+        self.waits: list = []
+
+        def collect(login, password, poll=True, on_batch=None):
+            self.pending = self.pending[1:]
+            return {"collected": 1, "errors": 0, "complete": False, "scores": {"G": 1}}
+
+        monkeypatch.setitem(job_runner.JOB_KINDS, "test", job_runner.JobKind(
+            "Test job", collect, lambda: list(self.pending), interval=30, max_polls=5,
+        ))
+
+    def _wait(self, task_ids, timeout):
+        self.waits.append((list(task_ids), timeout))
+
+    def _run(self):
+        return self.mod.run_job("test", "u", "p", wait=self._wait, registry=self.registry)
+
+    def test_runs_until_nothing_pending(self):
+        job = self._run()
+        assert job["status"] == "done"
+        prog = job["progress"]
+        assert (prog["polls"], prog["collected"], prog["pending"]) == (2, 2, 0)
+        (ids, timeout), = self.waits
+        assert ids == ["t2"] and 29 < timeout <= 30
+        assert "scores" not in prog["last_summary"]
+        assert job["finished_at"] is not None
+        assert not self.mod.is_running("test", self.registry)
+
+    def test_pingback_wakes_fetch_only_pingbacked_tasks_and_do_not_count_as_polls(self, monkeypatch):
+        self.pending = [f"t{i}" for i in range(6)]
+        polls = []
+
+        def collect(login, password, poll=True, on_batch=None):
+            polls.append(poll)
+            self.pending = self.pending[1:]
+            return {"collected": 1, "errors": 0, "complete": False}
+
+        monkeypatch.setitem(self.mod.JOB_KINDS, "test", self.mod.JobKind(
+            "Test job", collect, lambda: list(self.pending), interval=30, max_polls=2,
+        ))
+        # Every wait ends on a pingback, one task at a time
+        job = self.mod.run_job("test", "u", "p", wait=lambda ids, timeout: {ids[0]}, registry=self.registry)
+        assert job["status"] == "done"
+        assert polls == [True] + [False] * 5
+        assert (job["progress"]["polls"], job["progress"]["wakes"]) == (1, 5)
+
+    def test_times_out_at_max_polls(self):
+        self.pending = ["t"] * 10
+        job = self._run()
+        assert job["status"] == "timed_out"
+        assert job["progress"]["polls"] == 5
+
+    def test_collector_error_marks_job_failed(self, monkeypatch):
+        def boom(login, password, poll=True, on_batch=None):
+            raise RuntimeError("API down")
+        monkeypatch.setitem(self.mod.JOB_KINDS, "test", self.mod.JobKind("Test job", boom, list, 30))
+        job = self._run()
+        assert (job["status"], job["error"]) == ("failed", "API down")
+
+    def test_start_is_refused_while_a_live_worker_owns_the_kind(self):
+        assert self.registry.claim("test", "Test job") is not None
+        assert self.mod.is_running("test", self.registry)
+        assert self.mod.start_job("test", "u", "p", registry=self.registry) is False
+        with pytest.raises(ValueError):
+            self._run()
+        with pytest.raises(ValueError):
+            self.mod.start_job("nope", "u", "p", registry=self.registry)
+
+    def test_superseded_worker_stops_without_overwriting(self):
+        def collect(login, password, poll=True, on_batch=None):
+            # Another worker takes over the kind mid-run (e.g. after a stale heartbeat)
+            with sqlite3.connect(self.registry.path) as conn:
+                conn.execute("UPDATE jobs SET job_id = 'other'")
+            return {"collected": 1, "errors": 0, "complete": False}
+        self.mod.JOB_KINDS["test"] = self.mod.JobKind("Test job", collect, lambda: ["t"], 30)
+        job = self._run()
+        assert (job["job_id"], job["status"]) == ("other", "running")
+        assert self.waits == []
+
+    def test_long_collect_heartbeats_per_batch_and_stops_once_superseded(self):
+        reached = []
+
+        def collect(login, password, poll=True, on_batch=None):
+            with sqlite3.connect(self.registry.path) as conn:
+                conn.execute("UPDATE jobs SET updated_at = '2000-01-01 00:00:00'")
+            on_batch(8, 16)
+            reached.append(self.mod.is_running("test", self.registry))   # the batch heartbeat revived it
+            with sqlite3.connect(self.registry.path) as conn:
+                conn.execute("UPDATE jobs SET job_id = 'other'")
+            on_batch(16, 16)
+            reached.append("after takeover")
+            return {"collected": 1, "errors": 0, "complete": False}
+        self.mod.JOB_KINDS["test"] = self.mod.JobKind("Test job", collect, lambda: ["t"], 30)
+        job = self._run()
+        assert reached == [True]
+        assert (job["job_id"], job["status"]) == ("other", "running")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 21. JOB REGISTRY  (pipelines/job_registry.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestJobRegistry:
+    """JobRegistry — one live job per kind, heartbeats and one-time results."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from pipelines.job_registry import JobRegistry
+        self.cls = JobRegistry
+        self.path = tmp_path / "jobs.sqlite"
+        self.registry = JobRegistry(self.path)
+
+    def _age_heartbeat(self):
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE jobs SET updated_at = '2000-01-01 00:00:00'")
+
+    def test_one_live_job_per_kind_across_instances(self):
+        job_id = self.registry.claim("k", "Kind", progress={"message": "Starting"})
+        assert job_id
+        assert self.cls(self.path).claim("k", "Kind") is None   # fresh instance, same file
+        assert self.registry.claim("other", "Other") is not None
+        assert self.registry.heartbeat("k", job_id, {"message": "Round 2"})
+        assert self.cls(self.path).get("k")["progress"] == {"message": "Round 2"}
+
+    def test_stale_job_can_be_reclaimed_and_old_worker_is_superseded(self):
+        old = self.registry.claim("k", "Kind")
+        self._age_heartbeat()
+        assert not self.registry.is_running("k")
+        new = self.registry.claim("k", "Kind")
+        assert new and new != old
+        assert self.registry.heartbeat("k", old) is False
+        assert self.registry.finish("k", old, "done") is False
+        assert self.registry.get("k")["status"] == "running"
+
+    def test_result_is_taken_once(self):
+        job_id = self.registry.claim("k", "Kind")
+        assert self.registry.take_result("k") is None           # still running
+        self.registry.finish("k", job_id, "done", result={"anchor": "A", "n": np.int64(3)})
+        job = self.registry.take_result("k")
+        assert job["result"] == {"anchor": "A", "n": 3}
+        assert self.registry.take_result("k") is None
+        assert self.registry.get("k")["consumed"] is True
+
+    def test_trends_pipeline_records_failure_in_registry(self, monkeypatch):
+        from pipelines import trends_pipeline
+        monkeypatch.setattr(trends_pipeline, "load_credentials", lambda: (None, None))
+        trends_pipeline.run_trends_pipeline(None, None, registry=self.registry)
+        assert trends_pipeline.trends_pipeline_progress(self.registry) is None
+        assert trends_pipeline.take_trends_pipeline_result(self.registry) == {
+            "error": "DataForSEO credentials not configured.",
+        }
+        assert trends_pipeline.take_trends_pipeline_result(self.registry) is None
+
+    def test_trends_pipeline_worker_stops_once_superseded(self, monkeypatch):
+        from pipelines import trends_pipeline
+        old = self.registry.claim(trends_pipeline.JOB_KIND, trends_pipeline.JOB_LABEL)
+        self._age_heartbeat()
+        new = self.registry.claim(trends_pipeline.JOB_KIND, trends_pipeline.JOB_LABEL)
+        monkeypatch.setattr(trends_pipeline, "run_tournament", lambda *a, **k: pytest.fail("kept running"))
+        trends_pipeline._worker(["A", "B"], [], "u", "p", old, self.registry)
+        job = self.registry.get(trends_pipeline.JOB_KIND)
+        assert (job["job_id"], job["status"]) == (new, "running")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 22. RANKING PIPELINE  (pipelines/ranking_pipeline.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestRankingPipeline:
+    """Headless ranking — weights file, Non-Steam dedup / filter and on-Steam exclusion."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from pipelines import ranking_pipeline
+        self.mod = ranking_pipeline
+        self.tmp = tmp_path
+
+    def test_weights_file_overrides_defaults(self):
+        assert self.mod.load_weights(self.tmp / "missing.json") == self.mod.DEFAULT_WEIGHTS
+        path = self.tmp / "weights.json"
+        path.write_text('{"non_steam": {"trends": 4}}', encoding="utf-8")
+        weights = self.mod.load_weights(path)
+        assert weights["non_steam"] == {"youtube": 5, "trends": 4.0}
+        assert weights["steam"] == self.mod.DEFAULT_WEIGHTS["steam"]
+        path.write_text('{"steam": {"follower": 3}}', encoding="utf-8")
+        with pytest.raises(ValueError, match="follower"):
+            self.mod.load_weights(path)
+
+    def test_rank_nonsteam_dedups_filters_and_excludes_steam_titles(self):
+        raw = pd.DataFrame({
+            "Game Title":          ["Alpha", "Alpha", "Beta", "Gamma", "Delta"],
+            "SteamStatus":         ["Not on Steam", "Not on Steam", "Not on Steam", "PC Game (on Steam)", None],
+            "Category":            ["Main Game"] * 5,
+            "YouTube Views":       ["1,000", "50,000", "2,000", "9,000", "9,000"],
+            "YouTube ReleaseDate": ["2026-01-01"] * 5,
+            "Release Date":        ["2026-01-01"] * 5,
+            "date_appended":       ["2026-01-01", "2026-02-01", "2026-01-01", "2026-01-01", "2026-01-01"],
+        })
+        ranked, raw_rows, merged = self.mod.rank_nonsteam(
+            raw, {"Beta": 50}, w_youtube=5, w_trends=2, today=date(2026, 3, 1),
+            store_path=self.tmp / "row_store.sqlite",
+        )
+        assert (raw_rows, merged) == (5, 1)
+        assert ranked["Game Title"].tolist() == ["Alpha", "Beta"]   # newest Alpha row kept, sorted by score
+        assert ranked.loc[0, "YouTube Views"] == 50000
+        kept, removed = self.mod.exclude_on_steam(ranked, pd.DataFrame({"Name": [" beta "]}))
+        assert (kept["Game Title"].tolist(), removed) == (["Alpha"], 1)
+
+    def test_cli_paths_are_relative_to_the_launch_directory(self, monkeypatch):
+        import rank
+        monkeypatch.setattr(rank, "_LAUNCH_DIR", self.tmp)
+        calls = {}
+
+        def fake_run(weights, **kw):
+            calls.update(kw)
+            return {k: {"ranked": 0, "output": "x"} for k in ("steam", "non_steam")}
+
+        monkeypatch.setattr(rank, "run_ranking", fake_run)
+        assert rank.main(["--steam-csv", "raw/s.csv", "--out", "ranked", "--weights", "w.json"]) == 0
+        assert calls["steam_csv"] == self.tmp / "raw" / "s.csv"
+        assert calls["out_dir"] == self.tmp / "ranked"
+        assert calls["nonsteam_csv"] is None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 23. BENCHMARKS  (benchmarks/synthetic.py, benchmarks/hot_paths.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestBenchmarks:
+    """Seeded synthetic frames and the hot-path benchmark runner."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from benchmarks import hot_paths, synthetic
+        from pipelines.ranking_pipeline import dedup_nonsteam
+        self.dedup_nonsteam = dedup_nonsteam
+        self.synthetic = synthetic
+        self.hot_paths = hot_paths
+        self.tmp = tmp_path
+
+    def test_generators_are_seeded_and_shaped_like_snapshots(self):
+        steam = self.synthetic.steam_frame(500, seed=7)
+        pd.testing.assert_frame_equal(steam, self.synthetic.steam_frame(500, seed=7))
+        assert not steam.equals(self.synthetic.steam_frame(500, seed=8))
+        assert steam["AppId"].is_unique
+        assert {"AppId", "Name", "FollowerCount", "Genres", "Developers", "ReleaseDate"} <= set(steam.columns)
+
+        nonsteam = self.synthetic.nonsteam_frame(2000, seed=7, dup_rate=0.1)
+        _, merged = self.dedup_nonsteam(nonsteam)
+        assert 0 < merged <= 0.1 * 2 * len(nonsteam)
+        assert len(self.synthetic.inventory_frame(300)) == 300
+
+    def test_runner_records_time_and_memory_per_case_and_size(self):
+        cases = [c for c in self.hot_paths.CASES if c.name in ("flagging", "dedup_nonsteam", "populate_appids")]
+        doc = self.hot_paths.run([100, 200], cases, repeat=1, seed=1, log=lambda _: None)
+        assert [(r["case"], r["rows"]) for r in doc["results"]] == [
+            (c.name, n) for n in (100, 200) for c in cases
+        ]
+        assert all(r["seconds"] >= 0 and r["peak_mib"] >= 0 for r in doc["results"])
+        assert doc["meta"]["seed"] == 1 and doc["meta"]["sizes"] == [100, 200]
+        assert len(self.hot_paths.compare(doc, doc)) == len(doc["results"])
+        assert self.hot_paths.parse_size("1M") == 1_000_000 and self.hot_paths.parse_size("10k") == 10_000
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 24. FAKE API SERVER  (pipelines/fake_api_server.py, config.py base URLs)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestFakeApiServer:
+    """Local DataForSEO / Steam / SteamSpy stand-in driven through the real clients."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self):
+        from calculation import dataforseo_trends
+        from pipelines import fake_api_server
+        self.dfs = dataforseo_trends
+        self.fake = fake_api_server
+        self.servers = []
+        yield
+        for server in self.servers:
+            server.shutdown()
+            server.fake_state.close()
+            server.server_close()
+
+    def _start(self, **config) -> str:
+        server = self.fake.make_server("127.0.0.1", 0, self.fake.FakeApiConfig(**config))
+        self.fake.serve_in_background(server)
+        self.servers.append(server)
+        return self.fake.base_url(server)
+
+    def _dataforseo_at(self, base: str):
+        prefix = f"{base}/v3/keywords_data/google_trends/explore"
+        return patch.multiple(self.dfs, TASK_POST_URL=f"{prefix}/task_post",
+                              TASK_GET_URL=f"{prefix}/task_get", TASKS_READY_URL=f"{prefix}/tasks_ready")
+
+    def test_base_urls_follow_environment(self, monkeypatch):
+        import importlib
+        import config
+        monkeypatch.setenv("GAME_RANKING_API_BASE_URL", "http://127.0.0.1:9/")
+        monkeypatch.setenv("GAME_RANKING_STEAMSPY_URL", "http://spy.local")
+        try:
+            importlib.reload(config)
+            assert config.DATAFORSEO_BASE_URL == config.STEAM_STORE_BASE_URL == "http://127.0.0.1:9"
+            assert config.STEAMSPY_BASE_URL == "http://spy.local"
+        finally:
+            monkeypatch.undo()
+            importlib.reload(config)
+        assert config.DATAFORSEO_BASE_URL == "https://api.dataforseo.com"
+
+    def test_task_round_trip_scores_deterministically(self):
+        with self._dataforseo_at(self._start()):
+            ids = self.dfs.post_tasks_bulk([{"keywords": ["Alpha", "Beta"]}, {"keywords": ["Gamma"]}], "u", "p")
+            pending = dict(zip(ids, [["Alpha", "Beta"], ["Gamma"]]))
+            batches = []
+            results = self.dfs.collect_ready_results(pending, "u", "p", max_workers=1,
+                                                     on_batch=lambda *b: batches.append(b))
+            assert self.dfs.fetch_tasks_ready("u", "p") == set()   # fetched tasks leave the ready list
+        assert batches == [(1, 2), (2, 2)]
+        assert results[ids[0]] == {"Alpha": self.fake.keyword_score("Alpha"), "Beta": self.fake.keyword_score("Beta")}
+        assert set(results) == set(ids)
+
+    def test_saturated_ready_queue_falls_back_to_direct_checks(self):
+        with self._dataforseo_at(self._start(extra_ready=1000)):
+            ids = self.dfs.post_tasks_bulk([{"keywords": [f"Game {i}"]} for i in range(3)], "u", "p")
+            ready = self.dfs.fetch_tasks_ready("u", "p")
+            assert len(ready) == 1000 and not set(ids) & ready
+            results = self.dfs.collect_ready_results({tid: [f"Game {i}"] for i, tid in enumerate(ids)}, "u", "p")
+        assert set(results) == set(ids)
+
+    def test_injected_429s_are_retried_then_surface(self):
+        import requests
+        from calculation.http_client import HttpClient
+        base = self._start(rate_429=1.0, retry_after=0)
+        client = HttpClient(retries=2, backoff=0)
+        resp = client.get(f"{base}/api.php", params={"request": "appdetails", "appid": 10}, endpoint="spy")
+        assert resp.status_code == 429
+        assert client.stats().set_index("endpoint").loc["spy", "retries"] == 2
+        assert requests.get(f"{base}/stats", timeout=5).json()["http_429"] == 3
+
+    def test_steam_endpoints_answer_in_live_shapes(self):
+        from calculation import player_collector, steam_players
+        from calculation.http_client import TokenBucket
+        base = self._start()
+        with patch.object(player_collector, "CONCURRENT_PLAYERS_URL",
+                          f"{base}/ISteamUserStats/GetNumberOfCurrentPlayers/v1/"), \
+             patch.object(steam_players, "STEAMSPY_URL", f"{base}/api.php"), \
+             patch.object(steam_players, "STORE_SEARCH_URL", f"{base}/api/storesearch/"), \
+             patch.object(steam_players, "_throttle"):
+            count, reason = player_collector.fetch_current_players(730, TokenBucket(100))
+            spy = steam_players.get_steamspy_peak_ccu(730)
+            appid = steam_players.search_steam_appid("Hades", {})
+        assert reason is None and isinstance(count, int)
+        assert spy["owners_range"] and spy["peak_ccu"] is not None
+        assert appid == self.fake.fake_appid("Hades")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 25. RERUN PROFILING  (app/rerun_profile.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestRerunProfile:
+    """Per-stage wall time / rows / allocations, JSON-lines log and slow-rerun cProfile dumps."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        import tracemalloc
+        from app import rerun_profile
+        self.mod = rerun_profile
+        self.log_file = tmp_path / "reruns.jsonl"
+        self.profile_dir = tmp_path / "profiles"
+        was_tracing = tracemalloc.is_tracing()
+        yield
+        if not was_tracing:
+            tracemalloc.stop()
+
+    def test_stages_record_time_rows_and_allocations(self):
+        profile = self.mod.RerunProfile(track_alloc=True)
+        with profile.stage("build", rows=3):
+            blob = bytearray(4 * 2**20)
+        with profile.stage("count") as stage:
+            stage.rows = len(blob)
+        record = profile.finish(self.log_file, self.profile_dir)
+
+        build, count = record["stages"]
+        assert (build["name"], build["rows"], count["rows"]) == ("build", 3, 4 * 2**20)
+        assert build["alloc_mib"] >= 3.9 and build["peak_mib"] >= 3.9
+        assert record["total_seconds"] >= build["seconds"] + count["seconds"]
+        assert record["profile"] is None
+        assert self.mod.read_reruns(self.log_file) == [record]
+
+    def test_allocation_tracking_is_opt_in_and_stopped_on_finish(self, monkeypatch):
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        monkeypatch.delenv(self.mod.ALLOC_ENV, raising=False)
+        profile = self.mod.RerunProfile.start()
+        assert not tracemalloc.is_tracing()
+        profile.finish(self.log_file, self.profile_dir)
+        monkeypatch.setenv(self.mod.ALLOC_ENV, "1")
+        profile = self.mod.RerunProfile.start()
+        assert tracemalloc.is_tracing()
+        with profile.stage("build"):
+            bytearray(2**20)
+        record = profile.finish(self.log_file, self.profile_dir)
+        assert not tracemalloc.is_tracing()
+        assert record["stages"][0]["alloc_mib"] is not None
+
+    def test_untracked_allocations_and_failed_stage_still_logged(self):
+        profile = self.mod.RerunProfile(track_alloc=False)
+        with pytest.raises(ValueError), profile.stage("boom"):
+            raise ValueError("x")
+        profile.finish(self.log_file, self.profile_dir)
+        profile.finish(self.log_file, self.profile_dir)
+        records = self.mod.read_reruns(self.log_file)
+        assert len(records) == 2
+        assert records[0]["stages"] == [{"name": "boom", "seconds": records[0]["stages"][0]["seconds"],
+                                         "rows": None, "alloc_mib": None, "peak_mib": None}]
+
+    def test_only_slowest_cprofile_dumps_are_kept(self):
+        with patch.object(self.mod, "SLOW_RERUN_SECONDS", 0.0), patch.object(self.mod, "KEEP_PROFILES", 2):
+            paths = []
+            for _ in range(4):
+                profile = self.mod.RerunProfile(track_alloc=False, cprofile=True)
+                with profile.stage("work"):
+                    sum(range(10_000))
+                paths.append(profile.finish(self.log_file, self.profile_dir)["profile"])
+        assert all(paths)
+        kept = sorted(self.profile_dir.glob("*.prof"))
+        assert len(kept) == 2
+        import pstats
+        pstats.Stats(str(kept[-1]))   # a loadable cProfile dump
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 26. SNAPSHOT KEY INDEX  (pipelines/snapshot_index.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestSnapshotIndex:
+    """merge_snapshot — key-indexed merges that write only new and changed rows."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from pipelines import snapshot_index
+        from pipelines.steam_pipeline import _with_date_appended
+        self.mod = snapshot_index
+        self.conform = _with_date_appended
+        self.index = snapshot_index.SnapshotIndex(tmp_path / "snapshot_index.sqlite")
+        self.src = tmp_path / "raw_steam_2026-01-01.csv"
+        pd.DataFrame({
+            "AppId": [1, 2, 3], "Name": ["A", "B, the sequel", 'C "quoted"\nline'],
+            "date_appended": ["2026-01-01"] * 3,
+        }).to_csv(self.src, index=False)
+
+    def _merge(self, upload, out=None, **kw):
+        upload = pd.DataFrame(upload).assign(date_appended="2026-02-01")
+        return self.mod.merge_snapshot("steam", upload, self.src, out or self.src, self.conform,
+                                       index=self.index, **kw)
+
+    @staticmethod
+    def _reference(existing, upload, insert_only=False):
+        """The pre-index merge: drop every existing row of an uploaded key, append the upload."""
+        keys = set(upload["AppId"].astype(str))
+        if insert_only:
+            return pd.concat([existing, upload[~upload["AppId"].astype(str).isin(set(existing["AppId"].astype(str)))]])
+        return pd.concat([existing[~existing["AppId"].astype(str).isin(keys)], upload])
+
+    def test_inserts_append_in_place(self):
+        before = self.src.read_bytes()
+        result = self._merge({"AppId": [4, 5], "Name": ["D", "E"]})
+        assert (result.n_new, result.n_updated, result.rows_written) == (2, 0, 2)
+        assert self.src.read_bytes().startswith(before)
+        assert pd.read_csv(self.src)["AppId"].tolist() == [1, 2, 3, 4, 5]
+
+    def test_changed_rows_move_to_end_and_unchanged_rows_stay(self):
+        result = self._merge({"AppId": [2, 1], "Name": ["B2", "A"]})
+        assert (result.n_new, result.n_updated, result.n_unchanged) == (0, 1, 1)
+        out = pd.read_csv(self.src)
+        assert out["AppId"].tolist() == [1, 3, 2]
+        assert out["Name"].tolist()[-1] == "B2"
+        assert out.set_index("AppId").loc[1, "date_appended"] == "2026-01-01"
+
+    def test_identical_upload_writes_nothing(self):
+        self._merge({"AppId": [2], "Name": ["B2"]})
+        before = self.src.stat().st_mtime_ns, self.src.read_bytes()
+        result = self._merge({"AppId": [2], "Name": ["B2"]})
+        assert (result.n_unchanged, result.rows_written) == (1, 0)
+        assert (self.src.stat().st_mtime_ns, self.src.read_bytes()) == before
+
+    def test_float_appid_keys_the_same_row(self):
+        result = self._merge({"AppId": [2.0], "Name": ["B2"]})
+        assert (result.n_new, result.n_updated) == (0, 1)
+        assert len(pd.read_csv(self.src)) == 3
+
+    def test_new_dated_file_leaves_source_untouched(self, tmp_path):
+        before = self.src.read_bytes()
+        out = tmp_path / "raw_steam_2026-02-01.csv"
+        self._merge({"AppId": [3, 9], "Name": ["C2", "I"]}, out=out)
+        assert self.src.read_bytes() == before
+        assert pd.read_csv(out)["AppId"].tolist() == [1, 2, 3, 9]
+
+    def test_repeated_merges_match_full_rewrite(self, tmp_path):
+        rng = np.random.default_rng(7)
+        expected = pd.read_csv(self.src, dtype=str, keep_default_na=False)
+        with patch.object(self.mod, "_COMPACT_MIN_HOLES", 3):
+            for round_ in range(12):
+                ids = rng.choice(40, size=6, replace=False)
+                upload = pd.DataFrame({"AppId": ids, "Name": [f"N{i}-{round_ % 3}" for i in ids]})
+                insert_only = round_ % 4 == 3
+                self._merge(upload, insert_only=insert_only)
+                expected = self._reference(
+                    expected, upload.astype(str).assign(date_appended="2026-02-01"), insert_only,
+                )
+                out = pd.read_csv(self.src, dtype=str, keep_default_na=False)
+                # Unchanged rows keep their old place, so compare content per key
+                assert out["AppId"].is_unique
+                assert (out.set_index("AppId")["Name"].sort_index()
+                        .equals(expected.set_index("AppId")["Name"].sort_index()))
+        assert not self.index.is_current("steam", tmp_path / "missing.csv")
+        assert self.index.is_current("steam", self.src)
+
+    def test_reseeds_after_outside_rewrite(self):
+        self._merge({"AppId": [4], "Name": ["D"]})
+        pd.DataFrame({"AppId": [1, 7], "Name": ["A", "G"], "date_appended": ["x", "y"]}).to_csv(self.src, index=False)
+        result = self._merge({"AppId": [7, 4], "Name": ["G", "D"]})
+        assert (result.n_unchanged, result.n_new) == (1, 1)
+        assert pd.read_csv(self.src)["AppId"].tolist() == [1, 7, 4]
+
+    def test_snapshot_without_date_appended_is_rewritten_once(self, tmp_path):
+        pd.DataFrame({"AppId": [1], "Name": ["A"]}).to_csv(self.src, index=False)
+        out = tmp_path / "raw_steam_2026-02-01.csv"
+        self._merge({"AppId": [2], "Name": ["B"]}, out=out)
+        written = pd.read_csv(out)
+        assert written.columns.tolist() == ["AppId", "Name", "date_appended"]
+        assert written["AppId"].tolist() == [1, 2]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 27. RANKING-READY NON-STEAM FRAME  (pipelines/ranking_pipeline.py)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestPreparedNonSteam:
+    """prepare_nonsteam / load_prepared_nonsteam — the per-snapshot frame the Non-Steam tab ranks."""
+
+    @pytest.fixture(autouse=True)
+    def _import(self, tmp_path):
+        from pipelines import ranking_pipeline
+        self.mod = ranking_pipeline
+        self.tmp = tmp_path
+        self.ready_path = tmp_path / "nonsteam_ready.pkl"
+        self.store = tmp_path / "row_store.sqlite"
+        self.raw = pd.DataFrame({
+            "Game Title":          ["Alpha", "Alpha", "Beta", "Gamma", "Delta", "Epsilon"],
+            "SteamStatus":         ["Not on Steam"] * 3 + ["PC Game (on Steam)", None, "Not on Steam"],
+            "Category":            ["Main Game"] * 6,
+            "YouTube Views":       ["1,000", "50,000", "2,000", "9,000", "9,000", "n/a"],
+            "YouTube ReleaseDate": ["2026-01-01"] * 6,
+            "Release Date":        ["2026-01-01", "2026-01-01", "15/01/2026", "2026-01-01", "2026-01-01", "TBA"],
+            "date_appended":       ["2026-01-01", "2026-02-01", "2026-01-01", "2026-01-01", "2026-01-01", "2026-01-01"],
+        })
+        self.nonsteam_csv = tmp_path / "raw_non_steam_2026-03-01.csv"
+        self.steam_csv = tmp_path / "raw_steam_2026-03-01.csv"
+        self.raw.to_csv(self.nonsteam_csv, index=False)
+        pd.DataFrame({"AppId": [1], "Name": [" beta "]}).to_csv(self.steam_csv, index=False)
+
+    def _load(self):
+        return self.mod.load_prepared_nonsteam(self.nonsteam_csv, self.steam_csv,
+                                               path=self.ready_path, store_path=self.store)
+
+    def test_frame_is_deduplicated_typed_and_flagged(self):
+        ready = self.mod.prepare_nonsteam(self.raw, pd.Series(["BETA", None]), store_path=self.store)
+        frame = ready.frame
+        assert (ready.raw_rows, ready.dedup_merged) == (6, 1)
+        assert sorted(frame["Game Title"]) == ["Alpha", "Beta", "Epsilon"]
+        assert frame.loc[frame["Game Title"] == "Alpha", "date_appended"].item() == "2026-02-01"
+        assert pd.api.types.is_datetime64_any_dtype(frame["Release Date"])
+        assert frame.loc[frame["Game Title"] == "Epsilon", "Release Date"].isna().all()
+        assert frame.set_index("Game Title")["YouTube Views"].to_dict() == {"Alpha": 50000, "Beta": 2000, "Epsilon": 0}
+        assert frame.set_index("Game Title")["on_steam"].to_dict() == {"Alpha": False, "Beta": True, "Epsilon": False}
+
+    def test_ranking_matches_rank_then_exclude(self):
+        trends, today = {"Beta": 50}, date(2026, 3, 1)
+        ranked, _, _ = self.mod.rank_nonsteam(self.raw, trends, 5, 2, today, store_path=self.store)
+        expected, removed = self.mod.exclude_on_steam(ranked, pd.DataFrame({"Name": [" beta "]}))
+        ready = self._load()
+        pd.testing.assert_frame_equal(self.mod.rank_prepared_nonsteam(ready, trends, 5, 2, today), expected)
+        assert int(ready.frame["on_steam"].sum()) == removed == 1
+
+    def test_rebuilt_only_when_a_snapshot_changes(self, monkeypatch):
+        calls = []
+        prepare = self.mod.prepare_nonsteam
+        monkeypatch.setattr(self.mod, "prepare_nonsteam", lambda *a, **kw: calls.append(1) or prepare(*a, **kw))
+        first = self._load()
+        second = self._load()
+        assert len(calls) == 1 and second.key == first.key
+        pd.testing.assert_frame_equal(second.frame, first.frame)
+
+        pd.DataFrame({"AppId": [1, 2], "Name": ["Beta", "Alpha"]}).to_csv(self.steam_csv, index=False)
+        third = self._load()
+        assert len(calls) == 2 and third.key != first.key
+        assert third.frame["on_steam"].sum() == 2